@@ -33,7 +33,16 @@ from airflow.api.common.mark_tasks import (
 from airflow.api_connexion import security
 from airflow.api_connexion.endpoints.request_dict import get_json_request_dict
 from airflow.api_connexion.exceptions import AlreadyExists, BadRequest, NotFound
-from airflow.api_connexion.parameters import apply_sorting, check_limit, format_datetime, format_parameters
+from airflow.api_connexion.parameters import (
+    SortKey,
+    apply_keyset_pagination,
+    apply_sorting,
+    check_limit,
+    encode_cursor,
+    format_datetime,
+    format_parameters,
+    get_sort_keys,
+)
 from airflow.api_connexion.schemas.dag_run_schema import (
     DAGRunCollection,
     clear_dagrun_form_schema,
@@ -50,6 +59,7 @@ from airflow.api_connexion.schemas.task_instance_schema import (
     TaskInstanceReferenceCollection,
     task_instance_reference_collection_schema,
 )
+from airflow.api_connexion.streaming import stream_ndjson, wants_ndjson
 from airflow.api_connexion.types import APIResponse
 from airflow.models import DagModel, DagRun
 from airflow.security import permissions
@@ -134,7 +144,37 @@ def _fetch_dag_runs(
     limit: int | None,
     offset: int | None,
     order_by: str,
-) -> tuple[list[DagRun], int]:
+    cursor: str | None = None,
+    skip_total_entries: bool = False,
+) -> tuple[list[DagRun], int | None, str | None]:
+    query = _apply_date_filters(
+        query,
+        end_date_gte=end_date_gte,
+        end_date_lte=end_date_lte,
+        execution_date_gte=execution_date_gte,
+        execution_date_lte=execution_date_lte,
+        start_date_gte=start_date_gte,
+        start_date_lte=start_date_lte,
+    )
+    total_entries = None if skip_total_entries else query.count()
+    query, sort_keys = _apply_ordering(query, order_by, cursor)
+    dag_runs = query.offset(offset).limit(limit).all()
+    next_cursor = None
+    if sort_keys and dag_runs and len(dag_runs) == limit:
+        next_cursor = encode_cursor(dag_runs[-1], sort_keys)
+    return dag_runs, total_entries, next_cursor
+
+
+def _apply_date_filters(
+    query: Query,
+    *,
+    end_date_gte: str | None,
+    end_date_lte: str | None,
+    execution_date_gte: str | None,
+    execution_date_lte: str | None,
+    start_date_gte: str | None,
+    start_date_lte: str | None,
+) -> Query:
     if start_date_gte:
         query = query.filter(DagRun.start_date >= start_date_gte)
     if start_date_lte:
@@ -149,8 +189,10 @@ def _fetch_dag_runs(
         query = query.filter(DagRun.end_date >= end_date_gte)
     if end_date_lte:
         query = query.filter(DagRun.end_date <= end_date_lte)
+    return query
+
 
-    total_entries = query.count()
+def _apply_ordering(query: Query, order_by: str, cursor: str | None) -> tuple[Query, list[SortKey] | None]:
     to_replace = {"dag_run_id": "run_id"}
     allowed_filter_attrs = [
         "id",
@@ -163,8 +205,14 @@ def _fetch_dag_runs(
         "external_trigger",
         "conf",
     ]
-    query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
-    return query.offset(offset).limit(limit).all(), total_entries
+    sort_keys = get_sort_keys(DagRun, order_by, to_replace, allowed_filter_attrs)
+    if sort_keys is None:
+        if cursor:
+            raise BadRequest(detail=f"Ordering with '{order_by.lstrip('-')}' does not support a cursor")
+        query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
+    else:
+        query = apply_keyset_pagination(query, sort_keys, cursor)
+    return query, sort_keys
 
 
 @security.requires_access(
@@ -198,6 +246,8 @@ def get_dag_runs(
     offset: int | None = None,
     limit: int | None = None,
     order_by: str = "id",
+    cursor: str | None = None,
+    skip_total_entries: bool = False,
     session: Session = NEW_SESSION,
 ):
     """Get all DAG Runs."""
@@ -213,7 +263,7 @@ def get_dag_runs(
     if state:
         query = query.filter(DagRun.state.in_(state))
 
-    dag_run, total_entries = _fetch_dag_runs(
+    dag_run, total_entries, next_cursor = _fetch_dag_runs(
         query,
         end_date_gte=end_date_gte,
         end_date_lte=end_date_lte,
@@ -224,8 +274,13 @@ def get_dag_runs(
         limit=limit,
         offset=offset,
         order_by=order_by,
+        cursor=cursor,
+        skip_total_entries=skip_total_entries,
     )
-    return dagrun_collection_schema.dump(DAGRunCollection(dag_runs=dag_run, total_entries=total_entries))
+    response = dagrun_collection_schema.dump(DAGRunCollection(dag_runs=dag_run, total_entries=total_entries))
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
 
 
 @security.requires_access(
@@ -236,7 +291,11 @@ def get_dag_runs(
 )
 @provide_session
 def get_dag_runs_batch(*, session: Session = NEW_SESSION) -> APIResponse:
-    """Get list of DAG Runs"""
+    """
+    Get list of DAG Runs
+
+    The DAG Runs are streamed as newline-delimited JSON if the client accepts it.
+    """
     body = get_json_request_dict()
     try:
         data = dagruns_batch_form_schema.load(body)
@@ -245,19 +304,39 @@ def get_dag_runs_batch(*, session: Session = NEW_SESSION) -> APIResponse:
 
     appbuilder = get_airflow_app().appbuilder
     readable_dag_ids = appbuilder.sm.get_readable_dag_ids(g.user)
-    query = session.query(DagRun)
-    if data.get("dag_ids"):
-        dag_ids = set(data["dag_ids"]) & set(readable_dag_ids)
-        query = query.filter(DagRun.dag_id.in_(dag_ids))
-    else:
-        query = query.filter(DagRun.dag_id.in_(readable_dag_ids))
 
-    states = data.get("states")
-    if states:
-        query = query.filter(DagRun.state.in_(states))
+    def get_query(session: Session) -> Query:
+        query = session.query(DagRun)
+        if data.get("dag_ids"):
+            dag_ids = set(data["dag_ids"]) & set(readable_dag_ids)
+            query = query.filter(DagRun.dag_id.in_(dag_ids))
+        else:
+            query = query.filter(DagRun.dag_id.in_(readable_dag_ids))
+
+        states = data.get("states")
+        if states:
+            query = query.filter(DagRun.state.in_(states))
+        return query
+
+    if wants_ndjson():
+
+        def get_page_query(session: Session) -> Query:
+            query = _apply_date_filters(
+                get_query(session),
+                end_date_gte=data["end_date_gte"],
+                end_date_lte=data["end_date_lte"],
+                execution_date_gte=data["execution_date_gte"],
+                execution_date_lte=data["execution_date_lte"],
+                start_date_gte=data["start_date_gte"],
+                start_date_lte=data["start_date_lte"],
+            )
+            query, _ = _apply_ordering(query, data.get("order_by", "id"), None)
+            return query.offset(data["page_offset"]).limit(data["page_limit"])
 
-    dag_runs, total_entries = _fetch_dag_runs(
-        query,
+        return stream_ndjson(get_page_query, dagrun_schema.dump)
+
+    dag_runs, total_entries, _ = _fetch_dag_runs(
+        get_query(session),
         end_date_gte=data["end_date_gte"],
         end_date_lte=data["end_date_lte"],
         execution_date_gte=data["execution_date_gte"],
@@ -20,8 +20,15 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from airflow.api_connexion import security
-from airflow.api_connexion.exceptions import NotFound
-from airflow.api_connexion.parameters import apply_sorting, check_limit, format_parameters
+from airflow.api_connexion.exceptions import BadRequest, NotFound
+from airflow.api_connexion.parameters import (
+    apply_keyset_pagination,
+    apply_sorting,
+    check_limit,
+    encode_cursor,
+    format_parameters,
+    get_sort_keys,
+)
 from airflow.api_connexion.schemas.event_log_schema import (
     EventLogCollection,
     event_log_collection_schema,
@@ -51,6 +58,8 @@ def get_event_logs(
     limit: int,
     offset: int | None = None,
     order_by: str = "event_log_id",
+    cursor: str | None = None,
+    skip_total_entries: bool = False,
     session: Session = NEW_SESSION,
 ) -> APIResponse:
     """Get all log entries from event log"""
@@ -65,10 +74,19 @@ def get_event_logs(
         "owner",
         "extra",
     ]
-    total_entries = session.query(func.count(Log.id)).scalar()
+    total_entries = None if skip_total_entries else session.query(func.count(Log.id)).scalar()
     query = session.query(Log)
-    query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
+    sort_keys = get_sort_keys(Log, order_by, to_replace, allowed_filter_attrs)
+    if sort_keys is None:
+        if cursor:
+            raise BadRequest(detail=f"Ordering with '{order_by.lstrip('-')}' does not support a cursor")
+        query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
+    else:
+        query = apply_keyset_pagination(query, sort_keys, cursor)
     event_logs = query.offset(offset).limit(limit).all()
-    return event_log_collection_schema.dump(
+    response = event_log_collection_schema.dump(
         EventLogCollection(event_logs=event_logs, total_entries=total_entries)
     )
+    if sort_keys and event_logs and len(event_logs) == limit:
+        response["next_cursor"] = encode_cursor(event_logs[-1], sort_keys)
+    return response
@@ -16,6 +16,8 @@
 # under the License.
 from __future__ import annotations
 
+import re
+from datetime import datetime
 from typing import Any
 
 from flask import Response, request
@@ -24,14 +26,21 @@ from itsdangerous.url_safe import URLSafeSerializer
 from sqlalchemy.orm.session import Session
 
 from airflow.api_connexion import security
-from airflow.api_connexion.exceptions import BadRequest, NotFound
-from airflow.api_connexion.schemas.log_schema import LogResponseObject, logs_schema
+from airflow.api_connexion.exceptions import BadRequest, NotFound, Unknown
+from airflow.api_connexion.parameters import check_limit, format_datetime, format_parameters
+from airflow.api_connexion.schemas.log_schema import (
+    LogResponseObject,
+    LogSearchResult,
+    log_search_result_schema,
+    logs_schema,
+)
 from airflow.api_connexion.types import APIResponse
-from airflow.exceptions import TaskNotFound
+from airflow.exceptions import AirflowException, TaskNotFound
 from airflow.models import TaskInstance
 from airflow.security import permissions
 from airflow.utils.airflow_flask_app import get_airflow_app
 from airflow.utils.log.log_reader import TaskLogReader
+from airflow.utils.log.log_search import LogSearchQuery
 from airflow.utils.session import NEW_SESSION, provide_session
 
 
@@ -111,3 +120,85 @@ def get_log(
     logs = task_log_reader.read_log_stream(ti, task_try_number, metadata)
 
     return Response(logs, headers={"Content-Type": return_type})
+
+
+@security.requires_access(
+    [
+        (permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG),
+        (permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG_RUN),
+        (permissions.ACTION_CAN_READ, permissions.RESOURCE_TASK_INSTANCE),
+    ],
+)
+@format_parameters(
+    {
+        "start_date": format_datetime,
+        "end_date": format_datetime,
+        "limit": check_limit,
+    }
+)
+@provide_session
+def search_log(
+    *,
+    dag_id: str,
+    dag_run_id: str,
+    task_id: str,
+    limit: int,
+    pattern: str = "",
+    regex: bool = False,
+    ignore_case: bool = False,
+    levels: list[str] | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    context_lines: int = 0,
+    try_number: int | None = None,
+    map_index: int = -1,
+    session: Session = NEW_SESSION,
+) -> APIResponse:
+    """Search the logs of a specific task instance"""
+    query = LogSearchQuery(
+        pattern=pattern,
+        regex=regex,
+        ignore_case=ignore_case,
+        levels=levels,
+        start_date=start_date,
+        end_date=end_date,
+        context_lines=context_lines,
+        # One more match tells whether there are more matches than returned
+        max_matches=limit + 1,
+    )
+    try:
+        query.compile()
+    except re.error as e:
+        raise BadRequest("Invalid regular expression", detail=str(e))
+
+    task_log_reader = TaskLogReader()
+    if not task_log_reader.supports_search:
+        raise BadRequest("Task log handler does not support searching logs.")
+    ti = (
+        session.query(TaskInstance)
+        .filter(
+            TaskInstance.task_id == task_id,
+            TaskInstance.dag_id == dag_id,
+            TaskInstance.run_id == dag_run_id,
+            TaskInstance.map_index == map_index,
+        )
+        .join(TaskInstance.dag_run)
+        .one_or_none()
+    )
+    if ti is None:
+        raise NotFound(title="TaskInstance not found")
+
+    dag = get_airflow_app().dag_bag.get_dag(dag_id)
+    if dag:
+        try:
+            ti.task = dag.get_task(ti.task_id)
+        except TaskNotFound:
+            pass
+
+    try:
+        matches = list(task_log_reader.search_log(ti, try_number, query))
+    except AirflowException as e:
+        raise Unknown(title="Could not search the task log", detail=str(e))
+    return log_search_result_schema.dump(
+        LogSearchResult(matches=matches[:limit], truncated=len(matches) > limit)
+    )
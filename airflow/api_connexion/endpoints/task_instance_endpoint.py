@@ -28,7 +28,12 @@ from sqlalchemy.sql import ClauseElement
 from airflow.api_connexion import security
 from airflow.api_connexion.endpoints.request_dict import get_json_request_dict
 from airflow.api_connexion.exceptions import BadRequest, NotFound
-from airflow.api_connexion.parameters import format_datetime, format_parameters
+from airflow.api_connexion.parameters import (
+    apply_keyset_pagination,
+    encode_cursor,
+    format_datetime,
+    format_parameters,
+)
 from airflow.api_connexion.schemas.task_instance_schema import (
     TaskInstanceCollection,
     TaskInstanceReferenceCollection,
@@ -39,6 +44,7 @@ from airflow.api_connexion.schemas.task_instance_schema import (
     task_instance_reference_collection_schema,
     task_instance_schema,
 )
+from airflow.api_connexion.streaming import stream_ndjson, wants_ndjson
 from airflow.api_connexion.types import APIResponse
 from airflow.models import SlaMiss
 from airflow.models.dagrun import DagRun as DR
@@ -50,6 +56,9 @@ from airflow.utils.state import DagRunState, State
 
 T = TypeVar("T")
 
+# Task instances are listed in primary key order, so that they can be paginated with a cursor
+TASK_INSTANCE_SORT_KEYS = [(TI.dag_id, False), (TI.run_id, False), (TI.task_id, False), (TI.map_index, False)]
+
 
 @security.requires_access(
     [
@@ -309,6 +318,8 @@ def get_task_instances(
     pool: list[str] | None = None,
     queue: list[str] | None = None,
     offset: int | None = None,
+    cursor: str | None = None,
+    skip_total_entries: bool = False,
     session: Session = NEW_SESSION,
 ) -> APIResponse:
     """Get list of task instances."""
@@ -336,7 +347,10 @@ def get_task_instances(
     base_query = _apply_array_filter(base_query, key=TI.queue, values=queue)
 
     # Count elements before joining extra columns
-    total_entries = base_query.with_entities(func.count('*')).scalar()
+    if skip_total_entries:
+        total_entries = None
+    else:
+        total_entries = base_query.with_entities(func.count('*')).scalar()
     # Add join
     query = (
         base_query.join(
@@ -351,10 +365,14 @@ def get_task_instances(
         .add_entity(SlaMiss)
         .options(joinedload(TI.rendered_task_instance_fields))
     )
+    query = apply_keyset_pagination(query, TASK_INSTANCE_SORT_KEYS, cursor)
     task_instances = query.offset(offset).limit(limit).all()
-    return task_instance_collection_schema.dump(
+    response = task_instance_collection_schema.dump(
         TaskInstanceCollection(task_instances=task_instances, total_entries=total_entries)
     )
+    if task_instances and len(task_instances) == limit:
+        response["next_cursor"] = encode_cursor(task_instances[-1][0], TASK_INSTANCE_SORT_KEYS)
+    return response
 
 
 @security.requires_access(
@@ -366,50 +384,62 @@ def get_task_instances(
 )
 @provide_session
 def get_task_instances_batch(session: Session = NEW_SESSION) -> APIResponse:
-    """Get list of task instances."""
+    """
+    Get list of task instances.
+
+    The task instances are streamed as newline-delimited JSON if the client accepts it.
+    """
     body = get_json_request_dict()
     try:
         data = task_instance_batch_form.load(body)
     except ValidationError as err:
         raise BadRequest(detail=str(err.messages))
     states = _convert_state(data['state'])
-    base_query = session.query(TI).join(TI.dag_run)
 
-    base_query = _apply_array_filter(base_query, key=TI.dag_id, values=data["dag_ids"])
-    base_query = _apply_range_filter(
-        base_query,
-        key=DR.execution_date,
-        value_range=(data["execution_date_gte"], data["execution_date_lte"]),
-    )
-    base_query = _apply_range_filter(
-        base_query,
-        key=TI.start_date,
-        value_range=(data["start_date_gte"], data["start_date_lte"]),
-    )
-    base_query = _apply_range_filter(
-        base_query, key=TI.end_date, value_range=(data["end_date_gte"], data["end_date_lte"])
-    )
-    base_query = _apply_range_filter(
-        base_query, key=TI.duration, value_range=(data["duration_gte"], data["duration_lte"])
-    )
-    base_query = _apply_array_filter(base_query, key=TI.state, values=states)
-    base_query = _apply_array_filter(base_query, key=TI.pool, values=data["pool"])
-    base_query = _apply_array_filter(base_query, key=TI.queue, values=data["queue"])
+    def get_base_query(session: Session) -> Query:
+        base_query = session.query(TI).join(TI.dag_run)
+
+        base_query = _apply_array_filter(base_query, key=TI.dag_id, values=data["dag_ids"])
+        base_query = _apply_range_filter(
+            base_query,
+            key=DR.execution_date,
+            value_range=(data["execution_date_gte"], data["execution_date_lte"]),
+        )
+        base_query = _apply_range_filter(
+            base_query,
+            key=TI.start_date,
+            value_range=(data["start_date_gte"], data["start_date_lte"]),
+        )
+        base_query = _apply_range_filter(
+            base_query, key=TI.end_date, value_range=(data["end_date_gte"], data["end_date_lte"])
+        )
+        base_query = _apply_range_filter(
+            base_query, key=TI.duration, value_range=(data["duration_gte"], data["duration_lte"])
+        )
+        base_query = _apply_array_filter(base_query, key=TI.state, values=states)
+        base_query = _apply_array_filter(base_query, key=TI.pool, values=data["pool"])
+        base_query = _apply_array_filter(base_query, key=TI.queue, values=data["queue"])
+        return base_query
+
+    def get_query(session: Session) -> Query:
+        # Add join
+        base_query = get_base_query(session).join(
+            SlaMiss,
+            and_(
+                SlaMiss.dag_id == TI.dag_id,
+                SlaMiss.task_id == TI.task_id,
+                SlaMiss.execution_date == DR.execution_date,
+            ),
+            isouter=True,
+        )
+        return base_query.add_entity(SlaMiss).options(joinedload(TI.rendered_task_instance_fields))
+
+    if wants_ndjson():
+        return stream_ndjson(get_query, task_instance_schema.dump)
 
     # Count elements before joining extra columns
-    total_entries = base_query.with_entities(func.count('*')).scalar()
-    # Add join
-    base_query = base_query.join(
-        SlaMiss,
-        and_(
-            SlaMiss.dag_id == TI.dag_id,
-            SlaMiss.task_id == TI.task_id,
-            SlaMiss.execution_date == DR.execution_date,
-        ),
-        isouter=True,
-    ).add_entity(SlaMiss)
-    ti_query = base_query.options(joinedload(TI.rendered_task_instance_fields))
-    task_instances = ti_query.all()
+    total_entries = get_base_query(session).with_entities(func.count('*')).scalar()
+    task_instances = get_query(session).all()
 
     return task_instance_collection_schema.dump(
         TaskInstanceCollection(task_instances=task_instances, total_entries=total_entries)
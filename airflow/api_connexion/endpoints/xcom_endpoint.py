@@ -24,7 +24,12 @@ from sqlalchemy.orm import Session
 
 from airflow.api_connexion import security
 from airflow.api_connexion.exceptions import NotFound
-from airflow.api_connexion.parameters import check_limit, format_parameters
+from airflow.api_connexion.parameters import (
+    apply_keyset_pagination,
+    check_limit,
+    encode_cursor,
+    format_parameters,
+)
 from airflow.api_connexion.schemas.xcom_schema import XComCollection, xcom_collection_schema, xcom_schema
 from airflow.api_connexion.types import APIResponse
 from airflow.models import DagRun as DR, XCom
@@ -32,6 +37,15 @@ from airflow.security import permissions
 from airflow.utils.airflow_flask_app import get_airflow_app
 from airflow.utils.session import NEW_SESSION, provide_session
 
+# The map index makes the order total, so that XComs can be paginated with a cursor
+XCOM_SORT_KEYS = [
+    (DR.execution_date, False),
+    (XCom.task_id, False),
+    (XCom.dag_id, False),
+    (XCom.key, False),
+    (XCom.map_index, False),
+]
+
 
 @security.requires_access(
     [
@@ -50,6 +64,8 @@ def get_xcom_entries(
     task_id: str,
     limit: int | None,
     offset: int | None = None,
+    cursor: str | None = None,
+    skip_total_entries: bool = False,
     session: Session = NEW_SESSION,
 ) -> APIResponse:
     """Get all XCom values"""
@@ -67,10 +83,15 @@ def get_xcom_entries(
         query = query.filter(XCom.task_id == task_id)
     if dag_run_id != '~':
         query = query.filter(DR.run_id == dag_run_id)
-    query = query.order_by(DR.execution_date, XCom.task_id, XCom.dag_id, XCom.key)
-    total_entries = query.count()
-    query = query.offset(offset).limit(limit)
-    return xcom_collection_schema.dump(XComCollection(xcom_entries=query, total_entries=total_entries))
+    total_entries = None if skip_total_entries else query.count()
+    query = apply_keyset_pagination(query, XCOM_SORT_KEYS, cursor)
+    xcom_entries = query.offset(offset).limit(limit).all()
+    response = xcom_collection_schema.dump(
+        XComCollection(xcom_entries=xcom_entries, total_entries=total_entries)
+    )
+    if xcom_entries and len(xcom_entries) == limit:
+        response["next_cursor"] = encode_cursor(xcom_entries[-1], XCOM_SORT_KEYS)
+    return response
 
 
 @security.requires_access(
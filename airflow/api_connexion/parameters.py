@@ -16,13 +16,17 @@
 # under the License.
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, Container, TypeVar, cast
+from typing import Any, Callable, Container, Sequence, Tuple, TypeVar, cast
 
 from pendulum.parsing import ParserError
-from sqlalchemy import text
+from sqlalchemy import TypeDecorator, and_, or_, text
 from sqlalchemy.orm.query import Query
+from sqlalchemy.sql import ColumnElement
 
 from airflow.api_connexion.exceptions import BadRequest
 from airflow.configuration import conf
@@ -113,3 +117,96 @@ def apply_sorting(
     else:
         order_by = f"{lstriped_orderby} asc"
     return query.order_by(text(order_by))
+
+
+# A column to sort by, and whether it is sorted in descending order
+SortKey = Tuple[ColumnElement, bool]
+
+
+def get_sort_keys(
+    model: Any,
+    order_by: str,
+    to_replace: dict[str, str] | None = None,
+    allowed_attrs: Container[str] | None = None,
+    tiebreakers: Sequence[str] = ("id",),
+) -> list[SortKey] | None:
+    """
+    Get the keys to sort the rows of a model by for keyset pagination.
+
+    The attributes in ``tiebreakers`` are appended, in the same direction, so that the order is total.
+
+    :return: The sort keys, or None if the ordering is on a nullable column, which cannot be paginated
+        with a cursor.
+    """
+    attr = order_by.lstrip('-')
+    if allowed_attrs and attr not in allowed_attrs:
+        raise BadRequest(
+            detail=f"Ordering with '{attr}' is disallowed or the attribute does not exist on the model"
+        )
+    if to_replace:
+        attr = to_replace.get(attr, attr)
+    descending = order_by.startswith('-')
+    column = getattr(model, attr, None)
+    if column is None or getattr(column.expression, 'nullable', True):
+        return None
+    return [(column, descending)] + [
+        (getattr(model, tiebreaker), descending) for tiebreaker in tiebreakers if tiebreaker != attr
+    ]
+
+
+def _cursor_signature(sort_keys: Sequence[SortKey]) -> list[str]:
+    return [f"{column}{' desc' if descending else ''}" for column, descending in sort_keys]
+
+
+def encode_cursor(item: Any, sort_keys: Sequence[SortKey]) -> str:
+    """Encode the values of the sort keys of an item into an opaque cursor pointing after the item."""
+    values = []
+    for column, _ in sort_keys:
+        value = getattr(item, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    payload = json.dumps({"keys": _cursor_signature(sort_keys), "values": values}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[SortKey]) -> list[Any]:
+    """Decode the values of the sort keys from a cursor, raising BadRequest if it is invalid."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["keys"] != _cursor_signature(sort_keys):
+            raise ValueError("The cursor was created for a different ordering")
+        if len(payload["values"]) != len(sort_keys):
+            raise ValueError("The cursor does not match the ordering")
+        values = []
+        for (column, _), value in zip(sort_keys, payload["values"]):
+            column_type = column.type
+            if isinstance(column_type, TypeDecorator):
+                column_type = column_type.impl
+            try:
+                python_type = column_type.python_type
+            except NotImplementedError:
+                python_type = None
+            if value is not None and python_type is datetime:
+                value = timezone.parse(value)
+            values.append(value)
+    except (binascii.Error, UnicodeError, KeyError, TypeError, ValueError, ParserError) as err:
+        raise BadRequest("Invalid cursor", detail=str(err))
+    return values
+
+
+def apply_keyset_pagination(query: Query, sort_keys: Sequence[SortKey], cursor: str | None) -> Query:
+    """
+    Order the query by the sort keys, and only return the rows after the one the cursor points to.
+
+    Unlike an offset, the cursor does not require the database to scan all the preceding rows.
+    """
+    query = query.order_by(
+        *(column.desc() if descending else column.asc() for column, descending in sort_keys)
+    )
+    if not cursor:
+        return query
+    values = decode_cursor(cursor, sort_keys)
+    conditions = []
+    for i, (column, descending) in enumerate(sort_keys):
+        after = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*(key == value for (key, _), value in zip(sort_keys[:i], values)), after))
+    return query.filter(or_(*conditions))
@@ -131,7 +131,7 @@ class DAGRunCollection(NamedTuple):
     """List of DAGRuns with metadata"""
 
     dag_runs: list[DagRun]
-    total_entries: int
+    total_entries: int | None
 
 
 class DAGRunCollectionSchema(Schema):
@@ -46,7 +46,7 @@ class EventLogCollection(NamedTuple):
     """List of import errors with metadata"""
 
     event_logs: list[Log]
-    total_entries: int
+    total_entries: int | None
 
 
 class EventLogCollectionSchema(Schema):
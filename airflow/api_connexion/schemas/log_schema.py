@@ -20,6 +20,8 @@ from typing import NamedTuple
 
 from marshmallow import Schema, fields
 
+from airflow.utils.log.log_search import LogMatch
+
 
 class LogsSchema(Schema):
     """Schema for logs"""
@@ -35,4 +37,29 @@ class LogResponseObject(NamedTuple):
     continuation_token: str | None
 
 
+class LogMatchSchema(Schema):
+    """Schema for a line of a log matching a search"""
+
+    try_number = fields.Int()
+    offset = fields.Int()
+    line = fields.Str()
+    context_before = fields.List(fields.Str())
+    context_after = fields.List(fields.Str())
+
+
+class LogSearchResultSchema(Schema):
+    """Schema for the result of a log search"""
+
+    matches = fields.List(fields.Nested(LogMatchSchema))
+    truncated = fields.Bool()
+
+
+class LogSearchResult(NamedTuple):
+    """Log Search Result"""
+
+    matches: list[LogMatch]
+    truncated: bool
+
+
 logs_schema = LogsSchema()
+log_search_result_schema = LogSearchResultSchema()
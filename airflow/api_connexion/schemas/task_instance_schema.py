@@ -83,7 +83,7 @@ class TaskInstanceCollection(NamedTuple):
     """List of task instances with metadata"""
 
     task_instances: list[tuple[TaskInstance, SlaMiss | None]]
-    total_entries: int
+    total_entries: int | None
 
 
 class TaskInstanceCollectionSchema(Schema):
@@ -49,7 +49,7 @@ class XComCollection(NamedTuple):
     """List of XComs with meta"""
 
     xcom_entries: list[XCom]
-    total_entries: int
+    total_entries: int | None
 
 
 class XComCollectionSchema(Schema):
@@ -0,0 +1,56 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Iterator
+
+from flask import Response, request, stream_with_context
+from sqlalchemy.orm import Query, Session
+
+from airflow.utils.session import create_session
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# The number of rows fetched from the database at a time when streaming a response
+STREAM_YIELD_PER = 1000
+
+
+def wants_ndjson() -> bool:
+    """Whether the client accepts newline-delimited JSON rather than a JSON document"""
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_ndjson(get_query: Callable[[Session], Query], dump: Callable[[Any], Any]) -> Response:
+    """
+    Stream the rows of a query as newline-delimited JSON.
+
+    The rows are fetched in batches through a server-side cursor where the database supports it, and
+    serialized one at a time, so the memory used does not grow with the number of rows. The query is
+    built and run in its own session, since the response is generated after the view returns.
+
+    :param get_query: Builds the query in the given session
+    :param dump: Serializes a row to a JSON-compatible object
+    """
+
+    def generate() -> Iterator[bytes]:
+        with create_session() as session:
+            for row in get_query(session).yield_per(STREAM_YIELD_PER):
+                yield (json.dumps(dump(row)) + "\n").encode()
+
+    # Passing the generator through keeps the response from being buffered to validate it
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE, direct_passthrough=True)
@@ -274,6 +274,8 @@ class AirflowConfigParser(ConfigParser):
         ("core", "default_task_weight_rule"): sorted(WeightRule.all_weight_rules()),
         ("core", "dag_ignore_file_syntax"): ["regexp", "glob"],
         ('core', 'mp_start_method'): multiprocessing.get_all_start_methods(),
+        ("core", "serialized_dag_encoding"): ["json", "msgpack"],
+        ("core", "serialized_dag_compression"): ["none", "zlib", "zstd"],
         ("scheduler", "file_parsing_sort_mode"): ["modified_time", "random_seeded_by_host", "alphabetical"],
         ("logging", "logging_level"): _available_logging_levels,
         ("logging", "fab_logging_level"): _available_logging_levels,
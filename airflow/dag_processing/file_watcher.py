@@ -0,0 +1,473 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Incremental discovery of DAG files in the DAGs folder."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import stat
+import struct
+import sys
+import zipfile
+from pathlib import Path
+from typing import NamedTuple
+
+from airflow.configuration import conf
+from airflow.utils.file import _get_ignore_rule_type, _IgnoreRule, _read_ignore_rules, might_contain_dag
+from airflow.utils.log.logging_mixin import LoggingMixin
+
+log = logging.getLogger(__name__)
+
+IGNORE_FILE_NAME = ".airflowignore"
+
+
+class DagFileSnapshot(NamedTuple):
+    """What we remember about a single file found in the DAGs folder"""
+
+    mtime: float
+    size: int
+    is_dag_file: bool
+
+
+class DagDirectoryChanges(NamedTuple):
+    """DAG files which were added, modified or removed since the previous poll"""
+
+    added: set[str]
+    modified: set[str]
+    removed: set[str]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    @property
+    def changed(self) -> set[str]:
+        """Files which need to be (re-)parsed"""
+        return self.added | self.modified
+
+
+class PollingDagFileWatcher(LoggingMixin):
+    """
+    Keeps track of the DAG files in the DAGs folder by comparing stat snapshots.
+
+    Every poll walks the folder and applies the ``.airflowignore`` rules, as
+    ``list_py_file_paths`` does, but only files whose mtime or size changed since
+    the previous poll are opened to check whether they might contain DAGs.
+
+    :param dag_directory: Directory where DAG definitions are kept
+    :param safe_mode: whether to use a heuristic to determine whether a file
+        contains Airflow DAG definitions
+    :param include_examples: include example DAGs
+    """
+
+    event_driven = False
+
+    def __init__(
+        self,
+        dag_directory: str | os.PathLike,
+        safe_mode: bool | None = None,
+        include_examples: bool | None = None,
+    ):
+        super().__init__()
+        self._dag_directory = str(dag_directory)
+        if safe_mode is None:
+            safe_mode = conf.getboolean('core', 'DAG_DISCOVERY_SAFE_MODE', fallback=True)
+        self._safe_mode = safe_mode
+        if include_examples is None:
+            include_examples = conf.getboolean('core', 'LOAD_EXAMPLES')
+        self._include_examples = include_examples
+        self._ignore_rule_type = _get_ignore_rule_type(
+            conf.get_mandatory_value('core', 'DAG_IGNORE_FILE_SYNTAX', fallback="regexp")
+        )
+        self._snapshots: dict[str, DagFileSnapshot] = {}
+        # The ignore rules applying to each directory walked, keyed by directory path
+        self._dir_patterns: dict[str, list[_IgnoreRule]] = {}
+        self._example_file_paths: list[str] | None = None
+
+    @property
+    def file_paths(self) -> list[str]:
+        """Paths of all the files known to possibly contain DAGs"""
+        file_paths = [path for path, snapshot in self._snapshots.items() if snapshot.is_dag_file]
+        if self._include_examples:
+            file_paths.extend(self._get_example_file_paths())
+        return file_paths
+
+    def get_mtime(self, file_path: str) -> float | None:
+        """Return the modification time recorded during the last poll, if any"""
+        snapshot = self._snapshots.get(file_path)
+        return snapshot.mtime if snapshot else None
+
+    def poll(self) -> DagDirectoryChanges:
+        """Walk the DAGs folder and return the DAG files changed since the previous poll."""
+        return self._full_rescan()
+
+    def close(self) -> None:
+        """Release any resource held by the watcher."""
+
+    def _get_example_file_paths(self) -> list[str]:
+        # Example DAGs ship with Airflow and do not change while we are running
+        if self._example_file_paths is None:
+            from airflow import example_dags
+            from airflow.utils.file import list_py_file_paths
+
+            example_dag_folder = example_dags.__path__[0]  # type: ignore
+            self._example_file_paths = list_py_file_paths(
+                example_dag_folder, self._safe_mode, include_examples=False
+            )
+        return self._example_file_paths
+
+    def _full_rescan(self) -> DagDirectoryChanges:
+        snapshots: dict[str, DagFileSnapshot] = {}
+        self._dir_patterns = {}
+        if os.path.isfile(self._dag_directory):
+            self._snapshot_file(self._dag_directory, snapshots)
+        elif os.path.isdir(self._dag_directory):
+            self._walk(self._dag_directory, [], snapshots)
+        return self._replace_snapshots(set(self._snapshots), snapshots)
+
+    def _replace_snapshots(
+        self, previous_paths: set[str], snapshots: dict[str, DagFileSnapshot]
+    ) -> DagDirectoryChanges:
+        """
+        Replace the snapshots of ``previous_paths`` by the new ``snapshots`` and compute the changes.
+
+        :param previous_paths: the paths which were covered by the scan producing ``snapshots``
+        :param snapshots: the new snapshots of the files found by the scan
+        """
+        previous = {path: self._snapshots.pop(path) for path in previous_paths}
+        added, modified, removed = set(), set(), set()
+        for path, old in previous.items():
+            new = snapshots.get(path)
+            if old.is_dag_file and (new is None or not new.is_dag_file):
+                removed.add(path)
+        for path, new in snapshots.items():
+            if not new.is_dag_file:
+                continue
+            old = previous.get(path)
+            if old is None or not old.is_dag_file:
+                added.add(path)
+            elif (old.mtime, old.size) != (new.mtime, new.size):
+                modified.add(path)
+        self._snapshots.update(snapshots)
+        return DagDirectoryChanges(added=added, modified=modified, removed=removed)
+
+    def _walk(self, top: str, patterns: list[_IgnoreRule], snapshots: dict[str, DagFileSnapshot]) -> None:
+        """Recursively walk ``top``, recording the ignore rules and the snapshots of the files found."""
+        patterns_by_dir: dict[str, list[_IgnoreRule]] = {top: patterns}
+        visited_dirs = {os.path.realpath(top)}
+        for root, dirs, files in os.walk(top, followlinks=True):
+            patterns = patterns_by_dir.pop(root, [])
+            ignore_file_path = Path(root) / IGNORE_FILE_NAME
+            if ignore_file_path.is_file():
+                patterns = _read_ignore_rules(
+                    ignore_file_path, Path(self._dag_directory), self._ignore_rule_type, patterns
+                )
+            self._dir_patterns[root] = patterns
+            self._on_directory_walked(root)
+
+            dirs[:] = [d for d in dirs if not self._ignore_rule_type.match(Path(root) / d, patterns)]
+            # explicit loop for infinite recursion detection since we are following symlinks in this walk
+            for sd in dirs:
+                dirpath = os.path.realpath(os.path.join(root, sd))
+                if dirpath in visited_dirs:
+                    raise RuntimeError(
+                        "Detected recursive loop when walking DAG directory "
+                        f"{self._dag_directory}: {dirpath} has appeared more than once."
+                    )
+                visited_dirs.add(dirpath)
+                patterns_by_dir[os.path.join(root, sd)] = patterns
+
+            self._snapshot_files(root, files, patterns, snapshots)
+
+    def _snapshot_files(
+        self,
+        root: str,
+        files: list[str],
+        patterns: list[_IgnoreRule],
+        snapshots: dict[str, DagFileSnapshot],
+    ) -> None:
+        for file in files:
+            if file == IGNORE_FILE_NAME:
+                continue
+            file_path = os.path.join(root, file)
+            if self._ignore_rule_type.match(Path(file_path), patterns):
+                continue
+            self._snapshot_file(file_path, snapshots)
+
+    def _snapshot_file(self, file_path: str, snapshots: dict[str, DagFileSnapshot]) -> None:
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return
+        if not stat.S_ISREG(file_stat.st_mode):
+            return
+        previous = self._snapshots.get(file_path)
+        if previous and previous.mtime == file_stat.st_mtime and previous.size == file_stat.st_size:
+            snapshots[file_path] = previous
+            return
+        snapshots[file_path] = DagFileSnapshot(
+            mtime=file_stat.st_mtime, size=file_stat.st_size, is_dag_file=self._is_dag_file(file_path)
+        )
+
+    def _is_dag_file(self, file_path: str) -> bool:
+        try:
+            _, file_ext = os.path.splitext(file_path)
+            if file_ext != '.py' and not zipfile.is_zipfile(file_path):
+                return False
+            return might_contain_dag(file_path, self._safe_mode)
+        except Exception:
+            self.log.exception("Error while examining %s", file_path)
+            return False
+
+    def _on_directory_walked(self, directory: str) -> None:
+        """Hook called for every directory walked, and not ignored, during a scan."""
+
+
+# Constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyDagFileWatcher(PollingDagFileWatcher):
+    """
+    Keeps track of the DAG files in the DAGs folder using Linux inotify.
+
+    Every directory walked gets an inotify watch. A poll drains the pending events
+    without blocking and only rescans the directories they were reported for, so the
+    cost of a poll is proportional to what changed rather than to the size of the
+    folder. A change to an ``.airflowignore`` file or an overflow of the event queue
+    triggers a full rescan. When inotify watches cannot be added, for instance because
+    ``fs.inotify.max_user_watches`` is too low, the watcher falls back to polling.
+    """
+
+    event_driven = True
+
+    def __init__(
+        self,
+        dag_directory: str | os.PathLike,
+        safe_mode: bool | None = None,
+        include_examples: bool | None = None,
+    ):
+        super().__init__(dag_directory, safe_mode=safe_mode, include_examples=include_examples)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        # Map from watch descriptor to the watched directory, and back
+        self._watches: dict[int, str] = {}
+        self._watched_dirs: dict[str, int] = {}
+        self._needs_full_rescan = True
+
+    def poll(self) -> DagDirectoryChanges:
+        if self._fd < 0:
+            # inotify is not usable any more, behave like the polling watcher
+            return self._full_rescan()
+
+        dirty_dirs = self._read_events()
+        if self._needs_full_rescan:
+            self._needs_full_rescan = False
+            changes = self._full_rescan()
+            self._remove_stale_watches()
+            return changes
+        if not dirty_dirs:
+            return DagDirectoryChanges(added=set(), modified=set(), removed=set())
+        return self._rescan_directories(dirty_dirs)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches.clear()
+        self._watched_dirs.clear()
+
+    def _read_events(self) -> set[str]:
+        """Drain the inotify queue and return the directories in which something changed."""
+        dirty_dirs: set[str] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset : offset + length].rstrip(b"\0").decode(sys.getfilesystemencoding())
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    self.log.warning("inotify event queue overflowed, rescanning %s", self._dag_directory)
+                    self._needs_full_rescan = True
+                    continue
+                directory = self._watches.get(wd)
+                if mask & IN_IGNORED:
+                    self._forget_watch(wd)
+                if directory is None:
+                    continue
+                if name == IGNORE_FILE_NAME:
+                    self._needs_full_rescan = True
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    if directory == self._dag_directory:
+                        self._needs_full_rescan = True
+                    dirty_dirs.add(os.path.dirname(directory))
+                dirty_dirs.add(directory)
+        return dirty_dirs
+
+    def _rescan_directories(self, dirty_dirs: set[str]) -> DagDirectoryChanges:
+        previous_paths: set[str] = set()
+        snapshots: dict[str, DagFileSnapshot] = {}
+        for directory in sorted(dirty_dirs):
+            patterns = self._dir_patterns.get(directory)
+            if patterns is None:
+                # Ignored directory, or one which is already covered by the rescan of a parent
+                continue
+            if not os.path.isdir(directory):
+                previous_paths |= self._forget_directory(directory)
+                continue
+            previous_paths |= {path for path in self._snapshots if os.path.dirname(path) == directory}
+            try:
+                _, subdirs, files = next(os.walk(directory))
+            except StopIteration:
+                continue
+            self._snapshot_files(directory, files, patterns, snapshots)
+            for subdir in subdirs:
+                subdir_path = os.path.join(directory, subdir)
+                if subdir_path in self._dir_patterns:
+                    continue
+                if self._ignore_rule_type.match(Path(subdir_path), patterns):
+                    continue
+                # A directory which was created or moved in, its content has to be walked
+                self._walk(subdir_path, patterns, snapshots)
+            for known_dir in [d for d in self._dir_patterns if os.path.dirname(d) == directory]:
+                if not os.path.isdir(known_dir):
+                    previous_paths |= self._forget_directory(known_dir)
+        return self._replace_snapshots(previous_paths, snapshots)
+
+    def _forget_directory(self, directory: str) -> set[str]:
+        """Stop tracking a directory which disappeared, return the paths of the files it contained."""
+        prefix = directory + os.sep
+        for known_dir in [d for d in self._dir_patterns if d == directory or d.startswith(prefix)]:
+            del self._dir_patterns[known_dir]
+            wd = self._watched_dirs.get(known_dir)
+            if wd is not None and self._watches.get(wd) == known_dir:
+                self._remove_watch(wd)
+        return {path for path in self._snapshots if path.startswith(prefix)}
+
+    def _on_directory_walked(self, directory: str) -> None:
+        if self._fd < 0 or directory in self._watched_dirs:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                self.log.warning(
+                    "Could not watch %s, the limit of inotify watches (fs.inotify.max_user_watches) is "
+                    "reached. Falling back to polling %s.",
+                    directory,
+                    self._dag_directory,
+                )
+            else:
+                self.log.warning(
+                    "Could not watch %s (%s). Falling back to polling %s.",
+                    directory,
+                    os.strerror(err),
+                    self._dag_directory,
+                )
+            self.close()
+            # Have the manager only poll every dag_dir_list_interval, as a full rescan is not cheap
+            self.event_driven = False
+            return
+        # The kernel returns the existing watch descriptor when a watched directory was moved
+        self._forget_watch(wd)
+        self._watches[wd] = directory
+        self._watched_dirs[directory] = wd
+
+    def _remove_stale_watches(self) -> None:
+        """Remove the watches of directories which are not walked any more, e.g. because ignored."""
+        for directory, wd in list(self._watched_dirs.items()):
+            if directory not in self._dir_patterns:
+                self._remove_watch(wd)
+
+    def _remove_watch(self, wd: int) -> None:
+        if self._fd >= 0:
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._forget_watch(wd)
+
+    def _forget_watch(self, wd: int) -> None:
+        directory = self._watches.pop(wd, None)
+        if directory is not None and self._watched_dirs.get(directory) == wd:
+            del self._watched_dirs[directory]
+
+
+def get_dag_file_watcher(
+    dag_directory: str | os.PathLike, watch_mode: str | None = None
+) -> PollingDagFileWatcher | None:
+    """
+    Return the DAG file watcher configured by ``[scheduler] dag_dir_watch_mode``.
+
+    :param dag_directory: Directory where DAG definitions are kept
+    :param watch_mode: ``rescan``, ``poll`` or ``inotify``. Read from the configuration if not set.
+    :return: the watcher, or None in ``rescan`` mode, when the DAGs folder is fully listed every time
+    """
+    if watch_mode is None:
+        watch_mode = conf.get('scheduler', 'dag_dir_watch_mode', fallback='rescan')
+    if watch_mode == 'rescan':
+        return None
+    if watch_mode == 'inotify':
+        if sys.platform.startswith('linux'):
+            try:
+                return InotifyDagFileWatcher(dag_directory)
+            except (OSError, AttributeError) as e:
+                log.warning("inotify is not available (%s), using polling", e)
+        else:
+            log.warning("inotify is only available on Linux, using polling")
+        return PollingDagFileWatcher(dag_directory)
+    if watch_mode == 'poll':
+        return PollingDagFileWatcher(dag_directory)
+    raise ValueError(f"Unsupported dag_dir_watch_mode: {watch_mode}")
@@ -37,12 +37,19 @@ from pathlib import Path
 from typing import Any, NamedTuple, cast
 
 from setproctitle import setproctitle
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from tabulate import tabulate
 
 import airflow.models
 from airflow.callbacks.callback_requests import CallbackRequest, SlaCallbackRequest
 from airflow.configuration import conf
+from airflow.dag_processing.file_watcher import (
+    DagDirectoryChanges,
+    PollingDagFileWatcher,
+    get_dag_file_watcher,
+)
+from airflow.dag_processing.pool import DagFileProcessorPool
 from airflow.dag_processing.processor import DagFileProcessorProcess
 from airflow.models import errors
 from airflow.models.dag import DagModel
@@ -51,7 +58,7 @@ from airflow.models.db_callback_request import DbCallbackRequest
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.stats import Stats
 from airflow.utils import timezone
-from airflow.utils.file import list_py_file_paths, might_contain_dag
+from airflow.utils.file import get_file_hash, list_py_file_paths, might_contain_dag
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.net import get_hostname
@@ -81,6 +88,13 @@ class DagFileStat(NamedTuple):
     run_count: int
 
 
+class DagFileFingerprint(NamedTuple):
+    """Content hashes of a file and of the local modules it imported, as of its last successful parse"""
+
+    file_hash: str
+    module_hashes: dict[str, str | None]
+
+
 class DagParsingSignal(enum.Enum):
     """All signals sent to parser."""
 
@@ -421,12 +435,26 @@ class DagFileProcessorManager(LoggingMixin):
 
         # Map from file path to the processor
         self._processors: dict[str, DagFileProcessorProcess] = {}
+        # Long-lived workers processing the files, instead of one process per file
+        self._processor_pool: DagFileProcessorPool | None = None
+        if conf.getboolean('scheduler', 'parsing_pool_enabled', fallback=False):
+            self._processor_pool = DagFileProcessorPool()
 
         self._num_run = 0
 
         # Map from file path to stats about the file
         self._file_stats: dict[str, DagFileStat] = {}
 
+        # Whether to skip parsing files when neither them nor the local modules they import changed.
+        # Pickled DAGs are refreshed by parsing, so files are always parsed when pickling.
+        self._skip_unchanged_files = (
+            conf.getboolean('scheduler', 'skip_unchanged_dag_files', fallback=False) and not pickle_dags
+        )
+        # Map from file path to the fingerprint of its last successful parse
+        self._file_fingerprints: dict[str, DagFileFingerprint] = {}
+        # Map from file path to the hash of the file when its processor was started
+        self._file_hashes_at_start: dict[str, str | None] = {}
+
         # Last time that the DAG dir was traversed to look for files
         self.last_dag_dir_refresh_time = timezone.make_aware(datetime.fromtimestamp(0))
         # Last time stats were printed
@@ -439,6 +467,9 @@ class DagFileProcessorManager(LoggingMixin):
         self._processor_timeout = processor_timeout
         # How often to scan the DAGs directory for new files. Default to 5 minutes.
         self.dag_dir_list_interval = conf.getint('scheduler', 'dag_dir_list_interval')
+        # How to find out about new, modified and deleted files in the DAGs directory
+        self._dag_dir_watch_mode = conf.get('scheduler', 'dag_dir_watch_mode', fallback='rescan')
+        self._file_watcher: PollingDagFileWatcher | None = None
 
         # Mapping file name and callbacks requests
         self._callback_to_execute: dict[str, list[CallbackRequest]] = defaultdict(list)
@@ -717,6 +748,13 @@ class DagFileProcessorManager(LoggingMixin):
 
     def _refresh_dag_dir(self):
         """Refresh file paths from dag dir if we haven't done it for too long."""
+        if self._dag_dir_watch_mode != 'rescan':
+            if self._file_watcher is None:
+                # Created lazily, so that the watcher belongs to the process running the parsing loop
+                self._file_watcher = get_dag_file_watcher(self._dag_directory, self._dag_dir_watch_mode)
+            self._refresh_dag_dir_from_watcher()
+            return
+
         now = timezone.utcnow()
         elapsed_time_since_refresh = (now - self.last_dag_dir_refresh_time).total_seconds()
         if elapsed_time_since_refresh > self.dag_dir_list_interval:
@@ -726,39 +764,97 @@ class DagFileProcessorManager(LoggingMixin):
             self.last_dag_dir_refresh_time = now
             self.log.info("There are %s files in %s", len(self._file_paths), self._dag_directory)
             self.set_file_paths(self._file_paths)
+            self._remove_deleted_files()
 
-            try:
-                self.log.debug("Removing old import errors")
-                self.clear_nonexistent_import_errors()
-            except Exception:
-                self.log.exception("Error removing old import errors")
-
-            # Check if file path is a zipfile and get the full path of the python file.
-            # Without this, SerializedDagModel.remove_deleted_files would delete zipped dags.
-            # Likewise DagCode.remove_deleted_code
-            dag_filelocs = []
-            for fileloc in self._file_paths:
-                if not fileloc.endswith(".py") and zipfile.is_zipfile(fileloc):
-                    with zipfile.ZipFile(fileloc) as z:
-                        dag_filelocs.extend(
-                            [
-                                os.path.join(fileloc, info.filename)
-                                for info in z.infolist()
-                                if might_contain_dag(info.filename, True, z)
-                            ]
-                        )
-                else:
-                    dag_filelocs.append(fileloc)
+    def _refresh_dag_dir_from_watcher(self):
+        """
+        Refresh file paths from the changes reported by the DAG file watcher.
 
-            SerializedDagModel.remove_deleted_dags(
-                alive_dag_filelocs=dag_filelocs,
-                processor_subdir=self.get_dag_directory(),
-            )
-            DagModel.deactivate_deleted_dags(self._file_paths)
+        Event driven watchers are polled on every loop, the others every ``dag_dir_list_interval``.
+        New and modified files are queued for processing straight away, and the DAGs of removed files
+        are cleaned up.
+        """
+        now = timezone.utcnow()
+        elapsed_time_since_refresh = (now - self.last_dag_dir_refresh_time).total_seconds()
+        if not self._file_watcher.event_driven and elapsed_time_since_refresh <= self.dag_dir_list_interval:
+            return
+
+        is_initial_refresh = self.last_dag_dir_refresh_time == timezone.make_aware(datetime.fromtimestamp(0))
+        changes: DagDirectoryChanges = self._file_watcher.poll()
+        self.last_dag_dir_refresh_time = now
+        if not changes.has_changes:
+            return
 
-            from airflow.models.dagcode import DagCode
+        self.log.info(
+            "Found %s new, %s modified and %s removed files in %s",
+            len(changes.added),
+            len(changes.modified),
+            len(changes.removed),
+            self._dag_directory,
+        )
+        self.set_file_paths(self._file_watcher.file_paths)
+        # Cleaning up after deleted files goes through all the files, so only do it when files were
+        # removed, or were maybe removed while the manager was not running. A modified zip file may
+        # have lost some of the DAG files in it.
+        if (
+            is_initial_refresh
+            or changes.removed
+            or any(not path.endswith(".py") and zipfile.is_zipfile(path) for path in changes.modified)
+        ):
+            self._remove_deleted_files()
+        if not is_initial_refresh:
+            self._add_paths_to_queue_front(sorted(changes.changed))
+
+    def _add_paths_to_queue_front(self, file_paths: list[str]):
+        """Queue the given files ahead of the others, unless they are already being processed."""
+        file_paths = [file_path for file_path in file_paths if file_path not in self._processors]
+        if not file_paths:
+            return
+        self.log.debug("Queuing the following changed files for processing:\n\t%s", "\n\t".join(file_paths))
+        for file_path in file_paths:
+            if file_path not in self._file_stats:
+                self._file_stats[file_path] = DagFileStat(
+                    num_dags=0, import_errors=0, last_finish_time=None, last_duration=None, run_count=0
+                )
+        to_queue = set(file_paths)
+        self._file_path_queue = file_paths + [
+            file_path for file_path in self._file_path_queue if file_path not in to_queue
+        ]
 
-            DagCode.remove_deleted_code(dag_filelocs)
+    def _remove_deleted_files(self):
+        """Clean up the import errors, DAGs and code of the files which are no longer in the dag dir."""
+        try:
+            self.log.debug("Removing old import errors")
+            self.clear_nonexistent_import_errors()
+        except Exception:
+            self.log.exception("Error removing old import errors")
+
+        # Check if file path is a zipfile and get the full path of the python file.
+        # Without this, SerializedDagModel.remove_deleted_files would delete zipped dags.
+        # Likewise DagCode.remove_deleted_code
+        dag_filelocs = []
+        for fileloc in self._file_paths:
+            if not fileloc.endswith(".py") and zipfile.is_zipfile(fileloc):
+                with zipfile.ZipFile(fileloc) as z:
+                    dag_filelocs.extend(
+                        [
+                            os.path.join(fileloc, info.filename)
+                            for info in z.infolist()
+                            if might_contain_dag(info.filename, True, z)
+                        ]
+                    )
+            else:
+                dag_filelocs.append(fileloc)
+
+        SerializedDagModel.remove_deleted_dags(
+            alive_dag_filelocs=dag_filelocs,
+            processor_subdir=self.get_dag_directory(),
+        )
+        DagModel.deactivate_deleted_dags(self._file_paths)
+
+        from airflow.models.dagcode import DagCode
+
+        DagCode.remove_deleted_code(dag_filelocs)
 
     def _print_stat(self):
         """Occasionally print out stats about how fast the files are getting processed"""
@@ -952,7 +1048,12 @@ class DagFileProcessorManager(LoggingMixin):
                 Stats.decr('dag_processing.processes')
                 processor.terminate()
                 self._file_stats.pop(file_path)
+                self._file_hashes_at_start.pop(file_path, None)
         self._processors = filtered_processors
+        if self._file_fingerprints:
+            new_file_paths_set = set(new_file_paths)
+            for file_path in self._file_fingerprints.keys() - new_file_paths_set:
+                del self._file_fingerprints[file_path]
 
     def wait_until_finished(self):
         """Sleeps until all the processors are done."""
@@ -984,6 +1085,16 @@ class DagFileProcessorManager(LoggingMixin):
         )
         self._file_stats[processor.file_path] = stat
 
+        if self._skip_unchanged_files:
+            file_hash = self._file_hashes_at_start.pop(processor.file_path, None)
+            # Only remember clean parses, import errors may be caused by something outside the file
+            if processor.result is not None and count_import_errors == 0 and file_hash is not None:
+                self._file_fingerprints[processor.file_path] = DagFileFingerprint(
+                    file_hash=file_hash, module_hashes=processor.local_module_hashes
+                )
+            else:
+                self._file_fingerprints.pop(processor.file_path, None)
+
         file_name = os.path.splitext(os.path.basename(processor.file_path))[0].replace(os.sep, '.')
         Stats.timing(f'dag_processing.last_duration.{file_name}', last_duration)
 
@@ -1018,6 +1129,7 @@ class DagFileProcessorManager(LoggingMixin):
 
     def start_new_processes(self):
         """Start more processors if we have enough slots and files to process"""
+        skipped_file_paths = []
         while self._parallelism - len(self._processors) > 0 and self._file_path_queue:
             file_path = self._file_path_queue.pop(0)
             # Stop creating duplicate processor i.e. processor with the same filepath
@@ -1025,13 +1137,30 @@ class DagFileProcessorManager(LoggingMixin):
                 continue
 
             callback_to_execute_for_file = self._callback_to_execute[file_path]
-            processor = self._create_process(
-                file_path,
-                self._pickle_dags,
-                self._dag_ids,
-                self.get_dag_directory(),
-                callback_to_execute_for_file,
-            )
+            if self._skip_unchanged_files:
+                file_hash = get_file_hash(file_path)
+                if not callback_to_execute_for_file and self._is_file_unchanged(file_path, file_hash):
+                    del self._callback_to_execute[file_path]
+                    skipped_file_paths.append(file_path)
+                    continue
+                self._file_hashes_at_start[file_path] = file_hash
+
+            if self._processor_pool is not None:
+                processor = self._processor_pool.create_processor(
+                    file_path,
+                    self._pickle_dags,
+                    self._dag_ids,
+                    self.get_dag_directory(),
+                    callback_to_execute_for_file,
+                )
+            else:
+                processor = self._create_process(
+                    file_path,
+                    self._pickle_dags,
+                    self._dag_ids,
+                    self.get_dag_directory(),
+                    callback_to_execute_for_file,
+                )
 
             del self._callback_to_execute[file_path]
             Stats.incr('dag_processing.processes')
@@ -1041,6 +1170,49 @@ class DagFileProcessorManager(LoggingMixin):
             self._processors[file_path] = processor
             self.waitables[processor.waitable_handle] = processor
 
+        if skipped_file_paths:
+            self._record_unchanged_files(skipped_file_paths)
+
+    def _is_file_unchanged(self, file_path: str, file_hash: str | None) -> bool:
+        """Whether the file and the local modules it imported are the same as when it was last parsed."""
+        fingerprint = self._file_fingerprints.get(file_path)
+        if fingerprint is None or file_hash is None or fingerprint.file_hash != file_hash:
+            return False
+        return all(
+            get_file_hash(module_path) == module_hash
+            for module_path, module_hash in fingerprint.module_hashes.items()
+        )
+
+    @provide_session
+    def _record_unchanged_files(self, file_paths: list[str], session: Session = NEW_SESSION):
+        """
+        Record the files which were not parsed because they did not change as processed.
+
+        The DAGs they define are marked as parsed too, so they are not deactivated as stale.
+        """
+        self.log.debug("Skipping unchanged files:\n\t%s", "\n\t".join(file_paths))
+        now = timezone.utcnow()
+        for file_path in file_paths:
+            stat = self._file_stats.get(file_path)
+            self._file_stats[file_path] = DagFileStat(
+                num_dags=stat.num_dags if stat else 0,
+                import_errors=stat.import_errors if stat else 0,
+                last_finish_time=now,
+                last_duration=stat.last_duration if stat else None,
+                run_count=self.get_run_count(file_path) + 1,
+            )
+        Stats.incr('dag_processing.unchanged_files_skipped', len(file_paths))
+
+        zip_file_paths = [file_path for file_path in file_paths if not file_path.endswith('.py')]
+        session.query(DagModel).filter(
+            DagModel.is_active,
+            or_(
+                DagModel.fileloc.in_(file_paths),
+                *(DagModel.fileloc.startswith(file_path + os.sep) for file_path in zip_file_paths),
+            ),
+        ).update({DagModel.last_parsed_time: now}, synchronize_session=False)
+        session.commit()
+
     def prepare_file_path_queue(self):
         """Generate more file paths to process. Result are saved in _file_path_queue."""
         self._parsing_start_time = time.perf_counter()
@@ -1061,7 +1233,7 @@ class DagFileProcessorManager(LoggingMixin):
 
             if is_mtime_mode:
                 try:
-                    files_with_mtime[file_path] = os.path.getmtime(file_path)
+                    files_with_mtime[file_path] = self._get_file_mtime(file_path)
                 except FileNotFoundError:
                     self.log.warning("Skipping processing of missing file: %s", file_path)
                     continue
@@ -1097,7 +1269,7 @@ class DagFileProcessorManager(LoggingMixin):
         ]
 
         file_paths_to_exclude = set(file_paths_in_progress).union(
-            file_paths_recently_processed, files_paths_at_run_limit
+            file_paths_recently_processed, files_paths_at_run_limit, self._file_path_queue
         )
 
         # Do not convert the following list to set as set does not preserve the order
@@ -1123,6 +1295,14 @@ class DagFileProcessorManager(LoggingMixin):
 
         self._file_path_queue.extend(files_paths_to_queue)
 
+    def _get_file_mtime(self, file_path: str) -> float:
+        """Return the modification time of the file, as last seen by an event driven watcher if any."""
+        if self._file_watcher is not None and self._file_watcher.event_driven:
+            mtime = self._file_watcher.get_mtime(file_path)
+            if mtime is not None:
+                return mtime
+        return os.path.getmtime(file_path)
+
     def _kill_timed_out_processors(self):
         """Kill any file processors that timeout to defend against process hangs."""
         now = timezone.utcnow()
@@ -1145,6 +1325,7 @@ class DagFileProcessorManager(LoggingMixin):
                 # Clean up processor references
                 self.waitables.pop(processor.waitable_handle)
                 processors_to_remove.append(file_path)
+                self._file_hashes_at_start.pop(file_path, None)
 
         # Clean up `self._processors` after iterating over it
         for proc in processors_to_remove:
@@ -1169,6 +1350,8 @@ class DagFileProcessorManager(LoggingMixin):
         for processor in self._processors.values():
             Stats.decr('dag_processing.processes')
             processor.terminate()
+        if self._processor_pool is not None:
+            self._processor_pool.terminate()
 
     def end(self):
         """
@@ -1176,8 +1359,12 @@ class DagFileProcessorManager(LoggingMixin):
         them as orphaned.
         """
         pids_to_kill = self.get_all_pids()
+        if self._processor_pool is not None:
+            pids_to_kill = list(set(pids_to_kill).union(self._processor_pool.get_all_pids()))
         if pids_to_kill:
             kill_child_processes_by_pids(pids_to_kill)
+        if self._file_watcher is not None:
+            self._file_watcher.close()
 
     def emit_metrics(self):
         """
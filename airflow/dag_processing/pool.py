@@ -0,0 +1,488 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Pool of long-lived, pre-warmed DAG file processor processes."""
+from __future__ import annotations
+
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from multiprocessing.connection import Connection as MultiprocessingConnection
+from typing import NamedTuple
+
+from setproctitle import setproctitle
+
+from airflow import settings
+from airflow.callbacks.callback_requests import CallbackRequest
+from airflow.configuration import conf
+from airflow.dag_processing.processor import DagFileProcessor, DagFileProcessorProcess, redirect_output_to_log
+from airflow.exceptions import AirflowException
+from airflow.stats import Stats
+from airflow.utils import timezone
+from airflow.utils.log.logging_mixin import LoggingMixin, set_context
+from airflow.utils.mixins import MultiprocessingStartMethodMixin
+
+# Always imported by the workers, everything needed to parse DAG files
+DEFAULT_PRELOAD_MODULES = ["airflow.dag_processing.pool"]
+
+
+class DagFileProcessingJob(NamedTuple):
+    """A file to be processed by a pooled worker"""
+
+    file_path: str
+    pickle_dags: bool
+    dag_ids: list[str] | None
+    dag_directory: str
+    callback_requests: list[CallbackRequest]
+
+
+def _is_local_module(module, local_dirs: tuple[str, ...]) -> bool:
+    if module is None:
+        return False
+    if module.__name__.startswith('unusual_prefix_'):
+        # Modules created by DagBag for the DAG files
+        return True
+    module_path = getattr(module, '__file__', None)
+    return bool(module_path) and os.path.realpath(module_path).startswith(local_dirs)
+
+
+def _process_job(log: logging.Logger, thread_name: str, job: DagFileProcessingJob) -> tuple | None:
+    """Process a single file in a pooled worker, return the result to send back to the manager."""
+    set_context(log, job.file_path)
+    setproctitle(f"airflow scheduler - DagFileProcessor {job.file_path}")
+    threading.current_thread().name = thread_name
+    module_names_before = set(sys.modules)
+    try:
+        with redirect_output_to_log(log), Stats.timer() as timer:
+            log.info("Started process (PID=%s) to work on %s", os.getpid(), job.file_path)
+            dag_file_processor = DagFileProcessor(
+                dag_ids=job.dag_ids, dag_directory=job.dag_directory, log=log
+            )
+            num_dags, num_import_errors = dag_file_processor.process_file(
+                file_path=job.file_path,
+                pickle_dags=job.pickle_dags,
+                callback_requests=job.callback_requests,
+            )
+        log.info("Processing %s took %.3f seconds", job.file_path, timer.duration)
+        return num_dags, num_import_errors, dag_file_processor.local_module_hashes
+    except Exception:
+        log.exception("Got an exception while processing %s!", job.file_path)
+        return None
+    finally:
+        # Forget the modules coming from the DAGs folder, so that the next files import them
+        # afresh and see their latest version, as they would in a new process
+        local_dirs = tuple(
+            {
+                os.path.join(os.path.realpath(d), '')
+                for d in (settings.DAGS_FOLDER, os.path.dirname(job.file_path))
+            }
+        )
+        for name in set(sys.modules) - module_names_before:
+            if _is_local_module(sys.modules.get(name), local_dirs):
+                del sys.modules[name]
+
+
+def _run_worker(
+    connection: MultiprocessingConnection,
+    parent_connection: MultiprocessingConnection,
+    thread_name: str,
+    preload_modules: list[str],
+    max_files: int,
+) -> None:
+    """
+    Process the files sent by the manager until asked to stop or ``max_files`` were processed.
+
+    :param connection: the connection to receive jobs from and send results to
+    :param parent_connection: the parent end of the connection to close in the child
+    :param thread_name: the name to use for the thread processing the files
+    :param preload_modules: the modules to import before processing files
+    :param max_files: the number of files to process before exiting, 0 for no limit
+    """
+    # This helper runs in the newly created process
+    log: logging.Logger = logging.getLogger("airflow.processor")
+
+    # When forked, we share all the open FDs from the parent, so close the parent side of the pipe.
+    parent_connection.close()
+    del parent_connection
+
+    # Leave stopping the worker to the manager
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    for module_name in preload_modules:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            log.exception("Failed to preload module %s", module_name)
+
+    # Re-configure the ORM engine as there are issues with multiple processes
+    settings.configure_orm()
+    files_processed = 0
+    try:
+        while not max_files or files_processed < max_files:
+            setproctitle(f"airflow scheduler - DagFileProcessor worker {thread_name}")
+            try:
+                job = connection.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+            connection.send(_process_job(log, thread_name, job))
+            files_processed += 1
+    finally:
+        # We re-initialized the ORM within this Process above so we need to
+        # tear it down manually here
+        settings.dispose_orm()
+        connection.close()
+
+
+class DagFileProcessorWorker(LoggingMixin):
+    """
+    Manager side handle of a long-lived process parsing the files sent to it, one at a time.
+
+    :param context: the multiprocessing context to create the process from
+    :param worker_id: a number identifying the worker
+    :param preload_modules: the modules to import before processing files
+    :param max_files: the number of files to process before the worker exits, 0 for no limit
+    """
+
+    def __init__(
+        self,
+        context: multiprocessing.context.BaseContext,
+        worker_id: int,
+        preload_modules: list[str],
+        max_files: int,
+    ):
+        super().__init__()
+        self._context = context
+        self._worker_id = worker_id
+        self._preload_modules = preload_modules
+        self.max_files = max_files
+        self.files_processed = 0
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._connection: MultiprocessingConnection | None = None
+
+    def start(self) -> None:
+        """Launch the worker process."""
+        parent_connection, child_connection = self._context.Pipe(duplex=True)
+        process = self._context.Process(
+            target=_run_worker,
+            args=(
+                child_connection,
+                parent_connection,
+                f"DagFileProcessorWorker{self._worker_id}",
+                self._preload_modules,
+                self.max_files,
+            ),
+            name=f"DagFileProcessorWorker{self._worker_id}-Process",
+        )
+        process.start()
+        # Close the child side of the pipe now the subprocess has started -- otherwise this would prevent it
+        # from closing in some cases
+        child_connection.close()
+        self._process = process
+        self._connection = parent_connection
+
+    @property
+    def connection(self) -> MultiprocessingConnection:
+        if self._connection is None:
+            raise AirflowException("Tried to get the connection before starting!")
+        return self._connection
+
+    @property
+    def pid(self) -> int:
+        if self._process is None or self._process.pid is None:
+            raise AirflowException("Tried to get PID before starting!")
+        return self._process.pid
+
+    @property
+    def exit_code(self) -> int | None:
+        return self._process.exitcode if self._process else None
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def is_exhausted(self) -> bool:
+        """Whether the worker processed as many files as it is allowed to and exited"""
+        return bool(self.max_files) and self.files_processed >= self.max_files
+
+    def submit(self, job: DagFileProcessingJob) -> None:
+        """Send a file to process, the result can be received from the connection once available."""
+        self.connection.send(job)
+        self.files_processed += 1
+
+    def stop(self) -> None:
+        """Ask the worker to exit once it is done with its current file, and wait for it."""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self.connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=5)
+        self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker process, whatever it is doing."""
+        if self._process is None:
+            return
+        if self._process.is_alive() and self._process.pid:
+            self.log.warning("Killing DagFileProcessorWorker (PID=%d)", self._process.pid)
+            os.kill(self._process.pid, signal.SIGKILL)
+        self._process.join()
+        if self._connection is not None:
+            self._connection.close()
+
+
+class PooledDagFileProcessorProcess(DagFileProcessorProcess):
+    """
+    Processes a file in a worker from a DagFileProcessorPool instead of a process of its own.
+
+    :param file_path: a Python file containing Airflow DAG definitions
+    :param pickle_dags: whether to serialize the DAG objects to the DB
+    :param dag_ids: If specified, only look at these DAG ID's
+    :param callback_requests: failure callback to execute
+    :param pool: the pool to borrow a worker from
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        pickle_dags: bool,
+        dag_ids: list[str] | None,
+        dag_directory: str,
+        callback_requests: list[CallbackRequest],
+        pool: DagFileProcessorPool,
+    ):
+        super().__init__(
+            file_path=file_path,
+            pickle_dags=pickle_dags,
+            dag_ids=dag_ids,
+            dag_directory=dag_directory,
+            callback_requests=callback_requests,
+        )
+        self._pool = pool
+        self._worker: DagFileProcessorWorker | None = None
+
+    def start(self) -> None:
+        """Send the file to an idle worker of the pool."""
+        self._worker = self._pool.acquire_worker()
+        self._start_time = timezone.utcnow()
+        self._worker.submit(
+            DagFileProcessingJob(
+                file_path=self.file_path,
+                pickle_dags=self._pickle_dags,
+                dag_ids=self._dag_ids,
+                dag_directory=self._dag_directory,
+                callback_requests=self._callback_requests,
+            )
+        )
+
+    def kill(self) -> None:
+        """Kill the worker processing the file."""
+        if self._worker is None:
+            raise AirflowException("Tried to kill before starting!")
+        self._done = True
+        self._pool.discard_worker(self._worker)
+
+    def terminate(self, sigkill: bool = False) -> None:
+        """Stop the worker processing the file."""
+        if self._worker is None:
+            raise AirflowException("Tried to call terminate before starting!")
+        self.kill()
+
+    @property
+    def pid(self) -> int:
+        if self._worker is None:
+            raise AirflowException("Tried to get PID before starting!")
+        return self._worker.pid
+
+    @property
+    def exit_code(self) -> int | None:
+        if self._worker is None:
+            raise AirflowException("Tried to get exit code before starting!")
+        if not self._done:
+            raise AirflowException("Tried to call retcode before process was finished!")
+        return self._worker.exit_code
+
+    @property
+    def done(self) -> bool:
+        """
+        Check if the worker is done processing the file.
+
+        :return: whether the file was processed
+        """
+        if self._worker is None:
+            raise AirflowException("Tried to see if it's done before starting!")
+
+        if self._done:
+            return True
+
+        try:
+            if self._worker.connection.poll():
+                result = self._worker.connection.recv()
+                if result is not None:
+                    num_dags, num_import_errors, self._local_module_hashes = result
+                    self._result = num_dags, num_import_errors
+                self._done = True
+                self._pool.release_worker(self._worker)
+                return True
+        except (EOFError, OSError):
+            # The worker died while processing the file
+            self._done = True
+            self._pool.discard_worker(self._worker)
+            return True
+
+        if not self._worker.is_alive:
+            self._done = True
+            self._pool.discard_worker(self._worker)
+            return True
+
+        return False
+
+    @property
+    def waitable_handle(self):
+        if self._worker is None:
+            raise AirflowException("Tried to get the waitable handle before starting!")
+        return self._worker.connection
+
+
+class DagFileProcessorPool(LoggingMixin, MultiprocessingStartMethodMixin):
+    """
+    Pool of long-lived processes reused to process many DAG files.
+
+    Workers are forked from a template process which already imported the modules listed in
+    ``[scheduler] parsing_pool_preload_modules``, when the ``forkserver`` start method is available,
+    so that the cost of importing them is not paid for every file. Each worker processes at most
+    ``[scheduler] parsing_pool_worker_max_files`` files before being replaced, to cap memory growth.
+
+    :param max_files_per_worker: the number of files a worker processes before being replaced,
+        0 for no limit
+    :param preload_modules: the modules imported by the workers before processing files
+    :param start_method: how to create the workers, defaults to ``forkserver`` when available
+    """
+
+    def __init__(
+        self,
+        max_files_per_worker: int | None = None,
+        preload_modules: list[str] | None = None,
+        start_method: str | None = None,
+    ):
+        super().__init__()
+        if max_files_per_worker is None:
+            max_files_per_worker = conf.getint('scheduler', 'parsing_pool_worker_max_files', fallback=100)
+        self._max_files_per_worker = max_files_per_worker
+        if preload_modules is None:
+            preload_modules = [
+                module.strip()
+                for module in conf.get('scheduler', 'parsing_pool_preload_modules', fallback='').split(',')
+                if module.strip()
+            ]
+        self._preload_modules = DEFAULT_PRELOAD_MODULES + preload_modules
+        if start_method is None:
+            if conf.has_option('core', 'mp_start_method'):
+                start_method = self._get_multiprocessing_start_method()
+            elif 'forkserver' in multiprocessing.get_all_start_methods():
+                start_method = 'forkserver'
+            else:
+                start_method = self._get_multiprocessing_start_method()
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver':
+            self._context.set_forkserver_preload(self._preload_modules)
+        self._idle_workers: list[DagFileProcessorWorker] = []
+        self._busy_workers: list[DagFileProcessorWorker] = []
+        self._worker_counter = 0
+
+    def create_processor(
+        self,
+        file_path: str,
+        pickle_dags: bool,
+        dag_ids: list[str] | None,
+        dag_directory: str,
+        callback_requests: list[CallbackRequest],
+    ) -> PooledDagFileProcessorProcess:
+        """Creates a processor which processes the file in a worker of the pool."""
+        return PooledDagFileProcessorProcess(
+            file_path=file_path,
+            pickle_dags=pickle_dags,
+            dag_ids=dag_ids,
+            dag_directory=dag_directory,
+            callback_requests=callback_requests,
+            pool=self,
+        )
+
+    def acquire_worker(self) -> DagFileProcessorWorker:
+        """Return an idle worker, starting a new one if there is none."""
+        while self._idle_workers:
+            worker = self._idle_workers.pop()
+            if worker.is_alive:
+                break
+            worker.kill()
+        else:
+            worker = DagFileProcessorWorker(
+                context=self._context,
+                worker_id=self._worker_counter,
+                preload_modules=self._preload_modules,
+                max_files=self._max_files_per_worker,
+            )
+            self._worker_counter += 1
+            worker.start()
+            Stats.incr('dag_processing.pool.workers_started')
+            self.log.debug("Started DagFileProcessorWorker (PID: %s)", worker.pid)
+        self._busy_workers.append(worker)
+        return worker
+
+    def release_worker(self, worker: DagFileProcessorWorker) -> None:
+        """Give back a worker which finished processing a file."""
+        self._busy_workers.remove(worker)
+        if worker.is_exhausted:
+            self.log.debug(
+                "Recycling DagFileProcessorWorker (PID: %s) after %s files",
+                worker.pid,
+                worker.files_processed,
+            )
+            worker.stop()
+        else:
+            self._idle_workers.append(worker)
+
+    def discard_worker(self, worker: DagFileProcessorWorker) -> None:
+        """Kill a worker which is stuck or died."""
+        if worker in self._busy_workers:
+            self._busy_workers.remove(worker)
+        if worker in self._idle_workers:
+            self._idle_workers.remove(worker)
+        worker.kill()
+
+    def get_all_pids(self) -> list[int]:
+        """:return: the PIDs of all the workers of the pool"""
+        return [worker.pid for worker in self._idle_workers + self._busy_workers if worker.is_alive]
+
+    def terminate(self) -> None:
+        """Stop all the workers."""
+        for worker in self._idle_workers:
+            worker.stop()
+        for worker in self._busy_workers:
+            worker.kill()
+        self._idle_workers = []
+        self._busy_workers = []
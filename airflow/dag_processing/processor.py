@@ -23,7 +23,7 @@ import os
 import signal
 import threading
 import time
-from contextlib import redirect_stderr, redirect_stdout, suppress
+from contextlib import contextmanager, redirect_stderr, redirect_stdout, suppress
 from datetime import timedelta
 from multiprocessing.connection import Connection as MultiprocessingConnection
 from typing import TYPE_CHECKING, Iterator
@@ -50,6 +50,7 @@ from airflow.models.taskinstance import TaskInstance as TI
 from airflow.stats import Stats
 from airflow.utils import timezone
 from airflow.utils.email import get_email_address_list, send_email
+from airflow.utils.file import get_file_hash
 from airflow.utils.log.logging_mixin import LoggingMixin, StreamLogWriter, set_context
 from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.session import NEW_SESSION, provide_session
@@ -59,6 +60,22 @@ if TYPE_CHECKING:
     from airflow.models.operator import Operator
 
 
+@contextmanager
+def redirect_output_to_log(log: logging.Logger) -> Iterator[None]:
+    """Send stdout and stderr to the DAG processor logs, unless the logs already go to stdout."""
+    DAG_PROCESSOR_LOG_TARGET = conf.get_mandatory_value('logging', 'DAG_PROCESSOR_LOG_TARGET')
+    if DAG_PROCESSOR_LOG_TARGET == "stdout":
+        yield
+    else:
+        # The following line ensures that stdout goes to the same destination as the logs. If stdout
+        # gets sent to logs and logs are sent to stdout, this leads to an infinite loop. This
+        # necessitates this conditional based on the value of DAG_PROCESSOR_LOG_TARGET.
+        with redirect_stdout(StreamLogWriter(log, logging.INFO)), redirect_stderr(
+            StreamLogWriter(log, logging.WARN)
+        ):
+            yield
+
+
 class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
     """Runs DAG processing in a separate process using DagFileProcessor
 
@@ -90,6 +107,8 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
         self._process: multiprocessing.process.BaseProcess | None = None
         # The result of DagFileProcessor.process_file(file_path).
         self._result: tuple[int, int] | None = None
+        # The hashes of the local modules imported by the file, keyed by module path.
+        self._local_module_hashes: dict[str, str | None] = {}
         # Whether the process is done running.
         self._done = False
         # When the process started.
@@ -155,26 +174,16 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
 
             log.info("Started process (PID=%s) to work on %s", os.getpid(), file_path)
             dag_file_processor = DagFileProcessor(dag_ids=dag_ids, dag_directory=dag_directory, log=log)
-            result: tuple[int, int] = dag_file_processor.process_file(
+            num_dags, num_import_errors = dag_file_processor.process_file(
                 file_path=file_path,
                 pickle_dags=pickle_dags,
                 callback_requests=callback_requests,
             )
-            result_channel.send(result)
+            result_channel.send((num_dags, num_import_errors, dag_file_processor.local_module_hashes))
 
         try:
-            DAG_PROCESSOR_LOG_TARGET = conf.get_mandatory_value('logging', 'DAG_PROCESSOR_LOG_TARGET')
-            if DAG_PROCESSOR_LOG_TARGET == "stdout":
-                with Stats.timer() as timer:
-                    _handle_dag_file_processing()
-            else:
-                # The following line ensures that stdout goes to the same destination as the logs. If stdout
-                # gets sent to logs and logs are sent to stdout, this leads to an infinite loop. This
-                # necessitates this conditional based on the value of DAG_PROCESSOR_LOG_TARGET.
-                with redirect_stdout(StreamLogWriter(log, logging.INFO)), redirect_stderr(
-                    StreamLogWriter(log, logging.WARN)
-                ), Stats.timer() as timer:
-                    _handle_dag_file_processing()
+            with redirect_output_to_log(log), Stats.timer() as timer:
+                _handle_dag_file_processing()
             log.info("Processing %s took %.3f seconds", file_path, timer.duration)
         except Exception:
             # Log exceptions through the logging framework.
@@ -299,7 +308,8 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
 
         if self._parent_channel.poll():
             try:
-                self._result = self._parent_channel.recv()
+                num_dags, num_import_errors, self._local_module_hashes = self._parent_channel.recv()
+                self._result = num_dags, num_import_errors
                 self._done = True
                 self.log.debug("Waiting for %s", self._process)
                 self._process.join()
@@ -336,6 +346,16 @@ class DagFileProcessorProcess(LoggingMixin, MultiprocessingStartMethodMixin):
             raise AirflowException("Tried to get the result before it's done!")
         return self._result
 
+    @property
+    def local_module_hashes(self) -> dict[str, str | None]:
+        """
+        :return: the hashes of the modules from the DAGs folder imported by the file,
+            keyed by module path
+        """
+        if not self.done:
+            raise AirflowException("Tried to get the local module hashes before it's done!")
+        return self._local_module_hashes
+
     @property
     def start_time(self) -> datetime.datetime:
         """
@@ -375,6 +395,8 @@ class DagFileProcessor(LoggingMixin):
         super().__init__()
         self.dag_ids = dag_ids
         self._log = log
+        # The hashes of the modules from the DAGs folder imported by the last file processed
+        self.local_module_hashes: dict[str, str | None] = {}
         self._dag_directory = dag_directory
         self.dag_warnings: set[tuple[str, str]] = set()
 
@@ -757,12 +779,17 @@ class DagFileProcessor(LoggingMixin):
         """
         self.log.info("Processing file %s for tasks to queue", file_path)
 
+        self.local_module_hashes = {}
         try:
             dagbag = DagBag(file_path, include_examples=False)
         except Exception:
             self.log.exception("Failed at reloading the DAG file %s", file_path)
             Stats.incr('dag_file_refresh_error', 1, 1)
             return 0, 0
+        self.local_module_hashes = {
+            module_path: get_file_hash(module_path)
+            for module_path in dagbag.file_local_modules.get(file_path, [])
+        }
 
         if len(dagbag.dags) > 0:
             self.log.info("DAG(s) %s retrieved from %s", dagbag.dags.keys(), file_path)
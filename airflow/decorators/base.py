@@ -186,15 +186,17 @@ class DecoratedOperator(BaseOperator):
 
     def execute(self, context: Context):
         return_value = super().execute(context)
-        return self._handle_output(return_value=return_value, context=context, xcom_push=self.xcom_push)
+        return self._handle_output(
+            return_value=return_value, context=context, xcom_push_many=self.xcom_push_many
+        )
 
-    def _handle_output(self, return_value: Any, context: Context, xcom_push: Callable):
+    def _handle_output(self, return_value: Any, context: Context, xcom_push_many: Callable):
         """
         Handles logic for whether a decorator needs to push a single return value or multiple return values.
 
         :param return_value:
         :param context:
-        :param xcom_push:
+        :param xcom_push_many: Pushes the multiple return values at once
         """
         if not self.multiple_outputs:
             return return_value
@@ -205,8 +207,7 @@ class DecoratedOperator(BaseOperator):
                         'Returned dictionary keys must be strings when using '
                         f'multiple_outputs, found {key} ({type(key)}) instead'
                     )
-            for key, value in return_value.items():
-                xcom_push(context, key, value)
+            xcom_push_many(context, return_value)
         else:
             raise AirflowException(
                 f'Returned output was type {type(return_value)} expected dictionary for multiple_outputs'
@@ -0,0 +1,139 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from typing import DefaultDict, Iterable, NamedTuple
+
+from sqlalchemy.orm import Session
+
+from airflow.models.taskinstance import TaskInstance, TaskInstanceKey
+from airflow.ti_deps.dependencies_states import EXECUTION_STATES
+from airflow.utils import timezone
+from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.state import TaskInstanceState
+
+
+class _ActiveTaskInstance(NamedTuple):
+    """A queued or running task instance, as counted in ConcurrencyCounts"""
+
+    try_number: int
+    state: str
+    pool: str
+    pool_slots: int
+
+
+class ConcurrencyCounts(LoggingMixin):
+    """
+    Counts of the queued and running task instances, by pool, DAG and task.
+
+    The scheduler keeps these up to date from the task instances it queues and from the events of its
+    executor, instead of aggregating the task_instance table on every pass of its critical section. Task
+    instances queued or finished without the scheduler knowing (e.g. by other schedulers, backfills or
+    ``airflow tasks run``) are only accounted for once the counts are refreshed from the database, which
+    should be done regularly.
+    """
+
+    def __init__(self) -> None:
+        self._active_tis: dict[tuple[str, str, str, int], _ActiveTaskInstance] = {}
+        self._pool_slots: DefaultDict[tuple[str, str], int] = defaultdict(int)
+        self._dag_counts: DefaultDict[str, int] = defaultdict(int)
+        self._task_counts: DefaultDict[tuple[str, str], int] = defaultdict(int)
+        self.last_refreshed: datetime | None = None
+
+    def refresh(self, session: Session) -> None:
+        """Reload the counts from the queued and running task instances in the database"""
+        query = session.query(
+            TaskInstance.dag_id,
+            TaskInstance.task_id,
+            TaskInstance.run_id,
+            TaskInstance.map_index,
+            TaskInstance._try_number,
+            TaskInstance.state,
+            TaskInstance.pool,
+            TaskInstance.pool_slots,
+        ).filter(TaskInstance.state.in_(list(EXECUTION_STATES)))
+
+        self._active_tis.clear()
+        self._pool_slots.clear()
+        self._dag_counts.clear()
+        self._task_counts.clear()
+        for dag_id, task_id, run_id, map_index, try_number, state, pool, pool_slots in query:
+            # Match the try number of the executor events, see TaskInstance.try_number
+            if state != TaskInstanceState.RUNNING:
+                try_number += 1
+            self._add(
+                (dag_id, task_id, run_id, map_index), _ActiveTaskInstance(try_number, state, pool, pool_slots)
+            )
+        self.last_refreshed = timezone.utcnow()
+        self.log.debug("Refreshed the counts of %d queued and running task instances", len(self._active_tis))
+
+    def add_queued(self, task_instances: Iterable[TaskInstance]) -> None:
+        """Count task instances the scheduler just queued"""
+        for ti in task_instances:
+            key = ti.key
+            self.remove(key.primary)
+            self._add(
+                key.primary,
+                _ActiveTaskInstance(key.try_number, TaskInstanceState.QUEUED, ti.pool, ti.pool_slots),
+            )
+
+    def process_executor_event(self, key: TaskInstanceKey, state: str) -> None:
+        """Account for a task instance which the executor reports to be running or finished"""
+        active_ti = self._active_tis.get(key.primary)
+        # Ignore late events of previous tries
+        if active_ti is None or key.try_number < active_ti.try_number:
+            return
+        if state == TaskInstanceState.RUNNING:
+            self.remove(key.primary)
+            self._add(key.primary, active_ti._replace(state=TaskInstanceState.RUNNING))
+        elif state in (TaskInstanceState.SUCCESS, TaskInstanceState.FAILED):
+            self.remove(key.primary)
+
+    def remove(self, primary_key: tuple[str, str, str, int]) -> None:
+        """Stop counting the given task instance, if it was counted"""
+        active_ti = self._active_tis.pop(primary_key, None)
+        if active_ti is None:
+            return
+        dag_id, task_id, _, _ = primary_key
+        self._pool_slots[active_ti.pool, active_ti.state] -= active_ti.pool_slots
+        self._dag_counts[dag_id] -= 1
+        self._task_counts[dag_id, task_id] -= 1
+
+    def _add(self, primary_key: tuple[str, str, str, int], active_ti: _ActiveTaskInstance) -> None:
+        self._active_tis[primary_key] = active_ti
+        dag_id, task_id, _, _ = primary_key
+        self._pool_slots[active_ti.pool, active_ti.state] += active_ti.pool_slots
+        self._dag_counts[dag_id] += 1
+        self._task_counts[dag_id, task_id] += 1
+
+    def get_occupied_pool_slots(self) -> list[tuple[str, str, int]]:
+        """Return the number of slots occupied in each pool, as ``(pool, state, slots)``"""
+        return [(pool, state, slots) for (pool, state), slots in self._pool_slots.items() if slots]
+
+    def get_concurrency_maps(
+        self,
+    ) -> tuple[DefaultDict[str, int], DefaultDict[tuple[str, str], int]]:
+        """
+        Return copies of the number of queued and running task instances by DAG and by task, which the
+        caller may modify.
+        """
+        dag_map: DefaultDict[str, int] = defaultdict(int, self._dag_counts)
+        task_map: DefaultDict[tuple[str, str], int] = defaultdict(int, self._task_counts)
+        return dag_map, task_map
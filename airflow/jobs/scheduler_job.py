@@ -30,9 +30,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, Collection, DefaultDict, Iterator
 
-from sqlalchemy import func, not_, or_, text
+from sqlalchemy import false, func, not_, or_, text, true
 from sqlalchemy.exc import OperationalError
-from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm import joinedload, load_only, selectinload
 from sqlalchemy.orm.session import Session, make_transient
 
 from airflow import settings
@@ -42,9 +42,11 @@ from airflow.configuration import conf
 from airflow.exceptions import RemovedInAirflow3Warning
 from airflow.executors.executor_loader import UNPICKLEABLE_EXECUTORS
 from airflow.jobs.base_job import BaseJob
+from airflow.jobs.concurrency_counts import ConcurrencyCounts
 from airflow.models.dag import DAG, DagModel
 from airflow.models.dagbag import DagBag
 from airflow.models.dagrun import DagRun
+from airflow.models.dagstatesummary import DagStateSummary
 from airflow.models.dataset import DagScheduleDatasetReference, DatasetDagRunQueue, DatasetEvent
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstance, TaskInstanceKey
@@ -53,10 +55,12 @@ from airflow.ti_deps.dependencies_states import EXECUTION_STATES
 from airflow.timetables.simple import DatasetTriggeredTimetable
 from airflow.utils import timezone
 from airflow.utils.event_scheduler import EventScheduler
+from airflow.utils.hashring import ConsistentHashRing
 from airflow.utils.retries import MAX_DB_RETRIES, retry_db_transaction, run_with_db_retries
 from airflow.utils.session import NEW_SESSION, create_session, provide_session
 from airflow.utils.sqlalchemy import (
     CommitProhibitorGuard,
+    filter_in_chunks_and_limit,
     is_lock_not_available_error,
     prohibit_commit,
     skip_locked,
@@ -64,7 +68,7 @@ from airflow.utils.sqlalchemy import (
     with_row_locks,
 )
 from airflow.utils.state import DagRunState, State, TaskInstanceState
-from airflow.utils.types import DagRunType
+from airflow.utils.types import NOTSET, ArgNotSet, DagRunType
 
 if TYPE_CHECKING:
     from types import FrameType
@@ -158,6 +162,24 @@ class SchedulerJob(BaseJob):
         self.dagbag = DagBag(dag_folder=self.subdir, read_dags_from_db=True, load_op_links=False)
         self._paused_dag_without_running_dagruns: set = set()
 
+        # When DAGs are partitioned between the running schedulers, the DAGs this scheduler is
+        # responsible for. None when it is responsible for all of them.
+        self._partition_dags = conf.getboolean('scheduler', 'partition_dags', fallback=False)
+        self._partitioned_dag_ids: set[str] | None = None
+        self._partition_scheduler_ids: set[int] = set()
+
+        # Counts of queued and running task instances used by the critical section instead of querying
+        # them on every pass, when enabled
+        self._concurrency_counts: ConcurrencyCounts | None = None
+        if conf.getboolean('scheduler', 'cache_concurrency_counts', fallback=False):
+            self._concurrency_counts = ConcurrencyCounts()
+
+        # The DAGs whose runs were examined since their state summaries were last updated. None when the
+        # summaries are not maintained
+        self._dag_state_summary_dag_ids: set[str] | None = None
+        if DagStateSummary.is_enabled():
+            self._dag_state_summary_dag_ids = set()
+
     def register_signals(self) -> None:
         """Register signals that stop child processes"""
         signal.signal(signal.SIGINT, self._exit_gracefully)
@@ -263,9 +285,15 @@ class SchedulerJob(BaseJob):
                     "Failed to acquire advisory lock", params=None, orig=RuntimeError('55P03')
                 )
 
+        occupied_pool_slots = None
+        if self._concurrency_counts is not None:
+            if self._concurrency_counts.last_refreshed is None:
+                self._concurrency_counts.refresh(session)
+            occupied_pool_slots = self._concurrency_counts.get_occupied_pool_slots()
+
         # Get the pool settings. We get a lock on the pool rows, treating this as a "critical section"
         # Throws an exception if lock cannot be obtained, rather than blocking
-        pools = Pool.slots_stats(lock_rows=True, session=session)
+        pools = Pool.slots_stats(lock_rows=True, occupied_slots=occupied_pool_slots, session=session)
 
         # If the pools are full, there is no point doing anything!
         # If _somehow_ the pool is overfull, don't let the limit go negative - it breaks SQL
@@ -282,9 +310,12 @@ class SchedulerJob(BaseJob):
         # dag_id to # of running tasks and (dag_id, task_id) to # of running tasks.
         dag_active_tasks_map: DefaultDict[str, int]
         task_concurrency_map: DefaultDict[tuple[str, str], int]
-        dag_active_tasks_map, task_concurrency_map = self.__get_concurrency_maps(
-            states=list(EXECUTION_STATES), session=session
-        )
+        if self._concurrency_counts is not None:
+            dag_active_tasks_map, task_concurrency_map = self._concurrency_counts.get_concurrency_maps()
+        else:
+            dag_active_tasks_map, task_concurrency_map = self.__get_concurrency_maps(
+                states=list(EXECUTION_STATES), session=session
+            )
 
         num_tasks_in_executor = 0
         # Number of tasks that cannot be scheduled because of no open slot in pool
@@ -313,7 +344,6 @@ class SchedulerJob(BaseJob):
                 .join(TI.dag_model)
                 .filter(not_(DM.is_paused))
                 .filter(TI.state == TaskInstanceState.SCHEDULED)
-                .options(selectinload('dag_model'))
                 .order_by(-TI.priority_weight, DR.execution_date)
             )
 
@@ -327,7 +357,18 @@ class SchedulerJob(BaseJob):
                 task_filter = tuple_in_condition((TaskInstance.dag_id, TaskInstance.task_id), starved_tasks)
                 query = query.filter(not_(task_filter))
 
-            query = query.limit(max_tis)
+            if self._partitioned_dag_ids is None:
+                query = query.limit(max_tis)
+            else:
+                query = filter_in_chunks_and_limit(
+                    query,
+                    TI.dag_id,
+                    self._partitioned_dag_ids,
+                    limit=max_tis,
+                    sort_columns=[TI.priority_weight, DR.execution_date],
+                    sort_key=lambda row: (-row.priority_weight, row.execution_date),
+                )
+            query = query.options(selectinload('dag_model'))
 
             task_instances_to_examine: list[TI] = with_row_locks(
                 query,
@@ -509,6 +550,8 @@ class SchedulerJob(BaseJob):
                 },
                 synchronize_session=False,
             )
+            if self._concurrency_counts is not None:
+                self._concurrency_counts.add_queued(executable_tis)
 
         for ti in executable_tis:
             make_transient(ti)
@@ -526,6 +569,8 @@ class SchedulerJob(BaseJob):
         for ti in task_instances:
             if ti.dag_run.state in State.finished:
                 ti.set_state(State.NONE, session=session)
+                if self._concurrency_counts is not None:
+                    self._concurrency_counts.remove(ti.key.primary)
                 continue
             command = ti.command_as_list(
                 local=True,
@@ -585,6 +630,8 @@ class SchedulerJob(BaseJob):
             state, _ = value
             # We create map (dag_id, task_id, execution_date) -> in-memory try_number
             ti_primary_key_to_try_number_map[ti_key.primary] = ti_key.try_number
+            if self._concurrency_counts is not None:
+                self._concurrency_counts.process_executor_event(ti_key, state)
 
             self.log.info(
                 "Executor reports execution of %s.%s run_id=%s exited with status %s for try_number %s",
@@ -830,6 +877,31 @@ class SchedulerJob(BaseJob):
             self.adopt_or_reset_orphaned_tasks,
         )
 
+        if self._concurrency_counts is not None:
+            self._refresh_concurrency_counts()
+            timers.call_regular_interval(
+                conf.getfloat('scheduler', 'concurrency_counts_refresh_interval', fallback=30.0),
+                self._refresh_concurrency_counts,
+            )
+
+        if self._partition_dags:
+            self._refresh_dag_partition()
+            timers.call_regular_interval(
+                conf.getfloat('scheduler', 'partition_refresh_interval', fallback=10.0),
+                self._refresh_dag_partition,
+            )
+
+        if self._dag_state_summary_dag_ids is not None:
+            self._reconcile_dag_state_summaries()
+            timers.call_regular_interval(
+                conf.getfloat('scheduler', 'dag_state_summary_update_interval'),
+                self._update_dag_state_summaries,
+            )
+            timers.call_regular_interval(
+                conf.getfloat('scheduler', 'dag_state_summary_reconcile_interval', fallback=300.0),
+                self._reconcile_dag_state_summaries,
+            )
+
         timers.call_regular_interval(
             conf.getfloat('scheduler', 'trigger_timeout_check_interval', fallback=15.0),
             self.check_trigger_timeouts,
@@ -939,14 +1011,27 @@ class SchedulerJob(BaseJob):
 
             self._start_queued_dagruns(session)
             guard.commit()
-            dag_runs = self._get_next_dagruns_to_examine(DagRunState.RUNNING, session)
-            # Bulk fetch the currently active dag runs for the dags we are
-            # examining, rather than making one query per DagRun
+            dag_runs = list(self._get_next_dagruns_to_examine(DagRunState.RUNNING, session))
+            # Bulk fetch the task instances, latest DAG versions and DAG models of the dag runs we are
+            # examining, rather than making a few queries per DagRun
+            task_instances = DagRun.get_task_instances_of_dag_runs(dag_runs, session=session)
+            dag_ids = {dag_run.dag_id for dag_run in dag_runs}
+            if self._dag_state_summary_dag_ids is not None:
+                self._dag_state_summary_dag_ids.update(dag_ids)
+            latest_versions = SerializedDagModel.get_latest_version_hashes(dag_ids, session=session)
+            # DM.get_dagmodel finds these in the identity map of the session, as long as we hold them
+            dag_models = self._get_dag_models(dag_ids, session)
 
             callback_tuples = []
             for dag_run in dag_runs:
-                callback_to_run = self._schedule_dag_run(dag_run, session)
+                callback_to_run = self._schedule_dag_run(
+                    dag_run,
+                    session,
+                    task_instances=task_instances[dag_run.dag_id, dag_run.run_id],
+                    latest_version=latest_versions.get(dag_run.dag_id),
+                )
                 callback_tuples.append((dag_run, callback_to_run))
+            del dag_models
 
             guard.commit()
 
@@ -997,12 +1082,21 @@ class SchedulerJob(BaseJob):
     @retry_db_transaction
     def _get_next_dagruns_to_examine(self, state: DagRunState, session: Session):
         """Get Next DagRuns to Examine with retries"""
-        return DagRun.next_dagruns_to_examine(state, session)
+        return DagRun.next_dagruns_to_examine(state, session, dag_ids=self._partitioned_dag_ids)
+
+    @staticmethod
+    def _get_dag_models(dag_ids: Collection[str], session: Session) -> list[DM]:
+        """Load the DagModels of the given DAGs into the session with a single query"""
+        if not dag_ids:
+            return []
+        return session.query(DM).options(joinedload(DM.parent_dag)).filter(DM.dag_id.in_(dag_ids)).all()
 
     @retry_db_transaction
     def _create_dagruns_for_dags(self, guard: CommitProhibitorGuard, session: Session) -> None:
         """Find Dag Models needing DagRuns and Create Dag Runs with retries in case of OperationalError"""
-        query, dataset_triggered_dag_info = DagModel.dags_needing_dagruns(session)
+        query, dataset_triggered_dag_info = DagModel.dags_needing_dagruns(
+            session, dag_ids=self._partitioned_dag_ids
+        )
         all_dags_needing_dag_runs = set(query.all())
         dataset_triggered_dags = [
             dag for dag in all_dags_needing_dag_runs if dag.dag_id in dataset_triggered_dag_info
@@ -1236,11 +1330,15 @@ class SchedulerJob(BaseJob):
         self,
         dag_run: DagRun,
         session: Session,
+        task_instances: list[TI] | None = None,
+        latest_version: str | None | ArgNotSet = NOTSET,
     ) -> DagCallbackRequest | None:
         """
         Make scheduling decisions about an individual dag run
 
         :param dag_run: The DagRun to schedule
+        :param task_instances: All the task instances of the dag run, if they were already fetched
+        :param latest_version: The latest version hash of the serialized DAG, if it was already fetched
         :return: Callback that needs to be executed
         """
         callback: DagCallbackRequest | None = None
@@ -1289,9 +1387,15 @@ class SchedulerJob(BaseJob):
             self.log.error("Execution date is in future: %s", dag_run.execution_date)
             return callback
 
-        self._verify_integrity_if_dag_changed(dag_run=dag_run, session=session)
+        if self._verify_integrity_if_dag_changed(
+            dag_run=dag_run, session=session, latest_version=latest_version
+        ):
+            # Task instances may have been added or removed, the prefetched ones are stale
+            task_instances = None
         # TODO[HA]: Rename update_state -> schedule_dag_run, ?? something else?
-        schedulable_tis, callback_to_run = dag_run.update_state(session=session, execute_callbacks=False)
+        schedulable_tis, callback_to_run = dag_run.update_state(
+            session=session, execute_callbacks=False, task_instances=task_instances
+        )
         if dag_run.state in State.finished:
             active_runs = dag.get_num_active_runs(only_running=False, session=session)
             # Work out if we should allow creating a new DagRun now?
@@ -1305,12 +1409,29 @@ class SchedulerJob(BaseJob):
 
         return callback_to_run
 
-    def _verify_integrity_if_dag_changed(self, dag_run: DagRun, session: Session) -> None:
-        """Only run DagRun.verify integrity if Serialized DAG has changed since it is slow"""
-        latest_version = SerializedDagModel.get_latest_version_hash(dag_run.dag_id, session=session)
+    def _verify_integrity_if_dag_changed(
+        self,
+        dag_run: DagRun,
+        session: Session,
+        latest_version: str | None | ArgNotSet = NOTSET,
+    ) -> bool:
+        """
+        Only run DagRun.verify integrity if Serialized DAG has changed since it is slow
+
+        :return: Whether DagRun.verify_integrity was run
+        """
+        if isinstance(latest_version, ArgNotSet):
+            latest_version = SerializedDagModel.get_latest_version_hash(dag_run.dag_id, session=session)
         if dag_run.dag_hash == latest_version:
             self.log.debug("DAG %s not changed structure, skipping dagrun.verify_integrity", dag_run.dag_id)
-            return
+            return False
+
+        # If only some tasks changed since the dag run was last verified, only verify those
+        changed_task_ids = None
+        if latest_version is not None:
+            changed_task_ids = SerializedDagModel.get_changed_task_ids(
+                dag_run.dag_id, dag_run.dag_hash, latest_version, session=session
+            )
 
         dag_run.dag_hash = latest_version
 
@@ -1318,7 +1439,8 @@ class SchedulerJob(BaseJob):
         dag_run.dag = self.dagbag.get_dag(dag_id=dag_run.dag_id, session=session)
 
         # Verify integrity also takes care of session.flush
-        dag_run.verify_integrity(session=session)
+        dag_run.verify_integrity(session=session, task_ids=changed_task_ids)
+        return True
 
     def _send_dag_callbacks_to_processor(self, dag: DAG, callback: DagCallbackRequest | None = None) -> None:
         self._send_sla_callbacks_to_processor(dag)
@@ -1358,6 +1480,83 @@ class SchedulerJob(BaseJob):
             Stats.gauge(f'pool.queued_slots.{pool_name}', slot_stats["queued"])
             Stats.gauge(f'pool.running_slots.{pool_name}', slot_stats["running"])
 
+    @provide_session
+    def _refresh_concurrency_counts(self, session: Session = NEW_SESSION) -> None:
+        """Reconcile the cached counts of queued and running task instances with the database"""
+        if self._concurrency_counts is not None:
+            self._concurrency_counts.refresh(session)
+
+    @provide_session
+    def _update_dag_state_summaries(self, session: Session = NEW_SESSION) -> None:
+        """Refresh the state summaries of the DAGs whose runs were examined since the last update"""
+        if not self._dag_state_summary_dag_ids:
+            return
+        dag_ids, self._dag_state_summary_dag_ids = self._dag_state_summary_dag_ids, set()
+        try:
+            DagStateSummary.refresh(dag_ids, session=session)
+            session.commit()
+        except Exception:  # should not fail the scheduler
+            self.log.exception("Failed to update the state summaries of %d DAGs", len(dag_ids))
+            session.rollback()
+            self._dag_state_summary_dag_ids.update(dag_ids)
+
+    @provide_session
+    def _reconcile_dag_state_summaries(self, session: Session = NEW_SESSION) -> None:
+        """
+        Recompute the state summaries of all the DAGs this scheduler is responsible for, to catch the
+        changes made outside of the scheduler, and delete the summaries of the DAGs which are not active.
+        """
+        if self._partitioned_dag_ids is not None:
+            dag_ids = set(self._partitioned_dag_ids)
+        else:
+            dag_ids = {dag_id for dag_id, in session.query(DM.dag_id).filter(DM.is_active == true())}
+        dag_ids.update(
+            dag_id
+            for dag_id, in session.query(DagStateSummary.dag_id)
+            .join(DM, DM.dag_id == DagStateSummary.dag_id)
+            .filter(DM.is_active == false())
+        )
+        try:
+            DagStateSummary.refresh(dag_ids, session=session)
+            session.commit()
+        except Exception:  # should not fail the scheduler
+            self.log.exception("Failed to reconcile the state summaries of %d DAGs", len(dag_ids))
+            session.rollback()
+
+    @provide_session
+    def _refresh_dag_partition(self, session: Session = NEW_SESSION) -> None:
+        """
+        Work out which DAGs this scheduler is responsible for, when DAGs are partitioned between the
+        running schedulers.
+
+        Every DAG belongs to one of the schedulers which heartbeated recently, picked by consistent
+        hashing of its dag_id. All schedulers see the same heartbeats and so agree on the partitioning,
+        and a scheduler starting or dying only moves its own share of the DAGs.
+        """
+        timeout = conf.getint('scheduler', 'scheduler_health_check_threshold')
+        scheduler_ids = {
+            scheduler_id
+            for scheduler_id, in session.query(SchedulerJob.id).filter(
+                SchedulerJob.job_type == "SchedulerJob",
+                SchedulerJob.state == State.RUNNING,
+                SchedulerJob.latest_heartbeat >= timezone.utcnow() - timedelta(seconds=timeout),
+            )
+        }
+        scheduler_ids.add(self.id)
+
+        ring = ConsistentHashRing(str(scheduler_id) for scheduler_id in scheduler_ids)
+        dag_ids = session.query(DM.dag_id).filter(DM.is_active == true())
+        self._partitioned_dag_ids = {dag_id for dag_id, in dag_ids if ring.get_node(dag_id) == str(self.id)}
+
+        if scheduler_ids != self._partition_scheduler_ids:
+            self.log.info(
+                "Partitioning DAGs between %d schedulers, %d DAGs belong to this one",
+                len(scheduler_ids),
+                len(self._partitioned_dag_ids),
+            )
+            self._partition_scheduler_ids = scheduler_ids
+        Stats.gauge('scheduler.partitioned_dags', len(self._partitioned_dag_ids))
+
     @provide_session
     def heartbeat_callback(self, session: Session = NEW_SESSION) -> None:
         Stats.incr('scheduler_heartbeat', 1, 1)
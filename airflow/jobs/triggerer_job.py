@@ -17,25 +17,58 @@
 from __future__ import annotations
 
 import asyncio
+import collections.abc
+import functools
+import multiprocessing
 import os
+import pickle
+import select
 import signal
 import sys
 import threading
 import time
+import traceback
+import zlib
 from collections import deque
-from typing import Deque
+from multiprocessing.connection import Connection as MultiprocessingConnection, wait
+from typing import Any, Callable, Collection, Deque, TypeVar
 
+from setproctitle import setproctitle
 from sqlalchemy import func
 
+from airflow import settings
 from airflow.configuration import conf
+from airflow.exceptions import AirflowException
 from airflow.jobs.base_job import BaseJob
-from airflow.models.trigger import Trigger
+from airflow.models.trigger import NEW_TRIGGER_CHANNEL, Trigger
 from airflow.stats import Stats
 from airflow.triggers.base import BaseTrigger, TriggerEvent
+from airflow.triggers.temporal import DateTimeTrigger, TimerEntry, get_timer_heap
 from airflow.typing_compat import TypedDict
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.module_loading import import_string
-from airflow.utils.session import provide_session
+from airflow.utils.retries import run_with_db_retries
+from airflow.utils.session import create_session, provide_session
+
+T = TypeVar('T')
+
+# The longest time, in seconds, the triggerer waits before polling the database for triggers
+POLL_INTERVAL = 1.0
+
+# A trigger resumed for longer than this many seconds blocks the other triggers of its event loop
+BLOCKING_STEP_THRESHOLD = 0.2
+
+# The ways triggers are spread over the processes of a ShardedTriggerRunner
+TRIGGER_PLACEMENTS = ("cost", "classpath")
+
+
+def get_trigger_hash(trigger: BaseTrigger) -> str | None:
+    """The hash identifying the triggers identical to the given one, or None if it cannot be serialized."""
+    try:
+        return Trigger.compute_hash(*trigger.serialize())
+    except Exception:
+        return None
 
 
 class TriggererJob(BaseJob):
@@ -46,7 +79,11 @@ class TriggererJob(BaseJob):
 
     It runs as two threads:
      - The main thread does DB calls/checkins
-     - A subthread runs all the async code
+     - A subthread runs all the async code, or, with ``[triggerer] runner_processes``,
+       spreads the triggers over processes each running its own async loop
+
+    The main thread sleeps until triggers fire or fail, or until new triggers
+    are notified on PostgreSQL, and polls the database at least every second.
     """
 
     __mapper_args__ = {'polymorphic_identity': 'TriggererJob'}
@@ -62,8 +99,30 @@ class TriggererJob(BaseJob):
         else:
             raise ValueError(f"Capacity number {capacity} is invalid")
 
+        self.event_batch_size = conf.getint('triggerer', 'event_batch_size', fallback=1000)
+        if self.event_batch_size <= 0:
+            raise ValueError(f"Event batch size {self.event_batch_size} is invalid")
+
+        runner_processes = conf.getint('triggerer', 'runner_processes', fallback=0)
+        if runner_processes < 0:
+            raise ValueError(f"Number of runner processes {runner_processes} is invalid")
+
+        # Set when the main thread has work to do
+        self.wakeup = threading.Event()
+
         # Set up runner async thread
-        self.runner = TriggerRunner()
+        self.runner: TriggerRunner
+        if runner_processes:
+            self.runner = ShardedTriggerRunner(
+                runner_processes,
+                placement=conf.get('triggerer', 'trigger_placement', fallback='cost'),
+                quarantine_after_blocks=conf.getint('triggerer', 'quarantine_after_blocks', fallback=3),
+                main_wakeup=self.wakeup,
+            )
+        else:
+            self.runner = TriggerRunner(main_wakeup=self.wakeup)
+
+        self.listener: TriggerNotificationListener | None = None
 
     def register_signals(self) -> None:
         """Register signals that stop child processes"""
@@ -102,6 +161,10 @@ class TriggererJob(BaseJob):
         try:
             # Kick off runner thread
             self.runner.start()
+            # Listen for new triggers where the database supports it
+            if TriggerNotificationListener.is_supported():
+                self.listener = TriggerNotificationListener(self.wakeup)
+                self.listener.start()
             # Start our own DB loop in the main thread
             self._run_trigger_loop()
         except Exception:
@@ -113,6 +176,8 @@ class TriggererJob(BaseJob):
             # If the user interrupts/terms again, _graceful_exit will allow them
             # to force-kill here.
             self.runner.stop = True
+            if self.listener is not None:
+                self.listener.stop = True
             self.runner.join(30)
             self.log.info("Exited trigger loop")
 
@@ -122,9 +187,13 @@ class TriggererJob(BaseJob):
 
         This runs synchronously and handles all database reads/writes.
         """
+        last_clean = 0.0
         while not self.runner.stop:
-            # Clean out unused triggers
-            Trigger.clean_unused()
+            self.wakeup.clear()
+            # Clean out unused triggers, once per poll interval
+            if time.monotonic() - last_clean >= POLL_INTERVAL:
+                Trigger.clean_unused()
+                last_clean = time.monotonic()
             # Load/delete triggers
             self.load_triggers()
             # Handle events
@@ -135,8 +204,8 @@ class TriggererJob(BaseJob):
             self.heartbeat(only_if_necessary=True)
             # Collect stats
             self.emit_metrics()
-            # Idle sleep
-            time.sleep(1)
+            # Idle sleep, until there is work to do or it is time to poll again
+            self.wakeup.wait(POLL_INTERVAL)
 
     def load_triggers(self):
         """
@@ -152,37 +221,142 @@ class TriggererJob(BaseJob):
         """
         Handles outbound events from triggers - dispatching them into the Trigger
         model where they are then pushed into the relevant task instances.
+
+        Events are drained in batches of up to ``[triggerer] event_batch_size``,
+        each applied in one transaction.
         """
         while self.runner.events:
-            # Get the event and its trigger ID
-            trigger_id, event = self.runner.events.popleft()
-            # Tell the model to wake up its tasks
-            Trigger.submit_event(trigger_id=trigger_id, event=event)
-            # Emit stat event
-            Stats.incr('triggers.succeeded')
+            batch = self._drain_batch(self.runner.events)
+            with Stats.timer('triggers.event_batch_duration'):
+                for attempt in run_with_db_retries(logger=self.log):
+                    with attempt, create_session() as session:
+                        # Tell the model to wake up the tasks
+                        Trigger.submit_events(batch, session=session)
+            # Emit stat events
+            Stats.gauge('triggers.event_batch_size', len(batch))
+            Stats.incr('triggers.succeeded', len(batch))
 
     def handle_failed_triggers(self):
         """
         Handles "failed" triggers - ones that errored or exited before they
         sent an event. Task Instances that depend on them need failing.
+
+        Failed triggers are drained in batches of up to ``[triggerer] event_batch_size``,
+        each applied in one transaction.
         """
         while self.runner.failed_triggers:
-            # Tell the model to fail this trigger's deps
-            trigger_id, saved_exc = self.runner.failed_triggers.popleft()
-            Trigger.submit_failure(trigger_id=trigger_id, exc=saved_exc)
-            # Emit stat event
-            Stats.incr('triggers.failed')
+            batch = self._drain_batch(self.runner.failed_triggers)
+            with Stats.timer('triggers.failure_batch_duration'):
+                for attempt in run_with_db_retries(logger=self.log):
+                    with attempt, create_session() as session:
+                        # Tell the model to fail the triggers' deps
+                        Trigger.submit_failures(batch, session=session)
+            # Emit stat events
+            Stats.gauge('triggers.failure_batch_size', len(batch))
+            Stats.incr('triggers.failed', len(batch))
+
+    def _drain_batch(self, queue: Deque[T]) -> list[T]:
+        batch: list[T] = []
+        while queue and len(batch) < self.event_batch_size:
+            batch.append(queue.popleft())
+        return batch
 
     def emit_metrics(self):
         Stats.gauge('triggers.running', len(self.runner.triggers))
 
 
+class _TimerTask:
+    """
+    Stands for the task of a trigger waiting in the timer heap of the event loop.
+
+    Implements the part of :class:`asyncio.Task` the runner uses.
+    """
+
+    __slots__ = ("entry", "_done", "_cancelled")
+
+    def __init__(self):
+        self.entry: TimerEntry | None = None
+        self._done = False
+        self._cancelled = False
+
+    def done(self) -> bool:
+        return self._done
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> bool:
+        if self._done:
+            return False
+        if self.entry is not None:
+            self.entry.cancel()
+        self._done = self._cancelled = True
+        return True
+
+    def set_done(self) -> None:
+        self._done = True
+
+    def result(self) -> None:
+        if self._cancelled:
+            raise asyncio.CancelledError()
+
+
+def _waits_in_timer_heap(trigger: BaseTrigger) -> bool:
+    """Whether a trigger only waits for its moment, so it can wait in the timer heap without a coroutine."""
+    trigger_class = type(trigger)
+    return (
+        isinstance(trigger, DateTimeTrigger)
+        and trigger_class.run is DateTimeTrigger.run
+        and trigger_class.cleanup is BaseTrigger.cleanup
+    )
+
+
 class TriggerDetails(TypedDict):
     """Type class for the trigger details dictionary"""
 
-    task: asyncio.Task
+    task: asyncio.Task | _TimerTask
     name: str
     events: int
+    # The CPU time used by the trigger, in seconds
+    cpu_time: float
+    # The number of times the trigger blocked the event loop
+    blocks: int
+    # The hash identifying identical triggers, if they are deduplicated
+    trigger_hash: str | None
+    # The IDs of the identical triggers sharing the run of this trigger, its own included
+    shared_ids: set[int]
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """
+    A coroutine measuring each step of the coroutine it wraps.
+
+    After each time the wrapped coroutine is resumed, ``on_step`` is called with
+    the time it ran for and the CPU time it used, in seconds.
+    """
+
+    def __init__(self, coro: collections.abc.Coroutine, on_step: Callable[[float, float], None]):
+        self._coro = coro
+        self._on_step = on_step
+
+    def _step(self, method: Callable, *args):
+        start, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            return method(*args)
+        finally:
+            self._on_step(time.perf_counter() - start, time.thread_time() - start_cpu)
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
 
 
 class TriggerRunner(threading.Thread, LoggingMixin):
@@ -193,6 +367,13 @@ class TriggerRunner(threading.Thread, LoggingMixin):
     event loop, but is also sometimes interacted with from the main thread
     (where all the DB queries are done). All communication between threads is
     done via Deques.
+
+    Identical triggers, with the same classpath and kwargs, share one run
+    unless ``[triggerer] deduplicate_triggers`` is off: each event of the run
+    is sent for all of them.
+
+    Temporal triggers which only wait for their moment do not run as coroutines:
+    they wait in the timer heap of the event loop, which fires them in bulk.
     """
 
     # Maps trigger IDs to their running tasks and other info
@@ -216,7 +397,13 @@ class TriggerRunner(threading.Thread, LoggingMixin):
     # Should-we-stop flag
     stop: bool = False
 
-    def __init__(self):
+    # Set when events or failed triggers are queued, to wake the main thread up
+    main_wakeup: threading.Event
+
+    # Maps trigger hashes to the IDs of the triggers sharing the run identical triggers join
+    shared_runs: dict[str, set[int]]
+
+    def __init__(self, main_wakeup: threading.Event | None = None):
         super().__init__()
         self.triggers = {}
         self.trigger_cache = {}
@@ -224,6 +411,14 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         self.to_cancel = deque()
         self.events = deque()
         self.failed_triggers = deque()
+        self.main_wakeup = main_wakeup or threading.Event()
+        self.shared_runs = {}
+        self.deduplicate = Trigger.deduplication_enabled()
+        # The IDs of the triggers whose run may have exited, for the cleanup to look at
+        self._finished_ids: set[int] = set()
+        # Set when the inbound queues change or triggers exit, once the event loop runs
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
 
     def run(self):
         """Sync entrypoint - just runs arun in an async loop."""
@@ -236,15 +431,21 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         The loop in here runs trigger addition/deletion/cleanup. Actual
         triggers run in their own separate coroutines.
         """
+        self._wakeup = wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
         watchdog = asyncio.create_task(self.block_watchdog())
         last_status = time.time()
         while not self.stop:
+            wakeup.clear()
             # Run core logic
             await self.create_triggers()
             await self.cancel_triggers()
             await self.cleanup_finished_triggers()
-            # Sleep for a bit
-            await asyncio.sleep(1)
+            # Sleep until there is work to do, or for a bit
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
             # Every minute, log status if at least one trigger is running.
             if time.time() - last_status >= 60:
                 count = len(self.triggers)
@@ -261,14 +462,51 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         """
         while self.to_create:
             trigger_id, trigger_instance = self.to_create.popleft()
-            if trigger_id not in self.triggers:
-                self.triggers[trigger_id] = {
-                    "task": asyncio.create_task(self.run_trigger(trigger_id, trigger_instance)),
-                    "name": f"{trigger_instance!r} (ID {trigger_id})",
-                    "events": 0,
-                }
-            else:
+            if trigger_id in self.triggers:
                 self.log.warning("Trigger %s had insertion attempted twice", trigger_id)
+                await asyncio.sleep(0)
+                continue
+            name = f"{trigger_instance!r} (ID {trigger_id})"
+            trigger_hash = get_trigger_hash(trigger_instance) if self.deduplicate else None
+            shared_ids = self.shared_runs.get(trigger_hash) if trigger_hash else None
+            shared_details = self.triggers[next(iter(shared_ids))] if shared_ids else None
+            task: asyncio.Task | _TimerTask
+            # Join the run of an identical trigger unless it already fired, as this
+            # trigger would not get the events fired before
+            if (
+                shared_ids
+                and shared_details
+                and not shared_details["task"].done()
+                and not shared_details["events"]
+            ):
+                self.log.info(
+                    "Trigger %s shares the run of identical trigger %s", name, shared_details["name"]
+                )
+                task = shared_details["task"]
+            else:
+                shared_ids = set()
+                if _waits_in_timer_heap(trigger_instance):
+                    task = self._wait_in_timer_heap(trigger_id, trigger_instance, shared_ids)
+                else:
+                    task = asyncio.create_task(
+                        _TimedCoroutine(
+                            self.run_trigger(trigger_id, trigger_instance, shared_ids),
+                            functools.partial(self._record_step, shared_ids),
+                        )
+                    )
+                    task.add_done_callback(functools.partial(self._run_finished, shared_ids))
+                if trigger_hash:
+                    self.shared_runs[trigger_hash] = shared_ids
+            shared_ids.add(trigger_id)
+            self.triggers[trigger_id] = {
+                "task": task,
+                "name": name,
+                "events": 0,
+                "cpu_time": 0.0,
+                "blocks": 0,
+                "trigger_hash": trigger_hash,
+                "shared_ids": shared_ids,
+            }
             await asyncio.sleep(0)
 
     async def cancel_triggers(self):
@@ -278,50 +516,78 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         """
         while self.to_cancel:
             trigger_id = self.to_cancel.popleft()
-            if trigger_id in self.triggers:
-                # We only delete if it did not exit already
-                self.triggers[trigger_id]["task"].cancel()
+            details = self.triggers.get(trigger_id)
+            if details is not None:
+                if len(details["shared_ids"]) > 1 and not details["task"].done():
+                    # The identical triggers sharing the run still need it
+                    self._forget_trigger(trigger_id, cancelled=True)
+                else:
+                    # We only delete if it did not exit already
+                    details["task"].cancel()
+                    self._run_finished(details["shared_ids"])
             await asyncio.sleep(0)
 
     async def cleanup_finished_triggers(self):
         """
-        Go through all trigger tasks (coroutines) and clean up entries for
-        ones that have exited, optionally warning users if the exit was
-        not normal.
-        """
-        for trigger_id, details in list(self.triggers.items()):
-            if details["task"].done():
-                # Check to see if it exited for good reasons
-                saved_exc = None
-                try:
-                    result = details["task"].result()
-                except (asyncio.CancelledError, SystemExit, KeyboardInterrupt):
-                    # These are "expected" exceptions and we stop processing here
-                    # If we don't, then the system requesting a trigger be removed -
-                    # which turns into CancelledError - results in a failure.
-                    del self.triggers[trigger_id]
-                    continue
-                except BaseException as e:
-                    # This is potentially bad, so log it.
-                    self.log.exception("Trigger %s exited with error %s", details["name"], e)
-                    saved_exc = e
-                else:
-                    # See if they foolishly returned a TriggerEvent
-                    if isinstance(result, TriggerEvent):
-                        self.log.error(
-                            "Trigger %s returned a TriggerEvent rather than yielding it", details["name"]
-                        )
-                # See if this exited without sending an event, in which case
-                # any task instances depending on it need to be failed
-                if details["events"] == 0:
+        Go through the trigger tasks (coroutines) which may have exited and
+        clean up entries for ones that have, optionally warning users if the
+        exit was not normal.
+        """
+        finished_ids, self._finished_ids = self._finished_ids, set()
+        for trigger_id in sorted(finished_ids):
+            details = self.triggers.get(trigger_id)
+            # Cancelled tasks report again once they exit
+            if details is None or not details["task"].done():
+                continue
+            # Check to see if it exited for good reasons
+            saved_exc = None
+            try:
+                result = details["task"].result()
+            except (asyncio.CancelledError, SystemExit, KeyboardInterrupt):
+                # These are "expected" exceptions and we stop processing here
+                # If we don't, then the system requesting a trigger be removed -
+                # which turns into CancelledError - results in a failure.
+                self._forget_trigger(trigger_id, cancelled=True)
+                continue
+            except BaseException as e:
+                # This is potentially bad, so log it.
+                self.log.exception("Trigger %s exited with error %s", details["name"], e)
+                saved_exc = e
+            else:
+                # See if they foolishly returned a TriggerEvent
+                if isinstance(result, TriggerEvent):
                     self.log.error(
-                        "Trigger %s exited without sending an event. Dependent tasks will be failed.",
-                        details["name"],
+                        "Trigger %s returned a TriggerEvent rather than yielding it", details["name"]
                     )
-                    self.failed_triggers.append((trigger_id, saved_exc))
-                del self.triggers[trigger_id]
+            # See if this exited without sending an event, in which case
+            # any task instances depending on it need to be failed
+            if details["events"] == 0:
+                self.log.error(
+                    "Trigger %s exited without sending an event. Dependent tasks will be failed.",
+                    details["name"],
+                )
+                self.failed_triggers.append((trigger_id, saved_exc))
+                self.main_wakeup.set()
+            self._forget_trigger(trigger_id)
             await asyncio.sleep(0)
 
+    def _run_finished(self, shared_ids: Collection[int], *args) -> None:
+        """Have the cleanup look at the triggers sharing a run which exited, or is being cancelled."""
+        self._finished_ids.update(shared_ids)
+
+    def _forget_trigger(self, trigger_id: int, cancelled: bool = False) -> None:
+        """
+        Remove a trigger, and the run it shared once no identical trigger shares it anymore.
+
+        :param cancelled: Whether the trigger was cancelled, rather than exited
+        """
+        details = self.triggers.pop(trigger_id)
+        shared_ids = details["shared_ids"]
+        shared_ids.discard(trigger_id)
+        trigger_hash = details["trigger_hash"]
+        if not shared_ids and trigger_hash and self.shared_runs.get(trigger_hash) is shared_ids:
+            del self.shared_runs[trigger_hash]
+
     async def block_watchdog(self):
         """
         Watchdog loop that detects blocking (badly-written) triggers.
@@ -331,8 +597,9 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         there are badly-written triggers taking longer than that and blocking
         the event loop.
 
-        Unfortunately, we can't tell what trigger is blocking things, but
-        we can at least detect the top-level problem.
+        The triggers blocking the loop themselves are named by
+        :meth:`_record_step`; this also catches the loop being blocked by
+        anything else.
         """
         while not self.stop:
             last_run = time.monotonic()
@@ -340,7 +607,7 @@ class TriggerRunner(threading.Thread, LoggingMixin):
             # We allow a generous amount of buffer room for now, since it might
             # be a busy event loop.
             time_elapsed = time.monotonic() - last_run
-            if time_elapsed > 0.2:
+            if time_elapsed > BLOCKING_STEP_THRESHOLD:
                 self.log.error(
                     "Triggerer's async thread was blocked for %.2f seconds, "
                     "likely by a badly-written trigger. Set PYTHONASYNCIODEBUG=1 "
@@ -349,25 +616,86 @@ class TriggerRunner(threading.Thread, LoggingMixin):
                 )
                 Stats.incr('triggers.blocked_main_thread')
 
+    def _record_step(self, trigger_ids: Collection[int], duration: float, cpu_time: float) -> None:
+        """
+        Account for the time a run of triggers ran for when it was last resumed,
+        sharing its CPU time between the triggers.
+        """
+        all_details = [self.triggers[trigger_id] for trigger_id in trigger_ids if trigger_id in self.triggers]
+        if not all_details:
+            return
+        blocked = duration > BLOCKING_STEP_THRESHOLD
+        for details in all_details:
+            details["cpu_time"] += cpu_time / len(all_details)
+            if blocked:
+                details["blocks"] += 1
+        if blocked:
+            self.log.warning(
+                "Trigger %s blocked the event loop for %.2f seconds", all_details[0]["name"], duration
+            )
+
     # Async trigger logic
 
-    async def run_trigger(self, trigger_id, trigger):
+    def _push_event(self, trigger_id: int, shared_ids: Collection[int] | None, event: TriggerEvent) -> None:
+        """Push an event for a trigger and the identical triggers sharing its run."""
+        for shared_id in sorted(shared_ids or [trigger_id]):
+            if shared_id in self.triggers:
+                self.triggers[shared_id]["events"] += 1
+            self.events.append((shared_id, event))
+        self.main_wakeup.set()
+
+    def _wait_in_timer_heap(
+        self, trigger_id: int, trigger: DateTimeTrigger, shared_ids: Collection[int]
+    ) -> _TimerTask:
+        """Wait for the moment of a temporal trigger in the timer heap, instead of running it."""
+        task = _TimerTask()
+
+        def fire() -> None:
+            self.log.info("Trigger %s fired: %s", f"{trigger!r} (ID {trigger_id})", trigger.moment)
+            self._push_event(trigger_id, shared_ids, TriggerEvent(trigger.moment))
+            task.set_done()
+            self._run_finished(shared_ids)
+            # Clean the trigger up without waiting
+            self.wake()
+
+        task.entry = get_timer_heap().schedule(trigger.moment, fire)
+        return task
+
+    async def run_trigger(self, trigger_id, trigger, shared_ids: Collection[int] | None = None):
         """
         Wrapper which runs an actual trigger (they are async generators)
         and pushes their events into our outbound event deque.
+
+        Each event is pushed for all the identical triggers in ``shared_ids``,
+        which may change while the trigger runs, or only for ``trigger_id``.
         """
-        self.log.info("Trigger %s starting", self.triggers[trigger_id]['name'])
+        name = f"{trigger!r} (ID {trigger_id})"
+        self.log.info("Trigger %s starting", name)
         try:
             async for event in trigger.run():
-                self.log.info("Trigger %s fired: %s", self.triggers[trigger_id]['name'], event)
-                self.triggers[trigger_id]["events"] += 1
-                self.events.append((trigger_id, event))
+                self.log.info("Trigger %s fired: %s", name, event)
+                self._push_event(trigger_id, shared_ids, event)
         finally:
             # CancelledError will get injected when we're stopped - which is
             # fine, the cleanup process will understand that, but we want to
             # allow triggers a chance to cleanup, either in that case or if
             # they exit cleanly.
             trigger.cleanup()
+            # Clean the trigger up without waiting
+            self.wake()
+
+    # Any-thread sync API
+
+    def wake(self) -> None:
+        """Wake the event loop up to process the inbound queues and exited triggers, from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # The event loop is closed
+            pass
 
     # Main-thread sync API
 
@@ -413,6 +741,8 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         # Enqueue orphaned triggers for cancellation
         for old_id in cancel_trigger_ids:
             self.to_cancel.append(old_id)
+        if self.to_create or self.to_cancel:
+            self.wake()
 
     def get_trigger_by_classpath(self, classpath: str) -> type[BaseTrigger]:
         """
@@ -423,3 +753,513 @@ class TriggerRunner(threading.Thread, LoggingMixin):
         if classpath not in self.trigger_cache:
             self.trigger_cache[classpath] = import_string(classpath)
         return self.trigger_cache[classpath]
+
+
+class _RemoteTraceback(Exception):
+    """The traceback of an exception raised in a trigger runner process."""
+
+    def __init__(self, tb: str):
+        super().__init__(tb)
+        self.tb = tb
+
+    def __str__(self) -> str:
+        return self.tb
+
+
+def _portable_exception(exc: BaseException | None) -> tuple[BaseException | None, str | None]:
+    """An exception which can be sent to another process, and its formatted traceback."""
+    if exc is None:
+        return None, None
+    tb = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        exc = AirflowException(f"{type(exc).__name__}: {exc}")
+    return exc, tb
+
+
+class _ChildTriggerRunner(TriggerRunner):
+    """
+    The trigger runner of a process of a :class:`ShardedTriggerRunner`.
+
+    It is driven by the messages of the triggerer process, and sends it back
+    the events, failures and costs of its triggers.
+    """
+
+    # Outbound queue of the triggers which exited, with whether they were cancelled
+    finished: Deque[tuple[int, bool]]
+
+    def __init__(self):
+        super().__init__()
+        self.finished = deque()
+
+    def _forget_trigger(self, trigger_id: int, cancelled: bool = False) -> None:
+        super()._forget_trigger(trigger_id, cancelled)
+        self.finished.append((trigger_id, cancelled))
+
+    def handle_message(self, message: tuple) -> None:
+        """Apply a message sent by the triggerer process."""
+        kind = message[0]
+        if kind == "create":
+            _, trigger_id, classpath, kwargs = message
+            try:
+                trigger = self.get_trigger_by_classpath(classpath)(**kwargs)
+            except BaseException as e:
+                # Either the trigger code or the path to it is bad. Fail the trigger.
+                self.failed_triggers.append((trigger_id, e))
+                self.finished.append((trigger_id, False))
+            else:
+                self.to_create.append((trigger_id, trigger))
+        elif kind == "cancel":
+            self.to_cancel.append(message[1])
+        elif kind == "stop":
+            self.stop = True
+        self.wake()
+
+    def send_results(self, connection: MultiprocessingConnection) -> None:
+        """Send the events and failures of the triggers, then the triggers which exited."""
+        # Take the finished triggers first: their events and failures are queued before them
+        finished = []
+        while self.finished:
+            finished.append(self.finished.popleft())
+        while self.events:
+            connection.send(("event", *self.events.popleft()))
+        while self.failed_triggers:
+            trigger_id, exc = self.failed_triggers.popleft()
+            connection.send(("failed", trigger_id, *_portable_exception(exc)))
+        for trigger_id, cancelled in finished:
+            connection.send(("finished", trigger_id, cancelled))
+
+    def send_costs(self, connection: MultiprocessingConnection) -> None:
+        """Send the CPU time used by each trigger and the number of times it blocked the event loop."""
+        costs = {
+            trigger_id: (details["cpu_time"], details["blocks"])
+            for trigger_id, details in list(self.triggers.items())
+        }
+        connection.send(("costs", costs))
+
+    def relay(self, connection: MultiprocessingConnection) -> None:
+        """Relay the messages of the triggerer process and the results of the triggers until stopped."""
+        last_costs = time.monotonic()
+        try:
+            while self.is_alive():
+                timeout = 0.1
+                while connection.poll(timeout):
+                    self.handle_message(connection.recv())
+                    timeout = 0
+                self.send_results(connection)
+                if time.monotonic() - last_costs >= 1:
+                    self.send_costs(connection)
+                    last_costs = time.monotonic()
+            self.send_results(connection)
+        except (EOFError, OSError):
+            # The triggerer process exited
+            self.log.warning("Lost the connection to the triggerer, stopping")
+
+
+def _run_runner_process(
+    name: str, connection: MultiprocessingConnection, parent_connection: MultiprocessingConnection
+) -> None:
+    """The entrypoint of a process of a :class:`ShardedTriggerRunner`."""
+    # Since we share all open FDs from the parent, we need to close the parent side of the pipe here in
+    # the child, else it won't get closed properly until we exit.
+    parent_connection.close()
+    del parent_connection
+
+    # The triggerer stops its runner processes itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    setproctitle(f"airflow triggerer - {name}")
+    threading.current_thread().name = name
+
+    # Re-configure the ORM engine as there are issues with multiple processes
+    settings.configure_orm()
+    runner = _ChildTriggerRunner()
+    runner.start()
+    try:
+        runner.relay(connection)
+    finally:
+        runner.stop = True
+        runner.join(30)
+        # We re-initialized the ORM within this Process above so we need to
+        # tear it down manually here
+        settings.dispose_orm()
+        connection.close()
+
+
+class ShardedTriggerDetails(TypedDict):
+    """Type class for the details of a trigger run by a ShardedTriggerRunner"""
+
+    name: str
+    classpath: str
+    kwargs: dict[str, Any]
+    # The index of the process running the trigger
+    process: int
+    events: int
+    # The CPU time used by the trigger, in seconds
+    cpu_time: float
+    # The number of times the trigger blocked the event loop
+    blocks: int
+    # Whether the trigger is being moved to the quarantine process
+    moving: bool
+    # Whether the trigger was cancelled or failed
+    cancelled: bool
+    # The hash identifying identical triggers, if they are deduplicated
+    trigger_hash: str | None
+
+
+class _RunnerProcess:
+    """A process of a ShardedTriggerRunner, and the connection to it."""
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, connection: MultiprocessingConnection):
+        self.process = process
+        self.connection = connection
+
+
+class ShardedTriggerRunner(TriggerRunner, MultiprocessingStartMethodMixin):
+    """
+    Runtime environment running triggers in several processes.
+
+    Each process runs its triggers in its own event loop, so triggers using a
+    lot of CPU time only slow down the triggers of their process. This thread
+    places each new trigger in a process, relays the requests of the main thread
+    to the processes, and collects the events and failures of the triggers into
+    the same deques as :class:`TriggerRunner`.
+
+    The processes measure the CPU time used by each trigger and the number of
+    times it blocked its event loop. A trigger blocking its event loop too often
+    is moved to a separate quarantine process, started when first needed, where
+    it only delays the other quarantined triggers. A runner process which exits
+    unexpectedly is restarted with its triggers.
+
+    :param num_processes: The number of processes running the triggers, besides the quarantine process
+    :param placement: ``cost`` to place each new trigger in the process whose triggers used the least
+        CPU time, ``classpath`` to place all the triggers of a class in the same process
+    :param quarantine_after_blocks: The number of times a trigger may block its event loop before it is
+        moved to the quarantine process, or 0 to never move triggers
+    :param main_wakeup: Set when events or failed triggers are queued
+    """
+
+    # Maps trigger IDs to the process running them and other info
+    triggers: dict[int, ShardedTriggerDetails]  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        num_processes: int,
+        placement: str = "cost",
+        quarantine_after_blocks: int = 3,
+        main_wakeup: threading.Event | None = None,
+    ):
+        super().__init__(main_wakeup)
+        if num_processes <= 0:
+            raise ValueError(f"Number of runner processes {num_processes} is invalid")
+        if placement not in TRIGGER_PLACEMENTS:
+            raise ValueError(f"Unknown trigger placement {placement!r}, expected one of {TRIGGER_PLACEMENTS}")
+        self.num_processes = num_processes
+        self.placement = placement
+        self.quarantine_after_blocks = quarantine_after_blocks
+        # The index of the quarantine process comes after the others
+        self.quarantine = num_processes
+        self.processes: dict[int, _RunnerProcess] = {}
+        self._mp_context = multiprocessing.get_context(self._get_multiprocessing_start_method())
+        # Written to by wake, to interrupt the wait for messages of the processes
+        self._wakeup_reader, self._wakeup_writer = multiprocessing.Pipe(duplex=False)
+
+    def run(self):
+        """Start the processes and relay messages to and from them until stopped."""
+        try:
+            for index in range(self.num_processes):
+                self._start_process(index)
+            last_status = time.monotonic()
+            while not self.stop:
+                self._restart_dead_processes()
+                self._dispatch_created_triggers()
+                self._dispatch_cancelled_triggers()
+                self._receive_messages(timeout=POLL_INTERVAL)
+                self._quarantine_blocking_triggers()
+                # Every minute, log status if at least one trigger is running.
+                if time.monotonic() - last_status >= 60:
+                    if self.triggers:
+                        self.log.info("%i triggers currently running: %s", len(self.triggers), self.loads())
+                    last_status = time.monotonic()
+        finally:
+            self._stop_processes()
+
+    def loads(self) -> dict[int, tuple[float, int]]:
+        """The CPU time used by the triggers of each process, and their number."""
+        loads = {index: (0.0, 0) for index in range(self.num_processes)}
+        for details in list(self.triggers.values()):
+            cpu_time, count = loads.get(details["process"], (0.0, 0))
+            loads[details["process"]] = (cpu_time + details["cpu_time"], count + 1)
+        return loads
+
+    def place(self, classpath: str, trigger_hash: str | None = None) -> int:
+        """
+        The index of the process to run a new trigger of the given class in.
+
+        Identical triggers are placed in the same process, where they share a run.
+        """
+        if trigger_hash:
+            for details in list(self.triggers.values()):
+                if (
+                    details["trigger_hash"] == trigger_hash
+                    and not details["moving"]
+                    and not details["cancelled"]
+                ):
+                    return details["process"]
+        if self.placement == "classpath":
+            return zlib.crc32(classpath.encode()) % self.num_processes
+        loads = self.loads()
+        return min(range(self.num_processes), key=lambda index: loads[index])
+
+    def _process_name(self, index: int) -> str:
+        if index == self.quarantine:
+            return "TriggerRunnerProcess-quarantine"
+        return f"TriggerRunnerProcess-{index}"
+
+    def _start_process(self, index: int) -> None:
+        parent_connection, child_connection = self._mp_context.Pipe()
+        name = self._process_name(index)
+        process = self._mp_context.Process(
+            target=_run_runner_process,
+            args=(name, child_connection, parent_connection),
+            name=name,
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        self.processes[index] = _RunnerProcess(process, parent_connection)
+        self.log.info("Started trigger runner process %s (PID=%s)", name, process.pid)
+
+    def _send(self, index: int, message: tuple) -> None:
+        if index not in self.processes:
+            self._start_process(index)
+        try:
+            self.processes[index].connection.send(message)
+        except OSError:
+            # The process exited; it is restarted with its triggers
+            self.log.warning("Could not send %s to %s", message[0], self._process_name(index))
+
+    def _send_create(self, trigger_id: int) -> None:
+        details = self.triggers[trigger_id]
+        self._send(details["process"], ("create", trigger_id, details["classpath"], details["kwargs"]))
+
+    def _restart_dead_processes(self) -> None:
+        for index, runner_process in list(self.processes.items()):
+            if runner_process.process.is_alive():
+                continue
+            # Collect what the process sent before it exited
+            self._receive_from(index, runner_process.connection)
+            runner_process.connection.close()
+            self.log.error(
+                "Trigger runner process %s exited unexpectedly with code %s, restarting it",
+                self._process_name(index),
+                runner_process.process.exitcode,
+            )
+            self._start_process(index)
+            for trigger_id, details in list(self.triggers.items()):
+                if details["process"] != index:
+                    continue
+                if details["moving"] and not details["cancelled"]:
+                    self._finish(index, trigger_id, cancelled=True)
+                elif details["cancelled"]:
+                    del self.triggers[trigger_id]
+                else:
+                    details["cpu_time"], details["blocks"] = 0.0, 0
+                    self._send_create(trigger_id)
+
+    def _dispatch_created_triggers(self) -> None:
+        while self.to_create:
+            trigger_id, trigger = self.to_create.popleft()
+            if trigger_id in self.triggers:
+                self.log.warning("Trigger %s had insertion attempted twice", trigger_id)
+                continue
+            classpath, kwargs = trigger.serialize()
+            trigger_hash = Trigger.compute_hash(classpath, kwargs) if self.deduplicate else None
+            self.triggers[trigger_id] = {
+                "name": f"{trigger!r} (ID {trigger_id})",
+                "classpath": classpath,
+                "kwargs": kwargs,
+                "trigger_hash": trigger_hash,
+                "process": self.place(classpath, trigger_hash),
+                "events": 0,
+                "cpu_time": 0.0,
+                "blocks": 0,
+                "moving": False,
+                "cancelled": False,
+            }
+            self._send_create(trigger_id)
+
+    def _dispatch_cancelled_triggers(self) -> None:
+        while self.to_cancel:
+            trigger_id = self.to_cancel.popleft()
+            details = self.triggers.get(trigger_id)
+            if details is None or details["cancelled"]:
+                continue
+            details["cancelled"] = True
+            # A trigger being moved is already being cancelled, and is not started again
+            if not details["moving"]:
+                self._send(details["process"], ("cancel", trigger_id))
+
+    def wake(self) -> None:
+        """Wake this thread up to process the inbound queues, from any thread."""
+        try:
+            self._wakeup_writer.send_bytes(b"")
+        except OSError:
+            # The runner is stopped
+            pass
+
+    def _receive_messages(self, timeout: float) -> None:
+        connections = {runner_process.connection: index for index, runner_process in self.processes.items()}
+        for connection in wait([self._wakeup_reader, *connections], timeout=timeout):
+            if connection is self._wakeup_reader:
+                while self._wakeup_reader.poll():
+                    self._wakeup_reader.recv_bytes()
+            else:
+                self._receive_from(connections[connection], connection)  # type: ignore[index]
+
+    def _receive_from(self, index: int, connection: MultiprocessingConnection) -> None:
+        try:
+            while connection.poll():
+                self.handle_message(index, connection.recv())
+        except (EOFError, OSError):
+            # The process exited; it is restarted with its triggers
+            pass
+
+    def handle_message(self, index: int, message: tuple) -> None:
+        """Apply a message sent by the process with the given index."""
+        kind = message[0]
+        if kind == "event":
+            _, trigger_id, event = message
+            details = self.triggers.get(trigger_id)
+            if details is not None:
+                details["events"] += 1
+            self.events.append((trigger_id, event))
+            self.main_wakeup.set()
+        elif kind == "failed":
+            _, trigger_id, exc, tb = message
+            if exc is not None and tb:
+                exc.__cause__ = _RemoteTraceback(tb)
+            details = self.triggers.get(trigger_id)
+            if details is not None:
+                details["cancelled"] = True
+            self.failed_triggers.append((trigger_id, exc))
+            self.main_wakeup.set()
+        elif kind == "finished":
+            _, trigger_id, cancelled = message
+            self._finish(index, trigger_id, cancelled)
+        elif kind == "costs":
+            for trigger_id, (cpu_time, blocks) in message[1].items():
+                details = self.triggers.get(trigger_id)
+                if details is not None and details["process"] == index and not details["moving"]:
+                    details["cpu_time"], details["blocks"] = cpu_time, blocks
+
+    def _finish(self, index: int, trigger_id: int, cancelled: bool) -> None:
+        details = self.triggers.get(trigger_id)
+        if details is None or details["process"] != index:
+            return
+        if details["moving"] and cancelled and not details["cancelled"]:
+            # The trigger was cancelled to be moved: start it again in the quarantine process
+            details.update(process=self.quarantine, moving=False, cpu_time=0.0, blocks=0)
+            self._send_create(trigger_id)
+        else:
+            del self.triggers[trigger_id]
+
+    def _quarantine_blocking_triggers(self) -> None:
+        if self.quarantine_after_blocks <= 0:
+            return
+        for trigger_id, details in self.triggers.items():
+            if (
+                details["process"] == self.quarantine
+                or details["moving"]
+                or details["cancelled"]
+                or details["blocks"] < self.quarantine_after_blocks
+            ):
+                continue
+            self.log.warning(
+                "Trigger %s blocked its event loop %d times, moving it to the quarantine process",
+                details["name"],
+                details["blocks"],
+            )
+            Stats.incr('triggers.quarantined')
+            details["moving"] = True
+            self._send(details["process"], ("cancel", trigger_id))
+
+    def _stop_processes(self) -> None:
+        for runner_process in self.processes.values():
+            try:
+                runner_process.connection.send(("stop",))
+            except OSError:
+                pass
+        for index, runner_process in self.processes.items():
+            runner_process.process.join(10)
+            if runner_process.process.is_alive():
+                self.log.warning("Terminating trigger runner process %s", self._process_name(index))
+                runner_process.process.terminate()
+                runner_process.process.join(5)
+            runner_process.connection.close()
+        self._wakeup_writer.close()
+        self._wakeup_reader.close()
+
+
+class TriggerNotificationListener(threading.Thread, LoggingMixin):
+    """
+    Listens to the notifications of new triggers sent on PostgreSQL by deferred tasks.
+
+    Each notification sets ``wakeup``, so the triggerer assigns itself the new
+    triggers right away instead of at its next poll. The listening connection is
+    opened again after errors; the triggerer keeps polling in the meantime.
+
+    :param wakeup: Set when new triggers are notified
+    """
+
+    # Should-we-stop flag
+    stop: bool = False
+
+    def __init__(self, wakeup: threading.Event):
+        super().__init__(name="TriggerNotificationListener", daemon=True)
+        self.wakeup = wakeup
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Whether new triggers are notified, on PostgreSQL through psycopg2."""
+        engine = settings.engine
+        return (
+            engine is not None
+            and Trigger.notifications_enabled(engine.dialect.name)
+            and engine.dialect.driver == "psycopg2"
+        )
+
+    def run(self) -> None:
+        while not self.stop:
+            try:
+                self.listen()
+            except Exception:
+                self.log.exception("Could not listen for new triggers, retrying in %.0f seconds", 5)
+                deadline = time.monotonic() + 5
+                while not self.stop and time.monotonic() < deadline:
+                    time.sleep(POLL_INTERVAL)
+
+    def listen(self) -> None:
+        """Listen for new triggers on a connection of its own until stopped."""
+        connection = settings.engine.raw_connection()
+        # The connection listens for as long as the triggerer runs, it is not returned to the pool
+        connection.detach()
+        try:
+            dbapi_connection = connection.connection
+            dbapi_connection.rollback()
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NEW_TRIGGER_CHANNEL}")
+            self.log.info("Listening for new triggers")
+            # Poll for the triggers created while the connection was not listening
+            self.wakeup.set()
+            while not self.stop:
+                if not select.select([dbapi_connection], [], [], POLL_INTERVAL)[0]:
+                    continue
+                dbapi_connection.poll()
+                if dbapi_connection.notifies:
+                    dbapi_connection.notifies.clear()
+                    self.wakeup.set()
+        finally:
+            connection.close()
@@ -0,0 +1,70 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add source_code_compressed column to DagCode
+
+Revision ID: 0e35cfe0eb37
+Revises: ee8d93fcc81e
+Create Date: 2022-10-18 09:12:41.381205
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0e35cfe0eb37'
+down_revision = 'ee8d93fcc81e'
+branch_labels = None
+depends_on = None
+airflow_version = '2.5.0'
+
+
+def upgrade():
+    """Apply add source_code_compressed column to DagCode"""
+    with op.batch_alter_table('dag_code') as batch_op:
+        batch_op.add_column(sa.Column('source_code_compressed', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    """Unapply add source_code_compressed column to DagCode"""
+    from airflow.serialization import blob
+
+    conn = op.get_bind()
+    dag_code = sa.table(
+        'dag_code',
+        sa.column('fileloc_hash', sa.BigInteger),
+        sa.column('source_code', sa.Text),
+        sa.column('source_code_compressed', sa.LargeBinary),
+    )
+    compressed = conn.execute(
+        sa.select([dag_code.c.fileloc_hash, dag_code.c.source_code_compressed]).where(
+            dag_code.c.source_code_compressed.isnot(None)
+        )
+    ).fetchall()
+    for fileloc_hash, source_code_compressed in compressed:
+        conn.execute(
+            dag_code.update()
+            .where(dag_code.c.fileloc_hash == fileloc_hash)
+            .values(source_code=blob.decode(source_code_compressed))
+        )
+
+    with op.batch_alter_table('dag_code') as batch_op:
+        batch_op.drop_column('source_code_compressed')
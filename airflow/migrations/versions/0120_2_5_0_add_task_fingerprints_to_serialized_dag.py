@@ -0,0 +1,60 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add task fingerprints and changed task ids to SerializedDagModel
+
+Revision ID: 7bcc7b5245fd
+Revises: 0e35cfe0eb37
+Create Date: 2022-10-18 11:26:03.518427
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+import sqlalchemy_jsonfield
+from alembic import op
+
+from airflow.settings import json
+
+# revision identifiers, used by Alembic.
+revision = '7bcc7b5245fd'
+down_revision = '0e35cfe0eb37'
+branch_labels = None
+depends_on = None
+airflow_version = '2.5.0'
+
+
+def upgrade():
+    """Apply add task fingerprints and changed task ids to SerializedDagModel"""
+    with op.batch_alter_table('serialized_dag') as batch_op:
+        batch_op.add_column(
+            sa.Column('fingerprints', sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
+        )
+        batch_op.add_column(sa.Column('previous_dag_hash', sa.String(32), nullable=True))
+        batch_op.add_column(
+            sa.Column('changed_task_ids', sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
+        )
+
+
+def downgrade():
+    """Unapply add task fingerprints and changed task ids to SerializedDagModel"""
+    with op.batch_alter_table('serialized_dag') as batch_op:
+        batch_op.drop_column('changed_task_ids')
+        batch_op.drop_column('previous_dag_hash')
+        batch_op.drop_column('fingerprints')
@@ -0,0 +1,66 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add dag_state_summary table
+
+Revision ID: b7d2c5f1e94a
+Revises: 7bcc7b5245fd
+Create Date: 2022-10-19 10:02:17.215433
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+import sqlalchemy_jsonfield
+from alembic import op
+
+from airflow.migrations.db_types import TIMESTAMP, StringID
+from airflow.settings import json
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2c5f1e94a'
+down_revision = '7bcc7b5245fd'
+branch_labels = None
+depends_on = None
+airflow_version = '2.5.0'
+
+
+def upgrade():
+    """Apply add dag_state_summary table"""
+    op.create_table(
+        'dag_state_summary',
+        sa.Column('dag_id', StringID(), nullable=False),
+        sa.Column('dag_run_states', sqlalchemy_jsonfield.JSONField(json=json), nullable=False),
+        sa.Column('running_task_states', sqlalchemy_jsonfield.JSONField(json=json), nullable=False),
+        sa.Column('last_run_task_states', sqlalchemy_jsonfield.JSONField(json=json), nullable=False),
+        sa.Column('last_run_state', sa.String(length=50), nullable=True),
+        sa.Column('last_run_execution_date', TIMESTAMP(), nullable=True),
+        sa.Column('last_run_start_date', TIMESTAMP(), nullable=True),
+        sa.Column('last_run_end_date', TIMESTAMP(), nullable=True),
+        sa.Column('last_run_data_interval_start', TIMESTAMP(), nullable=True),
+        sa.Column('last_run_data_interval_end', TIMESTAMP(), nullable=True),
+        sa.Column('updated_at', TIMESTAMP(), nullable=False),
+        sa.ForeignKeyConstraint(['dag_id'], ['dag.dag_id'], name='dss_dag_id_fkey', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('dag_id', name=op.f('dag_state_summary_pkey')),
+    )
+
+
+def downgrade():
+    """Unapply add dag_state_summary table"""
+    op.drop_table('dag_state_summary')
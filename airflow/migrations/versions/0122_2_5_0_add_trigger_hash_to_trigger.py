@@ -0,0 +1,51 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Add trigger_hash column to Trigger
+
+Revision ID: 3f6d1a0b8c27
+Revises: b7d2c5f1e94a
+Create Date: 2022-10-20 14:26:03.114862
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f6d1a0b8c27'
+down_revision = 'b7d2c5f1e94a'
+branch_labels = None
+depends_on = None
+airflow_version = '2.5.0'
+
+
+def upgrade():
+    """Apply add trigger_hash column to Trigger"""
+    with op.batch_alter_table('trigger') as batch_op:
+        batch_op.add_column(sa.Column('trigger_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('idx_trigger_hash', ['trigger_hash'], unique=False)
+
+
+def downgrade():
+    """Unapply add trigger_hash column to Trigger"""
+    with op.batch_alter_table('trigger') as batch_op:
+        batch_op.drop_index('idx_trigger_hash')
+        batch_op.drop_column('trigger_hash')
@@ -65,6 +65,7 @@ def import_all_models():
     import airflow.jobs.local_task_job
     import airflow.jobs.scheduler_job
     import airflow.jobs.triggerer_job
+    import airflow.models.dagstatesummary
     import airflow.models.dagwarning
     import airflow.models.dataset
     import airflow.models.serialized_dag
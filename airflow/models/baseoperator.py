@@ -39,6 +39,7 @@ from typing import (
     Collection,
     Iterable,
     List,
+    Mapping,
     Sequence,
     Type,
     TypeVar,
@@ -1389,6 +1390,16 @@ class BaseOperator(AbstractOperator, metaclass=BaseOperatorMeta):
         """
         context['ti'].xcom_push(key=key, value=value, execution_date=execution_date)
 
+    @staticmethod
+    def xcom_push_many(context: Any, values: Mapping[str, Any]) -> None:
+        """
+        Make several XComs available for tasks to pull, storing them at once.
+
+        :param context: Execution Context Dictionary
+        :param values: The values of the XComs, by key
+        """
+        context['ti'].xcom_push_many(values)
+
     @staticmethod
     def xcom_pull(
         context: Any,
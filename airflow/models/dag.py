@@ -95,7 +95,14 @@ from airflow.utils.file import correct_maybe_zipped
 from airflow.utils.helpers import at_most_one, exactly_one, validate_key
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.session import NEW_SESSION, provide_session
-from airflow.utils.sqlalchemy import Interval, UtcDateTime, skip_locked, tuple_in_condition, with_row_locks
+from airflow.utils.sqlalchemy import (
+    Interval,
+    UtcDateTime,
+    filter_in_chunks_and_limit,
+    skip_locked,
+    tuple_in_condition,
+    with_row_locks,
+)
 from airflow.utils.state import DagRunState, State, TaskInstanceState
 from airflow.utils.types import NOTSET, ArgNotSet, DagRunType, EdgeInfoType
 
@@ -3315,13 +3322,17 @@ class DagModel(Base):
                 continue
 
     @classmethod
-    def dags_needing_dagruns(cls, session: Session) -> tuple[Query, dict[str, tuple[datetime, datetime]]]:
+    def dags_needing_dagruns(
+        cls, session: Session, dag_ids: Collection[str] | None = None
+    ) -> tuple[Query, dict[str, tuple[datetime, datetime]]]:
         """
         Return (and lock) a list of Dag objects that are due to create a new DagRun.
 
         This will return a resultset of rows that is row-level-locked with a "SELECT ... FOR UPDATE" query,
         you should ensure that any scheduling decisions are made in a single transaction -- as soon as the
         transaction is committed it will be unlocked.
+
+        :param dag_ids: Only return these DAGs, if given
         """
         # these dag ids are triggered by datasets, and they are ready to go.
         dataset_triggered_dag_info = {
@@ -3356,7 +3367,6 @@ class DagModel(Base):
                     k: v for k, v in dataset_triggered_dag_info.items() if k not in exclusion_list
                 }
 
-        # We limit so that _one_ scheduler doesn't try to do all the creation of dag runs
         query = (
             session.query(cls)
             .filter(
@@ -3369,8 +3379,19 @@ class DagModel(Base):
                 ),
             )
             .order_by(cls.next_dagrun_create_after)
-            .limit(cls.NUM_DAGS_PER_DAGRUN_QUERY)
         )
+        # We limit so that _one_ scheduler doesn't try to do all the creation of dag runs
+        if dag_ids is None:
+            query = query.limit(cls.NUM_DAGS_PER_DAGRUN_QUERY)
+        else:
+            query = filter_in_chunks_and_limit(
+                query,
+                cls.dag_id,
+                dag_ids,
+                limit=cls.NUM_DAGS_PER_DAGRUN_QUERY,
+                sort_columns=[cls.next_dagrun_create_after],
+                sort_key=lambda row: (row.next_dagrun_create_after is None, row.next_dagrun_create_after),
+            )
 
         return (
             with_row_locks(query, of=cls, session=session, **skip_locked(session=session)),
@@ -45,6 +45,7 @@ from airflow.exceptions import (
     ParamValidationError,
     RemovedInAirflow3Warning,
 )
+from airflow.serialization.dag_cache import SharedDagCache
 from airflow.stats import Stats
 from airflow.utils import timezone
 from airflow.utils.dag_cycle_tester import check_cycle
@@ -98,6 +99,7 @@ class DagBag(LoggingMixin):
         read_dags_from_db: bool = False,
         store_serialized_dags: bool | None = None,
         load_op_links: bool = True,
+        shared_dag_cache_dir: str | None = None,
     ):
         # Avoid circular import
         from airflow.models.dag import DAG
@@ -127,6 +129,8 @@ class DagBag(LoggingMixin):
         self.dags: dict[str, DAG] = {}
         # the file's last modified timestamp when we last read it
         self.file_last_changed: dict[str, datetime] = {}
+        # the files of the modules from the DAGs folder imported for the first time by each file
+        self.file_local_modules: dict[str, list[str]] = {}
         self.import_errors: dict[str, str] = {}
         self.has_logged = False
         self.read_dags_from_db = read_dags_from_db
@@ -134,6 +138,10 @@ class DagBag(LoggingMixin):
         self.dags_last_fetched: dict[str, datetime] = {}
         # Only used by SchedulerJob to compare the dag_hash to identify change in DAGs
         self.dags_hash: dict[str, str] = {}
+        # Only used by read_dags_from_db=True, to share the deserialized DAGs with other processes
+        self.shared_dag_cache: SharedDagCache | None = None
+        if shared_dag_cache_dir:
+            self.shared_dag_cache = SharedDagCache(shared_dag_cache_dir)
 
         self.dagbag_import_error_tracebacks = conf.getboolean('core', 'dagbag_import_error_tracebacks')
         self.dagbag_import_error_traceback_depth = conf.getint('core', 'dagbag_import_error_traceback_depth')
@@ -254,17 +262,29 @@ class DagBag(LoggingMixin):
         """Add DAG to DagBag from DB"""
         from airflow.models.serialized_dag import SerializedDagModel
 
-        row = SerializedDagModel.get(dag_id, session)
-        if not row:
-            return None
+        dag = None
+        if self.shared_dag_cache:
+            # Only the hash is read, to skip loading the serialized DAG when it is cached
+            dag_hash = SerializedDagModel.get_latest_version_hash(dag_id, session=session)
+            if dag_hash:
+                dag = self.shared_dag_cache.get(dag_id, dag_hash)
+
+        if dag is None:
+            row = SerializedDagModel.get(dag_id, session)
+            if not row:
+                return None
+
+            row.load_op_links = self.load_op_links
+            dag = row.dag
+            dag_hash = row.dag_hash
+            if self.shared_dag_cache:
+                self.shared_dag_cache.set(dag.dag_id, dag_hash, dag)
 
-        row.load_op_links = self.load_op_links
-        dag = row.dag
         for subdag in dag.subdags:
             self.dags[subdag.dag_id] = subdag
         self.dags[dag.dag_id] = dag
         self.dags_last_fetched[dag.dag_id] = timezone.utcnow()
-        self.dags_hash[dag.dag_id] = row.dag_hash
+        self.dags_hash[dag.dag_id] = dag_hash
 
     def process_file(self, filepath, only_if_updated=True, safe_mode=True):
         """
@@ -332,8 +352,12 @@ class DagBag(LoggingMixin):
                 loader = importlib.machinery.SourceFileLoader(mod_name, filepath)
                 spec = importlib.util.spec_from_loader(mod_name, loader)
                 new_module = importlib.util.module_from_spec(spec)
+                module_names_before = set(sys.modules)
                 sys.modules[spec.name] = new_module
                 loader.exec_module(new_module)
+                self.file_local_modules[filepath] = self._find_new_local_modules(
+                    module_names_before, mod_name, filepath
+                )
                 return [new_module]
             except Exception as e:
                 DagContext.autoregistered_dags.clear()
@@ -365,6 +389,22 @@ class DagBag(LoggingMixin):
         with timeout(dagbag_import_timeout, error_message=timeout_msg):
             return parse(mod_name, filepath)
 
+    @staticmethod
+    def _find_new_local_modules(module_names_before: set[str], mod_name: str, filepath: str) -> list[str]:
+        """
+        Find the files of the modules imported since ``module_names_before`` was captured, which come
+        from the DAGs folder or from the directory of the DAG file.
+        """
+        local_dirs = tuple(
+            {os.path.join(os.path.realpath(d), '') for d in (settings.DAGS_FOLDER, os.path.dirname(filepath))}
+        )
+        module_paths = set()
+        for name in set(sys.modules) - module_names_before - {mod_name}:
+            module_path = getattr(sys.modules.get(name), '__file__', None)
+            if module_path and os.path.realpath(module_path).startswith(local_dirs):
+                module_paths.add(module_path)
+        return sorted(module_paths)
+
     def _load_modules_from_zip(self, filepath, safe_mode):
         from airflow.models.dag import DagContext
 
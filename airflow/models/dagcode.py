@@ -22,12 +22,14 @@ import struct
 from datetime import datetime
 from typing import Iterable
 
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, LargeBinary, String, Text
 from sqlalchemy.dialects.mysql import MEDIUMTEXT
 from sqlalchemy.sql.expression import literal
 
 from airflow.exceptions import AirflowException, DagCodeNotFound
 from airflow.models.base import Base
+from airflow.serialization import blob
+from airflow.settings import COMPRESS_DAG_CODE, SERIALIZED_DAG_COMPRESSION
 from airflow.utils import timezone
 from airflow.utils.file import correct_maybe_zipped, open_maybe_zipped
 from airflow.utils.session import provide_session
@@ -51,12 +53,29 @@ class DagCode(Base):
     # The max length of fileloc exceeds the limit of indexing.
     last_updated = Column(UtcDateTime, nullable=False)
     source_code = Column(Text().with_variant(MEDIUMTEXT(), 'mysql'), nullable=False)
+    # Set instead of source_code (left empty) when the code is compressed
+    source_code_compressed = Column(LargeBinary, nullable=True)
 
     def __init__(self, full_filepath: str, source_code: str | None = None):
         self.fileloc = full_filepath
         self.fileloc_hash = DagCode.dag_fileloc_hash(self.fileloc)
         self.last_updated = timezone.utcnow()
-        self.source_code = source_code or DagCode.code(self.fileloc)
+        self.set_source_code(source_code or DagCode.code(self.fileloc))
+
+    def set_source_code(self, source_code: str) -> None:
+        """Store the source code, compressed if ``[core] compress_dag_code`` is True."""
+        if COMPRESS_DAG_CODE:
+            self.source_code = ""
+            self.source_code_compressed = blob.encode(source_code, "text", SERIALIZED_DAG_COMPRESSION)
+        else:
+            self.source_code = source_code
+            self.source_code_compressed = None
+
+    def get_source_code(self) -> str:
+        """Return the source code, whether it is stored compressed or not."""
+        if self.source_code_compressed is not None:
+            return blob.decode(self.source_code_compressed)
+        return self.source_code
 
     @provide_session
     def sync_to_db(self, session=None):
@@ -120,7 +139,7 @@ class DagCode(Base):
             if file_mod_time > current_version.last_updated:
                 orm_dag_code = existing_orm_dag_codes_map[fileloc]
                 orm_dag_code.last_updated = file_mod_time
-                orm_dag_code.source_code = cls._get_code_from_file(orm_dag_code.fileloc)
+                orm_dag_code.set_source_code(cls._get_code_from_file(orm_dag_code.fileloc))
                 session.merge(orm_dag_code)
 
     @classmethod
@@ -180,7 +199,7 @@ class DagCode(Base):
         if not dag_code:
             raise DagCodeNotFound()
         else:
-            code = dag_code.source_code
+            code = dag_code.get_source_code()
         return code
 
     @staticmethod
@@ -26,6 +26,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Collection,
     Iterable,
     Iterator,
     NamedTuple,
@@ -64,14 +65,21 @@ from airflow.models.mappedoperator import MappedOperator
 from airflow.models.taskinstance import TaskInstance as TI
 from airflow.models.tasklog import LogTemplate
 from airflow.stats import Stats
-from airflow.ti_deps.dep_context import DepContext
+from airflow.ti_deps.dep_context import DepContext, UpstreamStateSummary
 from airflow.ti_deps.dependencies_states import SCHEDULEABLE_STATES
 from airflow.typing_compat import Literal
 from airflow.utils import timezone
 from airflow.utils.helpers import is_container
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.session import NEW_SESSION, provide_session
-from airflow.utils.sqlalchemy import UtcDateTime, nulls_first, skip_locked, tuple_in_condition, with_row_locks
+from airflow.utils.sqlalchemy import (
+    UtcDateTime,
+    filter_in_chunks_and_limit,
+    nulls_first,
+    skip_locked,
+    tuple_in_condition,
+    with_row_locks,
+)
 from airflow.utils.state import DagRunState, State, TaskInstanceState
 from airflow.utils.types import NOTSET, ArgNotSet, DagRunType
 
@@ -281,6 +289,7 @@ class DagRun(Base, LoggingMixin):
         state: DagRunState,
         session: Session,
         max_number: int | None = None,
+        dag_ids: Collection[str] | None = None,
     ):
         """
         Return the next DagRuns that the scheduler should attempt to schedule.
@@ -289,6 +298,7 @@ class DagRun(Base, LoggingMixin):
         query, you should ensure that any scheduling decisions are made in a single transaction -- as soon as
         the transaction is committed it will be unlocked.
 
+        :param dag_ids: Only return DagRuns of these DAGs, if given
         :rtype: list[airflow.models.DagRun]
         """
         from airflow.models.dag import DagModel
@@ -323,9 +333,22 @@ class DagRun(Base, LoggingMixin):
         if not settings.ALLOW_FUTURE_EXEC_DATES:
             query = query.filter(DagRun.execution_date <= func.now())
 
-        return with_row_locks(
-            query.limit(max_number), of=cls, session=session, **skip_locked(session=session)
-        )
+        if dag_ids is None:
+            query = query.limit(max_number)
+        else:
+            query = filter_in_chunks_and_limit(
+                query,
+                cls.dag_id,
+                dag_ids,
+                limit=max_number,
+                sort_columns=[cls.last_scheduling_decision, cls.execution_date],
+                sort_key=lambda row: (
+                    row.last_scheduling_decision is not None,
+                    row.last_scheduling_decision,
+                    row.execution_date,
+                ),
+            )
+        return with_row_locks(query, of=cls, session=session, **skip_locked(session=session))
 
     @classmethod
     @provide_session
@@ -455,6 +478,31 @@ class DagRun(Base, LoggingMixin):
             tis = tis.filter(TI.task_id.in_(self.dag.task_ids))
         return tis.all()
 
+    @staticmethod
+    @provide_session
+    def get_task_instances_of_dag_runs(
+        dag_runs: Iterable[DagRun],
+        session: Session = NEW_SESSION,
+    ) -> dict[tuple[str, str], list[TI]]:
+        """
+        Returns the task instances of several dag runs, fetched with a single query.
+
+        :param dag_runs: The dag runs to fetch the task instances of
+        :param session: Sqlalchemy ORM Session
+        :return: Task instances keyed by ``(dag_id, run_id)``, with an entry for every dag run
+        """
+        tis_by_run: dict[tuple[str, str], list[TI]] = {(dr.dag_id, dr.run_id): [] for dr in dag_runs}
+        if not tis_by_run:
+            return tis_by_run
+        tis = (
+            session.query(TI)
+            .options(joinedload(TI.dag_run))
+            .filter(tuple_in_condition((TI.dag_id, TI.run_id), tis_by_run))
+        )
+        for ti in tis:
+            tis_by_run[ti.dag_id, ti.run_id].append(ti)
+        return tis_by_run
+
     @provide_session
     def get_task_instance(
         self,
@@ -515,7 +563,10 @@ class DagRun(Base, LoggingMixin):
 
     @provide_session
     def update_state(
-        self, session: Session = NEW_SESSION, execute_callbacks: bool = True
+        self,
+        session: Session = NEW_SESSION,
+        execute_callbacks: bool = True,
+        task_instances: list[TI] | None = None,
     ) -> tuple[list[TI], DagCallbackRequest | None]:
         """
         Determines the overall state of the DagRun based on the state
@@ -524,6 +575,8 @@ class DagRun(Base, LoggingMixin):
         :param session: Sqlalchemy ORM Session
         :param execute_callbacks: Should dag callbacks (success/failure, SLA etc) be invoked
             directly (default: true) or recorded as a pending request in the ``callback`` property
+        :param task_instances: All the task instances of this dag run, if they were already fetched
+            (e.g. by :meth:`get_task_instances_of_dag_runs`). They are fetched from the database otherwise.
         :return: Tuple containing tis that can be scheduled in the current loop & `callback` that
             needs to be executed
         """
@@ -553,7 +606,7 @@ class DagRun(Base, LoggingMixin):
         self.last_scheduling_decision = start_dttm
         with Stats.timer(f"dagrun.dependency-check.{self.dag_id}"):
             dag = self.get_dag()
-            info = self.task_instance_scheduling_decisions(session)
+            info = self.task_instance_scheduling_decisions(session, task_instances=task_instances)
 
             tis = info.tis
             schedulable_tis = info.schedulable_tis
@@ -670,8 +723,17 @@ class DagRun(Base, LoggingMixin):
         return schedulable_tis, callback
 
     @provide_session
-    def task_instance_scheduling_decisions(self, session: Session = NEW_SESSION) -> TISchedulingDecision:
-        tis = self.get_task_instances(session=session, state=State.task_states)
+    def task_instance_scheduling_decisions(
+        self,
+        session: Session = NEW_SESSION,
+        task_instances: list[TI] | None = None,
+    ) -> TISchedulingDecision:
+        if task_instances is None:
+            tis = self.get_task_instances(session=session, state=State.task_states)
+        elif self.dag and self.dag.partial:
+            tis = [ti for ti in task_instances if ti.task_id in self.dag.task_dict]
+        else:
+            tis = task_instances
         self.log.debug("number of tis tasks for %s: %s task(s)", self, len(tis))
 
         def _filter_tis_and_exclude_removed(dag: DAG, tis: list[TI]) -> Iterable[TI]:
@@ -698,6 +760,7 @@ class DagRun(Base, LoggingMixin):
                 schedulable_tis,
                 finished_tis,
                 session=session,
+                upstream_states=UpstreamStateSummary(finished_tis, tis),
             )
 
             # During expansion we may change some tis into non-schedulable
@@ -723,6 +786,7 @@ class DagRun(Base, LoggingMixin):
         schedulable_tis: list[TI],
         finished_tis: list[TI],
         session: Session,
+        upstream_states: UpstreamStateSummary | None = None,
     ) -> tuple[list[TI], bool, bool]:
         old_states = {}
         ready_tis: list[TI] = []
@@ -738,6 +802,7 @@ class DagRun(Base, LoggingMixin):
             flag_upstream_failed=True,
             ignore_unmapped_tasks=True,  # Ignore this Dep, as we will expand it if we can.
             finished_tis=finished_tis,
+            upstream_states=upstream_states,
         )
 
         # Check dependencies.
@@ -758,11 +823,15 @@ class DagRun(Base, LoggingMixin):
                     assert expanded_tis[0] is schedulable
                     additional_tis.extend(expanded_tis[1:])
                 expansion_happened = True
+                if upstream_states is not None:
+                    upstream_states.forget_expanded_tis()
             if schedulable.state in SCHEDULEABLE_STATES:
                 task = schedulable.task
                 if isinstance(schedulable.task, MappedOperator):
                     # Ensure the task indexes are complete
                     created = self._revise_mapped_task_indexes(task, session=session)
+                    if created and upstream_states is not None:
+                        upstream_states.forget_expanded_tis()
                     ready_tis.extend(created)
                 ready_tis.append(schedulable)
 
@@ -858,6 +927,7 @@ class DagRun(Base, LoggingMixin):
         self,
         *,
         session: Session = NEW_SESSION,
+        task_ids: Collection[str] | None = None,
     ):
         """
         Verifies the DagRun by checking for removed tasks or tasks that are not in the
@@ -865,6 +935,9 @@ class DagRun(Base, LoggingMixin):
 
         :missing_indexes: A dictionary of task vs indexes that are missing.
         :param session: Sqlalchemy ORM Session
+        :param task_ids: If given, only the task instances of these tasks are verified. This
+            is used when only these tasks were added, removed or modified since the last time
+            the DagRun was verified.
         """
         from airflow.settings import task_instance_mutation_hook
 
@@ -873,14 +946,13 @@ class DagRun(Base, LoggingMixin):
         hook_is_noop: Literal[True, False] = getattr(task_instance_mutation_hook, 'is_noop', False)
 
         dag = self.get_dag()
-        task_ids: set[str] = set()
 
-        task_ids = self._check_for_removed_or_restored_tasks(
-            dag, task_instance_mutation_hook, session=session
+        existing_task_ids = self._check_for_removed_or_restored_tasks(
+            dag, task_instance_mutation_hook, session=session, task_ids=task_ids
         )
 
         def task_filter(task: Operator) -> bool:
-            return task.task_id not in task_ids and (
+            return task.task_id not in existing_task_ids and (
                 self.is_backfill
                 or task.start_date <= self.execution_date
                 and (task.end_date is None or self.execution_date <= task.end_date)
@@ -892,12 +964,12 @@ class DagRun(Base, LoggingMixin):
         task_creator = self._get_task_creator(created_counts, task_instance_mutation_hook, hook_is_noop)
 
         # Create the missing tasks, including mapped tasks
-        tasks = self._create_tasks(dag, task_creator, task_filter, session=session)
+        tasks = self._create_tasks(dag, task_creator, task_filter, session=session, task_ids=task_ids)
 
         self._create_task_instances(dag.dag_id, tasks, created_counts, hook_is_noop, session=session)
 
     def _check_for_removed_or_restored_tasks(
-        self, dag: DAG, ti_mutation_hook, *, session: Session
+        self, dag: DAG, ti_mutation_hook, *, session: Session, task_ids: Collection[str] | None = None
     ) -> set[str]:
         """
         Check for removed tasks/restored/missing tasks.
@@ -905,11 +977,22 @@ class DagRun(Base, LoggingMixin):
         :param dag: DAG object corresponding to the dagrun
         :param ti_mutation_hook: task_instance_mutation_hook function
         :param session: Sqlalchemy ORM Session
+        :param task_ids: If given, only check the task instances of these tasks
 
         :return: Task IDs in the DAG run
 
         """
-        tis = self.get_task_instances(session=session)
+        if task_ids is None:
+            tis = self.get_task_instances(session=session)
+        elif task_ids:
+            tis = (
+                session.query(TI)
+                .options(joinedload(TI.dag_run))
+                .filter(TI.dag_id == self.dag_id, TI.run_id == self.run_id, TI.task_id.in_(task_ids))
+                .all()
+            )
+        else:
+            tis = []
 
         # check for removed or restored tasks
         task_ids = set()
@@ -1036,6 +1119,7 @@ class DagRun(Base, LoggingMixin):
         task_filter: Callable[[Operator], bool],
         *,
         session: Session,
+        task_ids: Collection[str] | None = None,
     ) -> CreatedTasksType:
         """
         Create missing tasks -- and expand any MappedOperator that _only_ have literals as input
@@ -1044,6 +1128,7 @@ class DagRun(Base, LoggingMixin):
         :param task_creator: a function that creates tasks
         :param task_filter: a function that filters tasks to create
         :param session: the session to use
+        :param task_ids: If given, only consider creating these tasks
         """
 
         def expand_mapped_literals(
@@ -1061,7 +1146,11 @@ class DagRun(Base, LoggingMixin):
                 return (task, sequence)
             return (task, range(count))
 
-        tasks_and_map_idxs = map(expand_mapped_literals, filter(task_filter, dag.task_dict.values()))
+        if task_ids is None:
+            candidates: Iterable[Operator] = dag.task_dict.values()
+        else:
+            candidates = [dag.task_dict[task_id] for task_id in sorted(task_ids) if task_id in dag.task_dict]
+        tasks_and_map_idxs = map(expand_mapped_literals, filter(task_filter, candidates))
 
         tasks: CreatedTasksType = itertools.chain.from_iterable(  # type: ignore
             itertools.starmap(task_creator, tasks_and_map_idxs)  # type: ignore
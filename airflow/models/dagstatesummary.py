@@ -0,0 +1,209 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Collection
+
+import sqlalchemy_jsonfield
+from sqlalchemy import Column, ForeignKey, String, and_, func
+from sqlalchemy.orm import Session
+
+from airflow.configuration import conf
+from airflow.models.base import Base, StringID
+from airflow.models.dagrun import DagRun
+from airflow.models.taskinstance import TaskInstance
+from airflow.settings import json
+from airflow.utils import timezone
+from airflow.utils.helpers import chunks
+from airflow.utils.session import NEW_SESSION, provide_session
+from airflow.utils.sqlalchemy import UtcDateTime
+from airflow.utils.state import DagRunState
+
+# The number of DAGs whose summaries are computed with each set of queries
+REFRESH_CHUNK_SIZE = 500
+
+
+class DagStateSummary(Base):
+    """
+    A table summarizing the states of the runs and task instances of each DAG.
+
+    The rows are maintained by the scheduler when ``[scheduler] dag_state_summary_update_interval``
+    is set, so that the home page of the webserver reads one row per DAG instead of aggregating
+    the dag_run and task_instance tables on every load. The scheduler refreshes the summaries of
+    the DAGs whose runs it examined, and periodically reconciles the summaries of all the DAGs to
+    catch the changes made by anything else.
+
+    The state counts are stored as lists of ``[state, count]`` pairs, as task instances
+    without a state are counted too.
+    """
+
+    __tablename__ = "dag_state_summary"
+
+    dag_id = Column(
+        StringID(),
+        ForeignKey('dag.dag_id', name='dss_dag_id_fkey', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    # The number of runs of the DAG in each state
+    dag_run_states = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
+    # The number of task instances in each state, in the running runs of the DAG
+    running_task_states = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
+    # The number of task instances in each state, in the latest run of the DAG which is not running
+    last_run_task_states = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=False)
+    # The latest run of the DAG, by logical date
+    last_run_state = Column(String(50))
+    last_run_execution_date = Column(UtcDateTime)
+    last_run_start_date = Column(UtcDateTime)
+    last_run_end_date = Column(UtcDateTime)
+    last_run_data_interval_start = Column(UtcDateTime)
+    last_run_data_interval_end = Column(UtcDateTime)
+    updated_at = Column(UtcDateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DagStateSummary: {self.dag_id} updated at {self.updated_at}>"
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Whether the summaries are maintained by the scheduler and read by the webserver"""
+        return conf.getfloat('scheduler', 'dag_state_summary_update_interval', fallback=0) > 0
+
+    @classmethod
+    @provide_session
+    def refresh(cls, dag_ids: Collection[str], session: Session = NEW_SESSION) -> None:
+        """
+        Recompute the summaries of the given DAGs.
+
+        Summaries are only kept for active DAGs: those of the given DAGs which are not active
+        anymore are deleted.
+
+        :param dag_ids: The DAGs whose summaries are refreshed
+        :param session: ORM Session
+        """
+        from airflow.models.dag import DagModel
+
+        for chunk in chunks(sorted(dag_ids), REFRESH_CHUNK_SIZE):
+            active_dag_ids = {
+                dag_id
+                for dag_id, in session.query(DagModel.dag_id).filter(
+                    DagModel.dag_id.in_(chunk), DagModel.is_active
+                )
+            }
+            inactive_dag_ids = set(chunk) - active_dag_ids
+            if inactive_dag_ids:
+                session.query(cls).filter(cls.dag_id.in_(inactive_dag_ids)).delete(synchronize_session=False)
+            if not active_dag_ids:
+                continue
+
+            summaries = {
+                summary.dag_id: summary
+                for summary in session.query(cls).filter(cls.dag_id.in_(active_dag_ids))
+            }
+            dag_run_states = cls._count_dag_run_states(active_dag_ids, session)
+            running_task_states = cls._count_running_task_states(active_dag_ids, session)
+            last_run_task_states = cls._count_last_run_task_states(active_dag_ids, session)
+            last_runs = cls._get_last_runs(active_dag_ids, session)
+
+            now = timezone.utcnow()
+            for dag_id in active_dag_ids:
+                summary = summaries.get(dag_id)
+                if summary is None:
+                    summary = cls(dag_id=dag_id)
+                    session.add(summary)
+                summary.dag_run_states = dag_run_states.get(dag_id, [])
+                summary.running_task_states = running_task_states.get(dag_id, [])
+                summary.last_run_task_states = last_run_task_states.get(dag_id, [])
+                last_run = last_runs.get(dag_id)
+                summary.last_run_state = last_run and last_run.state
+                summary.last_run_execution_date = last_run and last_run.execution_date
+                summary.last_run_start_date = last_run and last_run.start_date
+                summary.last_run_end_date = last_run and last_run.end_date
+                summary.last_run_data_interval_start = last_run and last_run.data_interval_start
+                summary.last_run_data_interval_end = last_run and last_run.data_interval_end
+                summary.updated_at = now
+        session.flush()
+
+    @staticmethod
+    def _group_counts(rows) -> dict[str, list[list[Any]]]:
+        counts: dict[str, list[list[Any]]] = defaultdict(list)
+        for dag_id, state, count in rows:
+            counts[dag_id].append([state, count])
+        return counts
+
+    @classmethod
+    def _count_dag_run_states(cls, dag_ids: Collection[str], session: Session):
+        return cls._group_counts(
+            session.query(DagRun.dag_id, DagRun.state, func.count())
+            .filter(DagRun.dag_id.in_(dag_ids))
+            .group_by(DagRun.dag_id, DagRun.state)
+        )
+
+    @classmethod
+    def _count_running_task_states(cls, dag_ids: Collection[str], session: Session):
+        return cls._group_counts(
+            session.query(TaskInstance.dag_id, TaskInstance.state, func.count())
+            .join(TaskInstance.dag_run)
+            .filter(DagRun.dag_id.in_(dag_ids), DagRun.state == DagRunState.RUNNING)
+            .group_by(TaskInstance.dag_id, TaskInstance.state)
+        )
+
+    @classmethod
+    def _count_last_run_task_states(cls, dag_ids: Collection[str], session: Session):
+        last_dag_run = (
+            session.query(DagRun.dag_id, func.max(DagRun.execution_date).label('execution_date'))
+            .filter(DagRun.dag_id.in_(dag_ids), DagRun.state != DagRunState.RUNNING)
+            .group_by(DagRun.dag_id)
+            .subquery('last_dag_run')
+        )
+        return cls._group_counts(
+            session.query(TaskInstance.dag_id, TaskInstance.state, func.count())
+            .join(TaskInstance.dag_run)
+            .join(
+                last_dag_run,
+                and_(
+                    last_dag_run.c.dag_id == DagRun.dag_id,
+                    last_dag_run.c.execution_date == DagRun.execution_date,
+                ),
+            )
+            .group_by(TaskInstance.dag_id, TaskInstance.state)
+        )
+
+    @staticmethod
+    def _get_last_runs(dag_ids: Collection[str], session: Session):
+        last_runs = (
+            session.query(DagRun.dag_id, func.max(DagRun.execution_date).label('max_execution_date'))
+            .filter(DagRun.dag_id.in_(dag_ids))
+            .group_by(DagRun.dag_id)
+            .subquery('last_runs')
+        )
+        query = session.query(
+            DagRun.dag_id,
+            DagRun.state,
+            DagRun.execution_date,
+            DagRun.start_date,
+            DagRun.end_date,
+            DagRun.data_interval_start,
+            DagRun.data_interval_end,
+        ).join(
+            last_runs,
+            and_(
+                last_runs.c.dag_id == DagRun.dag_id,
+                last_runs.c.max_execution_date == DagRun.execution_date,
+            ),
+        )
+        return {row.dag_id: row for row in query}
@@ -20,9 +20,8 @@ from __future__ import annotations
 
 import hashlib
 import logging
-import zlib
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterable
 
 import sqlalchemy_jsonfield
 from sqlalchemy import BigInteger, Column, Index, LargeBinary, String, and_, or_
@@ -33,8 +32,16 @@ from airflow.models.base import ID_LEN, Base
 from airflow.models.dag import DAG, DagModel
 from airflow.models.dagcode import DagCode
 from airflow.models.dagrun import DagRun
+from airflow.serialization import blob
 from airflow.serialization.serialized_objects import DagDependency, SerializedDAG
-from airflow.settings import COMPRESS_SERIALIZED_DAGS, MIN_SERIALIZED_DAG_UPDATE_INTERVAL, json
+from airflow.settings import (
+    COMPRESS_SERIALIZED_DAGS,
+    LAZY_LOAD_SERIALIZED_TASKS,
+    MIN_SERIALIZED_DAG_UPDATE_INTERVAL,
+    SERIALIZED_DAG_COMPRESSION,
+    SERIALIZED_DAG_ENCODING,
+    json,
+)
 from airflow.utils import timezone
 from airflow.utils.session import provide_session
 from airflow.utils.sqlalchemy import UtcDateTime
@@ -56,6 +63,8 @@ class SerializedDagModel(Base):
       to use a smaller interval such as 60
     * ``[core] compress_serialized_dags``:
       whether compressing the dag data to the Database.
+    * ``[core] serialized_dag_encoding`` and ``[core] serialized_dag_compression``:
+      the encoding and compression of the dag data stored in binary form.
 
     It is used by webserver to load dags
     because reading from database is lightweight compared to importing from files,
@@ -73,6 +82,12 @@ class SerializedDagModel(Base):
     last_updated = Column(UtcDateTime, nullable=False)
     dag_hash = Column(String(32), nullable=False)
     processor_subdir = Column(String(2000), nullable=True)
+    # Hashes of the DAG-level fields ("dag") and of each task ("tasks", keyed by task id)
+    fingerprints = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
+    # The hash of the version this one replaced, and the ids of the tasks added, removed or
+    # modified since then; None if unknown, or if more than the tasks changed
+    previous_dag_hash = Column(String(32), nullable=True)
+    changed_task_ids = Column(sqlalchemy_jsonfield.JSONField(json=json), nullable=True)
 
     __table_args__ = (Index('idx_fileloc_hash', fileloc_hash, unique=False),)
 
@@ -104,10 +119,18 @@ class SerializedDagModel(Base):
         dag_data_json = json.dumps(dag_data, sort_keys=True).encode("utf-8")
 
         self.dag_hash = hashlib.md5(dag_data_json).hexdigest()
+        self.fingerprints = self._get_fingerprints(dag_data["dag"])
+        self.previous_dag_hash = None
+        self.changed_task_ids = None
 
-        if COMPRESS_SERIALIZED_DAGS:
+        if COMPRESS_SERIALIZED_DAGS or SERIALIZED_DAG_ENCODING != "json":
             self._data = None
-            self._data_compressed = zlib.compress(dag_data_json)
+            if SERIALIZED_DAG_ENCODING == "json":
+                self._data_compressed = blob.compress(dag_data_json, "json", SERIALIZED_DAG_COMPRESSION)
+            else:
+                self._data_compressed = blob.encode(
+                    dag_data, SERIALIZED_DAG_ENCODING, SERIALIZED_DAG_COMPRESSION
+                )
         else:
             self._data = dag_data
             self._data_compressed = None
@@ -119,6 +142,35 @@ class SerializedDagModel(Base):
     def __repr__(self):
         return f"<SerializedDag: {self.dag_id}>"
 
+    # Fields which only depend on the tasks, or do not affect the task instances of a DAG run.
+    _FINGERPRINT_EXCLUDED_FIELDS = {"tasks", "_task_group", "edge_info", "dag_dependencies"}
+
+    @classmethod
+    def _get_fingerprints(cls, serialized_dag: dict[str, Any]) -> dict[str, Any]:
+        def fingerprint(data: Any) -> str:
+            return hashlib.md5(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+        return {
+            "dag": fingerprint(
+                {k: v for k, v in serialized_dag.items() if k not in cls._FINGERPRINT_EXCLUDED_FIELDS}
+            ),
+            "tasks": {task["task_id"]: fingerprint(task) for task in serialized_dag["tasks"]},
+        }
+
+    def _record_changes(self, previous_dag_hash: str, previous_fingerprints: dict[str, Any] | None) -> None:
+        """Record which tasks changed since the version with the given hash and fingerprints."""
+        self.previous_dag_hash = previous_dag_hash
+        if not previous_fingerprints or previous_fingerprints["dag"] != self.fingerprints["dag"]:
+            self.changed_task_ids = None
+            return
+        previous_tasks = previous_fingerprints["tasks"]
+        tasks = self.fingerprints["tasks"]
+        self.changed_task_ids = sorted(
+            task_id
+            for task_id in previous_tasks.keys() | tasks.keys()
+            if previous_tasks.get(task_id) != tasks.get(task_id)
+        )
+
     @classmethod
     @provide_session
     def write_dag(
@@ -161,7 +213,9 @@ class SerializedDagModel(Base):
         log.debug("Checking if DAG (%s) changed", dag.dag_id)
         new_serialized_dag = cls(dag, processor_subdir)
         serialized_dag_db = (
-            session.query(cls.dag_hash, cls.processor_subdir).filter(cls.dag_id == dag.dag_id).first()
+            session.query(cls.dag_hash, cls.processor_subdir, cls.fingerprints)
+            .filter(cls.dag_id == dag.dag_id)
+            .first()
         )
 
         if (
@@ -172,6 +226,9 @@ class SerializedDagModel(Base):
             log.debug("Serialized DAG (%s) is unchanged. Skipping writing to DB", dag.dag_id)
             return False
 
+        if serialized_dag_db is not None:
+            new_serialized_dag._record_changes(serialized_dag_db.dag_hash, serialized_dag_db.fingerprints)
+
         log.debug("Writing Serialized DAG: %s to the DB", dag.dag_id)
         session.merge(new_serialized_dag)
         log.debug("DAG: %s written to the DB", dag.dag_id)
@@ -208,7 +265,7 @@ class SerializedDagModel(Base):
         # use __data_cache to avoid decompress and loads
         if not hasattr(self, "__data_cache") or self.__data_cache is None:
             if self._data_compressed:
-                self.__data_cache = json.loads(zlib.decompress(self._data_compressed))
+                self.__data_cache = blob.decode(self._data_compressed)
             else:
                 self.__data_cache = self._data
 
@@ -220,7 +277,7 @@ class SerializedDagModel(Base):
         SerializedDAG._load_operator_extra_links = self.load_op_links
 
         if isinstance(self.data, dict):
-            dag = SerializedDAG.from_dict(self.data)  # type: Any
+            dag = SerializedDAG.from_dict(self.data, lazy=LAZY_LOAD_SERIALIZED_TASKS)  # type: Any
         else:
             dag = SerializedDAG.from_json(self.data)
         return dag
@@ -357,6 +414,54 @@ class SerializedDagModel(Base):
         """
         return session.query(cls.dag_hash).filter(cls.dag_id == dag_id).scalar()
 
+    @classmethod
+    @provide_session
+    def get_latest_version_hashes(cls, dag_ids: Iterable[str], session: Session = None) -> dict[str, str]:
+        """
+        Get the latest DAG versions for the given DAG IDs.
+
+        :param dag_ids: DAG IDs
+        :param session: ORM Session
+        :return: DAG Hashes keyed by DAG ID. DAGs which are not found are omitted.
+        """
+        dag_ids = set(dag_ids)
+        if not dag_ids:
+            return {}
+        query = session.query(cls.dag_id, cls.dag_hash).filter(cls.dag_id.in_(dag_ids))
+        return {dag_id: dag_hash for dag_id, dag_hash in query}
+
+    @classmethod
+    @provide_session
+    def get_changed_task_ids(
+        cls, dag_id: str, from_dag_hash: str | None, to_dag_hash: str, session: Session = None
+    ) -> set[str] | None:
+        """
+        Get the ids of the tasks added, removed or modified between two versions of a DAG.
+
+        Only changes between a version and the one which directly replaced it are recorded.
+
+        :param dag_id: DAG ID
+        :param from_dag_hash: The hash of the older version of the DAG
+        :param to_dag_hash: The hash of the newer version of the DAG
+        :param session: ORM Session
+        :return: The task ids, or None if they are not known or if more than the tasks changed
+        """
+        if from_dag_hash is None:
+            return None
+        row = (
+            session.query(cls.dag_hash, cls.previous_dag_hash, cls.changed_task_ids)
+            .filter(cls.dag_id == dag_id)
+            .one_or_none()
+        )
+        if (
+            row is None
+            or row.dag_hash != to_dag_hash
+            or row.previous_dag_hash != from_dag_hash
+            or row.changed_task_ids is None
+        ):
+            return None
+        return set(row.changed_task_ids)
+
     @classmethod
     @provide_session
     def get_dag_dependencies(cls, session: Session = None) -> dict[str, list[DagDependency]]:
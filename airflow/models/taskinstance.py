@@ -38,6 +38,7 @@ from typing import (
     ContextManager,
     Generator,
     Iterable,
+    Mapping,
     NamedTuple,
     Tuple,
 )
@@ -101,7 +102,7 @@ from airflow.models.param import ParamsDict
 from airflow.models.taskfail import TaskFail
 from airflow.models.taskmap import TaskMap
 from airflow.models.taskreschedule import TaskReschedule
-from airflow.models.xcom import XCOM_RETURN_KEY, XCom
+from airflow.models.xcom import XCOM_FETCH_BATCH_SIZE, XCOM_RETURN_KEY, XCom
 from airflow.plugins_manager import integrate_macros_plugins
 from airflow.sentry import Sentry
 from airflow.stats import Stats
@@ -307,8 +308,9 @@ class _LazyXComAccessIterator(collections.abc.Iterator):
 
     def __next__(self):
         if not self._it:
-            self._it = iter(self._cm.__enter__())
-        return XCom.deserialize_value(next(self._it))
+            # Stream the rows in batches, deserializing them as they are fetched
+            self._it = iter(XCom.deserialize_values(self._cm.__enter__().yield_per(XCOM_FETCH_BATCH_SIZE)))
+        return next(self._it)
 
 
 @attr.define
@@ -1675,10 +1677,10 @@ class TaskInstance(Base, LoggingMixin):
         """
         from airflow.models.trigger import Trigger
 
-        # First, make the trigger entry
-        trigger_row = Trigger.from_object(defer.trigger)
-        session.add(trigger_row)
-        session.flush()
+        # First, make the trigger entry, or share the entry of an identical trigger
+        trigger_row = Trigger.get_or_create(defer.trigger, session=session)
+        # Start the trigger as soon as the deferral is committed
+        Trigger.notify_new_triggers(session=session)
 
         # Then, update ourselves so it matches the deferral request
         # Keep an eye on the logic in `check_and_change_state_before_execution()`
@@ -2380,6 +2382,23 @@ class TaskInstance(Base, LoggingMixin):
             session=session,
         )
 
+    @provide_session
+    def xcom_push_many(self, values: Mapping[str, Any], session: Session = NEW_SESSION) -> None:
+        """
+        Make several XComs available for tasks to pull, storing them at once.
+
+        :param values: The values to store, by key. What types are possible depends
+            on whether ``enable_xcom_pickling`` is true or not, as with :meth:`xcom_push`.
+        """
+        XCom.set_many(
+            values,
+            dag_id=self.dag_id,
+            task_id=self.task_id,
+            run_id=self.run_id,
+            map_index=self.map_index,
+            session=session,
+        )
+
     @provide_session
     def xcom_pull(
         self,
@@ -2453,10 +2472,12 @@ class TaskInstance(Base, LoggingMixin):
 
         # At this point either task_ids or map_indexes is explicitly multi-value.
 
-        results = (
-            (r.task_id, r.map_index, XCom.deserialize_value(r))
-            for r in query.with_entities(XCom.task_id, XCom.map_index, XCom.value)
+        rows = (
+            query.with_entities(XCom.task_id, XCom.map_index, XCom.value)
+            .yield_per(XCOM_FETCH_BATCH_SIZE)
+            .all()
         )
+        results = ((r.task_id, r.map_index, value) for r, value in zip(rows, XCom.deserialize_values(rows)))
 
         if task_ids is None:
             task_id_pos: dict[str, int] = defaultdict(int)
@@ -17,21 +17,27 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
+import json
 from traceback import format_exception
-from typing import Any, Iterable
+from typing import Any, Collection, Iterable
 
-from sqlalchemy import Column, Integer, String, func, or_
+from sqlalchemy import Column, Index, Integer, String, bindparam, exists, func, or_, text
 from sqlalchemy.orm import relationship
 
+from airflow.configuration import conf
 from airflow.models.base import Base
 from airflow.models.taskinstance import TaskInstance
-from airflow.triggers.base import BaseTrigger
+from airflow.triggers.base import BaseTrigger, TriggerEvent
 from airflow.utils import timezone
 from airflow.utils.retries import run_with_db_retries
 from airflow.utils.session import provide_session
-from airflow.utils.sqlalchemy import ExtendedJSON, UtcDateTime
+from airflow.utils.sqlalchemy import ExtendedJSON, UtcDateTime, skip_locked
 from airflow.utils.state import State
 
+# The PostgreSQL notification channel telling the triggerers that new triggers are waiting
+NEW_TRIGGER_CHANNEL = "airflow_new_trigger"
+
 
 class Trigger(Base):
     """
@@ -41,8 +47,9 @@ class Trigger(Base):
 
     They are persisted into the database and then re-hydrated into a
     "triggerer" process, where many are run at once. We model it so that
-    there is a many-to-one relationship between Task and Trigger, for future
-    deduplication logic to use.
+    there is a many-to-one relationship between Task and Trigger: tasks
+    deferring on identical triggers, with the same classpath and kwargs, share
+    one row, so the trigger runs once and its event resumes all of them.
 
     Rows will be evicted from the database when the triggerer detects no
     active Tasks/DAGs using them. Events are not stored in the database;
@@ -57,6 +64,8 @@ class Trigger(Base):
     kwargs = Column(ExtendedJSON, nullable=False)
     created_date = Column(UtcDateTime, nullable=False)
     triggerer_id = Column(Integer, nullable=True)
+    # The hash of the classpath and kwargs, identifying identical triggers
+    trigger_hash = Column(String(64), nullable=True)
 
     triggerer_job = relationship(
         "BaseJob",
@@ -65,11 +74,27 @@ class Trigger(Base):
         uselist=False,
     )
 
+    __table_args__ = (Index('idx_trigger_hash', trigger_hash),)
+
     def __init__(self, classpath: str, kwargs: dict[str, Any], created_date: datetime.datetime | None = None):
         super().__init__()
         self.classpath = classpath
         self.kwargs = kwargs
         self.created_date = created_date or timezone.utcnow()
+        self.trigger_hash = self.compute_hash(classpath, kwargs)
+
+    @staticmethod
+    def compute_hash(classpath: str, kwargs: dict[str, Any]) -> str:
+        """The hash identifying the triggers with the given classpath and kwargs."""
+        from airflow.serialization.serialized_objects import BaseSerialization
+
+        serialized = json.dumps([classpath, BaseSerialization.serialize(kwargs)], sort_keys=True)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    @staticmethod
+    def deduplication_enabled() -> bool:
+        """Whether identical triggers share one row and one run, from ``[triggerer] deduplicate_triggers``."""
+        return conf.getboolean('triggerer', 'deduplicate_triggers', fallback=True)
 
     @classmethod
     def from_object(cls, trigger: BaseTrigger):
@@ -80,6 +105,65 @@ class Trigger(Base):
         classpath, kwargs = trigger.serialize()
         return cls(classpath=classpath, kwargs=kwargs)
 
+    @classmethod
+    @provide_session
+    def get_or_create(cls, trigger: BaseTrigger, session=None) -> Trigger:
+        """
+        Gets the row of a trigger identical to the given one which tasks are
+        deferred on, so that a task deferring on it shares its run and its
+        event, or creates a new row.
+
+        The returned row is locked until the end of the transaction, so that
+        :meth:`clean_unused` does not delete it before the task deferring on it
+        is committed.
+        """
+        trigger_row = cls.from_object(trigger)
+        if cls.deduplication_enabled():
+            existing = cls._identical_trigger_query(trigger_row, session).first()
+            if existing is not None:
+                return existing
+        session.add(trigger_row)
+        session.flush()
+        return trigger_row
+
+    @classmethod
+    def _identical_trigger_query(cls, trigger_row: Trigger, session):
+        """The query locking the row of a trigger identical to the given one which tasks are deferred on."""
+        # MySQL only skips the rows locked with FOR UPDATE, not with LOCK IN SHARE MODE
+        read = session.bind.dialect.name == "postgresql"
+        return (
+            session.query(cls)
+            .filter(
+                cls.trigger_hash == trigger_row.trigger_hash,
+                cls.classpath == trigger_row.classpath,
+                exists().where(TaskInstance.trigger_id == cls.id, TaskInstance.state == State.DEFERRED),
+            )
+            .order_by(cls.id)
+            .limit(1)
+            .with_for_update(read=read, **skip_locked(session=session))
+        )
+
+    @staticmethod
+    def notifications_enabled(dialect_name: str) -> bool:
+        """
+        Whether the triggerers are notified of new triggers on a database with the given dialect.
+
+        Only PostgreSQL supports notifications; triggerers poll for new triggers on any database.
+        """
+        return dialect_name == "postgresql" and conf.getboolean(
+            'triggerer', 'notify_new_triggers', fallback=True
+        )
+
+    @classmethod
+    @provide_session
+    def notify_new_triggers(cls, session=None) -> None:
+        """
+        Notify the triggerers that new triggers are waiting to be assigned, so that they start them
+        without waiting for their next poll. The notification is sent when the transaction is committed.
+        """
+        if cls.notifications_enabled(session.get_bind().dialect.name):
+            session.execute(text(f"NOTIFY {NEW_TRIGGER_CHANNEL}"))
+
     @classmethod
     @provide_session
     def bulk_fetch(cls, ids: Iterable[int], session=None) -> dict[int, Trigger]:
@@ -112,8 +196,19 @@ class Trigger(Base):
                 .having(func.count(TaskInstance.trigger_id) == 0)
             )
         ]
-        # ...and delete them (we can't do this in one query due to MySQL)
-        session.query(Trigger).filter(Trigger.id.in_(ids)).delete(synchronize_session=False)
+        if not ids:
+            return
+        # ...lock them, skipping those being reused by tasks deferring right now...
+        ids = [
+            trigger_id
+            for (trigger_id,) in session.query(cls.id)
+            .filter(cls.id.in_(ids))
+            .with_for_update(**skip_locked(session=session))
+        ]
+        # ...and delete them if they are still unused (we can't do this in one query due to MySQL)
+        session.query(Trigger).filter(
+            Trigger.id.in_(ids), ~exists().where(TaskInstance.trigger_id == Trigger.id)
+        ).delete(synchronize_session=False)
 
     @classmethod
     @provide_session
@@ -122,17 +217,62 @@ class Trigger(Base):
         Takes an event from an instance of itself, and triggers all dependent
         tasks to resume.
         """
-        for task_instance in session.query(TaskInstance).filter(
-            TaskInstance.trigger_id == trigger_id, TaskInstance.state == State.DEFERRED
-        ):
-            # Add the event's payload into the kwargs for the task
-            next_kwargs = task_instance.next_kwargs or {}
-            next_kwargs["event"] = event.payload
-            task_instance.next_kwargs = next_kwargs
-            # Remove ourselves as its trigger
-            task_instance.trigger_id = None
-            # Finally, mark it as scheduled so it gets re-queued
-            task_instance.state = State.SCHEDULED
+        cls.submit_events([(trigger_id, event)], session=session)
+
+    @classmethod
+    @provide_session
+    def submit_events(cls, events: Iterable[tuple[int, TriggerEvent]], session=None) -> int:
+        """
+        Takes events from triggers, and triggers all the tasks depending on
+        them to resume, with one query and one update for all of them.
+
+        Only the first event of each trigger is used, as its tasks are not
+        deferred anymore once it is submitted.
+
+        :return: The number of task instances resumed
+        """
+        payloads: dict[int, Any] = {}
+        for trigger_id, event in events:
+            payloads.setdefault(trigger_id, event.payload)
+        if not payloads:
+            return 0
+        task_instances = session.query(
+            TaskInstance.dag_id,
+            TaskInstance.task_id,
+            TaskInstance.run_id,
+            TaskInstance.map_index,
+            TaskInstance.trigger_id,
+            TaskInstance.next_kwargs,
+        ).filter(TaskInstance.trigger_id.in_(payloads), TaskInstance.state == State.DEFERRED)
+        # Add the event's payload into the kwargs of each task, and mark it as
+        # scheduled, without its trigger, so it gets re-queued
+        params = [
+            {
+                "b_dag_id": ti.dag_id,
+                "b_task_id": ti.task_id,
+                "b_run_id": ti.run_id,
+                "b_map_index": ti.map_index,
+                "b_next_kwargs": {**(ti.next_kwargs or {}), "event": payloads[ti.trigger_id]},
+            }
+            for ti in task_instances
+        ]
+        if not params:
+            return 0
+        table = TaskInstance.__table__
+        session.execute(
+            table.update()
+            .where(
+                table.c.dag_id == bindparam("b_dag_id"),
+                table.c.task_id == bindparam("b_task_id"),
+                table.c.run_id == bindparam("b_run_id"),
+                table.c.map_index == bindparam("b_map_index"),
+                table.c.state == State.DEFERRED,
+            )
+            .values(next_kwargs=bindparam("b_next_kwargs"), trigger_id=None, state=State.SCHEDULED),
+            params,
+        )
+        cls._expire_task_instances(payloads, session)
+        return len(params)
 
     @classmethod
     @provide_session
@@ -152,17 +292,51 @@ class Trigger(Base):
         workers as first-class concepts, we can run the failure code here
         in-process, but we can't do that right now.
         """
-        for task_instance in session.query(TaskInstance).filter(
-            TaskInstance.trigger_id == trigger_id, TaskInstance.state == State.DEFERRED
-        ):
-            # Add the error and set the next_method to the fail state
-            traceback = format_exception(type(exc), exc, exc.__traceback__) if exc else None
-            task_instance.next_method = "__fail__"
-            task_instance.next_kwargs = {"error": "Trigger failure", "traceback": traceback}
-            # Remove ourselves as its trigger
-            task_instance.trigger_id = None
-            # Finally, mark it as scheduled so it gets re-queued
-            task_instance.state = State.SCHEDULED
+        cls.submit_failures([(trigger_id, exc)], session=session)
+
+    @classmethod
+    @provide_session
+    def submit_failures(cls, failures: Iterable[tuple[int, BaseException | None]], session=None) -> None:
+        """
+        Called when triggers have failed unexpectedly, to mark everything that
+        depended on them as failed, with one update for each failed trigger.
+
+        See :meth:`submit_failure`.
+        """
+        params = [
+            {
+                "b_trigger_id": trigger_id,
+                "b_next_kwargs": {
+                    "error": "Trigger failure",
+                    "traceback": format_exception(type(exc), exc, exc.__traceback__) if exc else None,
+                },
+            }
+            for trigger_id, exc in failures
+        ]
+        if not params:
+            return
+        table = TaskInstance.__table__
+        # Set the next_method to the fail state, remove ourselves as the trigger of
+        # the tasks, and mark them as scheduled so they get re-queued
+        session.execute(
+            table.update()
+            .where(table.c.trigger_id == bindparam("b_trigger_id"), table.c.state == State.DEFERRED)
+            .values(
+                next_method="__fail__",
+                next_kwargs=bindparam("b_next_kwargs"),
+                trigger_id=None,
+                state=State.SCHEDULED,
+            ),
+            params,
+        )
+        cls._expire_task_instances({param["b_trigger_id"] for param in params}, session)
+
+    @staticmethod
+    def _expire_task_instances(trigger_ids: Collection[int], session) -> None:
+        """Expire the task instances of the session deferred on the triggers, after they were updated."""
+        for obj in list(session.identity_map.values()):
+            if isinstance(obj, TaskInstance) and obj.trigger_id in trigger_ids:
+                session.expire(obj)
 
     @classmethod
     @provide_session
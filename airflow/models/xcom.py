@@ -24,7 +24,7 @@ import logging
 import pickle
 import warnings
 from functools import wraps
-from typing import TYPE_CHECKING, Any, Iterable, cast, overload
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, cast, overload
 
 import pendulum
 from sqlalchemy import (
@@ -48,7 +48,7 @@ from airflow.utils import timezone
 from airflow.utils.helpers import exactly_one, is_container
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.session import NEW_SESSION, provide_session
-from airflow.utils.sqlalchemy import UtcDateTime
+from airflow.utils.sqlalchemy import UtcDateTime, tuple_in_condition
 
 log = logging.getLogger(__name__)
 
@@ -57,6 +57,13 @@ log = logging.getLogger(__name__)
 MAX_XCOM_SIZE = 49344
 XCOM_RETURN_KEY = 'return_value'
 
+# The number of XCom rows fetched from the database at a time when pulling many values
+XCOM_FETCH_BATCH_SIZE = 1000
+
+# Above this number of task instances, XComs pulled in bulk are filtered by map index
+# after they are fetched, so the query stays within the bind parameter limits of the database
+XCOM_MAX_FILTER_SIZE = 1000
+
 if TYPE_CHECKING:
     from airflow.models.taskinstance import TaskInstanceKey
 
@@ -232,6 +239,72 @@ class BaseXCom(Base, LoggingMixin):
         session.add(new)
         session.flush()
 
+    @classmethod
+    @provide_session
+    def set_many(
+        cls,
+        values: Mapping[str, Any],
+        *,
+        dag_id: str,
+        task_id: str,
+        run_id: str,
+        map_index: int = -1,
+        session: Session = NEW_SESSION,
+    ) -> None:
+        """Store several XCom values of a task instance at once.
+
+        This is equivalent to calling :meth:`set` for each key, but all the values
+        are replaced with one delete and one insert statement.
+
+        :param values: The XCom values to store, by key.
+        :param dag_id: DAG ID.
+        :param task_id: Task ID.
+        :param run_id: DAG run ID for the task.
+        :param map_index: Optional map index to assign XCom for a mapped task.
+            The default is ``-1`` (set for a non-mapped task).
+        :param session: Database session. If not given, a new session will be
+            created for this function.
+        """
+        from airflow.models.dagrun import DagRun
+
+        if not values:
+            return
+        dag_run_id = session.query(DagRun.id).filter_by(dag_id=dag_id, run_id=run_id).scalar()
+        if dag_run_id is None:
+            raise ValueError(f"DAG run not found on DAG {dag_id!r} with ID {run_id!r}")
+
+        timestamp = timezone.utcnow()
+        rows = [
+            {
+                "dag_run_id": dag_run_id,
+                "key": key,
+                "value": cls.serialize_value(
+                    value=value,
+                    key=key,
+                    task_id=task_id,
+                    dag_id=dag_id,
+                    run_id=run_id,
+                    map_index=map_index,
+                ),
+                "run_id": run_id,
+                "task_id": task_id,
+                "dag_id": dag_id,
+                "map_index": map_index,
+                "timestamp": timestamp,
+            }
+            for key, value in values.items()
+        ]
+
+        # Remove duplicate XComs and insert the new ones.
+        session.query(cls).filter(
+            cls.key.in_(list(values)),
+            cls.run_id == run_id,
+            cls.task_id == task_id,
+            cls.dag_id == dag_id,
+            cls.map_index == map_index,
+        ).delete(synchronize_session="fetch")
+        session.execute(cls.__table__.insert(), rows)
+
     @classmethod
     @provide_session
     def get_value(
@@ -490,6 +563,48 @@ class BaseXCom(Base, LoggingMixin):
             return query.limit(limit)
         return query
 
+    @classmethod
+    @provide_session
+    def get_values(
+        cls,
+        *,
+        dag_id: str,
+        run_id: str,
+        ti_keys: Iterable[tuple[str, int]],
+        key: str = XCOM_RETURN_KEY,
+        session: Session = NEW_SESSION,
+    ) -> dict[tuple[str, int], Any]:
+        """Retrieve the XCom values of many task instances of a DAG run in one query.
+
+        The rows are fetched in batches, through a server-side cursor where the
+        database supports it, and deserialized with :meth:`deserialize_values`.
+
+        :param dag_id: DAG ID.
+        :param run_id: DAG run ID for the tasks.
+        :param ti_keys: The ``(task_id, map_index)`` pairs of the task instances
+            to pull the XComs of.
+        :param key: The key of the XComs.
+        :param session: Database session. If not given, a new session will be
+            created for this function.
+        :return: The values found, by ``(task_id, map_index)``. Task instances
+            without a matching XCom are left out.
+        """
+        ti_keys = set(ti_keys)
+        if not ti_keys:
+            return {}
+        query = session.query(cls.task_id, cls.map_index, cls.value).filter(
+            cls.dag_id == dag_id,
+            cls.run_id == run_id,
+            cls.key == key,
+            cls.task_id.in_({task_id for task_id, _ in ti_keys}),
+        )
+        if len(ti_keys) <= XCOM_MAX_FILTER_SIZE:
+            query = query.filter(tuple_in_condition((cls.task_id, cls.map_index), ti_keys))
+        rows = [
+            row for row in query.yield_per(XCOM_FETCH_BATCH_SIZE) if (row.task_id, row.map_index) in ti_keys
+        ]
+        return {(row.task_id, row.map_index): value for row, value in zip(rows, cls.deserialize_values(rows))}
+
     @classmethod
     @provide_session
     def delete(cls, xcoms: XCom | Iterable[XCom], session: Session) -> None:
@@ -580,6 +695,21 @@ class BaseXCom(Base, LoggingMixin):
             query = query.filter_by(map_index=map_index)
         query.delete()
 
+    @classmethod
+    @provide_session
+    def purge_unreferenced(cls, *, older_than: datetime.datetime, session: Session = NEW_SESSION) -> int:
+        """Remove the values stored outside the database which no XCom refers to anymore.
+
+        This is called by ``airflow db clean``, after old XComs are deleted. The base
+        class stores all values in the database, so it has nothing to remove.
+
+        :param older_than: Only values stored before this time may be removed.
+        :param session: Database session. If not given, a new session will be
+            created for this function.
+        :return: The number of values removed.
+        """
+        return 0
+
     @staticmethod
     def serialize_value(
         value: Any,
@@ -607,18 +737,20 @@ class BaseXCom(Base, LoggingMixin):
     @staticmethod
     def deserialize_value(result: XCom) -> Any:
         """Deserialize XCom value from str or pickle object"""
-        if result.value is None:
-            return None
-        if conf.getboolean('core', 'enable_xcom_pickling'):
-            try:
-                return pickle.loads(result.value)
-            except pickle.UnpicklingError:
-                return json.loads(result.value.decode('UTF-8'))
-        else:
-            try:
-                return json.loads(result.value.decode('UTF-8'))
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                return pickle.loads(result.value)
+        return _deserialize(result.value, conf.getboolean('core', 'enable_xcom_pickling'))
+
+    @classmethod
+    def deserialize_values(cls, results: Iterable[XCom]) -> Iterator[Any]:
+        """Deserialize many XCom values, in order.
+
+        This calls :meth:`deserialize_value` for each value. Custom XCom backends
+        can override it to retrieve the values they store in bulk.
+        """
+        if cls.deserialize_value is not _base_deserialize_value:
+            return map(cls.deserialize_value, results)
+        # Read the configuration once rather than for every value
+        enable_pickling = conf.getboolean('core', 'enable_xcom_pickling')
+        return (_deserialize(result.value, enable_pickling) for result in results)
 
     def orm_deserialize_value(self) -> Any:
         """
@@ -632,6 +764,25 @@ class BaseXCom(Base, LoggingMixin):
         return BaseXCom.deserialize_value(self)
 
 
+_base_deserialize_value = BaseXCom.deserialize_value
+
+
+def _deserialize(value: bytes | None, enable_pickling: bool) -> Any:
+    # The value may be any buffer, such as a memory-mapped file
+    if value is None:
+        return None
+    if enable_pickling:
+        try:
+            return pickle.loads(value)
+        except pickle.UnpicklingError:
+            return json.loads(str(value, 'UTF-8'))
+    else:
+        try:
+            return json.loads(str(value, 'UTF-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return pickle.loads(value)
+
+
 def _patch_outdated_serializer(clazz: type[BaseXCom], params: Iterable[str]) -> None:
     """Patch a custom ``serialize_value`` to accept the modern signature.
 
@@ -0,0 +1,284 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+An XCom backend storing large values outside the metadata database.
+
+Values are serialized as with :class:`~airflow.models.xcom.BaseXCom`. Those no
+larger than ``[core] xcom_storage_threshold`` bytes are stored in the database,
+the others in a directory or an object store, in a file named after the SHA-256
+hash of their serialized content, and the database only keeps a reference to
+that file. Identical values are therefore stored once, however many XComs hold
+them. Stored files are removed by ``airflow db clean`` once no XCom refers to them.
+"""
+from __future__ import annotations
+
+import datetime
+import functools
+import hashlib
+import logging
+import mmap
+import os
+import uuid
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlsplit
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException, AirflowException
+from airflow.models.xcom import XCOM_FETCH_BATCH_SIZE, BaseXCom, _deserialize
+from airflow.utils import timezone
+from airflow.utils.session import NEW_SESSION, provide_session
+
+log = logging.getLogger(__name__)
+
+# The value stored in the database in place of a value stored outside of it, followed by its hash.
+# Serialized values are never confused with references: JSON never starts with this prefix, nor
+# does a pickle.
+REFERENCE_PREFIX = b"airflow-xcom-sha256:"
+REFERENCE_LENGTH = len(REFERENCE_PREFIX) + hashlib.sha256().digest_size * 2
+
+
+def _import_fsspec() -> Any:
+    try:
+        import fsspec
+    except ImportError:
+        raise AirflowException(
+            "The 'fsspec' package is required to store XComs in an object store. "
+            "Please install it with: pip install fsspec"
+        )
+    return fsspec
+
+
+class XComPayloadStore:
+    """
+    Serialized XCom values stored in files named after the hash of their content.
+
+    The files are spread over subdirectories named after the first two characters
+    of their hash. A local directory is read with memory-mapping; any other location
+    is accessed through fsspec, e.g. ``s3://bucket/xcom``.
+
+    :param path: The directory or the URL of the location of the files
+    """
+
+    def __init__(self, path: str) -> None:
+        scheme = urlsplit(path).scheme
+        # A single letter is the drive of a Windows path
+        if len(scheme) > 1 and scheme != "file":
+            self.fs, self.path = _import_fsspec().core.url_to_fs(path)
+        else:
+            self.fs = None
+            self.path = path[len("file://") :] if scheme == "file" else path
+        self.path = self.path.rstrip("/")
+
+    def get_path(self, digest: str) -> str:
+        """The path of the file holding the value with the given hash."""
+        return f"{self.path}/{digest[:2]}/{digest}"
+
+    def put(self, data: bytes) -> str:
+        """
+        Store a serialized value, unless a value with the same content is already stored locally.
+
+        :return: The hash of the value
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.get_path(digest)
+        if self.fs is not None:
+            # The time of an object cannot be refreshed, so an existing object is written again
+            # for it not to be removed as unreferenced before the XCom referring to it is committed.
+            # Objects are written at once, so readers never see a partial object.
+            self.fs.pipe_file(path, data)
+            return digest
+        try:
+            # Refresh the time of an existing file so it is not removed as unreferenced
+            # before the XCom referring to it is committed.
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """
+        Read a serialized value.
+
+        :return: A buffer holding the value: a memory-map of its file when it is stored locally,
+            which must be closed once read
+        :raises FileNotFoundError: If no value with this hash is stored
+        """
+        path = self.get_path(digest)
+        if self.fs is not None:
+            return self.fs.cat_file(path)
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def list(self) -> Iterator[tuple[str, datetime.datetime | None]]:
+        """The hashes of the stored values, with the time their file was last modified if it is known."""
+        if self.fs is not None:
+            if not self.fs.exists(self.path):
+                return
+            for path, info in self.fs.find(self.path, detail=True).items():
+                modified = info.get("mtime") or info.get("LastModified") or info.get("last_modified")
+                if isinstance(modified, (int, float)):
+                    modified = datetime.datetime.fromtimestamp(modified, tz=timezone.utc)
+                elif isinstance(modified, datetime.datetime):
+                    modified = timezone.coerce_datetime(modified)
+                else:
+                    modified = None
+                yield path.rstrip("/").rsplit("/", 1)[-1], modified
+            return
+        try:
+            directories = list(os.scandir(self.path))
+        except FileNotFoundError:
+            return
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                yield entry.name, datetime.datetime.fromtimestamp(entry.stat().st_mtime, tz=timezone.utc)
+
+    def delete(self, digest: str) -> None:
+        """Remove a stored value, if it exists."""
+        path = self.get_path(digest)
+        try:
+            if self.fs is not None:
+                self.fs.rm_file(path)
+            else:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def _get_store(path: str) -> XComPayloadStore:
+    return XComPayloadStore(path)
+
+
+def get_payload_store() -> XComPayloadStore:
+    """The store of the values of :class:`TieredXCom`, at ``[core] xcom_storage_path``."""
+    path = conf.get("core", "xcom_storage_path", fallback="")
+    if not path:
+        raise AirflowConfigException(
+            "[core] xcom_storage_path must be set to store XComs with airflow.models.xcom_storage.TieredXCom"
+        )
+    return _get_store(path)
+
+
+def is_reference(value: Any) -> bool:
+    """Whether a value of the XCom table refers to a value stored outside of the database."""
+    return (
+        value is not None
+        and len(value) == REFERENCE_LENGTH
+        and value[: len(REFERENCE_PREFIX)] == REFERENCE_PREFIX
+    )
+
+
+def _get_digest(reference: bytes) -> str:
+    return reference[len(REFERENCE_PREFIX) :].decode()
+
+
+def _load(value: bytes | None, enable_pickling: bool) -> Any:
+    if not is_reference(value):
+        return _deserialize(value, enable_pickling)
+    buffer = get_payload_store().get(_get_digest(value))  # type: ignore[arg-type]
+    try:
+        return _deserialize(buffer, enable_pickling)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+class TieredXCom(BaseXCom):
+    """
+    An XCom backend storing small values in the database and the others by content hash.
+
+    Select it with ``[core] xcom_backend = airflow.models.xcom_storage.TieredXCom``, and set
+    ``[core] xcom_storage_path`` to a directory shared by all the workers, or to the URL of an
+    object store. Large values are only read when they are pulled: the webserver shows where
+    they are stored instead.
+    """
+
+    @staticmethod
+    def serialize_value(
+        value: Any,
+        *,
+        key: str | None = None,
+        task_id: str | None = None,
+        dag_id: str | None = None,
+        run_id: str | None = None,
+        map_index: int | None = None,
+    ):
+        data = BaseXCom.serialize_value(
+            value, key=key, task_id=task_id, dag_id=dag_id, run_id=run_id, map_index=map_index
+        )
+        if len(data) <= conf.getint("core", "xcom_storage_threshold", fallback=4096):
+            return data
+        return REFERENCE_PREFIX + get_payload_store().put(data).encode()
+
+    @staticmethod
+    def deserialize_value(result: BaseXCom) -> Any:
+        return _load(result.value, conf.getboolean("core", "enable_xcom_pickling"))
+
+    @classmethod
+    def deserialize_values(cls, results: Iterable[BaseXCom]) -> Iterator[Any]:
+        enable_pickling = conf.getboolean("core", "enable_xcom_pickling")
+        return (_load(result.value, enable_pickling) for result in results)
+
+    def orm_deserialize_value(self) -> Any:
+        if is_reference(self.value):
+            return f"XCom value stored at {get_payload_store().get_path(_get_digest(self.value))}"
+        return BaseXCom.deserialize_value(self)
+
+    @classmethod
+    @provide_session
+    def purge_unreferenced(cls, *, older_than: datetime.datetime, session: Session = NEW_SESSION) -> int:
+        """
+        Remove the stored values which no XCom refers to anymore.
+
+        Only the files last modified before ``older_than`` are removed, so values being stored
+        by running tasks are kept. Files whose modification time is unknown are kept too.
+        """
+        store = get_payload_store()
+        referenced = {
+            _get_digest(value)
+            for value, in session.query(cls.value)
+            .filter(func.length(cls.value) == REFERENCE_LENGTH)
+            .yield_per(XCOM_FETCH_BATCH_SIZE)
+            if is_reference(value)
+        }
+        num_removed = 0
+        for digest, modified in list(store.list()):
+            if digest in referenced or modified is None or modified >= older_than:
+                continue
+            store.delete(digest)
+            num_removed += 1
+        log.info("Removed %d stored XCom values which are not referenced anymore", num_removed)
+        return num_removed
@@ -0,0 +1,168 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Binary encodings of serialized DAGs and DAG source code stored in the database.
+
+A blob starts with a header naming the encoding and the compression of its
+payload, so readers pick the right decoder whatever the writer was configured
+with. JSON compressed with zlib is written without a header, exactly as older
+versions of Airflow wrote compressed serialized DAGs, and blobs without a
+header are always read that way.
+"""
+from __future__ import annotations
+
+import importlib
+import zlib
+from typing import Any, Callable, NamedTuple
+
+from airflow.exceptions import AirflowConfigException, AirflowException
+from airflow.settings import json
+
+# A zlib stream or a JSON document can never start with a NUL byte.
+MAGIC = b"\x00AFB"
+_HEADER_LENGTH = len(MAGIC) + 2
+
+
+class _Codec(NamedTuple):
+    """A pair of functions converting data to bytes and back, and its id in the blob header."""
+
+    id: int
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def _import_optional(module: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise AirflowException(
+            f"The {module!r} package is required to read or write data in this format. "
+            f"Please install it with: pip install {module}"
+        )
+
+
+def _json_dumps(data: Any) -> bytes:
+    return json.dumps(data, sort_keys=True).encode("utf-8")
+
+
+def _json_loads(payload: bytes) -> Any:
+    return json.loads(payload)
+
+
+def _msgpack_dumps(data: Any) -> bytes:
+    return _import_optional("msgpack").packb(data, use_bin_type=True)
+
+
+def _msgpack_loads(payload: bytes) -> Any:
+    # Like the json module, msgpack interns the keys of the maps it decodes, so the
+    # keys repeated across all the tasks of a DAG are only kept once in memory.
+    return _import_optional("msgpack").unpackb(payload, raw=False)
+
+
+def _text_dumps(data: str) -> bytes:
+    return data.encode("utf-8")
+
+
+def _text_loads(payload: bytes) -> str:
+    return payload.decode("utf-8")
+
+
+def _zstd_compress(payload: bytes) -> bytes:
+    return _import_optional("zstandard").ZstdCompressor().compress(payload)
+
+
+def _zstd_decompress(payload: bytes) -> bytes:
+    return _import_optional("zstandard").ZstdDecompressor().decompress(payload)
+
+
+ENCODINGS: dict[str, _Codec] = {
+    "json": _Codec(0, _json_dumps, _json_loads),
+    "msgpack": _Codec(1, _msgpack_dumps, _msgpack_loads),
+    "text": _Codec(2, _text_dumps, _text_loads),
+}
+
+COMPRESSIONS: dict[str, _Codec] = {
+    "none": _Codec(0, bytes, bytes),
+    "zlib": _Codec(1, zlib.compress, zlib.decompress),
+    "zstd": _Codec(2, _zstd_compress, _zstd_decompress),
+}
+
+_ENCODINGS_BY_ID = {codec.id: codec for codec in ENCODINGS.values()}
+_COMPRESSIONS_BY_ID = {codec.id: codec for codec in COMPRESSIONS.values()}
+
+
+def validate(encoding: str, compression: str) -> None:
+    """Check that data can be written with the given encoding and compression."""
+    if encoding not in ENCODINGS:
+        raise AirflowConfigException(
+            f"Unknown serialization encoding {encoding!r}, expected one of {sorted(ENCODINGS)}"
+        )
+    if compression not in COMPRESSIONS:
+        raise AirflowConfigException(
+            f"Unknown serialization compression {compression!r}, expected one of {sorted(COMPRESSIONS)}"
+        )
+    if encoding == "msgpack":
+        _import_optional("msgpack")
+    if compression == "zstd":
+        _import_optional("zstandard")
+
+
+def encode(data: Any, encoding: str = "json", compression: str = "zlib") -> bytes:
+    """
+    Encode and compress data into a blob which :func:`decode` reads back.
+
+    :param data: The data to encode; a JSON-compatible object, or a string for the ``text`` encoding.
+    :param encoding: The name of the encoding, one of :data:`ENCODINGS`.
+    :param compression: The name of the compression, one of :data:`COMPRESSIONS`.
+    """
+    validate(encoding, compression)
+    return _compress(ENCODINGS[encoding].encode(data), encoding, compression)
+
+
+def compress(payload: bytes, encoding: str = "json", compression: str = "zlib") -> bytes:
+    """
+    Compress a payload already encoded with ``encoding`` into a blob which :func:`decode` reads back.
+
+    :param payload: The encoded data.
+    :param encoding: The name of the encoding of the payload, one of :data:`ENCODINGS`.
+    :param compression: The name of the compression, one of :data:`COMPRESSIONS`.
+    """
+    validate(encoding, compression)
+    return _compress(payload, encoding, compression)
+
+
+def _compress(payload: bytes, encoding: str, compression: str) -> bytes:
+    if encoding == "json" and compression == "zlib":
+        return zlib.compress(payload)
+    compressor = COMPRESSIONS[compression]
+    return MAGIC + bytes([ENCODINGS[encoding].id, compressor.id]) + compressor.encode(payload)
+
+
+def decode(blob: bytes) -> Any:
+    """Decode a blob written by :func:`encode`, or a zlib-compressed JSON blob without a header."""
+    if not blob.startswith(MAGIC):
+        return json.loads(zlib.decompress(blob))
+    encoding_id, compression_id = blob[len(MAGIC) : _HEADER_LENGTH]
+    try:
+        codec = _ENCODINGS_BY_ID[encoding_id]
+        compressor = _COMPRESSIONS_BY_ID[compression_id]
+    except KeyError:
+        raise AirflowException(
+            f"Unknown encoding {encoding_id} or compression {compression_id} "
+            "in the header of a serialized blob"
+        )
+    return codec.decode(compressor.decode(blob[_HEADER_LENGTH:]))
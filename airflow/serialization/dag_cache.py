@@ -0,0 +1,123 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A cache of deserialized DAGs shared by the processes of a host through files.
+
+Each version of a DAG is stored once, in a file named after its ``dag_hash``,
+as a pickle of the DAG deserialized from the database. Loading that file is
+much cheaper than deserializing the DAG again, so when the webserver workers
+share a cache directory, only the first one to need a version of a DAG pays
+for its deserialization. The files are memory-mapped, so a cache directory
+on a memory-backed file system is read without copying it into the workers.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import pickle
+import tempfile
+import weakref
+from typing import TYPE_CHECKING, Any
+
+from airflow.version import version
+
+if TYPE_CHECKING:
+    from airflow.models.dag import DAG
+
+log = logging.getLogger(__name__)
+
+_PROXY_TYPES = (weakref.ProxyType, weakref.CallableProxyType)
+
+
+def _get_referent(proxy: Any) -> Any:
+    # A proxy forwards attribute lookups to its referent, so the methods it does
+    # not define itself are bound to the referent
+    return proxy.__reduce_ex__.__self__
+
+
+class _DagPickler(pickle.Pickler):
+    """
+    Pickles DAGs, keeping the weak references of their tasks to their task groups.
+
+    Pickling a ``weakref.proxy`` pickles an empty copy of its referent, so the tasks
+    would lose their task group. The proxies are pickled as new proxies to their
+    referent instead, which is pickled once with the rest of the DAG.
+    """
+
+    def reducer_override(self, obj):
+        if type(obj) in _PROXY_TYPES:
+            return weakref.proxy, (_get_referent(obj),)
+        return NotImplemented
+
+
+class SharedDagCache:
+    """
+    DAGs deserialized from the database, stored in a directory by ``dag_id`` and ``dag_hash``.
+
+    Failing to read or write the cache is never an error: the DAG is deserialized as
+    if it was not cached. As pickles are loaded from it, the directory must only be
+    writable by the user running Airflow.
+
+    :param directory: The directory holding the cache, created if missing
+    """
+
+    def __init__(self, directory: str) -> None:
+        # Pickles are only read back by the version of Airflow that wrote them
+        self.directory = os.path.join(directory, version)
+
+    def _get_path(self, dag_id: str, dag_hash: str) -> str:
+        return os.path.join(self.directory, dag_id, f"{dag_hash}.pickle")
+
+    def get(self, dag_id: str, dag_hash: str) -> DAG | None:
+        """Load the version of a DAG with the given hash, or None if it is not cached."""
+        try:
+            with open(self._get_path(dag_id, dag_hash), "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as buffer:
+                return pickle.loads(buffer)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            log.warning("Could not load DAG %s from the shared DAG cache", dag_id, exc_info=True)
+            return None
+
+    def set(self, dag_id: str, dag_hash: str, dag: DAG) -> None:
+        """Store a version of a DAG, and remove the other versions of the DAG from the cache."""
+        path = self._get_path(dag_id, dag_hash)
+        dag_directory = os.path.dirname(path)
+        try:
+            os.makedirs(dag_directory, exist_ok=True)
+            # Write to a temporary file first so other processes never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=dag_directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    _DagPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(dag)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            log.warning("Could not store DAG %s in the shared DAG cache", dag_id, exc_info=True)
+            return
+
+        for name in os.listdir(dag_directory):
+            if name.endswith(".pickle") and name != os.path.basename(path):
+                try:
+                    os.unlink(os.path.join(dag_directory, name))
+                except FileNotFoundError:
+                    pass
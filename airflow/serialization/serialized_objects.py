@@ -18,6 +18,7 @@
 from __future__ import annotations
 
 import collections.abc
+import copy
 import datetime
 import enum
 import logging
@@ -25,7 +26,18 @@ import warnings
 import weakref
 from dataclasses import dataclass
 from inspect import Parameter, signature
-from typing import TYPE_CHECKING, Any, Collection, Iterable, Mapping, NamedTuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Type,
+    Union,
+)
 
 import cattr
 import lazy_object_proxy
@@ -266,6 +278,160 @@ class _ExpandInputRef(NamedTuple):
         return create_expand_input(self.key, value)
 
 
+class _LazyDict(dict):
+    """A dict whose values are only built when they are first accessed.
+
+    Keys (and their order) are known up front, so membership tests, ``len()``
+    and iterating over the keys never build a value. Looking up a key builds
+    only that value, while anything that needs all the values (``values()``,
+    ``items()``, comparisons, copying, pickling) builds all the remaining ones.
+
+    :param load: Builds the value of a key from the payload it was added with.
+    :param on_load: Called with the key and the value once the value is built
+        and stored, so it can reference other values of this dict.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Any, Any], Any],
+        on_load: Callable[[Any, Any], None] | None = None,
+    ) -> None:
+        super().__init__()
+        self._keys: dict[Any, None] = {}
+        self._pending: dict[Any, Any] = {}
+        # Whether the stored values are in the same order as the keys
+        self._ordered = True
+        self._load = load
+        self._on_load = on_load
+
+    def add_lazy(self, key: Any, payload: Any) -> None:
+        """Add a key whose value is built from ``payload`` when first accessed."""
+        if dict.__contains__(self, key):
+            dict.__delitem__(self, key)
+        self._keys[key] = None
+        self._pending[key] = payload
+
+    def is_loaded(self, key: Any) -> bool:
+        return dict.__contains__(self, key)
+
+    def _load_value(self, key: Any) -> Any:
+        payload = self._pending.pop(key)
+        try:
+            value = self._load(key, payload)
+        except BaseException:
+            self._pending[key] = payload
+            raise
+        dict.__setitem__(self, key, value)
+        self._ordered = False
+        if self._on_load:
+            self._on_load(key, value)
+        return value
+
+    def _load_all(self) -> None:
+        for key in list(self._pending):
+            if key in self._pending:
+                self._load_value(key)
+        if not self._ordered:
+            # Values are stored in the order they were loaded, restore the order of the keys.
+            ordered = {key: dict.__getitem__(self, key) for key in self._keys}
+            dict.clear(self)
+            dict.update(self, ordered)
+            self._ordered = True
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self._pending:
+            return self._load_value(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._pending.pop(key, None)
+        self._keys[key] = None
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        if key in self._pending:
+            del self._pending[key]
+        else:
+            dict.__delitem__(self, key)
+        del self._keys[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __eq__(self, other: Any) -> bool:
+        self._load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        self._load_all()
+        return dict.__ne__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._load_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        return copy.deepcopy(self.copy(), memo)
+
+    def copy(self) -> dict[Any, Any]:  # type: ignore[override]
+        self._load_all()
+        return dict(dict.items(self))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self._keys:
+            return self[key]
+        return default
+
+    def keys(self):  # type: ignore[override]
+        return self._keys.keys()
+
+    def values(self):  # type: ignore[override]
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):  # type: ignore[override]
+        self._load_all()
+        return dict.items(self)
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        if key not in self._keys:
+            return dict.pop(self, key, *args)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple[Any, Any]:
+        if not self._keys:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self._keys))
+        return key, self.pop(key)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self._keys:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._pending.clear()
+        dict.clear(self)
+
+
 class BaseSerialization:
     """BaseSerialization provides utils for serialization."""
 
@@ -1159,18 +1325,54 @@ class SerializedDAG(DAG, BaseSerialization):
             raise SerializationError(f'Failed to serialize DAG {dag.dag_id!r}: {e}')
 
     @classmethod
-    def deserialize_dag(cls, encoded_dag: dict[str, Any]) -> SerializedDAG:
-        """Deserializes a DAG from a JSON object."""
+    def deserialize_dag(cls, encoded_dag: dict[str, Any], lazy: bool = False) -> SerializedDAG:
+        """Deserializes a DAG from a JSON object.
+
+        :param encoded_dag: The JSON object of the DAG.
+        :param lazy: If True, each task is only deserialized when it is first
+            accessed through ``task_dict`` (or anything built on it). Task ids,
+            the task groups and the edges between the tasks are available
+            without deserializing any task.
+        """
         dag = SerializedDAG(dag_id=encoded_dag['_dag_id'])
 
+        load_op_links = cls._load_operator_extra_links
+        task_groups: dict[str, TaskGroup] | None = None
+
+        if lazy:
+            task_groups = {}
+            upstream_task_ids: dict[str, set[str]] = collections.defaultdict(set)
+
+            def load_task(task_id: str, encoded_task: dict[str, Any]) -> Operator:
+                # The class attribute may have been changed since the DAG was loaded.
+                SerializedBaseOperator._load_operator_extra_links = load_op_links
+                return SerializedBaseOperator.deserialize_operator(encoded_task)
+
+            def on_task_load(task_id: str, task: Operator) -> None:
+                if task_id in task_groups:  # type: ignore[operator]
+                    task.task_group = weakref.proxy(task_groups[task_id])  # type: ignore[index]
+                cls._set_task_dag_references(dag, task)
+                task.upstream_task_ids.update(upstream_task_ids[task_id])
+
         for k, v in encoded_dag.items():
             if k == "_downstream_task_ids":
                 v = set(v)
             elif k == "tasks":
 
-                SerializedBaseOperator._load_operator_extra_links = cls._load_operator_extra_links
-
-                v = {task["task_id"]: SerializedBaseOperator.deserialize_operator(task) for task in v}
+                SerializedBaseOperator._load_operator_extra_links = load_op_links
+
+                if lazy:
+                    encoded_tasks = v
+                    v = _LazyDict(load_task, on_task_load)
+                    for task in encoded_tasks:
+                        v.add_lazy(task["task_id"], task)
+                        downstream_task_ids = task.get(
+                            "downstream_task_ids", task.get("_downstream_task_ids")
+                        )
+                        for task_id in downstream_task_ids or ():
+                            upstream_task_ids[task_id].add(task["task_id"])
+                else:
+                    v = {task["task_id"]: SerializedBaseOperator.deserialize_operator(task) for task in v}
                 k = "task_dict"
             elif k == "timezone":
                 v = cls._deserialize_timezone(v)
@@ -1204,7 +1406,7 @@ class SerializedDAG(DAG, BaseSerialization):
         # Set _task_group
         if "_task_group" in encoded_dag:
             dag._task_group = SerializedTaskGroup.deserialize_task_group(
-                encoded_dag["_task_group"], None, dag.task_dict, dag
+                encoded_dag["_task_group"], None, dag.task_dict, dag, task_groups=task_groups
             )
         else:
             # This must be old data that had no task_group. Create a root TaskGroup and add
@@ -1223,21 +1425,12 @@ class SerializedDAG(DAG, BaseSerialization):
         for k in keys_to_set_none:
             setattr(dag, k, None)
 
-        for task in dag.task_dict.values():
-            task.dag = dag
-
-            for date_attr in ["start_date", "end_date"]:
-                if getattr(task, date_attr) is None:
-                    setattr(task, date_attr, getattr(dag, date_attr))
+        if lazy:
+            # References to the DAG are set on each task as it is loaded.
+            return dag
 
-            if task.subdag is not None:
-                setattr(task.subdag, 'parent_dag', dag)
-
-            # Dereference expand_input and op_kwargs_expand_input.
-            for k in ("expand_input", "op_kwargs_expand_input"):
-                kwargs_ref = getattr(task, k, None)
-                if isinstance(kwargs_ref, _ExpandInputRef):
-                    setattr(task, k, kwargs_ref.deref(dag))
+        for task in dag.task_dict.values():
+            cls._set_task_dag_references(dag, task)
 
             for task_id in task.downstream_task_ids:
                 # Bypass set_upstream etc here - it does more than we want
@@ -1245,6 +1438,24 @@ class SerializedDAG(DAG, BaseSerialization):
 
         return dag
 
+    @staticmethod
+    def _set_task_dag_references(dag: SerializedDAG, task: Operator) -> None:
+        """Attach a deserialized task to its DAG."""
+        task.dag = dag
+
+        for date_attr in ["start_date", "end_date"]:
+            if getattr(task, date_attr) is None:
+                setattr(task, date_attr, getattr(dag, date_attr))
+
+        if task.subdag is not None:
+            setattr(task.subdag, 'parent_dag', dag)
+
+        # Dereference expand_input and op_kwargs_expand_input.
+        for k in ("expand_input", "op_kwargs_expand_input"):
+            kwargs_ref = getattr(task, k, None)
+            if isinstance(kwargs_ref, _ExpandInputRef):
+                setattr(task, k, kwargs_ref.deref(dag))
+
     @classmethod
     def to_dict(cls, var: Any) -> dict:
         """Stringifies DAGs and operators contained by var and returns a dict of var."""
@@ -1255,12 +1466,17 @@ class SerializedDAG(DAG, BaseSerialization):
         return json_dict
 
     @classmethod
-    def from_dict(cls, serialized_obj: dict) -> SerializedDAG:
-        """Deserializes a python dict in to the DAG and operators it contains."""
+    def from_dict(cls, serialized_obj: dict, lazy: bool = False) -> SerializedDAG:
+        """Deserializes a python dict in to the DAG and operators it contains.
+
+        :param serialized_obj: The python dict.
+        :param lazy: If True, tasks are only deserialized when first accessed.
+            See :meth:`deserialize_dag`.
+        """
         ver = serialized_obj.get('__version', '<not present>')
         if ver != cls.SERIALIZER_VERSION:
             raise ValueError(f"Unsure how to deserialize version {ver!r}")
-        return cls.deserialize_dag(serialized_obj['dag'])
+        return cls.deserialize_dag(serialized_obj['dag'], lazy=lazy)
 
 
 class SerializedTaskGroup(TaskGroup, BaseSerialization):
@@ -1299,8 +1515,15 @@ class SerializedTaskGroup(TaskGroup, BaseSerialization):
         parent_group: TaskGroup | None,
         task_dict: dict[str, Operator],
         dag: SerializedDAG,
+        task_groups: dict[str, TaskGroup] | None = None,
     ) -> TaskGroup:
-        """Deserializes a TaskGroup from a JSON object."""
+        """Deserializes a TaskGroup from a JSON object.
+
+        If ``task_groups`` is given, the tasks of the group are not looked up in
+        ``task_dict`` until they are accessed through the group's children, and
+        the group of each task id is recorded in ``task_groups`` instead of being
+        set on the task.
+        """
         group_id = cls.deserialize(encoded_group["_group_id"])
         kwargs = {
             key: cls.deserialize(encoded_group[key])
@@ -1312,12 +1535,24 @@ class SerializedTaskGroup(TaskGroup, BaseSerialization):
             task.task_group = weakref.proxy(group)
             return task
 
-        group.children = {
-            label: set_ref(task_dict[val])  # type: ignore
-            if _type == DAT.OP  # type: ignore
-            else SerializedTaskGroup.deserialize_task_group(val, group, task_dict, dag=dag)
-            for label, (_type, val) in encoded_group["children"].items()
-        }
+        if task_groups is None:
+            group.children = {
+                label: set_ref(task_dict[val])  # type: ignore
+                if _type == DAT.OP  # type: ignore
+                else SerializedTaskGroup.deserialize_task_group(val, group, task_dict, dag=dag)
+                for label, (_type, val) in encoded_group["children"].items()
+            }
+        else:
+            children = _LazyDict(lambda label, task_id: task_dict[task_id])
+            for label, (_type, val) in encoded_group["children"].items():
+                if _type == DAT.OP:
+                    children.add_lazy(label, val)
+                    task_groups[val] = group
+                else:
+                    children[label] = SerializedTaskGroup.deserialize_task_group(
+                        val, group, task_dict, dag=dag, task_groups=task_groups
+                    )
+            group.children = children
         group.upstream_group_ids.update(cls.deserialize(encoded_group["upstream_group_ids"]))
         group.downstream_group_ids.update(cls.deserialize(encoded_group["downstream_group_ids"]))
         group.upstream_task_ids.update(cls.deserialize(encoded_group["upstream_task_ids"]))
@@ -585,6 +585,16 @@ MIN_SERIALIZED_DAG_UPDATE_INTERVAL = conf.getint('core', 'min_serialized_dag_upd
 # If set to True, serialized DAGs is compressed before writing to DB,
 COMPRESS_SERIALIZED_DAGS = conf.getboolean('core', 'compress_serialized_dags', fallback=False)
 
+# Encoding and compression of serialized DAGs stored in binary form, and of compressed DAG code
+SERIALIZED_DAG_ENCODING = conf.get('core', 'serialized_dag_encoding', fallback='json')
+SERIALIZED_DAG_COMPRESSION = conf.get('core', 'serialized_dag_compression', fallback='zlib')
+
+# If set to True, the source code of DAG files is compressed before writing to DB
+COMPRESS_DAG_CODE = conf.getboolean('core', 'compress_dag_code', fallback=False)
+
+# If set to True, the tasks of serialized DAGs are only deserialized when first accessed
+LAZY_LOAD_SERIALIZED_TASKS = conf.getboolean('core', 'lazy_load_serialized_tasks', fallback=False)
+
 # Fetching serialized DAG can not be faster than a minimum interval to reduce database
 # read rate. This config controls when your DAGs are updated in the Webserver
 MIN_SERIALIZED_DAG_FETCH_INTERVAL = conf.getint('core', 'min_serialized_dag_fetch_interval', fallback=10)
@@ -17,7 +17,8 @@
 # under the License.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Collection, Iterable, NamedTuple
 
 import attr
 from sqlalchemy.orm.session import Session
@@ -29,6 +30,67 @@ if TYPE_CHECKING:
     from airflow.models.taskinstance import TaskInstance
 
 
+class UpstreamStateCounts(NamedTuple):
+    """Number of finished upstream task instances of a task instance, by state"""
+
+    successes: int
+    skipped: int
+    failed: int
+    upstream_failed: int
+    removed: int
+    done: int
+
+
+class UpstreamStateSummary:
+    """
+    Counts of the task instances of a dag run, by task.
+
+    It is computed once per scheduling pass of a dag run, so that the trigger rules of all its task
+    instances can be evaluated without scanning the finished task instances, or querying the database
+    for mapped upstream tasks, for every single one of them.
+
+    :param finished_tis: The finished task instances of the dag run
+    :param tis: All the task instances of the dag run
+    """
+
+    def __init__(self, finished_tis: Iterable[TaskInstance], tis: Iterable[TaskInstance]) -> None:
+        self._finished_states: dict[str, Counter] = defaultdict(Counter)
+        for ti in finished_tis:
+            self._finished_states[ti.task_id][ti.state] += 1
+        self._expanded_ti_counts: Counter | None = Counter(ti.task_id for ti in tis if ti.map_index > 0)
+
+    def count_states(self, upstream_task_ids: Collection[str]) -> UpstreamStateCounts:
+        """Count the finished task instances of the given upstream tasks, by state"""
+        counter: Counter = Counter()
+        for task_id in upstream_task_ids:
+            states = self._finished_states.get(task_id)
+            if states:
+                counter.update(states)
+        return UpstreamStateCounts(
+            successes=counter.get(State.SUCCESS, 0),
+            skipped=counter.get(State.SKIPPED, 0),
+            failed=counter.get(State.FAILED, 0),
+            upstream_failed=counter.get(State.UPSTREAM_FAILED, 0),
+            removed=counter.get(State.REMOVED, 0),
+            done=sum(counter.values()),
+        )
+
+    def count_expanded_tis(self, upstream_task_ids: Collection[str]) -> int | None:
+        """
+        Count the task instances of the given upstream tasks with a map index above zero.
+
+        :return: The count, or None if it is no longer known because mapped tasks were expanded since
+            the summary was computed.
+        """
+        if self._expanded_ti_counts is None:
+            return None
+        return sum(self._expanded_ti_counts.get(task_id, 0) for task_id in upstream_task_ids)
+
+    def forget_expanded_tis(self) -> None:
+        """Forget the counts of expanded task instances, once new ones have been created"""
+        self._expanded_ti_counts = None
+
+
 @attr.define
 class DepContext:
     """
@@ -61,6 +123,8 @@ class DepContext:
         trigger rule
     :param ignore_ti_state: Ignore the task instance's previous failure/success
     :param finished_tis: A list of all the finished task instances of this run
+    :param upstream_states: Summary of the states of the task instances of this run, computed from
+        ``finished_tis``, to evaluate trigger rules with
     """
 
     deps: set = attr.ib(factory=set)
@@ -73,6 +137,7 @@ class DepContext:
     ignore_ti_state: bool = False
     ignore_unmapped_tasks: bool = False
     finished_tis: list[TaskInstance] | None = None
+    upstream_states: UpstreamStateSummary | None = None
 
     have_changed_ti_states: bool = False
     """Have any of the TIs state's been changed as a result of evaluating dependencies"""
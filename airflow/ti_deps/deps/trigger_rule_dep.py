@@ -22,7 +22,7 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import func
 
-from airflow.ti_deps.dep_context import DepContext
+from airflow.ti_deps.dep_context import DepContext, UpstreamStateCounts, UpstreamStateSummary
 from airflow.ti_deps.deps.base_ti_dep import BaseTIDep
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.state import State
@@ -54,13 +54,13 @@ class TriggerRuleDep(BaseTIDep):
         :param finished_tis: all the finished tasks of the dag_run
         """
         counter = Counter(ti.state for ti in finished_tis if ti.task_id in task.upstream_task_ids)
-        return (
-            counter.get(State.SUCCESS, 0),
-            counter.get(State.SKIPPED, 0),
-            counter.get(State.FAILED, 0),
-            counter.get(State.UPSTREAM_FAILED, 0),
-            counter.get(State.REMOVED, 0),
-            sum(counter.values()),
+        return UpstreamStateCounts(
+            successes=counter.get(State.SUCCESS, 0),
+            skipped=counter.get(State.SKIPPED, 0),
+            failed=counter.get(State.FAILED, 0),
+            upstream_failed=counter.get(State.UPSTREAM_FAILED, 0),
+            removed=counter.get(State.REMOVED, 0),
+            done=sum(counter.values()),
         )
 
     @provide_session
@@ -74,9 +74,13 @@ class TriggerRuleDep(BaseTIDep):
             yield self._passing_status(reason="The task had a always trigger rule set.")
             return
         # see if the task name is in the task upstream for our task
-        successes, skipped, failed, upstream_failed, removed, done = self._get_states_count_upstream_ti(
-            task=ti.task, finished_tis=dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-        )
+        if dep_context.upstream_states is not None:
+            counts = dep_context.upstream_states.count_states(ti.task.upstream_task_ids)
+        else:
+            counts = self._get_states_count_upstream_ti(
+                task=ti.task, finished_tis=dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
+            )
+        successes, skipped, failed, upstream_failed, removed, done = counts
 
         yield from self._evaluate_trigger_rule(
             ti=ti,
@@ -92,7 +96,9 @@ class TriggerRuleDep(BaseTIDep):
         )
 
     @staticmethod
-    def _count_upstreams(ti: TaskInstance, *, session: Session):
+    def _count_upstreams(
+        ti: TaskInstance, *, session: Session, upstream_states: UpstreamStateSummary | None = None
+    ):
         from airflow.models.taskinstance import TaskInstance
 
         # Optimization: Don't need to hit the database if no upstreams are mapped.
@@ -100,6 +106,12 @@ class TriggerRuleDep(BaseTIDep):
         if ti.task.dag and not any(ti.task.dag.get_task(tid).is_mapped for tid in upstream_task_ids):
             return len(upstream_task_ids)
 
+        # Nor if the expanded upstreams were already counted for this scheduling pass.
+        if upstream_states is not None:
+            expanded_tis = upstream_states.count_expanded_tis(upstream_task_ids)
+            if expanded_tis is not None:
+                return len(upstream_task_ids) + expanded_tis
+
         # We don't naively count task instances because it is not guaranteed
         # that all upstreams have been created in the database at this point.
         # Instead, we look for already-expanded tasks, and add them to the raw
@@ -147,7 +159,7 @@ class TriggerRuleDep(BaseTIDep):
         :param session: database session
         """
         task = ti.task
-        upstream = self._count_upstreams(ti, session=session)
+        upstream = self._count_upstreams(ti, session=session, upstream_states=dep_context.upstream_states)
         trigger_rule = task.trigger_rule
         upstream_done = done >= upstream
         upstream_tasks_state = {
@@ -18,11 +18,135 @@ from __future__ import annotations
 
 import asyncio
 import datetime
-from typing import Any
+import heapq
+import itertools
+import logging
+import weakref
+from typing import Any, Callable
 
 from airflow.triggers.base import BaseTrigger, TriggerEvent
 from airflow.utils import timezone
 
+log = logging.getLogger(__name__)
+
+# The longest time, in seconds, between two checks of the earliest deadline of a TimerHeap, so that
+# deadlines follow changes of the system clock
+MAX_TIMER_DELAY = 1.0
+
+
+class TimerEntry:
+    """A callback waiting in a :class:`TimerHeap` for its deadline."""
+
+    __slots__ = ("_heap", "callback", "cancelled")
+
+    def __init__(self, heap: TimerHeap, callback: Callable[[], None]):
+        self._heap = heap
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Stop waiting for the deadline; does nothing once the callback was called."""
+        if not self.cancelled:
+            self.cancelled = True
+            self._heap._entry_cancelled()
+
+
+class TimerHeap:
+    """
+    The deadlines waited for in an event loop, in a heap.
+
+    However many deadlines are waited for, the event loop runs a single timer,
+    for the earliest deadline, and calls at once the callbacks of all the
+    deadlines reached. The timer is checked against the system clock at least
+    every ``MAX_TIMER_DELAY`` seconds. Cancelled entries stay in the heap until
+    their deadline, or until they are the majority of the heap and it is rebuilt.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._heap: list[tuple[datetime.datetime, int, TimerEntry]] = []
+        # Orders the entries with the same deadline, which are never compared
+        self._counter = itertools.count()
+        self._num_cancelled = 0
+        self._handle: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._num_cancelled
+
+    def schedule(self, moment: datetime.datetime, callback: Callable[[], None]) -> TimerEntry:
+        """Call ``callback`` in the event loop once the UTC datetime ``moment`` is reached."""
+        entry = TimerEntry(self, callback)
+        heapq.heappush(self._heap, (moment, next(self._counter), entry))
+        if self._handle is None or self._heap[0][2] is entry:
+            self._schedule_timer()
+        return entry
+
+    def _entry_cancelled(self) -> None:
+        self._num_cancelled += 1
+        if self._num_cancelled > len(self._heap) // 2:
+            self._heap = [item for item in self._heap if not item[2].cancelled]
+            heapq.heapify(self._heap)
+            self._num_cancelled = 0
+
+    def _schedule_timer(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._heap:
+            return
+        delay = (self._heap[0][0] - timezone.utcnow()).total_seconds()
+        self._handle = self._loop.call_later(max(0.0, min(delay, MAX_TIMER_DELAY)), self._fire)
+
+    def _fire(self) -> None:
+        self._handle = None
+        now = timezone.utcnow()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)[2]
+            if entry.cancelled:
+                self._num_cancelled -= 1
+            else:
+                # Entries are only called once
+                entry.cancelled = True
+                due.append(entry)
+        try:
+            for entry in due:
+                try:
+                    entry.callback()
+                except Exception:
+                    log.exception("Exception in the callback of a deadline of a TimerHeap")
+        finally:
+            self._schedule_timer()
+
+
+_timer_heaps: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TimerHeap] = weakref.WeakKeyDictionary()
+
+
+def get_timer_heap(loop: asyncio.AbstractEventLoop | None = None) -> TimerHeap:
+    """The timer heap of an event loop, by default the running one."""
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    heap = _timer_heaps.get(loop)
+    if heap is None:
+        heap = _timer_heaps[loop] = TimerHeap(loop)
+    return heap
+
+
+async def sleep_until(moment: datetime.datetime) -> None:
+    """Sleep until the UTC datetime ``moment``, waiting in the timer heap of the running event loop."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def wake_up() -> None:
+        if not future.done():
+            future.set_result(None)
+
+    entry = get_timer_heap(loop).schedule(moment, wake_up)
+    try:
+        await future
+    finally:
+        entry.cancel()
+
 
 class DateTimeTrigger(BaseTrigger):
     """
@@ -49,19 +173,18 @@ class DateTimeTrigger(BaseTrigger):
 
     async def run(self):
         """
-        Simple time delay loop until the relevant time is met.
+        Wait until the relevant time is met.
+
+        The trigger waits in the timer heap of the event loop, shared by all the
+        temporal triggers, rather than waking up periodically. The heap checks its
+        earliest deadline against the system clock at least every second, in case
+        the clock changes unexpectedly, or handles a DST change poorly.
 
-        We do have a two-phase delay to save some cycles, but sleeping is so
-        cheap anyway that it's pretty loose. We also don't just sleep for
-        "the number of seconds until the time" in case the system clock changes
-        unexpectedly, or handles a DST change poorly.
+        The triggerer does not even run this coroutine for triggers of this class
+        and its subclasses which keep this method: it waits for their moment in
+        the timer heap directly.
         """
-        # Sleep an hour at a time while it's more than 2 hours away
-        while (self.moment - timezone.utcnow()).total_seconds() > 2 * 3600:
-            await asyncio.sleep(3600)
-        # Sleep a second at a time otherwise
-        while self.moment > timezone.utcnow():
-            await asyncio.sleep(1)
+        await sleep_until(self.moment)
         # Send our single event and then we're done
         yield TriggerEvent(self.moment)
 
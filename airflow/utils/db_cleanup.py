@@ -110,6 +110,9 @@ config_list: list[_TableConfig] = [
 
 config_dict: dict[str, _TableConfig] = {x.orm_model.name: x for x in sorted(config_list)}
 
+# The tables whose cleanup deletes XComs, directly or by cascade
+_XCOM_TABLES = {'xcom', 'task_instance', 'dag_run'}
+
 
 def _check_for_rows(*, query: Query, print_rows=False):
     num_entities = query.count()
@@ -306,6 +309,16 @@ def _suppress_with_logging(table, session):
             session.rollback()
 
 
+def _purge_xcom_values(*, clean_before_timestamp: DateTime, session: Session) -> None:
+    """Remove the XCom values stored outside the database by the XCom backend which are not used anymore."""
+    from airflow.models.xcom import XCom
+
+    try:
+        XCom.purge_unreferenced(older_than=clean_before_timestamp, session=session)
+    except Exception:
+        logger.warning("Encountered error when removing unreferenced XCom values", exc_info=True)
+
+
 @provide_session
 def run_cleanup(
     *,
@@ -363,3 +376,5 @@ def run_cleanup(
                 session=session,
             )
             session.commit()
+    if not dry_run and _XCOM_TABLES.intersection(effective_config_dict):
+        _purge_xcom_values(clean_before_timestamp=clean_before_timestamp, session=session)
@@ -17,6 +17,7 @@
 # under the License.
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
 import os
@@ -198,6 +199,49 @@ def open_maybe_zipped(fileloc, mode='r'):
         return open(fileloc, mode=mode)
 
 
+def _read_ignore_rules(
+    ignore_file_path: Path,
+    base_dir_path: Path,
+    ignore_rule_type: type[_IgnoreRule],
+    patterns: list[_IgnoreRule],
+) -> list[_IgnoreRule]:
+    """
+    Read the ignore rules defined in an ignore file and append them to the inherited patterns.
+
+    :param ignore_file_path: the ignore file to read
+    :param base_dir_path: the base path of the directory being searched
+    :param ignore_rule_type: the concrete class for ignore rules, which implements the _IgnoreRule interface.
+    :param patterns: the patterns inherited from the parent directories, they are not modified.
+
+    :return: a new list of ignore rules which applies to the directory of the ignore file.
+    """
+    with open(ignore_file_path) as ifile:
+        lines_no_comments = [re.sub(r"\s*#.*", "", line) for line in ifile.read().split("\n")]
+    # append new patterns and filter out "None" objects, which are invalid patterns
+    patterns = patterns + [
+        p
+        for p in [
+            ignore_rule_type.compile(line, base_dir_path, ignore_file_path)
+            for line in lines_no_comments
+            if line
+        ]
+        if p is not None
+    ]
+    # evaluation order of patterns is important with negation
+    # so that later patterns can override earlier patterns
+    return list(OrderedDict.fromkeys(patterns).keys())
+
+
+def _get_ignore_rule_type(ignore_file_syntax: str) -> type[_IgnoreRule]:
+    """Return the concrete class for ignore rules matching the ignore file syntax: regexp or glob."""
+    if ignore_file_syntax == "glob":
+        return _GlobIgnoreRule
+    elif ignore_file_syntax == "regexp" or not ignore_file_syntax:
+        return _RegexpIgnoreRule
+    else:
+        raise ValueError(f"Unsupported ignore_file_syntax: {ignore_file_syntax}")
+
+
 def _find_path_from_directory(
     base_dir_path: str,
     ignore_file_name: str,
@@ -220,21 +264,7 @@ def _find_path_from_directory(
 
         ignore_file_path = Path(root) / ignore_file_name
         if ignore_file_path.is_file():
-            with open(ignore_file_path) as ifile:
-                lines_no_comments = [re.sub(r"\s*#.*", "", line) for line in ifile.read().split("\n")]
-                # append new patterns and filter out "None" objects, which are invalid patterns
-                patterns += [
-                    p
-                    for p in [
-                        ignore_rule_type.compile(line, Path(base_dir_path), ignore_file_path)
-                        for line in lines_no_comments
-                        if line
-                    ]
-                    if p is not None
-                ]
-                # evaluation order of patterns is important with negation
-                # so that later patterns can override earlier patterns
-                patterns = list(OrderedDict.fromkeys(patterns).keys())
+            patterns = _read_ignore_rules(ignore_file_path, Path(base_dir_path), ignore_rule_type, patterns)
 
         dirs[:] = [subdir for subdir in dirs if not ignore_rule_type.match(Path(root) / subdir, patterns)]
 
@@ -270,12 +300,9 @@ def find_path_from_directory(
 
     :return: a generator of file paths.
     """
-    if ignore_file_syntax == "glob":
-        return _find_path_from_directory(base_dir_path, ignore_file_name, _GlobIgnoreRule)
-    elif ignore_file_syntax == "regexp" or not ignore_file_syntax:
-        return _find_path_from_directory(base_dir_path, ignore_file_name, _RegexpIgnoreRule)
-    else:
-        raise ValueError(f"Unsupported ignore_file_syntax: {ignore_file_syntax}")
+    return _find_path_from_directory(
+        base_dir_path, ignore_file_name, _get_ignore_rule_type(ignore_file_syntax)
+    )
 
 
 def list_py_file_paths(
@@ -333,6 +360,23 @@ def find_dag_file_paths(directory: str | pathlib.Path, safe_mode: bool) -> list[
     return file_paths
 
 
+def get_file_hash(file_path: str) -> str | None:
+    """
+    Return a hash of the content of a file.
+
+    :param file_path: Path to the file to hash.
+    :return: the hex digest of the content, or None if the file cannot be read.
+    """
+    file_hash = hashlib.sha1()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                file_hash.update(chunk)
+    except OSError:
+        return None
+    return file_hash.hexdigest()
+
+
 COMMENT_PATTERN = re.compile(r"\s*#.*")
 
 
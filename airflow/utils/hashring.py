@@ -0,0 +1,56 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import bisect
+import hashlib
+from typing import Iterable
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class ConsistentHashRing:
+    """
+    Maps keys onto a set of nodes with consistent hashing.
+
+    Every node is placed at several points of a ring, and a key belongs to the first node found on the
+    ring after the hash of the key. Keys are spread evenly between the nodes, and when a node joins or
+    leaves the ring only the keys of that node move.
+
+    :param nodes: The nodes of the ring
+    :param replicas: Number of points of the ring per node
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 64) -> None:
+        points = sorted(
+            (_hash(f"{node}:{replica}"), node) for node in set(nodes) for replica in range(replicas)
+        )
+        self._hashes = [point_hash for point_hash, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def __len__(self) -> int:
+        return len(set(self._nodes))
+
+    def get_node(self, key: str) -> str:
+        """Return the node the given key belongs to"""
+        if not self._nodes:
+            raise ValueError("The hash ring has no nodes")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
@@ -18,26 +18,169 @@
 """File logging handler for tasks."""
 from __future__ import annotations
 
+import json
 import logging
 import os
 import warnings
+from collections import deque
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator
 from urllib.parse import urljoin
 
 from airflow.configuration import AirflowConfigException, conf
-from airflow.exceptions import RemovedInAirflow3Warning
+from airflow.exceptions import AirflowException, RemovedInAirflow3Warning
 from airflow.utils.context import Context
 from airflow.utils.helpers import parse_template_string, render_template_to_string
+from airflow.utils.log.log_compression import (
+    compress_log,
+    get_log_compression,
+    get_log_files,
+    log_exists,
+    open_log,
+)
+from airflow.utils.log.log_search import LogMatch, LogSearchQuery, search_log_lines
 from airflow.utils.log.logging_mixin import DISABLE_PROPOGATE
 from airflow.utils.log.non_caching_file_handler import NonCachingFileHandler
 from airflow.utils.session import create_session
 from airflow.utils.state import State
 
 if TYPE_CHECKING:
+    import httpx
+
     from airflow.models import TaskInstance
 
 
+logger = logging.getLogger(__name__)
+
+# The number of bytes read at a time when looking for the last lines of a log file
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def find_tail_offset(file: BinaryIO, size: int, num_lines: int) -> int:
+    """
+    Find the byte position at which the last lines of a file start.
+
+    :param file: The file, opened in binary mode
+    :param size: The size of the file
+    :param num_lines: The number of lines at the end of the file
+    :return: The position of the first of the last ``num_lines`` lines, 0 if the file has fewer lines
+    """
+    if num_lines <= 0:
+        return size
+    end = size
+    if size:
+        # The newline ending the last line does not start another line
+        file.seek(size - 1)
+        if file.read(1) == b"\n":
+            end -= 1
+    position = end
+    while position > 0:
+        block_size = min(TAIL_BLOCK_SIZE, position)
+        position -= block_size
+        file.seek(position)
+        block = file.read(block_size)
+        index = len(block)
+        while True:
+            index = block.rfind(b"\n", 0, index)
+            if index == -1:
+                break
+            num_lines -= 1
+            if num_lines == 0:
+                return position + index + 1
+    return 0
+
+
+def _find_tail_offset_in_stream(file: BinaryIO, num_lines: int) -> int:
+    """Find the byte position at which the last lines of a file start, reading it from its start."""
+    position = 0
+    if num_lines <= 0:
+        while True:
+            block = file.read(TAIL_BLOCK_SIZE)
+            if not block:
+                return position
+            position += len(block)
+    # The positions of the last lines, and of the end of the file if it ends with a newline
+    starts: deque[int] = deque([0], maxlen=num_lines + 1)
+    while True:
+        block = file.read(TAIL_BLOCK_SIZE)
+        if not block:
+            break
+        index = block.find(b"\n")
+        while index != -1:
+            starts.append(position + index + 1)
+            index = block.find(b"\n", index + 1)
+        position += len(block)
+    if starts[-1] == position:
+        starts.pop()
+    return starts[-num_lines] if len(starts) >= num_lines else 0
+
+
+def read_log_file(
+    path: str, offset: int | None, length: int = 0, tail_lines: int | None = None
+) -> tuple[bytes, int, bool]:
+    """
+    Read a range of bytes of a log, whether it is compressed or not.
+
+    :param path: The path of the plain log file
+    :param offset: The byte position to read from, or None to read from the start of the log
+        or from its last ``tail_lines`` lines
+    :param length: The maximum number of bytes to read, 0 to read to the end of the log
+    :param tail_lines: The number of lines at the end of the log to read from, when offset is None
+    :return: The bytes, their position in the log, and whether the log holds more bytes after them
+    """
+    if offset is None:
+        offset = 0
+        if tail_lines:
+            with open_log(path) as file:
+                if file.seekable():
+                    offset = find_tail_offset(file, os.fstat(file.fileno()).st_size, tail_lines)
+                else:
+                    offset = _find_tail_offset_in_stream(file, tail_lines)
+    with open_log(path) as file:
+        if file.seekable():
+            file.seek(offset)
+        else:
+            # Compressed logs are read from their start
+            skipped = 0
+            while skipped < offset:
+                block = file.read(min(TAIL_BLOCK_SIZE, offset - skipped))
+                if not block:
+                    break
+                skipped += len(block)
+        data = file.read(length) if length > 0 else file.read()
+        has_more = length > 0 and bool(file.read(1))
+    return data, offset, has_more
+
+
+def _trim_to_last_line(data: bytes) -> bytes:
+    """Cut a chunk of a log after its last complete line, so the next chunk starts on a new line."""
+    end = data.rfind(b"\n")
+    return data[: end + 1] if end != -1 else data
+
+
+def _parse_log_response(response: httpx.Response, offset: int) -> tuple[bytes, int, bool]:
+    """
+    Get the bytes of a log file served by a worker.
+
+    :param response: The response of the worker, which may hold a range of the file
+    :param offset: The position in the file of the requested range
+    :return: The bytes, the position in the file after them, and whether the file holds more bytes
+    """
+    data = response.content
+    content_range = response.headers.get("Content-Range")
+    if response.status_code != 206 or not content_range:
+        # The whole file was served
+        data = data[offset:]
+        return data, offset + len(data), False
+    # Content-Range: bytes <first>-<last>/<size>
+    byte_range, _, size = content_range.split(" ", 1)[-1].partition("/")
+    start = int(byte_range.split("-", 1)[0])
+    has_more = size == "*" or start + len(data) < int(size)
+    if has_more:
+        data = _trim_to_last_line(data)
+    return data, start + len(data), has_more
+
+
 class FileTaskHandler(logging.Handler):
     """
     FileTaskHandler is a python log handler that handles and reads
@@ -53,6 +196,8 @@ class FileTaskHandler(logging.Handler):
         super().__init__()
         self.handler: logging.FileHandler | None = None
         self.local_base = base_log_folder
+        # The compression of the log file once the task is complete, if it is to be compressed
+        self.compression: str | None = None
         if filename_template is not None:
             warnings.warn(
                 "Passing filename_template to a log handler is deprecated and has no effect",
@@ -73,6 +218,13 @@ class FileTaskHandler(logging.Handler):
         if self.formatter:
             self.handler.setFormatter(self.formatter)
         self.handler.setLevel(self.level)
+        # The raw task process writes to the same file as the process supervising it, which
+        # is the last to write to it. Remote handlers upload the plain file when they close.
+        # A raw task process forked from its supervisor inherits the supervisor's handler.
+        if getattr(ti, 'raw', False) or conf.getboolean('logging', 'remote_logging'):
+            self.compression = None
+        else:
+            self.compression = get_log_compression()
 
         return DISABLE_PROPOGATE
 
@@ -87,6 +239,13 @@ class FileTaskHandler(logging.Handler):
     def close(self):
         if self.handler:
             self.handler.close()
+            if self.compression:
+                try:
+                    compress_log(self.handler.baseFilename, self.compression)
+                except Exception:
+                    logging.warning(
+                        "Failed to compress the log file %s", self.handler.baseFilename, exc_info=True
+                    )
 
     def _render_filename(self, ti: TaskInstance, try_number: int) -> str:
         with create_session() as session:
@@ -138,38 +297,53 @@ class FileTaskHandler(logging.Handler):
         Template method that contains custom logic of reading
         logs given the try_number.
 
+        Logs are read at most ``[logging] log_read_chunk_size`` bytes at a time, so
+        large log files are returned over several calls rather than loaded at once.
+
         :param ti: task instance record
         :param try_number: current try_number to read log from
         :param metadata: log metadata,
                          can be used for steaming log reading and auto-tailing.
                          Following attributes are used:
-                         log_pos: (absolute) Char position to which the log
-                                  which was retrieved in previous calls, this
-                                  part will be skipped and only following test
-                                  returned to be added to tail.
+                         log_pos: (absolute) Byte position in the log file to
+                                  which the log was retrieved in previous calls,
+                                  only the following bytes are returned.
+                         tail_lines: Number of lines at the end of the log to
+                                     start reading from, when log_pos is not set.
 
         :return: log message as a string and metadata.
                  Following attributes are used in metadata:
                  end_of_log: Boolean, True if end of log is reached or False
                              if further calls might get more log text.
                              This is determined by the status of the TaskInstance
-                 log_pos: (absolute) Char position to which the log is retrieved
+                             and whether the whole log file was read
+                 log_pos: (absolute) Byte position in the log file to which the log is retrieved
         """
-        from airflow.utils.jwt_signer import JWTSigner
-
         # Task instance here might be different from task instance when
         # initializing the handler. Thus explicitly getting log location
         # is needed to get correct log path.
         log_relative_path = self._render_filename(ti, try_number)
         location = os.path.join(self.local_base, log_relative_path)
 
+        metadata = metadata or {}
+        offset = metadata.get('log_pos')
+        tail_lines = metadata.get('tail_lines')
+        chunk_size = conf.getint('logging', 'log_read_chunk_size', fallback=0)
+
         log = ""
+        # Whether the log file holds more bytes than were read
+        has_more = False
 
-        if os.path.exists(location):
+        if log_exists(location):
             try:
-                with open(location, encoding="utf-8", errors="surrogateescape") as file:
-                    log += f"*** Reading local file: {location}\n"
-                    log += "".join(file.readlines())
+                if offset is None:
+                    for path in get_log_files(location):
+                        log += f"*** Reading local file: {path}\n"
+                data, offset, has_more = read_log_file(location, offset, chunk_size, tail_lines)
+                if has_more:
+                    data = _trim_to_last_line(data)
+                log += data.decode("utf-8", errors="surrogateescape")
+                log_pos = offset + len(data)
             except Exception as e:
                 log = f"*** Failed to load local log file: {location}\n"
                 log += f"*** {str(e)}\n"
@@ -211,32 +385,32 @@ class FileTaskHandler(logging.Handler):
             except Exception as f:
                 log += f'*** Unable to fetch logs from worker pod {ti.hostname} ***\n{str(f)}\n\n'
                 return log, {'end_of_log': True}
+
+            # The pod log is fetched whole, so the previously returned part is cut off
+            log_pos = len(log)
+            if offset:
+                log = log[offset:]
         else:
             import httpx
 
             url = self._get_log_retrieval_url(ti, log_relative_path)
-            log += f"*** Log file does not exist: {location}\n"
-            log += f"*** Fetching from: {url}\n"
+            if offset is None:
+                log += f"*** Log file does not exist: {location}\n"
+                log += f"*** Fetching from: {url}\n"
             try:
-                timeout = None  # No timeout
-                try:
-                    timeout = conf.getint('webserver', 'log_fetch_timeout_sec')
-                except (AirflowConfigException, ValueError):
-                    pass
-
-                signer = JWTSigner(
-                    secret_key=conf.get('webserver', 'secret_key'),
-                    expiration_time_in_seconds=conf.getint(
-                        'webserver', 'log_request_clock_grace', fallback=30
-                    ),
-                    audience="task-instance-logs",
-                )
+                headers = self._get_log_fetch_headers(log_relative_path)
+                params = {}
+                if offset is None and tail_lines:
+                    params['tail_lines'] = tail_lines
+                elif offset or chunk_size > 0:
+                    start = offset or 0
+                    headers['Range'] = (
+                        f"bytes={start}-{start + chunk_size - 1}" if chunk_size > 0 else f"bytes={start}-"
+                    )
+                # Otherwise the whole log is fetched, which the worker may send compressed
                 response = httpx.get(
-                    url,
-                    timeout=timeout,
-                    headers={'Authorization': signer.generate_signed_token({"filename": log_relative_path})},
+                    url, timeout=self._get_log_fetch_timeout(), headers=headers, params=params
                 )
-                response.encoding = "utf-8"
 
                 if response.status_code == 403:
                     log += (
@@ -249,23 +423,45 @@ class FileTaskHandler(logging.Handler):
                         "*** See more at https://airflow.apache.org/docs/apache-airflow/"
                         "stable/configurations-ref.html#secret-key\n***"
                     )
-                # Check if the resource was properly fetched
-                response.raise_for_status()
-
-                log += '\n' + response.text
+                if response.status_code == 416:
+                    # The log file has no bytes after the requested position yet
+                    data = b""
+                    log_pos = offset or 0
+                else:
+                    # Check if the resource was properly fetched
+                    response.raise_for_status()
+                    data, log_pos, has_more = _parse_log_response(response, offset or 0)
+
+                if offset is None:
+                    log += '\n'
+                log += data.decode("utf-8", errors="surrogateescape")
             except Exception as e:
                 log += f"*** Failed to fetch log file from worker. {str(e)}\n"
                 return log, {'end_of_log': True}
 
         # Process tailing if log is not at it's end
-        end_of_log = ti.try_number != try_number or ti.state not in State.running
-        log_pos = len(log)
-        if metadata and 'log_pos' in metadata:
-            previous_chars = metadata['log_pos']
-            log = log[previous_chars:]  # Cut off previously passed log test as new tail
+        end_of_log = not has_more and (ti.try_number != try_number or ti.state not in State.running)
 
         return log, {'end_of_log': end_of_log, 'log_pos': log_pos}
 
+    @staticmethod
+    def _get_log_fetch_timeout() -> int | None:
+        try:
+            return conf.getint('webserver', 'log_fetch_timeout_sec')
+        except (AirflowConfigException, ValueError):
+            return None  # No timeout
+
+    @staticmethod
+    def _get_log_fetch_headers(log_relative_path: str) -> dict[str, str]:
+        from airflow.utils.jwt_signer import JWTSigner
+
+        signer = JWTSigner(
+            secret_key=conf.get('webserver', 'secret_key'),
+            expiration_time_in_seconds=conf.getint('webserver', 'log_request_clock_grace', fallback=30),
+            audience="task-instance-logs",
+        )
+        return {'Authorization': signer.generate_signed_token({"filename": log_relative_path})}
+
     @staticmethod
     def _get_log_retrieval_url(ti: TaskInstance, log_relative_path: str) -> str:
         url = urljoin(
@@ -274,6 +470,86 @@ class FileTaskHandler(logging.Handler):
         )
         return url
 
+    @staticmethod
+    def _get_log_search_url(ti: TaskInstance, log_relative_path: str) -> str:
+        return urljoin(
+            f"http://{ti.hostname}:{conf.get('logging', 'WORKER_LOG_SERVER_PORT')}/search/",
+            log_relative_path,
+        )
+
+    def search_log(self, ti: TaskInstance, try_number: int, query: LogSearchQuery) -> Iterator[LogMatch]:
+        """
+        Search the log of a try of a task instance.
+
+        Local logs are searched as they are read, and logs on workers are searched by
+        the worker serving them. Handlers which read logs from elsewhere are searched in
+        the logs they read.
+
+        :param ti: task instance object
+        :param try_number: task instance try_number to search the log of
+        :param query: what to search
+        :return: the matching lines, yielded as the log is searched
+        """
+        if type(self)._read is FileTaskHandler._read:
+            log_relative_path = self._render_filename(ti, try_number)
+            location = os.path.join(self.local_base, log_relative_path)
+            if log_exists(location):
+                with open_log(location) as file:
+                    yield from search_log_lines(file, query, try_number)
+                return
+            if conf.get('core', 'executor') != 'KubernetesExecutor':
+                yield from self._search_worker_log(ti, try_number, log_relative_path, query)
+                return
+
+        yield from search_log_lines(self._read_log_lines(ti, try_number), query, try_number)
+
+    def _read_log_lines(self, ti: TaskInstance, try_number: int) -> Iterator[bytes]:
+        """Read a log to its end with ``read``, which may return it a chunk at a time, line by line."""
+        metadata: dict[str, Any] = {}
+        rest = b""
+        while True:
+            logs, metadatas = self.read(ti, try_number, metadata)
+            metadata = metadatas[0]
+            data = "".join(host_log for _, host_log in logs[0]).encode("utf-8", errors="surrogateescape")
+            lines = (rest + data).splitlines(keepends=True)
+            # The last line of a chunk may go on in the next chunk
+            rest = lines.pop() if lines and not lines[-1].endswith(b"\n") else b""
+            yield from lines
+            # A running task may have written nothing more since the last chunk
+            if not data or metadata.get("end_of_log", True):
+                break
+        if rest:
+            yield rest
+
+    def _search_worker_log(
+        self, ti: TaskInstance, try_number: int, log_relative_path: str, query: LogSearchQuery
+    ) -> Iterator[LogMatch]:
+        import httpx
+
+        params = {**query.to_params(), "try_number": str(try_number)}
+        try:
+            with httpx.stream(
+                "GET",
+                self._get_log_search_url(ti, log_relative_path),
+                params=params,
+                headers=self._get_log_fetch_headers(log_relative_path),
+                timeout=self._get_log_fetch_timeout(),
+            ) as response:
+                response.raise_for_status()
+                # The worker streams the matches as newline-delimited JSON
+                for line in response.iter_lines():
+                    if line:
+                        yield LogMatch(**json.loads(line))
+        except httpx.HTTPStatusError as e:
+            # Workers serving logs without /search answer it with an error too, so the log
+            # is fetched from the worker and searched here instead
+            logger.warning("Could not search the log on worker %s, fetching it instead: %s", ti.hostname, e)
+        except httpx.TransportError as e:
+            raise AirflowException(f"Could not search the log on worker {ti.hostname}: {e}") from e
+        else:
+            return
+        yield from search_log_lines(self._read_log_lines(ti, try_number), query, try_number)
+
     def read(self, task_instance, try_number=None, metadata=None):
         """
         Read logs of given task instance from local machine.
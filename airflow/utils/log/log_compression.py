@@ -0,0 +1,195 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compressed storage of task log files.
+
+When a task log is complete, its file is compressed into a segment next to it,
+named after it with the suffix of the compression, e.g. ``1.log.gz``. If more
+lines are later written to the same log, as when a rescheduled sensor runs
+again, they go to a new plain file, which is compressed and appended to the
+segment when it is complete in turn. Both gzip members and zstd frames can be
+concatenated, so a segment is read back as a whole. The content of a log is
+the content of its segment followed by the content of its plain file.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from typing import Any, BinaryIO
+
+from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException, AirflowException
+
+# The suffix of the segments written with each compression, which is also its HTTP content coding
+COMPRESSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+# The number of bytes copied at a time when compressing or decompressing a log
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        raise AirflowException(
+            "The 'zstandard' package is required to read or write task logs compressed with zstd. "
+            "Please install it with: pip install zstandard"
+        )
+    return zstandard
+
+
+def get_log_compression() -> str | None:
+    """The compression of completed task logs, from ``[logging] task_log_compression``, or None."""
+    compression = conf.get('logging', 'task_log_compression', fallback='none').strip().lower()
+    if compression in ('', 'none'):
+        return None
+    if compression not in COMPRESSIONS:
+        raise AirflowConfigException(
+            f"Unknown task log compression {compression!r}, expected one of {['none', *COMPRESSIONS]}"
+        )
+    if compression == 'zstd':
+        _import_zstandard()
+    return compression
+
+
+def find_compressed_log(path: str) -> tuple[str, str] | None:
+    """
+    Find the compressed segment of a log.
+
+    :param path: The path of the plain log file
+    :return: The path of the segment and its compression, or None if the log has no segment
+    """
+    for compression, suffix in COMPRESSIONS.items():
+        if os.path.exists(path + suffix):
+            return path + suffix, compression
+    return None
+
+
+def get_log_files(path: str) -> list[str]:
+    """The files holding a log, in the order of their content: its compressed segment and its plain file."""
+    files = []
+    compressed = find_compressed_log(path)
+    if compressed:
+        files.append(compressed[0])
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def log_exists(path: str) -> bool:
+    """Whether a log has a plain file or a compressed segment."""
+    return bool(get_log_files(path))
+
+
+def _open_segment(path: str, compression: str) -> BinaryIO:
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')  # type: ignore[return-value]
+    return _import_zstandard().ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+
+
+def _write_segment(source: BinaryIO, target: BinaryIO, compression: str) -> None:
+    if compression == 'gzip':
+        with gzip.GzipFile(fileobj=target, mode='wb') as writer:
+            shutil.copyfileobj(source, writer, COPY_BUFFER_SIZE)
+    else:
+        _import_zstandard().ZstdCompressor().copy_stream(source, target)
+
+
+def compress_log(path: str, compression: str) -> None:
+    """
+    Compress the plain file of a log and append it to the segment of the log.
+
+    The plain file is removed once compressed. A log which already has a segment keeps
+    its compression, so it is always stored in a single segment.
+
+    :param path: The path of the plain log file
+    :param compression: The compression of the segment, when the log has none yet
+    """
+    if not os.path.exists(path):
+        return
+    compressed = find_compressed_log(path)
+    if compressed:
+        segment_path, compression = compressed
+    else:
+        segment_path = path + COMPRESSIONS[compression]
+    # Write to a temporary file first so readers never see a partially written segment
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as target:
+            if compressed:
+                with open(segment_path, 'rb') as segment:
+                    shutil.copyfileobj(segment, target, COPY_BUFFER_SIZE)
+            with open(path, 'rb') as source:
+                _write_segment(source, target, compression)
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        os.replace(tmp_path, segment_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    os.unlink(path)
+
+
+class _ConcatenatedReader(io.RawIOBase):
+    """Read several files one after the other, as if they were one file."""
+
+    def __init__(self, files: list[BinaryIO]):
+        self._files = files
+        self._index = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._index < len(self._files):
+            data = self._files[self._index].read(len(buffer))
+            if data:
+                buffer[: len(data)] = data
+                return len(data)
+            self._index += 1
+        return 0
+
+    def close(self) -> None:
+        for file in self._files:
+            file.close()
+        super().close()
+
+
+def open_log(path: str) -> BinaryIO:
+    """
+    Open a log for reading its content, whether it is compressed or not.
+
+    A log without a segment is opened as a regular file. Otherwise the returned file is
+    not seekable: positions in it are reached by reading the content before them.
+
+    :param path: The path of the plain log file
+    :raises FileNotFoundError: If the log has neither a plain file nor a segment
+    """
+    compressed = find_compressed_log(path)
+    if compressed is None:
+        return open(path, 'rb')
+    files = [_open_segment(*compressed)]
+    try:
+        files.append(open(path, 'rb'))
+    except FileNotFoundError:
+        pass
+    return io.BufferedReader(_ConcatenatedReader(files), COPY_BUFFER_SIZE)  # type: ignore[return-value]
@@ -25,6 +25,7 @@ from airflow.compat.functools import cached_property
 from airflow.configuration import conf
 from airflow.models.taskinstance import TaskInstance
 from airflow.utils.helpers import render_log_filename
+from airflow.utils.log.log_search import LogMatch, LogSearchQuery
 from airflow.utils.log.logging_mixin import ExternalLoggingMixin
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.state import State
@@ -64,6 +65,9 @@ class TaskLogReader:
         """
         Used to continuously read log to the end
 
+        The log is read one chunk at a time as the stream is consumed. The log of a
+        running try is read until the end of what has been written so far.
+
         :param ti: The Task Instance
         :param try_number: the task try number
         :param metadata: A dictionary containing information about how to read the task log
@@ -79,13 +83,43 @@ class TaskLogReader:
             metadata.pop('max_offset', None)
             metadata.pop('offset', None)
             metadata.pop('log_pos', None)
+            previous_log_pos = None
             while 'end_of_log' not in metadata or (
-                not metadata['end_of_log'] and ti.state not in State.running
+                not metadata['end_of_log']
+                and (ti.state not in State.running or metadata.get('log_pos') != previous_log_pos)
             ):
+                previous_log_pos = metadata.get('log_pos')
                 logs, metadata = self.read_log_chunks(ti, current_try_number, metadata)
                 for host, log in logs[0]:
                     yield "\n".join([host or '', log]) + "\n"
 
+    def search_log(
+        self, ti: TaskInstance, try_number: int | None, query: LogSearchQuery
+    ) -> Iterator[LogMatch]:
+        """
+        Search the logs of a Task Instance.
+
+        :param ti: The Task Instance
+        :param try_number: If provided, the log of the given try is searched.
+            Otherwise, the logs of all attempts are searched.
+        :param query: What to search, ``max_matches`` limiting the matches across all attempts
+        :rtype: Iterator[LogMatch]
+        """
+        if try_number is None:
+            try_numbers = list(range(1, ti.next_try_number))
+        else:
+            try_numbers = [try_number]
+        max_matches = query.max_matches
+        for current_try_number in try_numbers:
+            if max_matches is not None and max_matches <= 0:
+                return
+            for match in self.log_handler.search_log(
+                ti, current_try_number, query._replace(max_matches=max_matches)
+            ):
+                yield match
+                if max_matches is not None:
+                    max_matches -= 1
+
     @cached_property
     def log_handler(self):
         """Log handler, which is configured to read logs."""
@@ -99,6 +133,11 @@ class TaskLogReader:
         """Checks if a read operation is supported by a current log handler."""
         return hasattr(self.log_handler, 'read')
 
+    @property
+    def supports_search(self) -> bool:
+        """Checks if a search operation is supported by a current log handler."""
+        return hasattr(self.log_handler, 'search_log')
+
     @property
     def supports_external_link(self) -> bool:
         """Check if the logging handler supports external links (e.g. to Elasticsearch, Stackdriver, etc)."""
@@ -0,0 +1,197 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Search of task logs.
+
+Logs are searched line by line as they are read, so only the matching lines and
+their context are held in memory. The level and the time of a line are those of
+the log record it belongs to: lines which do not start a record, such as the lines
+of a traceback, belong to the record before them.
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from datetime import datetime
+from typing import Any, Collection, Iterable, Iterator, Mapping, NamedTuple, Pattern
+
+from airflow.utils import timezone
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# The start of a line written by the default log formats, e.g.
+# "[2022-06-12T13:00:00.123+0000] {taskinstance.py:1165} INFO - ..."
+RECORD_START = re.compile(
+    r"^\[?(?P<timestamp>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\]?"
+    rf".*?\b(?P<level>{'|'.join(LOG_LEVELS)})\b"
+)
+
+
+class LogSearchQuery(NamedTuple):
+    """
+    What to search in task logs.
+
+    :param pattern: The text or regular expression lines must contain; every line matches an empty pattern
+    :param regex: Whether the pattern is a regular expression
+    :param ignore_case: Whether the case of letters is ignored when matching the pattern
+    :param levels: The levels of the log records to search, all of them if None
+    :param start_date: The earliest time of the log records to search
+    :param end_date: The latest time of the log records to search
+    :param context_lines: The number of lines returned before and after each matching line
+    :param max_matches: The maximum number of matching lines returned
+    """
+
+    pattern: str = ""
+    regex: bool = False
+    ignore_case: bool = False
+    levels: Collection[str] | None = None
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+    context_lines: int = 0
+    max_matches: int | None = None
+
+    def compile(self) -> Pattern[str]:
+        """
+        Compile the pattern of the query.
+
+        :raises re.error: If the pattern is not a valid regular expression
+        """
+        pattern = self.pattern if self.regex else re.escape(self.pattern)
+        return re.compile(pattern, re.IGNORECASE if self.ignore_case else 0)
+
+    def to_params(self) -> dict[str, str]:
+        """The query as URL query parameters, read back by :meth:`from_params`."""
+        params = {
+            "pattern": self.pattern,
+            "regex": str(self.regex).lower(),
+            "ignore_case": str(self.ignore_case).lower(),
+            "context_lines": str(self.context_lines),
+        }
+        if self.levels is not None:
+            params["levels"] = ",".join(self.levels)
+        if self.start_date is not None:
+            params["start_date"] = self.start_date.isoformat()
+        if self.end_date is not None:
+            params["end_date"] = self.end_date.isoformat()
+        if self.max_matches is not None:
+            params["max_matches"] = str(self.max_matches)
+        return params
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, str]) -> LogSearchQuery:
+        """
+        Read a query from URL query parameters written by :meth:`to_params`.
+
+        :raises ValueError: If a parameter is not valid
+        """
+        levels = params.get("levels")
+        start_date = params.get("start_date")
+        end_date = params.get("end_date")
+        max_matches = params.get("max_matches")
+        return cls(
+            pattern=params.get("pattern", ""),
+            regex=params.get("regex") == "true",
+            ignore_case=params.get("ignore_case") == "true",
+            levels=levels.split(",") if levels is not None else None,
+            start_date=timezone.parse(start_date) if start_date else None,
+            end_date=timezone.parse(end_date) if end_date else None,
+            context_lines=int(params.get("context_lines", 0)),
+            max_matches=int(max_matches) if max_matches else None,
+        )
+
+
+class LogMatch(NamedTuple):
+    """A line of a task log matching a search, with the lines around it."""
+
+    try_number: int
+    offset: int
+    line: str
+    context_before: list[str]
+    context_after: list[str]
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+def _parse_record_start(line: str) -> tuple[str, datetime | None] | None:
+    match = RECORD_START.match(line)
+    if not match:
+        return None
+    try:
+        timestamp = timezone.parse(match.group("timestamp").replace(",", "."))
+    except ValueError:
+        timestamp = None
+    return match.group("level"), timestamp
+
+
+def search_log_lines(lines: Iterable[bytes], query: LogSearchQuery, try_number: int) -> Iterator[LogMatch]:
+    """
+    Search the lines of a log.
+
+    :param lines: The lines of the log, with their line endings, as read from a file opened in binary mode
+    :param query: What to search
+    :param try_number: The try of the task instance the log was written by
+    :return: The matching lines, in the order of the log, each yielded once the lines after it are read
+    """
+    pattern = query.compile()
+    levels = {level.upper() for level in query.levels} if query.levels is not None else None
+    start_date, end_date = query.start_date, query.end_date
+    context_lines = max(query.context_lines, 0)
+    max_matches = query.max_matches
+
+    before: deque[str] = deque(maxlen=context_lines)
+    # The matches still waiting for the lines after them
+    pending: deque[LogMatch] = deque()
+    num_matches = 0
+    level: str | None = None
+    timestamp: datetime | None = None
+    offset = 0
+
+    for raw_line in lines:
+        line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+        line_offset = offset
+        offset += len(raw_line)
+
+        for match in pending:
+            match.context_after.append(line)
+        while pending and len(pending[0].context_after) >= context_lines:
+            yield pending.popleft()
+
+        if max_matches is not None and num_matches >= max_matches:
+            if not pending:
+                return
+            continue
+
+        record_start = _parse_record_start(line)
+        if record_start:
+            level, timestamp = record_start
+
+        if (
+            (levels is None or level in levels)
+            and (start_date is None or (timestamp is not None and timestamp >= start_date))
+            and (end_date is None or (timestamp is not None and timestamp <= end_date))
+            and pattern.search(line)
+        ):
+            num_matches += 1
+            match = LogMatch(try_number, line_offset, line, list(before), [])
+            if context_lines:
+                pending.append(match)
+            else:
+                yield match
+        before.append(line)
+
+    yield from pending
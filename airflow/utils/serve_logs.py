@@ -18,12 +18,15 @@
 from __future__ import annotations
 
 import collections
+import json
 import logging
 import os
+import re
 import socket
+from typing import Iterator
 
 import gunicorn.app.base
-from flask import Flask, abort, request, send_from_directory
+from flask import Flask, Response, abort, request, send_file, send_from_directory
 from jwt.exceptions import (
     ExpiredSignatureError,
     ImmatureSignatureError,
@@ -32,10 +35,14 @@ from jwt.exceptions import (
     InvalidSignatureError,
 )
 from setproctitle import setproctitle
+from werkzeug.security import safe_join
 
 from airflow.configuration import conf
 from airflow.utils.docs import get_docs_url
 from airflow.utils.jwt_signer import JWTSigner
+from airflow.utils.log.file_task_handler import read_log_file
+from airflow.utils.log.log_compression import COPY_BUFFER_SIZE, find_compressed_log, log_exists, open_log
+from airflow.utils.log.log_search import LogSearchQuery, search_log_lines
 
 logger = logging.getLogger(__name__)
 
@@ -106,11 +113,84 @@ def create_app():
 
     @flask_app.route('/log/<path:filename>')
     def serve_logs_view(filename):
-        return send_from_directory(log_directory, filename, mimetype="application/json", as_attachment=False)
+        path = safe_join(log_directory, filename)
+        if path is None:
+            abort(404)
+        tail_lines = request.args.get('tail_lines', type=int)
+        if tail_lines:
+            return _serve_log_range(path, None, tail_lines=tail_lines)
+        compressed = find_compressed_log(path)
+        if compressed is None:
+            # Range requests are answered with the requested bytes of the file
+            return send_from_directory(
+                log_directory, filename, mimetype="application/json", as_attachment=False
+            )
+        return _serve_compressed_log(path, *compressed)
+
+    @flask_app.route('/search/<path:filename>')
+    def search_logs_view(filename):
+        path = safe_join(log_directory, filename)
+        if path is None or not log_exists(path):
+            abort(404)
+        try:
+            query = LogSearchQuery.from_params(request.args)
+            query.compile()
+            try_number = int(request.args.get('try_number', 0))
+        except (ValueError, re.error) as e:
+            return Response(str(e), status=400)
+        return Response(_stream_log_matches(path, query, try_number), mimetype="application/x-ndjson")
 
     return flask_app
 
 
+def _serve_log_range(
+    path: str, start: int | None, length: int = 0, tail_lines: int | None = None
+) -> Response:
+    """
+    Serve a range of the bytes of a log, as a partial response.
+
+    The Content-Range header tells the position in the log from which to request the rest of it. The
+    size of a compressed log is only known once it is read to its end, so it is not always given.
+    """
+    if not log_exists(path):
+        abort(404)
+    data, start, has_more = read_log_file(path, start, length, tail_lines)
+    if not data:
+        if start:
+            return Response(status=416)
+        return Response(b"", mimetype="application/json")
+    response = Response(data, status=206, mimetype="application/json")
+    size = "*" if has_more else start + len(data)
+    response.headers["Content-Range"] = f"bytes {start}-{start + len(data) - 1}/{size}"
+    return response
+
+
+def _serve_compressed_log(path: str, segment_path: str, compression: str) -> Response:
+    byte_range = request.range
+    if byte_range and len(byte_range.ranges) == 1 and byte_range.ranges[0][0] >= 0:
+        start, end = byte_range.ranges[0]
+        return _serve_log_range(path, start, end - start if end else 0)
+    if not os.path.exists(path) and request.accept_encodings[compression]:
+        # The segment holds the whole log, so it is sent as it is stored for the client to decompress
+        response = send_file(segment_path, mimetype="application/json", conditional=False)
+        response.headers["Content-Encoding"] = compression
+    else:
+        response = Response(_stream_log(path), mimetype="application/json", direct_passthrough=True)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _stream_log_matches(path: str, query: LogSearchQuery, try_number: int) -> Iterator[bytes]:
+    with open_log(path) as file:
+        for match in search_log_lines(file, query, try_number):
+            yield (json.dumps(match.to_dict()) + "\n").encode()
+
+
+def _stream_log(path: str) -> Iterator[bytes]:
+    with open_log(path) as file:
+        yield from iter(lambda: file.read(COPY_BUFFER_SIZE), b"")
+
+
 GunicornOption = collections.namedtuple("GunicornOption", ["key", "value"])
 
 
@@ -21,7 +21,7 @@ import copy
 import datetime
 import json
 import logging
-from typing import Any, Iterable
+from typing import Any, Callable, Collection, Iterable, Sequence
 
 import pendulum
 from dateutil import relativedelta
@@ -41,6 +41,10 @@ log = logging.getLogger(__name__)
 
 utc = pendulum.tz.timezone('UTC')
 
+# The most values sent at once in the IN clause of filter_in_chunks_and_limit. Databases limit the
+# number of parameters of a statement, e.g. 2100 for MSSQL.
+MAX_IN_CLAUSE_VALUES = 1000
+
 using_mysql = conf.get_mandatory_value('database', 'sql_alchemy_conn').lower().startswith('mysql')
 
 
@@ -440,3 +444,39 @@ def tuple_not_in_condition(
     if not clauses:
         return true()
     return and_(*clauses)
+
+
+def filter_in_chunks_and_limit(
+    query,
+    column: ColumnElement,
+    values: Collection[Any],
+    limit: int,
+    sort_columns: Sequence[ColumnElement],
+    sort_key: Callable[[Any], Any],
+):
+    """
+    Restrict an ordered query to the rows whose ``column`` is in ``values``, and limit it.
+
+    When there are more than ``MAX_IN_CLAUSE_VALUES`` values, the query is first run for each
+    chunk of them, selecting only ``column`` and ``sort_columns``, to find its first ``limit``
+    rows. The returned query is restricted to the values of the first ``limit`` rows among
+    those, so it never sends more than ``MAX_IN_CLAUSE_VALUES`` values either.
+
+    :param query: An SQLAlchemy Query object, with its ordering but no limit
+    :param column: The column whose values the rows are restricted to
+    :param values: The values of ``column`` of the rows to return
+    :param limit: The maximum number of rows returned
+    :param sort_columns: The columns the query is ordered by
+    :param sort_key: Sorts rows of ``column`` and ``sort_columns`` in the order of the query
+    :return: updated query
+    """
+    if len(values) > MAX_IN_CLAUSE_VALUES:
+        rows = []
+        sorted_values = sorted(values)
+        for i in range(0, len(sorted_values), MAX_IN_CLAUSE_VALUES):
+            chunk = sorted_values[i : i + MAX_IN_CLAUSE_VALUES]
+            rows.extend(query.with_entities(column, *sort_columns).filter(column.in_(chunk)).limit(limit))
+        rows.sort(key=sort_key)
+        # The values of the first rows, in order
+        values = list(dict.fromkeys(row[0] for row in rows[:limit]))[:MAX_IN_CLAUSE_VALUES]
+    return query.filter(column.in_(values)).limit(limit)
@@ -19,8 +19,9 @@
 
 /* global describe, test, expect */
 
-import type { DagRun } from 'src/types';
-import { areActiveRuns } from './useGridData';
+import type { DagRun, Task } from 'src/types';
+import { areActiveRuns, mergeGridData } from './useGridData';
+import type { GridData } from './useGridData';
 
 const commonDagRunParams = {
   runId: 'runId',
@@ -57,3 +58,69 @@ describe('Test areActiveRuns()', () => {
     expect(result).toBe(false);
   });
 });
+
+describe('Test mergeGridData()', () => {
+  const run = (runId: string, state: DagRun['state']): DagRun => ({
+    ...commonDagRunParams, runId, state,
+  });
+  const instance = (runId: string, state: DagRun['state']) => ({
+    runId, taskId: 'task', state, startDate: null, endDate: null,
+  });
+  const groups = (instances: Task['instances']): Task => ({
+    id: null,
+    label: null,
+    instances: [],
+    children: [{ id: 'task', label: 'task', instances }],
+  });
+  const previous = {
+    dagRuns: [run('run1', 'success'), run('run2', 'running')],
+    groups: groups([instance('run1', 'success'), instance('run2', 'running')]),
+    ordering: ['data_interval_end'],
+    cursor: '2022-01-01T10:00:00+00:00',
+  } as GridData;
+
+  test('Replaces the runs which changed and keeps the others', () => {
+    const update = {
+      dagRuns: [run('run2', 'success'), run('run3', 'running')],
+      groups: groups([instance('run2', 'success'), instance('run3', 'running')]),
+      ordering: ['data_interval_end'],
+      cursor: '2022-01-01T10:01:00+00:00',
+      runIds: ['run2', 'run3'],
+    } as GridData & { runIds: string[] };
+
+    expect(mergeGridData(previous, update)).toEqual({
+      dagRuns: [run('run2', 'success'), run('run3', 'running')],
+      groups: groups([instance('run2', 'success'), instance('run3', 'running')]),
+      ordering: ['data_interval_end'],
+      cursor: '2022-01-01T10:01:00+00:00',
+    });
+  });
+
+  test('Keeps the instances of the runs which did not change', () => {
+    const update = {
+      dagRuns: [run('run2', 'success')],
+      groups: groups([instance('run2', 'success')]),
+      ordering: ['data_interval_end'],
+      cursor: '2022-01-01T10:01:00+00:00',
+      runIds: ['run1', 'run2'],
+    } as GridData & { runIds: string[] };
+
+    const merged = mergeGridData(previous, update);
+    expect(merged?.dagRuns).toEqual([run('run1', 'success'), run('run2', 'success')]);
+    expect(merged?.groups.children?.[0].instances).toEqual([
+      instance('run1', 'success'), instance('run2', 'success'),
+    ]);
+  });
+
+  test('Returns null when a run which did not change is missing', () => {
+    const update = {
+      dagRuns: [],
+      groups: groups([]),
+      ordering: ['data_interval_end'],
+      cursor: '2022-01-01T10:01:00+00:00',
+      runIds: ['run0', 'run1', 'run2'],
+    } as GridData & { runIds: string[] };
+
+    expect(mergeGridData(previous, update)).toBeNull();
+  });
+});
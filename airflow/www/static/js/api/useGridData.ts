@@ -17,7 +17,7 @@
  * under the License.
  */
 
-import { useQuery } from 'react-query';
+import { useQuery, useQueryClient } from 'react-query';
 import axios, { AxiosResponse } from 'axios';
 
 import { getMetaValue } from 'src/utils';
@@ -26,7 +26,9 @@ import useErrorToast from 'src/utils/useErrorToast';
 import useFilters, {
   BASE_DATE_PARAM, NUM_RUNS_PARAM, RUN_STATE_PARAM, RUN_TYPE_PARAM, now,
 } from 'src/dag/useFilters';
-import type { Task, DagRun, RunOrdering } from 'src/types';
+import type {
+  Task, DagRun, RunOrdering, TaskInstance,
+} from 'src/types';
 import { camelCase } from 'lodash';
 
 const DAG_ID_PARAM = 'dag_id';
@@ -40,6 +42,13 @@ export interface GridData {
   dagRuns: DagRun[];
   groups: Task;
   ordering: RunOrdering;
+  // passed back as `since` to only get the runs which changed
+  cursor?: string;
+}
+
+// the runs which changed since a cursor, along with the ids of all the runs displayed
+interface GridDataUpdate extends GridData {
+  runIds: string[];
 }
 
 const emptyGridData: GridData = {
@@ -57,9 +66,46 @@ const formatOrdering = (data: GridData) => ({
   ordering: data.ordering.map((o: string) => camelCase(o)) as RunOrdering,
 });
 
+// merge the runs which changed into the grid data already fetched,
+// or return null if a run which did not change is missing from it
+export const mergeGridData = (previous: GridData, update: GridDataUpdate): GridData | null => {
+  const changedRuns = new Map(update.dagRuns.map((run) => [run.runId, run]));
+  const previousRuns = new Map(previous.dagRuns.map((run) => [run.runId, run]));
+  const dagRuns = update.runIds.map((runId) => changedRuns.get(runId) || previousRuns.get(runId));
+  // a run which did not change is displayed for the first time when a more recent one is deleted
+  if (dagRuns.some((run) => !run)) return null;
+
+  const previousInstances = new Map<string | null, TaskInstance[]>();
+  const addInstances = (task: Task) => {
+    previousInstances.set(task.id, task.instances);
+    task.children?.forEach(addInstances);
+  };
+  addInstances(previous.groups);
+
+  const runIds = new Set(update.runIds);
+  const mergeTask = (task: Task): Task => ({
+    ...task,
+    instances: [
+      ...(previousInstances.get(task.id) || []).filter(
+        (ti) => runIds.has(ti.runId) && !changedRuns.has(ti.runId),
+      ),
+      ...task.instances,
+    ],
+    ...(task.children && { children: task.children.map(mergeTask) }),
+  });
+
+  return {
+    dagRuns: dagRuns as DagRun[],
+    groups: mergeTask(update.groups),
+    ordering: update.ordering,
+    cursor: update.cursor,
+  };
+};
+
 export const areActiveRuns = (runs: DagRun[] = []) => runs.filter((run) => ['queued', 'running'].includes(run.state)).length > 0;
 
 const useGridData = () => {
+  const queryClient = useQueryClient();
   const { isRefreshOn, stopRefresh } = useAutoRefresh();
   const errorToast = useErrorToast();
   const {
@@ -68,8 +114,9 @@ const useGridData = () => {
     },
   } = useFilters();
 
+  const queryKey = ['gridData', baseDate, numRuns, runType, runState];
   const query = useQuery(
-    ['gridData', baseDate, numRuns, runType, runState],
+    queryKey,
     async () => {
       const params = {
         root: urlRoot || undefined,
@@ -79,7 +126,19 @@ const useGridData = () => {
         [RUN_TYPE_PARAM]: runType,
         [RUN_STATE_PARAM]: runState,
       };
-      const response = await axios.get<AxiosResponse, GridData>(gridDataUrl, { params });
+      // only get the runs which changed since the grid data already fetched
+      const previous = queryClient.getQueryData<GridData>(queryKey);
+      let response: GridData | null = null;
+      if (previous?.cursor) {
+        const update = await axios.get<AxiosResponse, GridDataUpdate>(
+          gridDataUrl,
+          { params: { ...params, since: previous.cursor } },
+        );
+        response = mergeGridData(previous, update);
+      }
+      if (!response) {
+        response = await axios.get<AxiosResponse, GridData>(gridDataUrl, { params });
+      }
       // turn off auto refresh if there are no active runs
       if (!areActiveRuns(response.dagRuns)) stopRefresh();
       return response;
@@ -432,6 +432,32 @@ export interface paths {
       };
     };
   };
+  "/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}/logSearch": {
+    /**
+     * Search the logs of a task instance, and get the matching lines with the lines around them.
+     * The logs are searched where they are stored, so only the matching lines are transferred.
+     *
+     * Log lines which do not start a log record, such as the lines of a traceback,
+     * have the level and the time of the record before them.
+     *
+     * *New in version 2.5.0*
+     */
+    get: operations["search_log"];
+    parameters: {
+      path: {
+        /** The DAG ID. */
+        dag_id: components["parameters"]["DAGID"];
+        /** The DAG run ID. */
+        dag_run_id: components["parameters"]["DAGRunID"];
+        /** The task ID. */
+        task_id: components["parameters"]["TaskID"];
+      };
+      query: {
+        /** Filter on map index for mapped task. */
+        map_index?: components["parameters"]["FilterMapIndex"];
+      };
+    };
+  };
   "/dags/{dag_id}/details": {
     /** The response contains many DAG attributes, so the response can be large. If possible, consider using GET /dags/{dag_id}. */
     get: operations["get_dag_details"];
@@ -1045,6 +1071,32 @@ export interface components {
     EventLogCollection: {
       event_logs?: components["schemas"]["EventLog"][];
     } & components["schemas"]["CollectionInfo"];
+    /**
+     * @description A line of a log matching a search.
+     *
+     * *New in version 2.5.0*
+     */
+    LogMatch: {
+      /** @description The try number whose log holds the line. */
+      try_number?: number;
+      /** @description The position of the line in the log, in bytes. */
+      offset?: number;
+      line?: string;
+      /** @description The lines before the matching line. */
+      context_before?: string[];
+      /** @description The lines after the matching line. */
+      context_after?: string[];
+    };
+    /**
+     * @description The lines of a log matching a search.
+     *
+     * *New in version 2.5.0*
+     */
+    LogSearchResult: {
+      matches?: components["schemas"]["LogMatch"][];
+      /** @description Whether more lines match the search than were returned. */
+      truncated?: boolean;
+    };
     ImportError: {
       /** @description The import error ID. */
       import_error_id?: number;
@@ -1942,8 +1994,19 @@ export interface components {
     };
     /** @description Metadata about collection. */
     CollectionInfo: {
-      /** @description Count of objects in the current result set. */
-      total_entries?: number;
+      /**
+       * @description Count of objects in the current result set.
+       *
+       * *Changed in version 2.5.0*&#58; Null if `skip_total_entries` is set.
+       */
+      total_entries?: number | null;
+      /**
+       * @description A cursor to pass as the `cursor` parameter to get the next page of results.
+       * Only present on full pages of endpoints supporting cursors.
+       *
+       * *New in version 2.5.0*
+       */
+      next_cursor?: string;
     };
     /**
      * @description Task state.
@@ -2063,6 +2126,19 @@ export interface components {
     PageOffset: number;
     /** @description The numbers of items to return. */
     PageLimit: number;
+    /**
+     * @description The `next_cursor` of the previous page. Only the items after the last item of that page are
+     * returned. Unlike an offset, the cursor does not require skipping over the previous pages.
+     *
+     * *New in version 2.5.0*
+     */
+    PageCursor: string;
+    /**
+     * @description Do not count the total number of entries, which is costly on large tables.
+     *
+     * *New in version 2.5.0*
+     */
+    SkipTotalEntries: boolean;
     /**
      * @description The username of the user.
      *
@@ -2578,6 +2654,19 @@ export interface operations {
         limit?: components["parameters"]["PageLimit"];
         /** The number of items to skip before starting to collect the result set. */
         offset?: components["parameters"]["PageOffset"];
+        /**
+         * The `next_cursor` of the previous page. Only the items after the last item of that page are
+         * returned. Unlike an offset, the cursor does not require skipping over the previous pages.
+         *
+         * *New in version 2.5.0*
+         */
+        cursor?: components["parameters"]["PageCursor"];
+        /**
+         * Do not count the total number of entries, which is costly on large tables.
+         *
+         * *New in version 2.5.0*
+         */
+        skip_total_entries?: components["parameters"]["SkipTotalEntries"];
         /**
          * Returns objects greater or equal to the specified date.
          *
@@ -2668,6 +2757,7 @@ export interface operations {
       200: {
         content: {
           "application/json": components["schemas"]["DAGRunCollection"];
+          "application/x-ndjson": components["schemas"]["DAGRun"];
         };
       };
       400: components["responses"]["BadRequest"];
@@ -2817,6 +2907,19 @@ export interface operations {
         limit?: components["parameters"]["PageLimit"];
         /** The number of items to skip before starting to collect the result set. */
         offset?: components["parameters"]["PageOffset"];
+        /**
+         * The `next_cursor` of the previous page. Only the items after the last item of that page are
+         * returned. Unlike an offset, the cursor does not require skipping over the previous pages.
+         *
+         * *New in version 2.5.0*
+         */
+        cursor?: components["parameters"]["PageCursor"];
+        /**
+         * Do not count the total number of entries, which is costly on large tables.
+         *
+         * *New in version 2.5.0*
+         */
+        skip_total_entries?: components["parameters"]["SkipTotalEntries"];
         /**
          * The name of the field to order the results by.
          * Prefix a field name with `-` to reverse the sort order.
@@ -3101,6 +3204,19 @@ export interface operations {
         limit?: components["parameters"]["PageLimit"];
         /** The number of items to skip before starting to collect the result set. */
         offset?: components["parameters"]["PageOffset"];
+        /**
+         * The `next_cursor` of the previous page. Only the items after the last item of that page are
+         * returned. Unlike an offset, the cursor does not require skipping over the previous pages.
+         *
+         * *New in version 2.5.0*
+         */
+        cursor?: components["parameters"]["PageCursor"];
+        /**
+         * Do not count the total number of entries, which is costly on large tables.
+         *
+         * *New in version 2.5.0*
+         */
+        skip_total_entries?: components["parameters"]["SkipTotalEntries"];
       };
     };
     responses: {
@@ -3272,6 +3388,7 @@ export interface operations {
       200: {
         content: {
           "application/json": components["schemas"]["TaskInstanceCollection"];
+          "application/x-ndjson": components["schemas"]["TaskInstance"];
         };
       };
       401: components["responses"]["Unauthenticated"];
@@ -3415,6 +3532,19 @@ export interface operations {
         limit?: components["parameters"]["PageLimit"];
         /** The number of items to skip before starting to collect the result set. */
         offset?: components["parameters"]["PageOffset"];
+        /**
+         * The `next_cursor` of the previous page. Only the items after the last item of that page are
+         * returned. Unlike an offset, the cursor does not require skipping over the previous pages.
+         *
+         * *New in version 2.5.0*
+         */
+        cursor?: components["parameters"]["PageCursor"];
+        /**
+         * Do not count the total number of entries, which is costly on large tables.
+         *
+         * *New in version 2.5.0*
+         */
+        skip_total_entries?: components["parameters"]["SkipTotalEntries"];
       };
     };
     responses: {
@@ -3536,6 +3666,61 @@ export interface operations {
       404: components["responses"]["NotFound"];
     };
   };
+  /**
+   * Search the logs of a task instance, and get the matching lines with the lines around them.
+   * The logs are searched where they are stored, so only the matching lines are transferred.
+   *
+   * Log lines which do not start a log record, such as the lines of a traceback,
+   * have the level and the time of the record before them.
+   *
+   * *New in version 2.5.0*
+   */
+  search_log: {
+    parameters: {
+      path: {
+        /** The DAG ID. */
+        dag_id: components["parameters"]["DAGID"];
+        /** The DAG run ID. */
+        dag_run_id: components["parameters"]["DAGRunID"];
+        /** The task ID. */
+        task_id: components["parameters"]["TaskID"];
+      };
+      query: {
+        /** Filter on map index for mapped task. */
+        map_index?: components["parameters"]["FilterMapIndex"];
+        /** The text the lines contain. All lines match an empty pattern. */
+        pattern?: string;
+        /** Whether the pattern is a regular expression. */
+        regex?: boolean;
+        /** Whether the case of letters is ignored when matching the pattern. */
+        ignore_case?: boolean;
+        /** The levels of the log records to search. All levels are searched by default. */
+        levels?: ("DEBUG" | "INFO" | "WARNING" | "ERROR" | "CRITICAL")[];
+        /** The earliest time of the log records to search. */
+        start_date?: string;
+        /** The latest time of the log records to search. */
+        end_date?: string;
+        /** The number of lines returned before and after each matching line. */
+        context_lines?: number;
+        /** The try number whose log is searched. The logs of all tries are searched by default. */
+        try_number?: number;
+        /** The numbers of items to return. */
+        limit?: components["parameters"]["PageLimit"];
+      };
+    };
+    responses: {
+      /** Success. */
+      200: {
+        content: {
+          "application/json": components["schemas"]["LogSearchResult"];
+        };
+      };
+      400: components["responses"]["BadRequest"];
+      401: components["responses"]["Unauthenticated"];
+      403: components["responses"]["PermissionDenied"];
+      404: components["responses"]["NotFound"];
+    };
+  };
   /** The response contains many DAG attributes, so the response can be large. If possible, consider using GET /dags/{dag_id}. */
   get_dag_details: {
     parameters: {
@@ -4152,6 +4337,8 @@ export type DagWarning = CamelCasedPropertiesDeep<components['schemas']['DagWarn
 export type DagWarningCollection = CamelCasedPropertiesDeep<components['schemas']['DagWarningCollection']>;
 export type EventLog = CamelCasedPropertiesDeep<components['schemas']['EventLog']>;
 export type EventLogCollection = CamelCasedPropertiesDeep<components['schemas']['EventLogCollection']>;
+export type LogMatch = CamelCasedPropertiesDeep<components['schemas']['LogMatch']>;
+export type LogSearchResult = CamelCasedPropertiesDeep<components['schemas']['LogSearchResult']>;
 export type ImportError = CamelCasedPropertiesDeep<components['schemas']['ImportError']>;
 export type ImportErrorCollection = CamelCasedPropertiesDeep<components['schemas']['ImportErrorCollection']>;
 export type HealthInfo = CamelCasedPropertiesDeep<components['schemas']['HealthInfo']>;
@@ -4267,6 +4454,7 @@ export type GetXcomEntriesVariables = CamelCasedPropertiesDeep<operations['get_x
 export type GetXcomEntryVariables = CamelCasedPropertiesDeep<operations['get_xcom_entry']['parameters']['path'] & operations['get_xcom_entry']['parameters']['query']>;
 export type GetExtraLinksVariables = CamelCasedPropertiesDeep<operations['get_extra_links']['parameters']['path']>;
 export type GetLogVariables = CamelCasedPropertiesDeep<operations['get_log']['parameters']['path'] & operations['get_log']['parameters']['query']>;
+export type SearchLogVariables = CamelCasedPropertiesDeep<operations['search_log']['parameters']['path'] & operations['search_log']['parameters']['query']>;
 export type GetDagDetailsVariables = CamelCasedPropertiesDeep<operations['get_dag_details']['parameters']['path']>;
 export type GetTasksVariables = CamelCasedPropertiesDeep<operations['get_tasks']['parameters']['path'] & operations['get_tasks']['parameters']['query']>;
 export type GetTaskVariables = CamelCasedPropertiesDeep<operations['get_task']['parameters']['path']>;
@@ -98,6 +98,7 @@ from airflow.models.abstractoperator import AbstractOperator
 from airflow.models.dag import DAG, get_dataset_triggered_next_run_info
 from airflow.models.dagcode import DagCode
 from airflow.models.dagrun import DagRun, DagRunType
+from airflow.models.dagstatesummary import DagStateSummary
 from airflow.models.dataset import DagScheduleDatasetReference, DatasetDagRunQueue, DatasetEvent, DatasetModel
 from airflow.models.operator import Operator
 from airflow.models.serialized_dag import SerializedDagModel
@@ -408,6 +409,49 @@ def dag_to_grid(dag, dag_runs, session):
     return task_group_to_grid(dag.task_group, dag_runs, grouped_tis)
 
 
+class GridDataCache:
+    """
+    Cache of the ``groups`` built by :func:`dag_to_grid`, keyed on the DAG and the runs displayed.
+
+    An entry is only reused for the same DAG object, and while the number and the latest
+    ``updated_at`` of the task instances of the runs are unchanged.
+
+    :param max_size: The maximum number of entries kept; the least recently used are evicted first.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: collections.OrderedDict[tuple, tuple] = collections.OrderedDict()
+
+    def get(self, key: tuple, dag: DAG, version: tuple) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        cached_dag, cached_version, groups = entry
+        if cached_dag is not dag or cached_version != version:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return groups
+
+    def set(self, key: tuple, dag: DAG, version: tuple, groups: dict) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (dag, version, groups)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+# How far back the since cursor of grid_data goes before the time of the request. Rows are
+# stamped with updated_at before their transaction commits, on hosts whose clocks may differ,
+# so changes committed after a request may carry an earlier updated_at. Runs changed in that
+# window are sent again, and clients replace them by run_id.
+GRID_DATA_CURSOR_MARGIN = timedelta(seconds=30)
+
+grid_data_cache = GridDataCache(max_size=conf.getint('webserver', 'grid_data_cache_size', fallback=0))
+
+
 def get_key_paths(input_dict):
     """Return a list of dot-separated dictionary paths"""
     for key, value in input_dict.items():
@@ -860,13 +904,20 @@ class Airflow(AirflowBaseView):
             return flask.json.jsonify({})
 
         payload = {}
-        dag_state_stats = dag_state_stats.filter(dr.dag_id.in_(filter_dag_ids))
         data = {}
 
-        for dag_id, state, count in dag_state_stats:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+        if DagStateSummary.is_enabled():
+            summaries = session.query(DagStateSummary.dag_id, DagStateSummary.dag_run_states).filter(
+                DagStateSummary.dag_id.in_(filter_dag_ids)
+            )
+            for dag_id, dag_run_states in summaries:
+                data[dag_id] = dict(dag_run_states)
+        else:
+            dag_state_stats = dag_state_stats.filter(dr.dag_id.in_(filter_dag_ids))
+            for dag_id, state, count in dag_state_stats:
+                if dag_id not in data:
+                    data[dag_id] = {}
+                data[dag_id][state] = count
 
         for dag_id in filter_dag_ids:
             payload[dag_id] = []
@@ -900,6 +951,45 @@ class Airflow(AirflowBaseView):
         else:
             filter_dag_ids = allowed_dag_ids
 
+        if DagStateSummary.is_enabled():
+            data = self._get_task_stats_from_summaries(filter_dag_ids, session)
+        else:
+            data = self._get_task_stats_from_task_instances(filter_dag_ids, session)
+
+        payload = {}
+        for dag_id in filter_dag_ids:
+            payload[dag_id] = []
+            for state in State.task_states:
+                count = data.get(dag_id, {}).get(state, 0)
+                payload[dag_id].append({'state': state, 'count': count})
+        return flask.json.jsonify(payload)
+
+    @staticmethod
+    def _get_task_stats_from_summaries(filter_dag_ids, session):
+        """The task instance counts of the running runs of each DAG, or of their last run."""
+        show_completed_runs = conf.getboolean(
+            'webserver', 'SHOW_RECENT_STATS_FOR_COMPLETED_RUNS', fallback=True
+        )
+        summaries = (
+            session.query(
+                DagStateSummary.dag_id,
+                DagStateSummary.running_task_states,
+                DagStateSummary.last_run_task_states,
+            )
+            .join(DagModel, DagModel.dag_id == DagStateSummary.dag_id)
+            .filter(DagStateSummary.dag_id.in_(filter_dag_ids), DagModel.is_active)
+        )
+        data = {}
+        for dag_id, running_task_states, last_run_task_states in summaries:
+            if running_task_states:
+                data[dag_id] = dict(running_task_states)
+            elif show_completed_runs and last_run_task_states:
+                data[dag_id] = dict(last_run_task_states)
+        return data
+
+    @staticmethod
+    def _get_task_stats_from_task_instances(filter_dag_ids, session):
+        """The task instance counts of the running runs of each DAG, or of their last run."""
         running_dag_run_query_result = (
             session.query(DagRun.dag_id, DagRun.run_id)
             .join(DagModel, DagModel.dag_id == DagRun.dag_id)
@@ -977,14 +1067,7 @@ class Airflow(AirflowBaseView):
             )
         )
 
-        data = get_task_stats_from_query(qry)
-        payload = {}
-        for dag_id in filter_dag_ids:
-            payload[dag_id] = []
-            for state in State.task_states:
-                count = data.get(dag_id, {}).get(state, 0)
-                payload[dag_id].append({'state': state, 'count': count})
-        return flask.json.jsonify(payload)
+        return get_task_stats_from_query(qry)
 
     @expose('/last_dagruns', methods=['POST'])
     @auth.has_access(
@@ -1009,6 +1092,38 @@ class Airflow(AirflowBaseView):
         if not filter_dag_ids:
             return flask.json.jsonify({})
 
+        if DagStateSummary.is_enabled():
+            query = session.query(
+                DagStateSummary.dag_id,
+                DagStateSummary.last_run_start_date.label('start_date'),
+                DagStateSummary.last_run_end_date.label('end_date'),
+                DagStateSummary.last_run_state.label('state'),
+                DagStateSummary.last_run_execution_date.label('execution_date'),
+                DagStateSummary.last_run_data_interval_start.label('data_interval_start'),
+                DagStateSummary.last_run_data_interval_end.label('data_interval_end'),
+            ).filter(
+                DagStateSummary.dag_id.in_(filter_dag_ids),
+                DagStateSummary.last_run_execution_date.isnot(None),
+            )
+        else:
+            query = self._get_last_dagruns_query(filter_dag_ids, session)
+
+        resp = {
+            r.dag_id.replace('.', '__dot__'): {
+                "dag_id": r.dag_id,
+                "state": r.state,
+                "execution_date": wwwutils.datetime_to_string(r.execution_date),
+                "start_date": wwwutils.datetime_to_string(r.start_date),
+                "end_date": wwwutils.datetime_to_string(r.end_date),
+                "data_interval_start": wwwutils.datetime_to_string(r.data_interval_start),
+                "data_interval_end": wwwutils.datetime_to_string(r.data_interval_end),
+            }
+            for r in query
+        }
+        return flask.json.jsonify(resp)
+
+    @staticmethod
+    def _get_last_dagruns_query(filter_dag_ids, session):
         last_runs_subquery = (
             session.query(
                 DagRun.dag_id,
@@ -1019,7 +1134,7 @@ class Airflow(AirflowBaseView):
             .subquery("last_runs")
         )
 
-        query = session.query(
+        return session.query(
             DagRun.dag_id,
             DagRun.start_date,
             DagRun.end_date,
@@ -1035,20 +1150,6 @@ class Airflow(AirflowBaseView):
             ),
         )
 
-        resp = {
-            r.dag_id.replace('.', '__dot__'): {
-                "dag_id": r.dag_id,
-                "state": r.state,
-                "execution_date": wwwutils.datetime_to_string(r.execution_date),
-                "start_date": wwwutils.datetime_to_string(r.start_date),
-                "end_date": wwwutils.datetime_to_string(r.end_date),
-                "data_interval_start": wwwutils.datetime_to_string(r.data_interval_start),
-                "data_interval_end": wwwutils.datetime_to_string(r.data_interval_end),
-            }
-            for r in query
-        }
-        return flask.json.jsonify(resp)
-
     @expose('/code')
     @auth.has_access(
         [
@@ -3431,9 +3532,15 @@ class Airflow(AirflowBaseView):
         ]
     )
     def grid_data(self):
-        """Returns grid data"""
+        """
+        Returns grid data
+
+        The response contains a ``cursor``. When it is passed back as the ``since`` argument, only the
+        runs which changed since then are returned, along with the ids of all the runs displayed. The
+        cursor goes back ``GRID_DATA_CURSOR_MARGIN`` before the request, so a run may be sent again.
+        """
         dag_id = request.args.get('dag_id')
-        dag = get_airflow_app().dag_bag.get_dag(dag_id)
+        dag = base_dag = get_airflow_app().dag_bag.get_dag(dag_id)
 
         if not dag:
             return {'error': f"can't find dag {dag_id}"}, 404
@@ -3451,6 +3558,14 @@ class Airflow(AirflowBaseView):
         except (KeyError, ValueError):
             base_date = dag.get_latest_execution_date() or timezone.utcnow()
 
+        since = request.args.get('since')
+        if since:
+            try:
+                since = timezone.parse(since)
+            except (ParserError, ValueError):
+                return {'error': f"Invalid since cursor: {since}"}, 400
+
+        cursor = timezone.utcnow() - GRID_DATA_CURSOR_MARGIN
         with create_session() as session:
             query = session.query(DagRun).filter(
                 DagRun.dag_id == dag.dag_id, DagRun.execution_date <= base_date
@@ -3465,12 +3580,52 @@ class Airflow(AirflowBaseView):
                 query = query.filter(DagRun.state == run_state)
 
             dag_runs = wwwutils.sorted_dag_runs(query, ordering=dag.timetable.run_ordering, limit=num_runs)
-            encoded_runs = [wwwutils.encode_dag_run(dr) for dr in dag_runs]
-            data = {
-                'groups': dag_to_grid(dag, dag_runs, session),
-                'dag_runs': encoded_runs,
-                'ordering': dag.timetable.run_ordering,
-            }
+            run_ids = [dr.run_id for dr in dag_runs]
+
+            if since:
+                # Only send the runs which changed since the cursor, along with all their task
+                # instances, since the summaries of task groups depend on every task of a run.
+                changed_run_ids = {
+                    run_id
+                    for run_id, in session.query(TaskInstance.run_id)
+                    .filter(
+                        TaskInstance.dag_id == dag.dag_id,
+                        TaskInstance.run_id.in_(run_ids),
+                        TaskInstance.updated_at >= since,
+                    )
+                    .distinct()
+                }
+                changed_runs = [
+                    dr
+                    for dr in dag_runs
+                    if dr.run_id in changed_run_ids or (dr.updated_at and dr.updated_at >= since)
+                ]
+                data = {
+                    'groups': dag_to_grid(dag, changed_runs, session),
+                    'dag_runs': [wwwutils.encode_dag_run(dr) for dr in changed_runs],
+                    'run_ids': run_ids,
+                    'ordering': dag.timetable.run_ordering,
+                }
+            else:
+                if grid_data_cache.max_size > 0:
+                    cache_key = (dag_id, root, tuple(run_ids))
+                    cache_version = tuple(
+                        session.query(func.count(), func.max(TaskInstance.updated_at))
+                        .filter(TaskInstance.dag_id == dag.dag_id, TaskInstance.run_id.in_(run_ids))
+                        .one()
+                    )
+                    groups = grid_data_cache.get(cache_key, base_dag, cache_version)
+                    if groups is None:
+                        groups = dag_to_grid(dag, dag_runs, session)
+                        grid_data_cache.set(cache_key, base_dag, cache_version, groups)
+                else:
+                    groups = dag_to_grid(dag, dag_runs, session)
+                data = {
+                    'groups': groups,
+                    'dag_runs': [wwwutils.encode_dag_run(dr) for dr in dag_runs],
+                    'ordering': dag.timetable.run_ordering,
+                }
+            data['cursor'] = cursor.isoformat()
         # avoid spaces to reduce payload size
         return (
             htmlsafe_json_dumps(data, separators=(',', ':'), dumps=flask.json.dumps),
@@ -16,6 +16,7 @@
 # under the License.
 from __future__ import annotations
 
+import json
 from datetime import timedelta
 from unittest import mock
 
@@ -465,6 +466,38 @@ class TestGetDagRunsPagination(TestDagRunEndpoint):
         dag_run_ids = [dag_run["dag_run_id"] for dag_run in response.json["dag_runs"]]
         assert dag_run_ids == expected_dag_run_ids
 
+    @parameterized.expand(
+        [
+            ("-execution_date", [f"TEST_DAG_RUN_ID{i}" for i in range(5, 0, -1)]),
+            ("dag_run_id", [f"TEST_DAG_RUN_ID{i}" for i in range(1, 6)]),
+        ]
+    )
+    def test_handle_cursor(self, order_by, expected_dag_run_ids):
+        self._create_dag_runs(5)
+        params = {"limit": 2, "order_by": order_by, "skip_total_entries": True}
+        dag_run_ids = []
+        while True:
+            response = self.client.get(
+                "api/v1/dags/TEST_DAG_ID/dagRuns",
+                query_string=params,
+                environ_overrides={'REMOTE_USER': "test"},
+            )
+            assert response.status_code == 200
+            assert response.json["total_entries"] is None
+            dag_run_ids.extend(dag_run["dag_run_id"] for dag_run in response.json["dag_runs"])
+            if "next_cursor" not in response.json:
+                break
+            params["cursor"] = response.json["next_cursor"]
+        assert dag_run_ids == expected_dag_run_ids
+
+    def test_should_raise_400_for_invalid_cursor(self):
+        self._create_dag_runs(5)
+        response = self.client.get(
+            "api/v1/dags/TEST_DAG_ID/dagRuns?cursor=invalid", environ_overrides={'REMOTE_USER': "test"}
+        )
+        assert response.status_code == 400
+        assert response.json["title"] == "Invalid cursor"
+
     def test_should_respect_page_size_limit(self):
         self._create_dag_runs(200)
         response = self.client.get(
@@ -652,6 +685,25 @@ class TestGetDagRunBatch(TestDagRunEndpoint):
             "total_entries": 2,
         }
 
+    def test_should_stream_ndjson(self):
+        self._create_test_dag_run()
+        self._create_test_dag_run(state="queued", idx_start=3)
+        payload = {"dag_ids": ["TEST_DAG_ID"], "order_by": "-execution_date", "page_limit": 3}
+        expected = self.client.post(
+            "api/v1/dags/~/dagRuns/list", json=payload, environ_overrides={'REMOTE_USER': "test"}
+        ).json["dag_runs"]
+        assert len(expected) == 3
+
+        response = self.client.post(
+            "api/v1/dags/~/dagRuns/list",
+            json=payload,
+            headers={"Accept": "application/x-ndjson"},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert [json.loads(line) for line in response.data.decode().splitlines()] == expected
+
     def test_filter_by_state(self):
         self._create_test_dag_run()
         self._create_test_dag_run(state="queued", idx_start=3)
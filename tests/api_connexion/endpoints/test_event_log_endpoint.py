@@ -285,6 +285,34 @@ class TestGetEventLogPagination(TestEventLogEndpoint):
         events = [event_log["event"] for event_log in response.json["event_logs"]]
         assert events == expected_events
 
+    def test_handle_cursor(self, task_instance, session):
+        log_models = self._create_event_logs(task_instance, 5)
+        session.add_all(log_models)
+        session.commit()
+
+        events = []
+        params = {"limit": 2, "order_by": "-event_log_id", "skip_total_entries": True}
+        response = self.client.get(
+            "api/v1/eventLogs", query_string=params, environ_overrides={'REMOTE_USER': "test"}
+        )
+        while True:
+            assert response.status_code == 200
+            assert response.json["total_entries"] is None
+            events.extend(event_log["event"] for event_log in response.json["event_logs"])
+            if "next_cursor" not in response.json:
+                break
+            params["cursor"] = response.json["next_cursor"]
+            response = self.client.get(
+                "api/v1/eventLogs", query_string=params, environ_overrides={'REMOTE_USER': "test"}
+            )
+        assert events == [f"TEST_EVENT_{i}" for i in range(5, 0, -1)]
+
+    def test_should_raise_400_for_cursor_with_nullable_order_by(self, task_instance, session):
+        response = self.client.get(
+            "/api/v1/eventLogs?order_by=when&cursor=foo", environ_overrides={'REMOTE_USER': "test"}
+        )
+        assert response.status_code == 400
+
     def test_should_respect_page_size_limit_default(self, task_instance, session):
         log_models = self._create_event_logs(task_instance, 200)
         session.add_all(log_models)
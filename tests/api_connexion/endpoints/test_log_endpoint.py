@@ -29,6 +29,7 @@ from airflow import DAG
 from airflow.api_connexion.exceptions import EXCEPTIONS_LINK_MAP
 from airflow.config_templates.airflow_local_settings import DEFAULT_LOGGING_CONFIG
 from airflow.decorators import task
+from airflow.exceptions import AirflowException
 from airflow.operators.empty import EmptyOperator
 from airflow.security import permissions
 from airflow.utils import timezone
@@ -169,7 +170,7 @@ class TestGetLog:
             == f"[('localhost', '*** Reading local file: {expected_filename}\\nLog for testing.')]"
         )
         info = serializer.loads(response.json['continuation_token'])
-        assert info == {'end_of_log': True, 'log_pos': 41 + len(expected_filename)}
+        assert info == {'end_of_log': True, 'log_pos': len('Log for testing.')}
         assert 200 == response.status_code
 
     @pytest.mark.parametrize(
@@ -387,3 +388,77 @@ class TestGetLog:
         )
         assert response.status_code == 404
         assert response.json["title"] == "TaskInstance not found"
+
+    def test_search_log(self):
+        response = self.client.get(
+            f"api/v1/dags/{self.DAG_ID}/dagRuns/{self.RUN_ID}/taskInstances/{self.TASK_ID}/logSearch",
+            query_string={"pattern": "TESTING", "ignore_case": True},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert response.json == {
+            "matches": [
+                {
+                    "try_number": 1,
+                    "offset": 0,
+                    "line": "Log for testing.",
+                    "context_before": [],
+                    "context_after": [],
+                }
+            ],
+            "truncated": False,
+        }
+
+    def test_search_log_with_limit(self):
+        log = (
+            self.log_dir
+            / f"dag_id={self.DAG_ID}"
+            / f"run_id={self.RUN_ID}"
+            / f"task_id={self.TASK_ID}"
+            / "attempt=1.log"
+        )
+        log.write_text("First line.\nSecond line.\n")
+        response = self.client.get(
+            f"api/v1/dags/{self.DAG_ID}/dagRuns/{self.RUN_ID}/taskInstances/{self.TASK_ID}/logSearch",
+            query_string={"limit": 1},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert [match["line"] for match in response.json["matches"]] == ["First line."]
+        assert response.json["truncated"] is True
+
+    def test_search_log_with_invalid_regex(self):
+        response = self.client.get(
+            f"api/v1/dags/{self.DAG_ID}/dagRuns/{self.RUN_ID}/taskInstances/{self.TASK_ID}/logSearch",
+            query_string={"pattern": "(", "regex": True},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 400
+        assert response.json["title"] == "Invalid regular expression"
+
+    @mock.patch("airflow.api_connexion.endpoints.log_endpoint.TaskLogReader")
+    def test_search_log_of_unreachable_worker(self, mock_log_reader):
+        mock_log_reader.return_value.search_log.side_effect = AirflowException(
+            "Could not search the log on worker hostname: Connection refused"
+        )
+        response = self.client.get(
+            f"api/v1/dags/{self.DAG_ID}/dagRuns/{self.RUN_ID}/taskInstances/{self.TASK_ID}/logSearch",
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 500
+        assert response.json["title"] == "Could not search the task log"
+        assert response.json["detail"] == "Could not search the log on worker hostname: Connection refused"
+
+    def test_search_log_raises_404_for_invalid_dag_run_id(self):
+        response = self.client.get(
+            f"api/v1/dags/{self.DAG_ID}/dagRuns/NO_DAG_RUN/taskInstances/{self.TASK_ID}/logSearch",
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 404
+
+    def test_search_log_raises_403_forbidden(self):
+        response = self.client.get(
+            f"api/v1/dags/{self.DAG_ID}/dagRuns/{self.RUN_ID}/taskInstances/{self.TASK_ID}/logSearch",
+            environ_overrides={'REMOTE_USER': "test_no_permissions"},
+        )
+        assert response.status_code == 403
@@ -17,6 +17,7 @@
 from __future__ import annotations
 
 import datetime as dt
+import json
 from unittest import mock
 
 import pendulum
@@ -642,6 +643,29 @@ class TestGetTaskInstances(TestTaskInstanceEndpoint):
         assert count == response.json["total_entries"]
         assert count == len(response.json["task_instances"])
 
+    def test_should_respond_200_with_cursor(self, session):
+        self.create_task_instances(session)
+        self.create_task_instances(session, dag_id="example_skip_dag")
+        params = {"limit": 3, "skip_total_entries": True}
+        task_instances = []
+        while True:
+            response = self.client.get(
+                "/api/v1/dags/~/dagRuns/~/taskInstances",
+                query_string=params,
+                environ_overrides={"REMOTE_USER": "test"},
+            )
+            assert response.status_code == 200
+            assert response.json["total_entries"] is None
+            task_instances.extend((ti["dag_id"], ti["task_id"]) for ti in response.json["task_instances"])
+            if "next_cursor" not in response.json:
+                break
+            params["cursor"] = response.json["next_cursor"]
+
+        expected = session.query(TaskInstance.dag_id, TaskInstance.task_id).order_by(
+            TaskInstance.dag_id, TaskInstance.run_id, TaskInstance.task_id, TaskInstance.map_index
+        )
+        assert task_instances == [tuple(row) for row in expected]
+
     def test_should_raises_401_unauthenticated(self):
         response = self.client.get(
             "/api/v1/dags/example_python_operator/dagRuns/~/taskInstances",
@@ -789,6 +813,26 @@ class TestGetTaskInstancesBatch(TestTaskInstanceEndpoint):
         assert expected_ti_count == response.json["total_entries"]
         assert expected_ti_count == len(response.json["task_instances"])
 
+    def test_should_stream_ndjson(self, session):
+        self.create_task_instances(
+            session, task_instances=[{"state": State.RUNNING}, {"state": State.QUEUED}]
+        )
+        expected = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list",
+            environ_overrides={"REMOTE_USER": "test"},
+            json={"state": ["running", "queued"]},
+        ).json["task_instances"]
+
+        response = self.client.post(
+            "/api/v1/dags/~/dagRuns/~/taskInstances/list",
+            environ_overrides={"REMOTE_USER": "test"},
+            headers={"Accept": "application/x-ndjson"},
+            json={"state": ["running", "queued"]},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert [json.loads(line) for line in response.data.decode().splitlines()] == expected
+
     @parameterized.expand(
         [
             (
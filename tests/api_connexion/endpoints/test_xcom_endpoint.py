@@ -477,6 +477,30 @@ class TestPaginationGetXComEntries(TestXComEndpoint):
             f"/api/v1/dags/{self.dag_id}/dagRuns/{self.run_id}/taskInstances/{self.task_id}/xcomEntries"
             f"?{query_params}"
         )
+        self._create_xcom_entries()
+
+        response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
+        assert response.status_code == 200
+        assert response.json["total_entries"] == 10
+        conn_ids = [conn["key"] for conn in response.json["xcom_entries"] if conn]
+        assert conn_ids == expected_xcom_ids
+
+    def test_handle_cursor(self):
+        self._create_xcom_entries()
+        url = f"/api/v1/dags/{self.dag_id}/dagRuns/{self.run_id}/taskInstances/{self.task_id}/xcomEntries"
+        params = {"limit": 3, "skip_total_entries": True}
+        keys = []
+        while True:
+            response = self.client.get(url, query_string=params, environ_overrides={'REMOTE_USER': "test"})
+            assert response.status_code == 200
+            assert response.json["total_entries"] is None
+            keys.extend(xcom["key"] for xcom in response.json["xcom_entries"])
+            if "next_cursor" not in response.json:
+                break
+            params["cursor"] = response.json["next_cursor"]
+        assert keys == sorted(f"TEST_XCOM_KEY{i}" for i in range(1, 11))
+
+    def _create_xcom_entries(self):
         with create_session() as session:
             dagrun = DagRun(
                 dag_id=self.dag_id,
@@ -502,9 +526,3 @@ class TestPaginationGetXComEntries(TestXComEndpoint):
                     timestamp=self.execution_date_parsed,
                 )
                 session.add(xcom)
-
-        response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
-        assert response.status_code == 200
-        assert response.json["total_entries"] == 10
-        conn_ids = [conn["key"] for conn in response.json["xcom_entries"] if conn]
-        assert conn_ids == expected_xcom_ids
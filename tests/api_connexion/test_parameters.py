@@ -26,10 +26,14 @@ from pendulum.tz.timezone import Timezone
 from airflow.api_connexion.exceptions import BadRequest
 from airflow.api_connexion.parameters import (
     check_limit,
+    decode_cursor,
+    encode_cursor,
     format_datetime,
     format_parameters,
+    get_sort_keys,
     validate_istimezone,
 )
+from airflow.models import DagRun
 from airflow.utils import timezone
 from tests.test_utils.config import conf_vars
 
@@ -123,3 +127,37 @@ class TestFormatParameters(unittest.TestCase):
         decorated_endpoint = decorator(endpoint)
         decorated_endpoint(limit=89)
         endpoint.assert_called_once_with(limit=89)
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def test_get_sort_keys(self):
+        assert get_sort_keys(DagRun, "-dag_run_id", {"dag_run_id": "run_id"}) == [
+            (DagRun.run_id, True),
+            (DagRun.id, True),
+        ]
+        assert get_sort_keys(DagRun, "id") == [(DagRun.id, False)]
+        # Rows with nulls cannot be compared to a cursor
+        assert get_sort_keys(DagRun, "start_date") is None
+
+    def test_get_sort_keys_disallowed(self):
+        with pytest.raises(BadRequest):
+            get_sort_keys(DagRun, "conf", allowed_attrs=["id"])
+
+    def test_cursor_round_trip(self):
+        sort_keys = get_sort_keys(DagRun, "-execution_date")
+        dag_run = DagRun(execution_date=timezone.datetime(2022, 1, 1, 12))
+        dag_run.id = 42
+
+        cursor = encode_cursor(dag_run, sort_keys)
+
+        assert decode_cursor(cursor, sort_keys) == [timezone.datetime(2022, 1, 1, 12), 42]
+
+    def test_decode_cursor_raises_400(self):
+        sort_keys = get_sort_keys(DagRun, "id")
+        with pytest.raises(BadRequest):
+            decode_cursor("not a cursor", sort_keys)
+        # A cursor of another ordering
+        dag_run = DagRun(execution_date=timezone.datetime(2022, 1, 1, 12))
+        dag_run.id = 42
+        with pytest.raises(BadRequest):
+            decode_cursor(encode_cursor(dag_run, get_sort_keys(DagRun, "execution_date")), sort_keys)
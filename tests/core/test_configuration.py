@@ -704,6 +704,17 @@ notacommand = OK
         )
         assert message == exception
 
+    def test_enum_serialized_dag_compression(self):
+        test_conf = AirflowConfigParser(default_config='')
+        test_conf.read_dict({'core': {'serialized_dag_compression': 'zst'}})
+        with pytest.raises(AirflowConfigException) as ctx:
+            test_conf.validate()
+        exception = str(ctx.value)
+        message = (
+            "`[core] serialized_dag_compression` should not be 'zst'. Possible values: none, zlib, zstd."
+        )
+        assert message == exception
+
     def test_as_dict_works_without_sensitive_cmds(self):
         conf_materialize_cmds = conf.as_dict(display_sensitive=True, raw=True, include_cmds=True)
         conf_maintain_cmds = conf.as_dict(display_sensitive=True, raw=True, include_cmds=False)
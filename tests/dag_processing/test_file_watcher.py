@@ -0,0 +1,169 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from unittest import mock
+
+import pytest
+
+from airflow.dag_processing.file_watcher import (
+    InotifyDagFileWatcher,
+    PollingDagFileWatcher,
+    get_dag_file_watcher,
+)
+
+DAG_CONTENT = "from airflow import DAG\n"
+
+
+def _write(path, content=DAG_CONTENT):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.fixture
+def dag_dir(tmp_path):
+    _write(tmp_path / "dag_1.py")
+    _write(tmp_path / "subdir" / "dag_2.py")
+    _write(tmp_path / "not_a_dag.py", "print('hello')\n")
+    _write(tmp_path / "ignored" / "dag_3.py")
+    _write(tmp_path / ".airflowignore", "ignored\n")
+    return tmp_path
+
+
+WATCHER_CLASSES = [PollingDagFileWatcher]
+if sys.platform.startswith("linux"):
+    WATCHER_CLASSES.append(InotifyDagFileWatcher)
+
+
+@pytest.mark.parametrize("watcher_class", WATCHER_CLASSES)
+class TestDagFileWatcher:
+    @pytest.fixture(autouse=True)
+    def watcher(self, watcher_class, dag_dir):
+        self.watcher = watcher_class(dag_dir, safe_mode=True, include_examples=False)
+        yield
+        self.watcher.close()
+
+    def test_initial_poll_lists_all_dag_files(self, dag_dir):
+        changes = self.watcher.poll()
+
+        expected = {str(dag_dir / "dag_1.py"), str(dag_dir / "subdir" / "dag_2.py")}
+        assert changes.added == expected
+        assert changes.modified == set()
+        assert changes.removed == set()
+        assert set(self.watcher.file_paths) == expected
+
+    def test_poll_without_changes(self):
+        self.watcher.poll()
+
+        assert not self.watcher.poll().has_changes
+
+    def test_poll_reports_added_modified_and_removed_files(self, dag_dir):
+        self.watcher.poll()
+        new_file = _write(dag_dir / "subdir" / "nested" / "dag_4.py")
+        modified_file = _write(dag_dir / "dag_1.py", DAG_CONTENT + "# a change\n")
+        removed_file = str(dag_dir / "subdir" / "dag_2.py")
+        os.remove(removed_file)
+
+        changes = self.watcher.poll()
+
+        assert changes.added == {new_file}
+        assert changes.modified == {modified_file}
+        assert changes.removed == {removed_file}
+        assert set(self.watcher.file_paths) == {new_file, modified_file}
+
+    def test_poll_reports_files_of_removed_directory(self, dag_dir):
+        self.watcher.poll()
+        shutil.rmtree(dag_dir / "subdir")
+
+        changes = self.watcher.poll()
+
+        assert changes.removed == {str(dag_dir / "subdir" / "dag_2.py")}
+        assert self.watcher.file_paths == [str(dag_dir / "dag_1.py")]
+
+    def test_poll_applies_changed_ignore_file(self, dag_dir):
+        self.watcher.poll()
+        _write(dag_dir / ".airflowignore", "subdir\n")
+
+        changes = self.watcher.poll()
+
+        assert changes.added == {str(dag_dir / "ignored" / "dag_3.py")}
+        assert changes.removed == {str(dag_dir / "subdir" / "dag_2.py")}
+
+    def test_file_becoming_a_dag_file_is_added(self, dag_dir):
+        self.watcher.poll()
+        not_a_dag = _write(dag_dir / "not_a_dag.py", DAG_CONTENT + "# now it is\n")
+
+        assert self.watcher.poll().added == {not_a_dag}
+
+    def test_unchanged_files_are_not_opened(self, dag_dir):
+        self.watcher.poll()
+        new_file = _write(dag_dir / "dag_5.py")
+
+        with mock.patch(
+            "airflow.dag_processing.file_watcher.might_contain_dag", return_value=True
+        ) as mock_might_contain_dag:
+            self.watcher.poll()
+
+        mock_might_contain_dag.assert_called_once_with(new_file, True)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+class TestInotifyDagFileWatcher:
+    def test_poll_only_rescans_changed_directories(self, dag_dir):
+        watcher = InotifyDagFileWatcher(dag_dir, safe_mode=True, include_examples=False)
+        try:
+            watcher.poll()
+            new_file = _write(dag_dir / "subdir" / "dag_6.py")
+
+            with mock.patch.object(watcher, "_walk") as mock_walk:
+                changes = watcher.poll()
+
+            mock_walk.assert_not_called()
+            assert changes.added == {new_file}
+        finally:
+            watcher.close()
+
+    def test_falls_back_to_polling_when_watches_cannot_be_added(self, dag_dir):
+        watcher = InotifyDagFileWatcher(dag_dir, safe_mode=True, include_examples=False)
+        with mock.patch.object(watcher._libc, "inotify_add_watch", return_value=-1):
+            watcher.poll()
+        assert watcher._fd == -1
+        assert watcher.event_driven is False
+
+        new_file = _write(dag_dir / "dag_7.py")
+        assert watcher.poll().added == {new_file}
+
+
+class TestGetDagFileWatcher:
+    def test_rescan_mode(self, tmp_path):
+        assert get_dag_file_watcher(tmp_path, "rescan") is None
+
+    def test_poll_mode(self, tmp_path):
+        assert type(get_dag_file_watcher(tmp_path, "poll")) is PollingDagFileWatcher
+
+    @mock.patch("airflow.dag_processing.file_watcher.sys.platform", "darwin")
+    def test_inotify_mode_falls_back_to_polling(self, tmp_path):
+        assert type(get_dag_file_watcher(tmp_path, "inotify")) is PollingDagFileWatcher
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported dag_dir_watch_mode"):
+            get_dag_file_watcher(tmp_path, "invalid")
@@ -40,6 +40,7 @@ from sqlalchemy import func
 from airflow.callbacks.callback_requests import CallbackRequest, DagCallbackRequest, SlaCallbackRequest
 from airflow.config_templates.airflow_local_settings import DEFAULT_LOGGING_CONFIG
 from airflow.configuration import conf
+from airflow.dag_processing.file_watcher import get_dag_file_watcher
 from airflow.dag_processing.manager import (
     DagFileProcessorAgent,
     DagFileProcessorManager,
@@ -52,6 +53,7 @@ from airflow.models import DagBag, DagModel, DbCallbackRequest, errors
 from airflow.models.dagcode import DagCode
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.utils import timezone
+from airflow.utils.file import get_file_hash
 from airflow.utils.net import get_hostname
 from airflow.utils.session import create_session
 from tests.core.test_logging_config import SETTINGS_FILE_VALID, settings_context
@@ -812,6 +814,130 @@ class TestDagFileProcessorManager:
         # assert code not deleted
         assert DagCode.has_dag(dag.fileloc)
 
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+    @conf_vars(
+        {
+            ('core', 'load_examples'): 'False',
+            ('scheduler', 'dag_dir_watch_mode'): 'inotify',
+            ('scheduler', 'dag_dir_list_interval'): '300',
+        }
+    )
+    def test_refresh_dag_dir_when_inotify_falls_back_to_polling(self, tmp_path):
+        """Test that the DAG folder is only rescanned every dag_dir_list_interval without inotify"""
+        (tmp_path / "dag_1.py").write_text("from airflow import DAG\n")
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+        try:
+            manager._file_watcher = get_dag_file_watcher(tmp_path, "inotify")
+            with mock.patch.object(manager._file_watcher._libc, "inotify_add_watch", return_value=-1):
+                manager._refresh_dag_dir()
+            assert manager.file_paths == [str(tmp_path / "dag_1.py")]
+            assert manager._file_watcher.event_driven is False
+
+            with mock.patch.object(manager._file_watcher, "poll") as mock_poll:
+                manager._refresh_dag_dir()
+                mock_poll.assert_not_called()
+
+                manager.last_dag_dir_refresh_time = timezone.utcnow() - timedelta(minutes=10)
+                manager._refresh_dag_dir()
+                mock_poll.assert_called_once()
+        finally:
+            manager.end()
+
+    @pytest.mark.parametrize("watch_mode", ["poll", "inotify"])
+    def test_refresh_dag_dir_with_watcher_queues_changed_files(self, tmp_path, watch_mode):
+        """Test that files reported as changed by the DAG file watcher are queued first"""
+        dag_content = "from airflow import DAG\n"
+        (tmp_path / "dag_1.py").write_text(dag_content)
+        (tmp_path / "dag_2.py").write_text(dag_content)
+
+        with conf_vars(
+            {
+                ('core', 'load_examples'): 'False',
+                ('scheduler', 'dag_dir_watch_mode'): watch_mode,
+                ('scheduler', 'file_parsing_sort_mode'): 'alphabetical',
+            }
+        ):
+            manager = DagFileProcessorManager(
+                dag_directory=tmp_path,
+                max_runs=1,
+                processor_timeout=timedelta(days=365),
+                signal_conn=MagicMock(),
+                dag_ids=[],
+                pickle_dags=False,
+                async_mode=True,
+            )
+            try:
+                manager._refresh_dag_dir()
+                assert sorted(manager.file_paths) == [str(tmp_path / "dag_1.py"), str(tmp_path / "dag_2.py")]
+                assert manager._file_path_queue == []
+                manager.prepare_file_path_queue()
+                assert manager._file_path_queue == [str(tmp_path / "dag_1.py"), str(tmp_path / "dag_2.py")]
+
+                (tmp_path / "dag_3.py").write_text(dag_content)
+                manager.last_dag_dir_refresh_time = timezone.utcnow() - timedelta(minutes=10)
+                manager._refresh_dag_dir()
+
+                assert manager._file_path_queue == [
+                    str(tmp_path / "dag_3.py"),
+                    str(tmp_path / "dag_1.py"),
+                    str(tmp_path / "dag_2.py"),
+                ]
+                # Files already queued are not queued twice
+                manager.prepare_file_path_queue()
+                assert len(manager._file_path_queue) == 3
+            finally:
+                manager.end()
+
+    @conf_vars(
+        {
+            ('core', 'load_examples'): 'False',
+            ('scheduler', 'dag_dir_watch_mode'): 'poll',
+        }
+    )
+    def test_refresh_dag_dir_with_watcher_only_cleans_up_after_removed_files(self, tmp_path):
+        """Test that the DAGs of deleted files are only cleaned up when the watcher reports removed files"""
+        dag_content = "from airflow import DAG\n"
+        (tmp_path / "dag_1.py").write_text(dag_content)
+        (tmp_path / "dag_2.py").write_text(dag_content)
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+        try:
+            with mock.patch.object(manager, "_remove_deleted_files") as mock_remove_deleted_files:
+                # Files may have been removed while the manager was not running
+                manager._refresh_dag_dir()
+                mock_remove_deleted_files.assert_called_once()
+
+                mock_remove_deleted_files.reset_mock()
+                (tmp_path / "dag_1.py").write_text(dag_content + "# modified\n")
+                (tmp_path / "dag_3.py").write_text(dag_content)
+                manager.last_dag_dir_refresh_time = timezone.utcnow() - timedelta(minutes=10)
+                manager._refresh_dag_dir()
+                assert str(tmp_path / "dag_3.py") in manager.file_paths
+                mock_remove_deleted_files.assert_not_called()
+
+                (tmp_path / "dag_2.py").unlink()
+                manager.last_dag_dir_refresh_time = timezone.utcnow() - timedelta(minutes=10)
+                manager._refresh_dag_dir()
+                assert str(tmp_path / "dag_2.py") not in manager.file_paths
+                mock_remove_deleted_files.assert_called_once()
+        finally:
+            manager.end()
+
     @conf_vars(
         {
             ('core', 'load_examples'): 'False',
@@ -985,6 +1111,94 @@ class TestDagFileProcessorManager:
         with create_session() as session:
             assert session.query(DbCallbackRequest).count() == 1
 
+    @conf_vars({('scheduler', 'skip_unchanged_dag_files'): 'True'})
+    @mock.patch("airflow.dag_processing.manager.DagFileProcessorManager._create_process")
+    def test_skip_unchanged_files(self, mock_create_process, tmp_path):
+        """Test that files are only parsed again when they or their local modules change"""
+        dag_path = tmp_path / "dag.py"
+        dag_path.write_text("from airflow import DAG\nimport helper\n")
+        helper_path = tmp_path / "helper.py"
+        helper_path.write_text("VALUE = 1\n")
+        dag_file = str(dag_path)
+
+        def create_process(*args, **kwargs):
+            processor = FakeDagFileProcessorRunner._create_process(*args, **kwargs)
+            processor._local_module_hashes = {str(helper_path): get_file_hash(str(helper_path))}
+            return processor
+
+        mock_create_process.side_effect = create_process
+
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=-1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+        manager.set_file_paths([dag_file])
+
+        def process_file():
+            manager._file_path_queue = [dag_file]
+            manager.start_new_processes()
+            manager.collect_results()
+
+        process_file()
+        assert mock_create_process.call_count == 1
+        assert manager.get_run_count(dag_file) == 1
+
+        # Nothing changed, the file is not parsed again but counted as processed
+        process_file()
+        assert mock_create_process.call_count == 1
+        assert manager.get_run_count(dag_file) == 2
+
+        # A local module imported by the file changed
+        helper_path.write_text("VALUE = 2\n")
+        process_file()
+        assert mock_create_process.call_count == 2
+
+        # The file itself changed
+        dag_path.write_text("from airflow import DAG\nimport helper  # changed\n")
+        process_file()
+        assert mock_create_process.call_count == 3
+
+    @conf_vars({('scheduler', 'skip_unchanged_dag_files'): 'True'})
+    @mock.patch("airflow.dag_processing.manager.DagFileProcessorManager._create_process")
+    def test_skip_unchanged_files_keeps_dags_active(self, mock_create_process, tmp_path):
+        """Test that the DAGs of skipped files are marked as parsed, so they are not deactivated"""
+        dag_file = str(tmp_path / "dag.py")
+        (tmp_path / "dag.py").write_text("from airflow import DAG\n")
+        mock_create_process.side_effect = FakeDagFileProcessorRunner._create_process
+        last_parsed_time = timezone.utcnow() - timedelta(hours=1)
+        with create_session() as session:
+            session.add(
+                DagModel(
+                    dag_id="test_dag", fileloc=dag_file, is_active=True, last_parsed_time=last_parsed_time
+                )
+            )
+
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=-1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+        manager.set_file_paths([dag_file])
+        manager._file_path_queue = [dag_file]
+        manager.start_new_processes()
+        manager.collect_results()
+        manager._file_path_queue = [dag_file]
+        manager.start_new_processes()
+
+        assert mock_create_process.call_count == 1
+        with create_session() as session:
+            dag_model = session.query(DagModel).filter(DagModel.dag_id == "test_dag").one()
+            assert dag_model.last_parsed_time == manager.get_last_finish_time(dag_file)
+
     def test_callback_queue(self, tmpdir):
         # given
         manager = DagFileProcessorManager(
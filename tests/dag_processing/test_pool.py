@@ -0,0 +1,165 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import time
+from datetime import timedelta
+from textwrap import dedent
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+
+from airflow.dag_processing.manager import DagFileProcessorManager
+from airflow.dag_processing.pool import (
+    DagFileProcessingJob,
+    DagFileProcessorPool,
+    PooledDagFileProcessorProcess,
+    _process_job,
+)
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_dags, clear_db_import_errors, clear_db_serialized_dags
+
+DAG_CONTENT = dedent(
+    """
+    import pendulum
+    from airflow import DAG
+    from airflow.operators.empty import EmptyOperator
+
+    with DAG("{dag_id}", start_date=pendulum.datetime(2022, 1, 1), schedule=None):
+        EmptyOperator(task_id="task")
+    """
+)
+
+
+def wait_until_done(processor, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not processor.done:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"Processing {processor.file_path} did not finish in time")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def dag_files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"dag_{i}.py"
+        path.write_text(DAG_CONTENT.format(dag_id=f"test_pooled_dag_{i}"))
+        paths.append(str(path))
+    return paths
+
+
+class TestDagFileProcessorPool:
+    def setup_method(self):
+        clear_db_dags()
+        clear_db_serialized_dags()
+        clear_db_import_errors()
+
+    def teardown_method(self):
+        clear_db_dags()
+        clear_db_serialized_dags()
+        clear_db_import_errors()
+
+    def _process(self, pool, file_path, dag_directory):
+        processor = pool.create_processor(file_path, False, [], dag_directory, [])
+        processor.start()
+        wait_until_done(processor)
+        return processor
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork is required")
+    def test_workers_are_reused_and_recycled(self, tmp_path, dag_files):
+        pool = DagFileProcessorPool(max_files_per_worker=2, preload_modules=[], start_method="fork")
+        try:
+            first = self._process(pool, dag_files[0], str(tmp_path))
+            second = self._process(pool, dag_files[1], str(tmp_path))
+            assert first.result == (1, 0)
+            assert second.result == (1, 0)
+            # The same worker processed both files
+            assert first.pid == second.pid
+
+            # The worker processed as many files as allowed and was replaced
+            third = self._process(pool, dag_files[2], str(tmp_path))
+            assert third.result == (1, 0)
+            assert third.pid != first.pid
+        finally:
+            pool.terminate()
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork is required")
+    def test_killed_worker_is_discarded(self, tmp_path, dag_files):
+        pool = DagFileProcessorPool(max_files_per_worker=0, preload_modules=[], start_method="fork")
+        try:
+            first = self._process(pool, dag_files[0], str(tmp_path))
+            processor = pool.create_processor(dag_files[1], False, [], str(tmp_path), [])
+            processor.start()
+            assert processor.pid == first.pid
+            processor.kill()
+
+            assert processor.done
+            assert pool.get_all_pids() == []
+            third = self._process(pool, dag_files[2], str(tmp_path))
+            assert third.pid != first.pid
+            assert third.result == (1, 0)
+        finally:
+            pool.terminate()
+
+    def test_process_job_forgets_local_modules(self, tmp_path, monkeypatch):
+        module_name = "pooled_dag_helper"
+        (tmp_path / f"{module_name}.py").write_text("VALUE = 1\n")
+        dag_file = tmp_path / "dag_with_helper.py"
+        dag_file.write_text(f"import {module_name}\n" + DAG_CONTENT.format(dag_id="test_pooled_helper"))
+        monkeypatch.syspath_prepend(str(tmp_path))
+        job = DagFileProcessingJob(
+            file_path=str(dag_file),
+            pickle_dags=False,
+            dag_ids=[],
+            dag_directory=str(tmp_path),
+            callback_requests=[],
+        )
+
+        with mock.patch("airflow.dag_processing.pool.set_context"):
+            num_dags, num_import_errors, module_hashes = _process_job(MagicMock(), "test", job)
+
+        assert (num_dags, num_import_errors) == (1, 0)
+        assert list(module_hashes) == [str(tmp_path / f"{module_name}.py")]
+        assert module_name not in sys.modules
+        assert not [name for name in sys.modules if name.endswith("_dag_with_helper")]
+
+    @conf_vars({("scheduler", "parsing_pool_enabled"): "True"})
+    @mock.patch("airflow.dag_processing.manager.DagFileProcessorManager._create_process")
+    def test_manager_uses_pool(self, mock_create_process, tmp_path):
+        manager = DagFileProcessorManager(
+            dag_directory=tmp_path,
+            max_runs=1,
+            processor_timeout=timedelta(days=365),
+            signal_conn=MagicMock(),
+            dag_ids=[],
+            pickle_dags=False,
+            async_mode=True,
+        )
+        manager._file_path_queue = [str(tmp_path / "dag.py")]
+
+        with mock.patch.object(PooledDagFileProcessorProcess, "start"), mock.patch.object(
+            PooledDagFileProcessorProcess, "pid", 1234
+        ), mock.patch.object(PooledDagFileProcessorProcess, "waitable_handle", "handle"):
+            manager.start_new_processes()
+
+        mock_create_process.assert_not_called()
+        assert isinstance(manager._processors[str(tmp_path / "dag.py")], PooledDagFileProcessorProcess)
@@ -0,0 +1,91 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import pytest
+
+from airflow.jobs.concurrency_counts import ConcurrencyCounts
+from airflow.operators.empty import EmptyOperator
+from airflow.utils.state import State
+from tests.test_utils.db import clear_db_runs
+
+
+@pytest.fixture
+def task_instances(dag_maker, session):
+    with dag_maker(dag_id='test_concurrency_counts', session=session):
+        EmptyOperator(task_id='task_1', pool='pool_a', pool_slots=2)
+        EmptyOperator(task_id='task_2', pool='pool_b')
+    dr = dag_maker.create_dagrun()
+    tis = {ti.task_id: ti for ti in dr.get_task_instances(session=session)}
+    yield tis
+    clear_db_runs()
+
+
+class TestConcurrencyCounts:
+    def test_refresh(self, task_instances, session):
+        task_instances['task_1'].state = State.QUEUED
+        task_instances['task_2'].state = State.RUNNING
+        session.flush()
+        counts = ConcurrencyCounts()
+
+        counts.refresh(session)
+
+        assert sorted(counts.get_occupied_pool_slots()) == [('pool_a', 'queued', 2), ('pool_b', 'running', 1)]
+        dag_map, task_map = counts.get_concurrency_maps()
+        assert dag_map == {'test_concurrency_counts': 2}
+        assert task_map == {
+            ('test_concurrency_counts', 'task_1'): 1,
+            ('test_concurrency_counts', 'task_2'): 1,
+        }
+        assert counts.last_refreshed is not None
+
+    def test_queued_task_instances_are_counted_until_they_finish(self, task_instances, session):
+        counts = ConcurrencyCounts()
+        counts.refresh(session)
+        ti = task_instances['task_1']
+
+        counts.add_queued([ti])
+        assert counts.get_occupied_pool_slots() == [('pool_a', 'queued', 2)]
+
+        counts.process_executor_event(ti.key, State.RUNNING)
+        assert counts.get_occupied_pool_slots() == [('pool_a', 'running', 2)]
+
+        counts.process_executor_event(ti.key, State.SUCCESS)
+        assert counts.get_occupied_pool_slots() == []
+        dag_map, task_map = counts.get_concurrency_maps()
+        assert not any(dag_map.values())
+        assert not any(task_map.values())
+
+    def test_events_of_previous_tries_are_ignored(self, task_instances, session):
+        counts = ConcurrencyCounts()
+        ti = task_instances['task_2']
+        ti.try_number = 1
+        counts.add_queued([ti])
+
+        counts.process_executor_event(ti.key.with_try_number(1), State.FAILED)
+
+        assert counts.get_occupied_pool_slots() == [('pool_b', 'queued', 1)]
+
+    def test_concurrency_maps_are_copies(self, task_instances):
+        counts = ConcurrencyCounts()
+        counts.add_queued([task_instances['task_2']])
+
+        dag_map, _ = counts.get_concurrency_maps()
+        dag_map['test_concurrency_counts'] += 1
+
+        assert counts.get_concurrency_maps()[0] == {'test_concurrency_counts': 1}
@@ -48,6 +48,7 @@ from airflow.jobs.local_task_job import LocalTaskJob
 from airflow.jobs.scheduler_job import SchedulerJob
 from airflow.models import DAG, DagBag, DagModel, DbCallbackRequest, Pool, TaskInstance
 from airflow.models.dagrun import DagRun
+from airflow.models.dagstatesummary import DagStateSummary
 from airflow.models.dataset import DatasetDagRunQueue, DatasetEvent, DatasetModel
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstanceKey
@@ -544,6 +545,76 @@ class TestSchedulerJob:
         assert ti_with_dagrun.key in res_keys
         session.rollback()
 
+    def test_find_executable_task_instances_of_partitioned_dags(self, dag_maker, session):
+        tis = {}
+        for dag_id in ('test_partitioned_dag_1', 'test_partitioned_dag_2'):
+            with dag_maker(dag_id=dag_id, session=session):
+                EmptyOperator(task_id='dummy')
+            ti = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED).get_task_instance('dummy', session)
+            ti.state = State.SCHEDULED
+            tis[dag_id] = ti
+        session.flush()
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        self.scheduler_job._partitioned_dag_ids = {'test_partitioned_dag_2'}
+
+        res = self.scheduler_job._executable_task_instances_to_queued(max_tis=32, session=session)
+        assert [ti.key for ti in res] == [tis['test_partitioned_dag_2'].key]
+
+    def test_find_executable_task_instances_of_partitioned_dags_in_chunks(self, dag_maker, session):
+        """The partition is sent in chunks when it has more DAGs than an IN clause takes"""
+        tis = {}
+        for priority_weight in range(4):
+            dag_id = f'test_partitioned_dag_{priority_weight}'
+            with dag_maker(dag_id=dag_id, session=session):
+                EmptyOperator(task_id='dummy', priority_weight=priority_weight)
+            ti = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED).get_task_instance('dummy', session)
+            ti.state = State.SCHEDULED
+            tis[dag_id] = ti
+        session.flush()
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        self.scheduler_job._partitioned_dag_ids = {
+            'test_partitioned_dag_0',
+            'test_partitioned_dag_1',
+            'test_partitioned_dag_2',
+        }
+
+        with mock.patch('airflow.utils.sqlalchemy.MAX_IN_CLAUSE_VALUES', 2):
+            res = self.scheduler_job._executable_task_instances_to_queued(max_tis=2, session=session)
+        assert sorted(ti.key for ti in res) == sorted(
+            [tis['test_partitioned_dag_2'].key, tis['test_partitioned_dag_1'].key]
+        )
+
+    @conf_vars({('scheduler', 'cache_concurrency_counts'): 'True'})
+    def test_find_executable_task_instances_with_cached_concurrency_counts(self, dag_maker, session):
+        session.add(Pool(pool='test_cached_counts_pool', slots=1))
+        with dag_maker(dag_id='test_cached_concurrency_counts', max_active_tasks=16, session=session):
+            EmptyOperator(task_id='task_1', pool='test_cached_counts_pool', priority_weight=2)
+            EmptyOperator(task_id='task_2', pool='test_cached_counts_pool', priority_weight=1)
+        dr = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        for ti in dr.get_task_instances(session=session):
+            ti.state = State.SCHEDULED
+        session.flush()
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        res = self.scheduler_job._executable_task_instances_to_queued(max_tis=32, session=session)
+        assert [ti.task_id for ti in res] == ['task_1']
+
+        # The pool is full according to the counts, which are not queried again
+        with mock.patch.object(self.scheduler_job._concurrency_counts, 'refresh') as mock_refresh, mock.patch(
+            'airflow.jobs.scheduler_job.SchedulerJob._SchedulerJob__get_concurrency_maps'
+        ) as mock_get_concurrency_maps:
+            assert self.scheduler_job._executable_task_instances_to_queued(max_tis=32, session=session) == []
+        mock_refresh.assert_not_called()
+        mock_get_concurrency_maps.assert_not_called()
+
+        # Once the executor reports the task finished, its slot is free again
+        self.scheduler_job._concurrency_counts.process_executor_event(res[0].key, State.SUCCESS)
+        res = self.scheduler_job._executable_task_instances_to_queued(max_tis=32, session=session)
+        assert [ti.task_id for ti in res] == ['task_2']
+        session.rollback()
+
     def test_find_executable_task_instances_pool(self, dag_maker):
         dag_id = 'SchedulerJobTest.test_find_executable_task_instances_pool'
         task_id_1 = 'dummy'
@@ -2625,6 +2696,88 @@ class TestSchedulerJob:
         session.rollback()
         session.close()
 
+    def test_verify_integrity_if_dag_changed_refetches_task_instances(self, dag_maker, session):
+        with dag_maker(dag_id='test_verify_integrity_refetches_tis', session=session) as dag:
+            BashOperator(task_id='dummy', bash_command='echo hi')
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        dr = dag_maker.create_dagrun()
+        prefetched_tis = DagRun.get_task_instances_of_dag_runs([dr], session=session)
+
+        BashOperator(task_id='bash_task_1', dag=dag, bash_command='echo hi')
+        SerializedDagModel.write_dag(dag=dag, session=session)
+        latest_version = SerializedDagModel.get_latest_version_hash(dr.dag_id, session=session)
+
+        self.scheduler_job._schedule_dag_run(
+            dr,
+            session,
+            task_instances=prefetched_tis[dr.dag_id, dr.run_id],
+            latest_version=latest_version,
+        )
+        session.flush()
+
+        assert dr.dag_hash == latest_version
+        states = session.query(TaskInstance.task_id, TaskInstance.state).filter(
+            TaskInstance.dag_id == dr.dag_id, TaskInstance.run_id == dr.run_id
+        )
+        assert sorted(states) == [('bash_task_1', State.SCHEDULED), ('dummy', State.SCHEDULED)]
+
+    def test_verify_integrity_if_dag_changed_only_verifies_changed_tasks(self, dag_maker, session):
+        with dag_maker(dag_id='test_verify_integrity_changed_tasks', session=session) as dag:
+            BashOperator(task_id='unchanged', bash_command='echo hi')
+            BashOperator(task_id='modified', bash_command='echo hi')
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        dr = dag_maker.create_dagrun()
+        dr.dag_hash = SerializedDagModel.get_latest_version_hash(dr.dag_id, session=session)
+
+        dag.get_task('modified').retries = 3
+        BashOperator(task_id='added', dag=dag, bash_command='echo hi')
+        SerializedDagModel.write_dag(dag=dag, session=session)
+        session.flush()
+        latest_version = SerializedDagModel.get_latest_version_hash(dr.dag_id, session=session)
+
+        with mock.patch.object(DagRun, "verify_integrity", autospec=True) as mock_verify_integrity:
+            assert self.scheduler_job._verify_integrity_if_dag_changed(dr, session, latest_version)
+        mock_verify_integrity.assert_called_once_with(dr, session=session, task_ids={'modified', 'added'})
+
+        # Without a record of the changes since the version of the dag run, all tasks are verified
+        dr.dag_hash = 'unknown'
+        with mock.patch.object(DagRun, "verify_integrity", autospec=True) as mock_verify_integrity:
+            assert self.scheduler_job._verify_integrity_if_dag_changed(dr, session, latest_version)
+        mock_verify_integrity.assert_called_once_with(dr, session=session, task_ids=None)
+
+    def test_do_scheduling_fetches_task_instances_of_all_dag_runs_at_once(self, dag_maker, session):
+        dag_runs = []
+        for dag_id in ('test_batched_scheduling_1', 'test_batched_scheduling_2'):
+            with dag_maker(dag_id=dag_id, session=session):
+                BashOperator(task_id='task', bash_command='echo hi')
+            dr = dag_maker.create_dagrun(state=DagRunState.RUNNING)
+            dr.dag_hash = SerializedDagModel.get_latest_version_hash(dag_id, session=session)
+            dag_runs.append(dr)
+        session.flush()
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        self.scheduler_job.dagbag = dag_maker.dagbag
+        self.scheduler_job.processor_agent = mock.MagicMock()
+
+        with mock.patch.object(settings, "USE_JOB_SCHEDULE", False), mock.patch.object(
+            DagRun, "get_task_instances", autospec=True
+        ) as mock_get_task_instances, mock.patch.object(
+            DagRun, "get_task_instances_of_dag_runs", wraps=DagRun.get_task_instances_of_dag_runs
+        ) as mock_get_task_instances_of_dag_runs:
+            self.scheduler_job._do_scheduling(session)
+
+        mock_get_task_instances.assert_not_called()
+        mock_get_task_instances_of_dag_runs.assert_called_once()
+        states = session.query(TaskInstance.dag_id, TaskInstance.state).filter(
+            TaskInstance.dag_id.in_(dr.dag_id for dr in dag_runs)
+        )
+        assert sorted(states) == [
+            ('test_batched_scheduling_1', State.QUEUED),
+            ('test_batched_scheduling_2', State.QUEUED),
+        ]
+
     @pytest.mark.need_serialized_dag
     def test_retry_still_in_executor(self, dag_maker):
         """
@@ -2896,6 +3049,102 @@ class TestSchedulerJob:
         assert 0 == self.scheduler_job.adopt_or_reset_orphaned_tasks(session=session)
         session.rollback()
 
+    @conf_vars({('scheduler', 'partition_dags'): 'True'})
+    def test_refresh_dag_partition(self, session):
+        dag_ids = [f'test_refresh_dag_partition_{i}' for i in range(50)]
+        for dag_id in dag_ids:
+            session.add(DagModel(dag_id=dag_id, is_active=True))
+        session.add(DagModel(dag_id='test_refresh_dag_partition_inactive', is_active=False))
+
+        schedulers = [SchedulerJob(subdir=os.devnull) for _ in range(3)]
+        for scheduler in schedulers:
+            scheduler.state = State.RUNNING
+            scheduler.latest_heartbeat = timezone.utcnow()
+            session.add(scheduler)
+        dead_scheduler = SchedulerJob(subdir=os.devnull)
+        dead_scheduler.state = State.RUNNING
+        dead_scheduler.latest_heartbeat = timezone.utcnow() - timedelta(minutes=15)
+        session.add(dead_scheduler)
+        session.flush()
+
+        for scheduler in schedulers:
+            scheduler._refresh_dag_partition(session=session)
+            assert scheduler._partition_scheduler_ids == {s.id for s in schedulers}
+        partitions = [scheduler._partitioned_dag_ids for scheduler in schedulers]
+        # Every DAG belongs to exactly one of the live schedulers
+        assert sorted(dag_id for partition in partitions for dag_id in partition) == sorted(dag_ids)
+
+        # When a scheduler dies, its DAGs move to the others, which keep their own
+        schedulers[0].latest_heartbeat = timezone.utcnow() - timedelta(minutes=15)
+        session.flush()
+        for scheduler, partition in zip(schedulers[1:], partitions[1:]):
+            scheduler._refresh_dag_partition(session=session)
+            assert partition <= scheduler._partitioned_dag_ids
+        assert schedulers[1]._partitioned_dag_ids | schedulers[2]._partitioned_dag_ids == set(dag_ids)
+        session.rollback()
+
+    @conf_vars({('scheduler', 'dag_state_summary_update_interval'): '10'})
+    def test_update_dag_state_summaries_of_examined_dag_runs(self, dag_maker, session):
+        with dag_maker(dag_id='test_dag_state_summaries', session=session):
+            BashOperator(task_id='task', bash_command='true')
+        dag_maker.create_dagrun(state=DagRunState.RUNNING)
+        with dag_maker(dag_id='test_dag_state_summaries_not_examined', session=session):
+            BashOperator(task_id='task', bash_command='true')
+        dag_maker.create_dagrun(state=DagRunState.SUCCESS)
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        self.scheduler_job.executor = MockExecutor(do_update=False)
+        self.scheduler_job.processor_agent = mock.MagicMock(spec=DagFileProcessorAgent)
+        self.scheduler_job._do_scheduling(session)
+        assert self.scheduler_job._dag_state_summary_dag_ids == {'test_dag_state_summaries'}
+
+        self.scheduler_job._update_dag_state_summaries(session=session)
+        assert self.scheduler_job._dag_state_summary_dag_ids == set()
+        summary = session.query(DagStateSummary).one()
+        assert summary.dag_id == 'test_dag_state_summaries'
+        assert dict(summary.dag_run_states) == {DagRunState.RUNNING: 1}
+        assert dict(summary.running_task_states) == {State.QUEUED: 1}
+
+        # Reconciling covers the DAGs whose runs were not examined
+        self.scheduler_job._reconcile_dag_state_summaries(session=session)
+        summaries = {summary.dag_id: summary for summary in session.query(DagStateSummary)}
+        assert set(summaries) == {'test_dag_state_summaries', 'test_dag_state_summaries_not_examined'}
+        assert summaries['test_dag_state_summaries_not_examined'].last_run_state == DagRunState.SUCCESS
+
+    def test_get_next_dagruns_to_examine_of_partitioned_dags(self, dag_maker, session):
+        for dag_id in ('test_partitioned_dagruns_1', 'test_partitioned_dagruns_2'):
+            with dag_maker(dag_id=dag_id, session=session):
+                EmptyOperator(task_id='dummy')
+            dag_maker.create_dagrun(state=DagRunState.RUNNING)
+        session.flush()
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        self.scheduler_job._partitioned_dag_ids = {'test_partitioned_dagruns_1'}
+
+        dag_runs = self.scheduler_job._get_next_dagruns_to_examine(DagRunState.RUNNING, session)
+        assert [dr.dag_id for dr in dag_runs] == ['test_partitioned_dagruns_1']
+
+    def test_get_next_dagruns_to_examine_of_partitioned_dags_in_chunks(self, dag_maker, session):
+        for i in range(4):
+            with dag_maker(dag_id=f'test_partitioned_dagruns_{i}', session=session):
+                EmptyOperator(task_id='dummy')
+            dag_run = dag_maker.create_dagrun(state=DagRunState.RUNNING)
+            dag_run.last_scheduling_decision = timezone.datetime(2020, 1, 4 - i)
+        session.flush()
+
+        self.scheduler_job = SchedulerJob(subdir=os.devnull)
+        self.scheduler_job._partitioned_dag_ids = {
+            'test_partitioned_dagruns_0',
+            'test_partitioned_dagruns_1',
+            'test_partitioned_dagruns_3',
+        }
+
+        with mock.patch('airflow.utils.sqlalchemy.MAX_IN_CLAUSE_VALUES', 2), mock.patch.object(
+            DagRun, 'DEFAULT_DAGRUNS_TO_EXAMINE', 2
+        ):
+            dag_runs = self.scheduler_job._get_next_dagruns_to_examine(DagRunState.RUNNING, session)
+        assert [dr.dag_id for dr in dag_runs] == ['test_partitioned_dagruns_3', 'test_partitioned_dagruns_1']
+
     def test_adopt_or_reset_orphaned_tasks_stale_scheduler_jobs(self, dag_maker):
         dag_id = 'test_adopt_or_reset_orphaned_tasks_stale_scheduler_jobs'
         with dag_maker(dag_id=dag_id, schedule='@daily'):
@@ -20,20 +20,27 @@ from __future__ import annotations
 import asyncio
 import datetime
 import time
-from threading import Thread
+from threading import Event, Thread
+from unittest import mock
 
 import pytest
 
-from airflow.jobs.triggerer_job import TriggererJob, TriggerRunner
+from airflow.jobs.triggerer_job import (
+    ShardedTriggerRunner,
+    TriggererJob,
+    TriggerNotificationListener,
+    TriggerRunner,
+)
 from airflow.models import DagModel, DagRun, TaskInstance, Trigger
 from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
-from airflow.triggers.base import TriggerEvent
-from airflow.triggers.temporal import TimeDeltaTrigger
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+from airflow.triggers.temporal import DateTimeTrigger, TimeDeltaTrigger, get_timer_heap
 from airflow.triggers.testing import FailureTrigger, SuccessTrigger
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State, TaskInstanceState
+from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_dags, clear_db_runs
 
 
@@ -56,6 +63,19 @@ class TimeDeltaTrigger_(TimeDeltaTrigger):
         )
 
 
+class BlockingTrigger(BaseTrigger):
+    """A trigger blocking its event loop until it is cancelled."""
+
+    def serialize(self):
+        return ("tests.jobs.test_triggerer_job.BlockingTrigger", {})
+
+    async def run(self):
+        while True:
+            time.sleep(0.3)
+            await asyncio.sleep(0.01)
+        yield
+
+
 @pytest.fixture(autouse=True)
 def clean_database():
     """Fixture that cleans the database before and after every test."""
@@ -395,6 +415,439 @@ def test_trigger_failing(session):
         job.runner.stop = True
 
 
+@conf_vars({('triggerer', 'event_batch_size'): '2'})
+@mock.patch('airflow.jobs.triggerer_job.Stats')
+@mock.patch('airflow.jobs.triggerer_job.Trigger.submit_events')
+def test_handle_events_in_batches(mock_submit_events, mock_stats):
+    """
+    Checks that trigger events are submitted in batches, with metrics.
+    """
+    job = TriggererJob()
+    events = [(trigger_id, TriggerEvent(trigger_id)) for trigger_id in range(5)]
+    job.runner.events.extend(events)
+
+    job.handle_events()
+
+    assert not job.runner.events
+    assert [call.args[0] for call in mock_submit_events.call_args_list] == [
+        events[:2],
+        events[2:4],
+        events[4:],
+    ]
+    mock_stats.gauge.assert_has_calls(
+        [
+            mock.call('triggers.event_batch_size', 2),
+            mock.call('triggers.event_batch_size', 2),
+            mock.call('triggers.event_batch_size', 1),
+        ]
+    )
+    assert mock_stats.incr.call_args_list == [
+        mock.call('triggers.succeeded', 2),
+        mock.call('triggers.succeeded', 2),
+        mock.call('triggers.succeeded', 1),
+    ]
+    assert mock_stats.timer.call_count == 3
+
+
+@conf_vars({('triggerer', 'event_batch_size'): '2'})
+@mock.patch('airflow.jobs.triggerer_job.Trigger.submit_failures')
+def test_handle_failed_triggers_in_batches(mock_submit_failures):
+    """
+    Checks that failed triggers are submitted in batches.
+    """
+    job = TriggererJob()
+    failures = [(trigger_id, ValueError()) for trigger_id in range(3)]
+    job.runner.failed_triggers.extend(failures)
+
+    job.handle_failed_triggers()
+
+    assert not job.runner.failed_triggers
+    assert [call.args[0] for call in mock_submit_failures.call_args_list] == [failures[:2], failures[2:]]
+
+
+def test_invalid_event_batch_size():
+    with conf_vars({('triggerer', 'event_batch_size'): '0'}):
+        with pytest.raises(ValueError, match="Event batch size 0 is invalid"):
+            TriggererJob()
+
+
+@pytest.mark.parametrize("runner_processes", ["0", "1"])
+def test_runner_wakes_up_for_new_triggers(session, runner_processes):
+    """
+    Checks that the runner starts new triggers without waiting for its next loop,
+    and wakes the main thread up when they fire.
+    """
+    with conf_vars({('triggerer', 'runner_processes'): runner_processes}):
+        job = TriggererJob()
+    job.runner.daemon = True
+    job.runner.start()
+    try:
+        # Let the runner settle into waiting for work
+        time.sleep(1.5)
+        trigger_orm = Trigger.from_object(SuccessTrigger())
+        trigger_orm.id = 1
+        session.add(trigger_orm)
+        session.commit()
+        start = time.monotonic()
+        job.load_triggers()
+        assert job.wakeup.wait(5)
+        assert time.monotonic() - start < 0.9
+        assert list(job.runner.events) == [(1, TriggerEvent(True))]
+    finally:
+        job.runner.stop = True
+        job.runner.join(30)
+
+
+def test_trigger_loop_wakes_up():
+    """
+    Checks that the main thread runs its loop again as soon as it is woken up.
+    """
+    job = TriggererJob()
+    loops = []
+
+    def load_triggers():
+        loops.append(time.monotonic())
+        if len(loops) == 1:
+            job.wakeup.set()
+        else:
+            job.runner.stop = True
+
+    with mock.patch.object(job, "load_triggers", side_effect=load_triggers), mock.patch.object(
+        job, "heartbeat"
+    ), mock.patch.object(Trigger, "clean_unused") as mock_clean_unused:
+        job._run_trigger_loop()
+    assert len(loops) == 2
+    assert loops[1] - loops[0] < 0.5
+    # Unused triggers are only cleaned once per poll interval
+    mock_clean_unused.assert_called_once()
+
+
+def test_notification_listener_not_supported_on_sqlite():
+    with mock.patch("airflow.jobs.triggerer_job.settings.engine") as mock_engine:
+        mock_engine.dialect.name = "sqlite"
+        assert not TriggerNotificationListener.is_supported()
+        mock_engine.dialect.name = "postgresql"
+        mock_engine.dialect.driver = "psycopg2"
+        assert TriggerNotificationListener.is_supported()
+        with conf_vars({('triggerer', 'notify_new_triggers'): 'False'}):
+            assert not TriggerNotificationListener.is_supported()
+
+
+@pytest.mark.backend("postgres")
+def test_notification_listener(session):
+    """
+    Checks that the listener wakes the triggerer up when a new trigger is committed.
+    """
+    wakeup = Event()
+    listener = TriggerNotificationListener(wakeup)
+    listener.start()
+    try:
+        # The listener wakes the triggerer up once listening, to catch up on missed triggers
+        assert wakeup.wait(10)
+        wakeup.clear()
+        session.add(Trigger.from_object(SuccessTrigger()))
+        Trigger.notify_new_triggers(session=session)
+        session.flush()
+        assert not wakeup.wait(0.5)
+        session.commit()
+        assert wakeup.wait(5)
+    finally:
+        listener.stop = True
+        listener.join(10)
+    session.query(Trigger).delete()
+    session.commit()
+
+
+def test_trigger_blocking_the_event_loop():
+    """
+    Checks that the runner counts the times each trigger blocked its event loop.
+    """
+    runner = TriggerRunner()
+    runner.daemon = True
+    runner.to_create.append((1, BlockingTrigger()))
+    runner.to_create.append((2, TimeDeltaTrigger(datetime.timedelta(days=7))))
+    runner.start()
+    try:
+        for _ in range(50):
+            if 1 in runner.triggers and runner.triggers[1]["blocks"] >= 2:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("TriggerRunner never counted the blocking trigger")
+        assert runner.triggers[1]["cpu_time"] < 0.1
+        assert runner.triggers[2]["blocks"] == 0
+    finally:
+        runner.stop = True
+        runner.join(10)
+
+
+@conf_vars({('triggerer', 'runner_processes'): '2'})
+def test_trigger_firing_and_failing_in_runner_processes(session):
+    """
+    Checks that the events and failures of triggers run in runner processes
+    make it into the queues of the runner.
+    """
+    for trigger_id, trigger in [(1, SuccessTrigger()), (2, FailureTrigger())]:
+        trigger_orm = Trigger.from_object(trigger)
+        trigger_orm.id = trigger_id
+        session.add(trigger_orm)
+    session.commit()
+    job = TriggererJob()
+    assert isinstance(job.runner, ShardedTriggerRunner)
+    job.load_triggers()
+    job.runner.daemon = True
+    job.runner.start()
+    try:
+        for _ in range(100):
+            if job.runner.events and job.runner.failed_triggers and not job.runner.triggers:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("ShardedTriggerRunner never sent the trigger event and failure out")
+        assert list(job.runner.events) == [(1, TriggerEvent(True))]
+        [(trigger_id, exc)] = job.runner.failed_triggers
+        assert trigger_id == 2
+        assert isinstance(exc, ValueError)
+        assert exc.args[0] == "Deliberate trigger failure"
+        # The traceback of the failure is kept from the runner process
+        assert "in run" in str(exc.__cause__)
+    finally:
+        job.runner.stop = True
+        job.runner.join(30)
+    assert not job.runner.is_alive()
+    assert all(not runner_process.process.is_alive() for runner_process in job.runner.processes.values())
+
+
+def test_blocking_trigger_moved_to_quarantine():
+    """
+    Checks that a trigger blocking its event loop is moved to the quarantine process.
+    """
+    runner = ShardedTriggerRunner(1, quarantine_after_blocks=2)
+    runner.daemon = True
+    runner.to_create.append((1, BlockingTrigger()))
+    runner.to_create.append((2, TimeDeltaTrigger(datetime.timedelta(days=7))))
+    runner.start()
+    try:
+        for _ in range(100):
+            if 1 in runner.triggers and runner.triggers[1]["process"] == runner.quarantine:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("ShardedTriggerRunner never moved the blocking trigger to the quarantine process")
+        assert runner.triggers[2]["process"] == 0
+        assert runner.quarantine in runner.processes
+    finally:
+        runner.stop = True
+        runner.join(30)
+
+
+def test_identical_triggers_share_a_run():
+    """
+    Checks that identical triggers run once, and that each of them gets its event.
+    """
+    moment = timezone.utcnow() + datetime.timedelta(seconds=1)
+    runner = TriggerRunner()
+    runner.daemon = True
+    runner.to_create.extend(
+        [
+            (1, DateTimeTrigger(moment)),
+            (2, DateTimeTrigger(moment)),
+            (3, DateTimeTrigger(moment + datetime.timedelta(microseconds=1))),
+        ]
+    )
+    runner.start()
+    try:
+        for _ in range(50):
+            if len(runner.triggers) == 3:
+                break
+            time.sleep(0.1)
+        assert runner.triggers[1]["task"] is runner.triggers[2]["task"]
+        assert runner.triggers[1]["task"] is not runner.triggers[3]["task"]
+        for _ in range(50):
+            if len(runner.events) == 3:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("TriggerRunner never sent the events of the triggers")
+        assert sorted(trigger_id for trigger_id, _ in runner.events) == [1, 2, 3]
+        events = dict(runner.events)
+        assert events[1] == events[2] == TriggerEvent(moment)
+        for _ in range(50):
+            if not runner.triggers:
+                break
+            time.sleep(0.1)
+        assert not runner.shared_runs
+        assert not runner.failed_triggers
+    finally:
+        runner.stop = True
+        runner.join(10)
+
+
+def test_cancel_trigger_sharing_a_run():
+    """
+    Checks that a shared run goes on until all the triggers sharing it are cancelled.
+    """
+
+    async def cancel(runner, trigger_id):
+        runner.to_cancel.append(trigger_id)
+        await runner.cancel_triggers()
+        await asyncio.sleep(0)
+        await runner.cleanup_finished_triggers()
+
+    async def run():
+        runner = TriggerRunner()
+        moment = timezone.datetime(2030, 1, 1)
+        runner.to_create.extend([(1, DateTimeTrigger(moment)), (2, DateTimeTrigger(moment))])
+        await runner.create_triggers()
+        task = runner.triggers[2]["task"]
+        assert runner.triggers[1]["task"] is task
+
+        await cancel(runner, 1)
+        assert list(runner.triggers) == [2]
+        assert not task.done()
+
+        await cancel(runner, 2)
+        assert task.cancelled()
+        assert not runner.triggers
+        assert not runner.shared_runs
+        assert not runner.failed_triggers
+
+    asyncio.run(run())
+
+
+@conf_vars({('triggerer', 'deduplicate_triggers'): 'False'})
+def test_identical_triggers_not_deduplicated():
+    async def run():
+        runner = TriggerRunner()
+        moment = timezone.datetime(2030, 1, 1)
+        runner.to_create.extend([(1, DateTimeTrigger(moment)), (2, DateTimeTrigger(moment))])
+        await runner.create_triggers()
+        assert runner.triggers[1]["task"] is not runner.triggers[2]["task"]
+        for details in runner.triggers.values():
+            details["task"].cancel()
+
+    asyncio.run(run())
+
+
+def test_datetime_triggers_wait_in_timer_heap():
+    """
+    Checks that DateTimeTriggers wait in the timer heap rather than in a coroutine
+    each, unless their class runs its own coroutine.
+    """
+
+    class CustomDateTimeTrigger(DateTimeTrigger):
+        async def run(self):
+            yield TriggerEvent(self.moment)
+
+    async def run():
+        runner = TriggerRunner()
+        moment = timezone.datetime(2030, 1, 1)
+        runner.to_create.extend(
+            [
+                (1, DateTimeTrigger(moment)),
+                (2, DateTimeTrigger(timezone.utcnow() - datetime.timedelta(seconds=1))),
+                (3, CustomDateTimeTrigger(moment + datetime.timedelta(seconds=1))),
+            ]
+        )
+        await runner.create_triggers()
+        assert not isinstance(runner.triggers[1]["task"], asyncio.Task)
+        assert isinstance(runner.triggers[3]["task"], asyncio.Task)
+
+        await asyncio.sleep(0.1)
+        await runner.cleanup_finished_triggers()
+        assert sorted(runner.triggers) == [1]
+        assert sorted(trigger_id for trigger_id, _ in runner.events) == [2, 3]
+        assert len(get_timer_heap()) == 1
+
+        runner.to_cancel.append(1)
+        await runner.cancel_triggers()
+        await runner.cleanup_finished_triggers()
+        assert not runner.triggers
+        assert len(get_timer_heap()) == 0
+        assert not runner.failed_triggers
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("placement", ["cost", "classpath"])
+def test_sharded_runner_placement(placement):
+    runner = ShardedTriggerRunner(3, placement=placement)
+    with mock.patch.object(runner, "_send"):
+        for trigger_id in range(6):
+            runner.to_create.append((trigger_id, DateTimeTrigger(timezone.datetime(2030, 1, trigger_id + 1))))
+            runner._dispatch_created_triggers()
+            runner.handle_message(
+                runner.triggers[trigger_id]["process"], ("costs", {trigger_id: (trigger_id + 1.0, 0)})
+            )
+    processes = [runner.triggers[trigger_id]["process"] for trigger_id in range(6)]
+    if placement == "cost":
+        # Each trigger goes to the process whose triggers used the least CPU time
+        assert processes == [0, 1, 2, 0, 1, 2]
+        assert runner.loads() == {0: (5.0, 2), 1: (7.0, 2), 2: (9.0, 2)}
+    else:
+        # All the triggers of a class go to the same process
+        assert len(set(processes)) == 1
+
+
+def test_sharded_runner_places_identical_triggers_together():
+    runner = ShardedTriggerRunner(3)
+    with mock.patch.object(runner, "_send"):
+        for trigger_id in range(6):
+            runner.to_create.append(
+                (trigger_id, DateTimeTrigger(timezone.datetime(2030, 1, trigger_id % 2 + 1)))
+            )
+            runner._dispatch_created_triggers()
+    processes = [runner.triggers[trigger_id]["process"] for trigger_id in range(6)]
+    assert processes == [0, 1, 0, 1, 0, 1]
+
+
+def test_sharded_runner_moves_and_cancels_triggers():
+    runner = ShardedTriggerRunner(2, quarantine_after_blocks=3)
+    triggers = {trigger_id: DateTimeTrigger(timezone.datetime(2030, 1, trigger_id)) for trigger_id in (1, 2)}
+    with mock.patch.object(runner, "_send") as mock_send:
+        runner.to_create.extend(triggers.items())
+        runner._dispatch_created_triggers()
+        runner.handle_message(0, ("costs", {1: (1.0, 3)}))
+        runner.handle_message(1, ("costs", {2: (1.0, 3)}))
+        runner._quarantine_blocking_triggers()
+        assert mock_send.call_args_list == [
+            mock.call(0, ("create", 1, *triggers[1].serialize())),
+            mock.call(1, ("create", 2, *triggers[2].serialize())),
+            mock.call(0, ("cancel", 1)),
+            mock.call(1, ("cancel", 2)),
+        ]
+        mock_send.reset_mock()
+
+        # Trigger 1 is started again in the quarantine process once cancelled
+        runner.handle_message(0, ("finished", 1, True))
+        mock_send.assert_called_once_with(2, ("create", 1, *triggers[1].serialize()))
+        assert runner.triggers[1]["process"] == runner.quarantine
+        assert runner.triggers[1]["blocks"] == 0
+
+        # Trigger 2 is not started again once cancelled by the triggerer
+        mock_send.reset_mock()
+        runner.to_cancel.append(2)
+        runner._dispatch_cancelled_triggers()
+        runner.handle_message(1, ("finished", 2, True))
+        mock_send.assert_not_called()
+        assert 2 not in runner.triggers
+
+
+@pytest.mark.parametrize(
+    "processes, placement, error",
+    [
+        ("-1", "cost", "Number of runner processes -1 is invalid"),
+        ("2", "random", "Unknown trigger placement 'random'"),
+    ],
+)
+def test_invalid_runner_processes(processes, placement, error):
+    with conf_vars(
+        {('triggerer', 'runner_processes'): processes, ('triggerer', 'trigger_placement'): placement}
+    ):
+        with pytest.raises(ValueError, match=error):
+            TriggererJob()
+
+
 def test_trigger_cleanup(session):
     """
     Checks that the triggerer will correctly clean up triggers that do not
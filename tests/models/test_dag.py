@@ -2229,6 +2229,33 @@ class TestDagModel:
         session.rollback()
         session.close()
 
+    @mock.patch('airflow.utils.sqlalchemy.MAX_IN_CLAUSE_VALUES', 2)
+    @mock.patch.object(DagModel, 'NUM_DAGS_PER_DAGRUN_QUERY', 2)
+    def test_dags_needing_dagruns_of_dag_ids_in_chunks(self, session):
+        for i in range(4):
+            session.add(
+                DagModel(
+                    dag_id=f'test_dags_needing_dagruns_{i}',
+                    next_dagrun_create_after=timezone.datetime(2020, 1, 1 + i),
+                    is_active=True,
+                )
+            )
+        session.flush()
+
+        query, _ = DagModel.dags_needing_dagruns(
+            session,
+            dag_ids={
+                'test_dags_needing_dagruns_1',
+                'test_dags_needing_dagruns_2',
+                'test_dags_needing_dagruns_3',
+            },
+        )
+        assert [dag_model.dag_id for dag_model in query] == [
+            'test_dags_needing_dagruns_1',
+            'test_dags_needing_dagruns_2',
+        ]
+        session.rollback()
+
     def test_dags_needing_dagruns_datasets(self, dag_maker, session):
         dataset = Dataset(uri='hello')
         with dag_maker(
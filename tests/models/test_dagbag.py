@@ -155,6 +155,26 @@ class TestDagBag:
             dagbag = models.DagBag(dag_folder=self.empty_dir, include_examples=False)
             assert [] == dagbag.process_file(f.name)
 
+    def test_process_file_captures_local_modules(self, tmp_path, monkeypatch):
+        """Modules imported from the DAGs folder while loading a file are recorded."""
+        module_name = f"local_helpers_{os.getpid()}"
+        helper_path = tmp_path / f"{module_name}.py"
+        helper_path.write_text("VALUE = 1\n")
+        dag_path = tmp_path / "dag_with_helpers.py"
+        dag_path.write_text(f"import textwrap\nimport {module_name}\n# airflow DAG\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        try:
+            with conf_vars({('core', 'dags_folder'): str(tmp_path)}), mock.patch.object(
+                settings, "DAGS_FOLDER", str(tmp_path)
+            ):
+                dagbag = models.DagBag(dag_folder=self.empty_dir, include_examples=False)
+                dagbag.process_file(str(dag_path))
+        finally:
+            sys.modules.pop(module_name, None)
+
+        assert dagbag.file_local_modules == {str(dag_path): [str(helper_path)]}
+
     def test_process_file_duplicated_dag_id(self):
         """Loading a DAG with ID that already existed in a DAG bag should result in an import error."""
         dagbag = models.DagBag(dag_folder=self.empty_dir, include_examples=False)
@@ -981,6 +1001,33 @@ class TestDagBag:
         assert set(updated_ser_dag_1.tags) == {"example", "example2", "new_tag"}
         assert updated_ser_dag_1_update_time > ser_dag_1_update_time
 
+    def test_get_dag_with_shared_dag_cache(self, tmp_path):
+        """A DAG deserialized by one DagBag is loaded from the shared cache by the others"""
+        example_bash_op_dag = DagBag(include_examples=True).dags.get("example_bash_operator")
+        SerializedDagModel.write_dag(dag=example_bash_op_dag)
+
+        first_dag_bag = DagBag(read_dags_from_db=True, shared_dag_cache_dir=str(tmp_path))
+        first_dag = first_dag_bag.get_dag("example_bash_operator")
+
+        second_dag_bag = DagBag(read_dags_from_db=True, shared_dag_cache_dir=str(tmp_path))
+        with patch.object(SerializedDAG, "from_dict") as mock_from_dict:
+            second_dag = second_dag_bag.get_dag("example_bash_operator")
+        mock_from_dict.assert_not_called()
+        assert second_dag is not first_dag
+        assert set(second_dag.task_dict) == set(first_dag.task_dict)
+        assert second_dag.tags == first_dag.tags
+        assert second_dag_bag.dags_hash[
+            "example_bash_operator"
+        ] == SerializedDagModel.get_latest_version_hash("example_bash_operator")
+
+        # A new version of the DAG is deserialized again
+        example_bash_op_dag.tags += ["new_tag"]
+        SerializedDagModel.write_dag(dag=example_bash_op_dag)
+        third_dag = DagBag(read_dags_from_db=True, shared_dag_cache_dir=str(tmp_path)).get_dag(
+            "example_bash_operator"
+        )
+        assert "new_tag" in third_dag.tags
+
     def test_collect_dags_from_db(self):
         """DAGs are collected from Database"""
         db.clear_db_dags()
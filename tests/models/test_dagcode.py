@@ -135,6 +135,20 @@ class TestDagCode(unittest.TestCase):
             for test_string in ['example_bash_operator', 'also_run_this', 'run_this_last']:
                 assert test_string in dag_code
 
+    @patch('airflow.models.dagcode.COMPRESS_DAG_CODE', True)
+    def test_compressed_code(self):
+        """Test that compressed source code is read back from the DB"""
+        example_dag = make_example_dags(example_dags_module).get('example_bash_operator')
+        example_dag.sync_to_db()
+
+        with create_session() as session:
+            result = session.query(DagCode).filter(DagCode.fileloc == example_dag.fileloc).one()
+            assert result.source_code == ""
+            assert result.source_code_compressed is not None
+
+        with open_maybe_zipped(example_dag.fileloc, 'r') as source:
+            assert DagCode.get_code_by_fileloc(example_dag.fileloc) == source.read()
+
     def test_db_code_updated_on_dag_file_change(self):
         """Test if DagCode is updated in DB when DAG file is changed"""
         example_dag = make_example_dags(example_dags_module).get('example_bash_operator')
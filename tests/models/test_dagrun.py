@@ -624,6 +624,23 @@ class TestDagRun:
         ti = dag_run.get_task_instance('test_short_circuit_false')
         assert ti is None
 
+    def test_get_task_instances_of_dag_runs(self, session):
+        dag = DAG(dag_id='test_get_task_instances_of_dag_runs', start_date=DEFAULT_DATE)
+        EmptyOperator(task_id='task_1', dag=dag)
+        EmptyOperator(task_id='task_2', dag=dag)
+        dr_1 = self.create_dag_run(dag, execution_date=DEFAULT_DATE, session=session)
+        dr_2 = self.create_dag_run(dag, execution_date=DEFAULT_DATE.add(days=1), session=session)
+        self.create_dag_run(dag, execution_date=DEFAULT_DATE.add(days=2), session=session)
+
+        tis_by_run = DagRun.get_task_instances_of_dag_runs([dr_1, dr_2], session=session)
+
+        assert set(tis_by_run) == {(dag.dag_id, dr_1.run_id), (dag.dag_id, dr_2.run_id)}
+        for dr in (dr_1, dr_2):
+            tis = tis_by_run[dag.dag_id, dr.run_id]
+            assert sorted(ti.task_id for ti in tis) == ['task_1', 'task_2']
+            assert all(ti.run_id == dr.run_id for ti in tis)
+        assert DagRun.get_task_instances_of_dag_runs([], session=session) == {}
+
     def test_get_latest_runs(self, session):
         dag = DAG(dag_id='test_latest_runs_1', start_date=DEFAULT_DATE)
         self.create_dag_run(dag, execution_date=timezone.datetime(2015, 1, 1), session=session)
@@ -947,6 +964,26 @@ def test_verify_integrity_task_start_and_end_date(Stats_incr, session, run_type,
     Stats_incr.assert_called_with('task_instance_created-EmptyOperator', expected_tis)
 
 
+def test_verify_integrity_only_given_tasks(dag_maker, session):
+    """Test that only the task instances of the given tasks are verified"""
+    with dag_maker('test_verify_integrity_only_given_tasks', session=session):
+        EmptyOperator(task_id='task_1')
+        EmptyOperator(task_id='task_2')
+    dag_run = dag_maker.create_dagrun(state=DagRunState.QUEUED)
+
+    with DAG('test_verify_integrity_only_given_tasks', start_date=DEFAULT_DATE) as dag:
+        EmptyOperator(task_id='task_1')
+        EmptyOperator(task_id='task_3')
+        EmptyOperator(task_id='task_4')
+    dag_run.dag = dag
+    dag_run.verify_integrity(session=session, task_ids={'task_2', 'task_3'})
+
+    states = session.query(TI.task_id, TI.state).filter(
+        TI.dag_id == dag_run.dag_id, TI.run_id == dag_run.run_id
+    )
+    assert sorted(states) == [('task_1', None), ('task_2', State.REMOVED), ('task_3', None)]
+
+
 @pytest.mark.parametrize('is_noop', [True, False])
 def test_expand_mapped_task_instance_at_create(is_noop, dag_maker, session):
     with mock.patch('airflow.settings.task_instance_mutation_hook') as mock_mut:
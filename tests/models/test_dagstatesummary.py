@@ -0,0 +1,102 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import pendulum
+import pytest
+
+from airflow.models.dag import DagModel
+from airflow.models.dagstatesummary import DagStateSummary
+from airflow.operators.empty import EmptyOperator
+from airflow.utils.state import DagRunState, TaskInstanceState
+from tests.test_utils.db import clear_db_dags, clear_db_runs
+
+DEFAULT_DATE = pendulum.datetime(2022, 1, 1, tz="UTC")
+
+
+class TestDagStateSummary:
+    @pytest.fixture(autouse=True)
+    def clean_db(self):
+        clear_db_runs()
+        clear_db_dags()
+        yield
+        clear_db_runs()
+        clear_db_dags()
+
+    @pytest.fixture
+    def dag_runs(self, dag_maker, session):
+        with dag_maker('test_dag_state_summary', start_date=DEFAULT_DATE, session=session):
+            EmptyOperator(task_id='task_1')
+            EmptyOperator(task_id='task_2')
+        first = dag_maker.create_dagrun(
+            run_id='first', execution_date=DEFAULT_DATE, state=DagRunState.SUCCESS
+        )
+        second = dag_maker.create_dagrun(
+            run_id='second', execution_date=DEFAULT_DATE.add(days=1), state=DagRunState.FAILED
+        )
+        third = dag_maker.create_dagrun(
+            run_id='third', execution_date=DEFAULT_DATE.add(days=2), state=DagRunState.RUNNING
+        )
+        first.get_task_instance('task_1', session=session).state = TaskInstanceState.SUCCESS
+        second.get_task_instance('task_1', session=session).state = TaskInstanceState.FAILED
+        second.get_task_instance('task_2', session=session).state = TaskInstanceState.UPSTREAM_FAILED
+        third.get_task_instance('task_1', session=session).state = TaskInstanceState.RUNNING
+        session.flush()
+        return first, second, third
+
+    def test_refresh(self, dag_runs, session):
+        first, second, third = dag_runs
+
+        DagStateSummary.refresh({'test_dag_state_summary'}, session=session)
+
+        summary = session.query(DagStateSummary).one()
+        assert summary.dag_id == 'test_dag_state_summary'
+        assert dict(summary.dag_run_states) == {'success': 1, 'failed': 1, 'running': 1}
+        assert dict(summary.running_task_states) == {'running': 1, None: 1}
+        # The latest run which is not running
+        assert dict(summary.last_run_task_states) == {'failed': 1, 'upstream_failed': 1}
+        assert summary.last_run_state == DagRunState.RUNNING
+        assert summary.last_run_execution_date == third.execution_date
+        assert summary.last_run_start_date == third.start_date
+
+    def test_refresh_updates_existing_summary(self, dag_runs, session):
+        DagStateSummary.refresh({'test_dag_state_summary'}, session=session)
+        first_updated_at = session.query(DagStateSummary.updated_at).scalar()
+
+        third = dag_runs[2]
+        third.state = DagRunState.SUCCESS
+        third.get_task_instance('task_1', session=session).state = TaskInstanceState.SUCCESS
+        session.flush()
+        DagStateSummary.refresh({'test_dag_state_summary'}, session=session)
+
+        summary = session.query(DagStateSummary).one()
+        assert dict(summary.dag_run_states) == {'success': 2, 'failed': 1}
+        assert summary.running_task_states == []
+        assert dict(summary.last_run_task_states) == {'success': 1, None: 1}
+        assert summary.last_run_state == DagRunState.SUCCESS
+        assert summary.updated_at >= first_updated_at
+
+    def test_refresh_deletes_inactive_dags(self, dag_runs, session):
+        DagStateSummary.refresh({'test_dag_state_summary'}, session=session)
+        session.query(DagModel).filter(DagModel.dag_id == 'test_dag_state_summary').update(
+            {DagModel.is_active: False}
+        )
+
+        DagStateSummary.refresh({'test_dag_state_summary', 'unknown_dag'}, session=session)
+
+        assert session.query(DagStateSummary).count() == 0
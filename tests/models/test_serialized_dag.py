@@ -28,6 +28,7 @@ from airflow.models import DagBag
 from airflow.models.dagcode import DagCode
 from airflow.models.serialized_dag import SerializedDagModel as SDM
 from airflow.serialization.serialized_objects import SerializedDAG
+from airflow.utils import timezone
 from airflow.utils.session import create_session
 from tests.test_utils.asserts import assert_queries_count
 
@@ -48,23 +49,35 @@ def clear_db_serialized_dags():
     [
         {"compress_serialized_dags": "False"},
         {"compress_serialized_dags": "True"},
+        {"serialized_dag_encoding": "msgpack", "serialized_dag_compression": "zstd"},
+        {"serialized_dag_encoding": "msgpack", "serialized_dag_compression": "none"},
     ]
 )
 class SerializedDagModelTest(unittest.TestCase):
     """Unit tests for SerializedDagModel."""
 
     compress_serialized_dags = "False"
+    serialized_dag_encoding = "json"
+    serialized_dag_compression = "zlib"
 
     def setUp(self):
-        self.patcher = mock.patch(
-            'airflow.models.serialized_dag.COMPRESS_SERIALIZED_DAGS', self.compress_serialized_dags
-        )
-        self.patcher.start()
+        self.patchers = [
+            mock.patch(
+                'airflow.models.serialized_dag.COMPRESS_SERIALIZED_DAGS', self.compress_serialized_dags
+            ),
+            mock.patch('airflow.models.serialized_dag.SERIALIZED_DAG_ENCODING', self.serialized_dag_encoding),
+            mock.patch(
+                'airflow.models.serialized_dag.SERIALIZED_DAG_COMPRESSION', self.serialized_dag_compression
+            ),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
 
         clear_db_serialized_dags()
 
     def tearDown(self):
-        self.patcher.stop()
+        for patcher in self.patchers:
+            patcher.stop()
         clear_db_serialized_dags()
 
     def test_dag_fileloc_hash(self):
@@ -148,6 +161,34 @@ class SerializedDagModelTest(unittest.TestCase):
             assert s_dag.processor_subdir != s_dag_2.processor_subdir
             assert dag_updated is True
 
+    def test_write_dag_records_changed_tasks(self):
+        """Writing a new version of a DAG records which tasks changed since the previous one"""
+        from airflow.operators.bash import BashOperator
+
+        dag = DAG("test_changed_tasks", start_date=timezone.datetime(2022, 1, 1))
+        BashOperator(task_id="unchanged", bash_command="echo 1", dag=dag)
+        modified = BashOperator(task_id="modified", bash_command="echo 1", dag=dag)
+        BashOperator(task_id="removed", bash_command="echo 1", dag=dag)
+        SDM.write_dag(dag)
+        version_1 = SDM.get_latest_version_hash(dag.dag_id)
+
+        modified.bash_command = "echo 2"
+        del dag.task_dict["removed"]
+        BashOperator(task_id="added", bash_command="echo 1", dag=dag)
+        SDM.write_dag(dag)
+        version_2 = SDM.get_latest_version_hash(dag.dag_id)
+
+        assert SDM.get_changed_task_ids(dag.dag_id, version_1, version_2) == {"modified", "removed", "added"}
+        assert SDM.get_changed_task_ids(dag.dag_id, "older", version_2) is None
+        assert SDM.get_changed_task_ids(dag.dag_id, version_1, "newer") is None
+        assert SDM.get_changed_task_ids(dag.dag_id, None, version_2) is None
+
+        # Changing the DAG itself may change all of its tasks
+        dag.end_date = timezone.datetime(2023, 1, 1)
+        SDM.write_dag(dag)
+        version_3 = SDM.get_latest_version_hash(dag.dag_id)
+        assert SDM.get_changed_task_ids(dag.dag_id, version_2, version_3) is None
+
     def test_read_dags(self):
         """DAGs can be read from database."""
         example_dags = self._write_example_dags()
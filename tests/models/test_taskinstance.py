@@ -1374,6 +1374,34 @@ class TestTaskInstance:
         assert ti_2.xcom_pull("task_1", map_indexes=1, session=session) == "b"
         assert list(ti_2.xcom_pull("task_1", session=session)) == ["a", "b"]
 
+    @mock.patch("airflow.models.taskinstance.XCOM_FETCH_BATCH_SIZE", 2)
+    def test_xcom_pull_mapped_in_batches(self, dag_maker, session):
+        with dag_maker(dag_id="test_xcom", session=session):
+            task_1 = EmptyOperator.partial(task_id="task_1")._expand(EXPAND_INPUT_EMPTY, strict=False)
+            EmptyOperator(task_id="task_2")
+
+        dagrun = dag_maker.create_dagrun(start_date=timezone.datetime(2016, 6, 1, 0, 0, 0))
+
+        ti_1_0 = dagrun.get_task_instance("task_1", session=session)
+        ti_1_0.map_index = 0
+        tis = [ti_1_0]
+        for map_index in range(1, 5):
+            tis.append(session.merge(TI(task_1, run_id=dagrun.run_id, map_index=map_index)))
+        session.flush()
+        for ti in tis:
+            ti.xcom_push(key=XCOM_RETURN_KEY, value=ti.map_index, session=session)
+
+        ti_2 = dagrun.get_task_instance("task_2", session=session)
+        assert list(ti_2.xcom_pull("task_1", session=session)) == [0, 1, 2, 3, 4]
+        assert ti_2.xcom_pull("task_1", map_indexes=[4, 0, 2], session=session) == [4, 0, 2]
+
+    def test_xcom_push_many(self, create_task_instance, session):
+        ti = create_task_instance(dag_id="test_xcom", task_id="test_xcom", session=session)
+        ti.xcom_push_many({"foo": "bar", "baz": [1, 2]}, session=session)
+
+        assert ti.xcom_pull(task_ids="test_xcom", key="foo", session=session) == "bar"
+        assert ti.xcom_pull(task_ids="test_xcom", key="baz", session=session) == [1, 2]
+
     def test_xcom_pull_after_success(self, create_task_instance):
         """
         tests xcom set/clear relative to a task in a 'success' rerun scenario
@@ -17,16 +17,21 @@
 from __future__ import annotations
 
 import datetime
+from unittest import mock
 
 import pytest
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.orm import Query
 
 from airflow.jobs.triggerer_job import TriggererJob
 from airflow.models import TaskInstance, Trigger
 from airflow.operators.empty import EmptyOperator
 from airflow.triggers.base import TriggerEvent
+from airflow.triggers.temporal import DateTimeTrigger
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State
+from tests.test_utils.config import conf_vars
 
 
 @pytest.fixture
@@ -135,6 +140,86 @@ def test_submit_failure(session, create_task_instance):
     assert updated_task_instance.next_method == "__fail__"
 
 
+def test_submit_events(session, dag_maker):
+    """
+    Tests that events submitted together re-wake the task instances
+    deferred on each of their triggers.
+    """
+    with dag_maker(session=session):
+        for task_id in ("first", "second", "not_deferred", "no_event"):
+            EmptyOperator(task_id=task_id)
+    dag_run = dag_maker.create_dagrun()
+    triggers = {}
+    for trigger_id, ti in enumerate(dag_run.task_instances, start=1):
+        trigger = Trigger(classpath="airflow.triggers.testing.SuccessTrigger", kwargs={})
+        trigger.id = trigger_id
+        session.add(trigger)
+        ti.state = State.RUNNING if ti.task_id == "not_deferred" else State.DEFERRED
+        ti.trigger_id = trigger_id
+        ti.next_kwargs = {"cheesecake": True} if ti.task_id == "first" else None
+        triggers[ti.task_id] = trigger_id
+    session.commit()
+
+    resumed = Trigger.submit_events(
+        [
+            (triggers["first"], TriggerEvent(1)),
+            (triggers["second"], TriggerEvent(2)),
+            (triggers["second"], TriggerEvent(3)),
+            (triggers["not_deferred"], TriggerEvent(4)),
+        ],
+        session=session,
+    )
+    session.flush()
+    session.expunge_all()
+
+    assert resumed == 2
+    tis = {ti.task_id: ti for ti in session.query(TaskInstance)}
+    assert tis["first"].state == State.SCHEDULED
+    assert tis["first"].next_kwargs == {"event": 1, "cheesecake": True}
+    assert tis["first"].trigger_id is None
+    assert tis["second"].state == State.SCHEDULED
+    assert tis["second"].next_kwargs == {"event": 2}
+    assert tis["not_deferred"].state == State.RUNNING
+    assert tis["not_deferred"].trigger_id == triggers["not_deferred"]
+    assert tis["no_event"].state == State.DEFERRED
+    assert tis["no_event"].trigger_id == triggers["no_event"]
+
+
+def test_submit_failures(session, dag_maker):
+    """
+    Tests that failures submitted together fail the task instances
+    deferred on each of the triggers.
+    """
+    with dag_maker(session=session):
+        for task_id in ("first", "second", "no_failure"):
+            EmptyOperator(task_id=task_id)
+    dag_run = dag_maker.create_dagrun()
+    for trigger_id, ti in enumerate(dag_run.task_instances, start=1):
+        trigger = Trigger(classpath="airflow.triggers.testing.SuccessTrigger", kwargs={})
+        trigger.id = trigger_id
+        session.add(trigger)
+        ti.state = State.DEFERRED
+        ti.trigger_id = trigger_id
+    session.commit()
+    trigger_ids = {ti.task_id: ti.trigger_id for ti in dag_run.task_instances}
+
+    Trigger.submit_failures(
+        [(trigger_ids["first"], ValueError("Deliberate")), (trigger_ids["second"], None)], session=session
+    )
+    session.flush()
+    session.expunge_all()
+
+    tis = {ti.task_id: ti for ti in session.query(TaskInstance)}
+    for task_id in ("first", "second"):
+        assert tis[task_id].state == State.SCHEDULED
+        assert tis[task_id].next_method == "__fail__"
+        assert tis[task_id].trigger_id is None
+    assert tis["first"].next_kwargs["error"] == "Trigger failure"
+    assert "ValueError: Deliberate" in tis["first"].next_kwargs["traceback"][-1]
+    assert tis["second"].next_kwargs == {"error": "Trigger failure", "traceback": None}
+    assert tis["no_failure"].state == State.DEFERRED
+
+
 def test_assign_unassigned(session, create_task_instance):
     """
     Tests that unassigned triggers of all appropriate states are assigned.
@@ -180,3 +265,76 @@ def test_assign_unassigned(session, create_task_instance):
         session.query(Trigger).filter(Trigger.id == trigger_on_healthy_triggerer.id).one().triggerer_id
         == healthy_triggerer.id
     )
+
+
+@pytest.mark.parametrize(
+    "dialect_name, enabled, notified",
+    [("postgresql", "True", True), ("postgresql", "False", False), ("mysql", "True", False)],
+)
+def test_notify_new_triggers(dialect_name, enabled, notified):
+    """
+    Checks that new triggers are only notified on PostgreSQL, when enabled.
+    """
+    session = mock.MagicMock()
+    session.get_bind.return_value.dialect.name = dialect_name
+    with conf_vars({('triggerer', 'notify_new_triggers'): enabled}):
+        Trigger.notify_new_triggers(session=session)
+    if notified:
+        session.execute.assert_called_once()
+        assert str(session.execute.call_args.args[0]) == "NOTIFY airflow_new_trigger"
+    else:
+        session.execute.assert_not_called()
+
+
+def test_get_or_create(session, dag_maker):
+    """
+    Checks that tasks deferring on identical triggers share a trigger row.
+    """
+    with dag_maker():
+        EmptyOperator(task_id='a')
+        EmptyOperator(task_id='b')
+    dag_run = dag_maker.create_dagrun()
+    ti_a, ti_b = sorted(dag_run.task_instances, key=lambda ti: ti.task_id)
+    moment = timezone.datetime(2030, 1, 1)
+
+    # No task is deferred on a trigger yet
+    trigger_row = Trigger.get_or_create(DateTimeTrigger(moment), session=session)
+    assert trigger_row.trigger_hash == Trigger.compute_hash(*DateTimeTrigger(moment).serialize())
+    ti_a.state = State.DEFERRED
+    ti_a.trigger_id = trigger_row.id
+    session.flush()
+
+    assert Trigger.get_or_create(DateTimeTrigger(moment), session=session) is trigger_row
+    other_row = Trigger.get_or_create(DateTimeTrigger(timezone.datetime(2030, 1, 2)), session=session)
+    assert other_row.id != trigger_row.id
+    with conf_vars({('triggerer', 'deduplicate_triggers'): 'False'}):
+        assert Trigger.get_or_create(DateTimeTrigger(moment), session=session).id != trigger_row.id
+
+    # Triggers are only shared while tasks are deferred on them
+    ti_a.state = State.SCHEDULED
+    session.flush()
+    assert Trigger.get_or_create(DateTimeTrigger(moment), session=session).id != trigger_row.id
+
+
+@pytest.mark.parametrize(
+    "dialect, lock",
+    [
+        (postgresql.dialect(), "FOR SHARE SKIP LOCKED"),
+        (mysql.dialect(), "FOR UPDATE SKIP LOCKED"),
+    ],
+)
+def test_get_or_create_lock(dialect, lock):
+    """
+    Checks that the row of an identical trigger is locked with a clause the database accepts,
+    MySQL only skipping the rows locked for update.
+    """
+    # MySQL 8 supports SKIP LOCKED
+    dialect.supports_for_update_of = True
+    session = mock.MagicMock()
+    session.bind.dialect = dialect
+    session.query.side_effect = Query
+    trigger_row = Trigger.from_object(DateTimeTrigger(timezone.datetime(2030, 1, 1)))
+
+    query = Trigger._identical_trigger_query(trigger_row, session)
+    sql = str(query.statement.compile(dialect=dialect))
+    assert sql.endswith(lock)
@@ -203,6 +203,21 @@ class TestXCom:
         assert value == {"key": "value"}
         XCom.orm_deserialize_value.assert_not_called()
 
+    def test_deserialize_values(self):
+        rows = [MagicMock(value=json.dumps(i).encode()) for i in range(3)] + [MagicMock(value=None)]
+        with mock.patch("airflow.models.xcom.conf.getboolean", return_value=False) as mock_getboolean:
+            assert list(BaseXCom.deserialize_values(rows)) == [0, 1, 2, None]
+        mock_getboolean.assert_called_once_with("core", "enable_xcom_pickling")
+
+    def test_deserialize_values_custom_backend_deserialize_value(self):
+        class DeserializeXCom(BaseXCom):
+            @staticmethod
+            def deserialize_value(result):
+                return f"custom {result.value}"
+
+        rows = [MagicMock(value="a"), MagicMock(value="b")]
+        assert list(DeserializeXCom.deserialize_values(rows)) == ["custom a", "custom b"]
+
     @conf_vars({("core", "enable_xcom_pickling"): 'False'})
     @mock.patch('airflow.models.xcom.conf.getimport')
     def test_set_serialize_call_old_signature(self, get_import, task_instance):
@@ -486,6 +501,29 @@ class TestXComGet:
         assert [x.value for x in stored_xcoms] == [{"key2": "value2"}, {"key1": "value1"}]
         assert [x.execution_date for x in stored_xcoms] == [ti2.execution_date, ti1.execution_date]
 
+    @pytest.mark.usefixtures("setup_for_xcom_get_many_multiple_tasks")
+    def test_xcom_get_values(self, session, task_instance):
+        values = XCom.get_values(
+            dag_id=task_instance.dag_id,
+            run_id=task_instance.run_id,
+            ti_keys=[("task_1", -1), ("task_2", -1), ("task_3", -1), ("task_1", 0)],
+            key="xcom_1",
+            session=session,
+        )
+        assert values == {("task_1", -1): {"key1": "value1"}, ("task_2", -1): {"key2": "value2"}}
+
+    @pytest.mark.usefixtures("setup_for_xcom_get_many_multiple_tasks")
+    @mock.patch("airflow.models.xcom.XCOM_MAX_FILTER_SIZE", 1)
+    def test_xcom_get_values_filtered_after_fetch(self, session, task_instance):
+        values = XCom.get_values(
+            dag_id=task_instance.dag_id,
+            run_id=task_instance.run_id,
+            ti_keys=[("task_2", -1), ("task_1", 0)],
+            key="xcom_1",
+            session=session,
+        )
+        assert values == {("task_2", -1): {"key2": "value2"}}
+
 
 @pytest.mark.usefixtures("setup_xcom_pickling")
 class TestXComSet:
@@ -553,6 +591,39 @@ class TestXComSet:
             )
         assert session.query(XCom).one().value == {"key2": "value2"}
 
+    def test_xcom_set_many(self, session, task_instance):
+        XCom.set_many(
+            {"xcom_1": {"key": "value"}, "xcom_2": [1, 2]},
+            dag_id=task_instance.dag_id,
+            task_id=task_instance.task_id,
+            run_id=task_instance.run_id,
+            session=session,
+        )
+        stored_xcoms = session.query(XCom).order_by(XCom.key).all()
+        assert [(x.key, x.value) for x in stored_xcoms] == [("xcom_1", {"key": "value"}), ("xcom_2", [1, 2])]
+        assert {x.execution_date for x in stored_xcoms} == {task_instance.execution_date}
+
+    @pytest.mark.usefixtures("setup_for_xcom_set_again_replace")
+    def test_xcom_set_many_again_replace(self, session, task_instance):
+        XCom.set_many(
+            {"xcom_1": {"key2": "value2"}},
+            dag_id=task_instance.dag_id,
+            task_id="task_1",
+            run_id=task_instance.run_id,
+            session=session,
+        )
+        assert session.query(XCom).one().value == {"key2": "value2"}
+
+    def test_xcom_set_many_dag_run_not_found(self, session, task_instance):
+        with pytest.raises(ValueError, match="DAG run not found"):
+            XCom.set_many(
+                {"xcom_1": 1},
+                dag_id=task_instance.dag_id,
+                task_id="task_1",
+                run_id="missing",
+                session=session,
+            )
+
 
 @pytest.mark.usefixtures("setup_xcom_pickling")
 class TestXComClear:
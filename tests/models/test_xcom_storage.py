@@ -0,0 +1,203 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+from airflow.exceptions import AirflowConfigException, AirflowException
+from airflow.models.xcom import XCOM_RETURN_KEY, XCom
+from airflow.models.xcom_storage import (
+    REFERENCE_PREFIX,
+    TieredXCom,
+    XComPayloadStore,
+    get_payload_store,
+    is_reference,
+)
+from airflow.utils import timezone
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_runs
+
+LARGE_VALUE = {"data": "x" * 100}
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    clear_db_runs()
+    yield
+    clear_db_runs()
+
+
+@pytest.fixture()
+def storage_path(tmp_path):
+    path = tmp_path / "xcom"
+    with conf_vars(
+        {
+            ("core", "xcom_storage_path"): os.fspath(path),
+            ("core", "xcom_storage_threshold"): "50",
+            ("core", "enable_xcom_pickling"): "False",
+        }
+    ):
+        yield path
+
+
+@pytest.fixture()
+def task_instance(create_task_instance, session):
+    return create_task_instance(dag_id="dag", task_id="task", session=session)
+
+
+def _set(ti, value, session, key=XCOM_RETURN_KEY):
+    TieredXCom.set(
+        key=key, value=value, dag_id=ti.dag_id, task_id=ti.task_id, run_id=ti.run_id, session=session
+    )
+
+
+def _get_stored_value(ti, session, key=XCOM_RETURN_KEY):
+    return session.query(XCom.value).filter_by(dag_id=ti.dag_id, task_id=ti.task_id, key=key).scalar()
+
+
+class TestXComPayloadStore:
+    def test_put_get(self, tmp_path):
+        store = XComPayloadStore(os.fspath(tmp_path))
+        digest = store.put(b"value")
+        assert digest == hashlib.sha256(b"value").hexdigest()
+        assert (tmp_path / digest[:2] / digest).read_bytes() == b"value"
+
+        buffer = store.get(digest)
+        try:
+            assert buffer[:] == b"value"
+        finally:
+            buffer.close()
+
+    def test_put_deduplicated(self, tmp_path):
+        store = XComPayloadStore(f"file://{tmp_path}/")
+        path = store.get_path(store.put(b"value"))
+        os.utime(path, (0, 0))
+
+        store.put(b"value")
+        assert [digest for digest, _ in store.list()] == [hashlib.sha256(b"value").hexdigest()]
+        # The time of the file is refreshed so it is not purged while the new XCom is stored
+        assert os.stat(path).st_mtime > 0
+
+    def test_put_object_store_rewrites_existing_object(self):
+        fs = mock.MagicMock()
+        fs.exists.return_value = True
+        fsspec = mock.MagicMock()
+        fsspec.core.url_to_fs.return_value = (fs, "bucket/xcom")
+        with mock.patch.dict(sys.modules, {"fsspec": fsspec}):
+            store = XComPayloadStore("s3://bucket/xcom")
+
+        digest = store.put(b"value")
+        # The object is written again so that its time is refreshed
+        fs.pipe_file.assert_called_once_with(f"bucket/xcom/{digest[:2]}/{digest}", b"value")
+
+    def test_get_missing(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            XComPayloadStore(os.fspath(tmp_path)).get("0" * 64)
+
+    def test_list_delete(self, tmp_path):
+        store = XComPayloadStore(os.fspath(tmp_path))
+        assert list(XComPayloadStore(os.fspath(tmp_path / "missing")).list()) == []
+        first, second = store.put(b"first"), store.put(b"second")
+        (tmp_path / first[:2] / "partial.tmp").write_bytes(b"")
+
+        assert {digest for digest, _ in store.list()} == {first, second}
+        store.delete(first)
+        store.delete(first)
+        assert [digest for digest, _ in store.list()] == [second]
+
+    def test_object_store_requires_fsspec(self):
+        with mock.patch.dict(sys.modules, {"fsspec": None}):
+            with pytest.raises(AirflowException, match="pip install fsspec"):
+                XComPayloadStore("s3://bucket/xcom")
+
+    def test_get_payload_store_requires_path(self):
+        with conf_vars({("core", "xcom_storage_path"): ""}):
+            with pytest.raises(AirflowConfigException, match="xcom_storage_path"):
+                get_payload_store()
+
+
+class TestTieredXCom:
+    def test_small_value_in_database(self, storage_path, task_instance, session):
+        _set(task_instance, {"small": 1}, session)
+
+        assert _get_stored_value(task_instance, session) == json.dumps({"small": 1}).encode()
+        assert not storage_path.exists()
+        assert TieredXCom.get_value(ti_key=task_instance.key, session=session) == {"small": 1}
+
+    def test_large_value_stored_by_hash(self, storage_path, task_instance, session):
+        _set(task_instance, LARGE_VALUE, session)
+
+        data = json.dumps(LARGE_VALUE).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        reference = _get_stored_value(task_instance, session)
+        assert reference == REFERENCE_PREFIX + digest.encode()
+        assert is_reference(reference)
+        assert (storage_path / digest[:2] / digest).read_bytes() == data
+        assert TieredXCom.get_value(ti_key=task_instance.key, session=session) == LARGE_VALUE
+
+    @conf_vars({("core", "enable_xcom_pickling"): "True"})
+    def test_large_pickled_value(self, storage_path, task_instance, session):
+        _set(task_instance, LARGE_VALUE, session)
+
+        assert is_reference(_get_stored_value(task_instance, session))
+        assert TieredXCom.get_value(ti_key=task_instance.key, session=session) == LARGE_VALUE
+
+    def test_identical_values_stored_once(self, storage_path, task_instance, session):
+        _set(task_instance, LARGE_VALUE, session, key="first")
+        _set(task_instance, LARGE_VALUE, session, key="second")
+
+        assert _get_stored_value(task_instance, session, "first") == _get_stored_value(
+            task_instance, session, "second"
+        )
+        assert len(list(get_payload_store().list())) == 1
+
+    def test_deserialize_values(self, storage_path, task_instance, session):
+        _set(task_instance, LARGE_VALUE, session, key="large")
+        _set(task_instance, "small", session, key="small")
+
+        rows = session.query(XCom.value).order_by(XCom.key).all()
+        assert list(TieredXCom.deserialize_values(rows)) == [LARGE_VALUE, "small"]
+
+    def test_orm_deserialize_value_does_not_read_large_value(self, storage_path, task_instance, session):
+        _set(task_instance, LARGE_VALUE, session)
+        digest = hashlib.sha256(json.dumps(LARGE_VALUE).encode()).hexdigest()
+
+        xcom = TieredXCom(value=_get_stored_value(task_instance, session))
+        with mock.patch.object(XComPayloadStore, "get") as mock_get:
+            value = xcom.orm_deserialize_value()
+        mock_get.assert_not_called()
+        assert value == f"XCom value stored at {storage_path}/{digest[:2]}/{digest}"
+
+    def test_purge_unreferenced(self, storage_path, task_instance, session):
+        _set(task_instance, LARGE_VALUE, session)
+        store = get_payload_store()
+        referenced = hashlib.sha256(json.dumps(LARGE_VALUE).encode()).hexdigest()
+        old_unreferenced = store.put(b"old")
+        new_unreferenced = store.put(b"new")
+        for digest in (referenced, old_unreferenced):
+            os.utime(store.get_path(digest), (0, 0))
+
+        older_than = timezone.utcnow() - datetime.timedelta(hours=1)
+        assert TieredXCom.purge_unreferenced(older_than=older_than, session=session) == 1
+        assert {digest for digest, _ in store.list()} == {referenced, new_unreferenced}
@@ -0,0 +1,95 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import zlib
+from unittest import mock
+
+import pytest
+
+from airflow.exceptions import AirflowConfigException, AirflowException
+from airflow.serialization import blob
+
+DATA = {
+    "__version": 1,
+    "dag": {
+        "_dag_id": "test_dag",
+        "tasks": [
+            {"task_id": f"task_{i}", "_task_type": "EmptyOperator", "_task_module": "airflow.operators.empty"}
+            for i in range(10)
+        ],
+        "params": {"__var": {"a": 1.5, "b": None, "c": True}, "__type": "dict"},
+        "edge_info": {},
+    },
+}
+
+FORMATS = [
+    (encoding, compression)
+    for encoding in ("json", "msgpack")
+    for compression in ("none", "zlib", "zstd")
+    if (encoding, compression) != ("json", "zlib")
+]
+
+
+@pytest.mark.parametrize("encoding, compression", FORMATS)
+def test_roundtrip(encoding, compression):
+    pytest.importorskip("msgpack")
+    pytest.importorskip("zstandard")
+    encoded = blob.encode(DATA, encoding, compression)
+
+    assert encoded.startswith(blob.MAGIC)
+    assert blob.decode(encoded) == DATA
+
+
+def test_json_zlib_is_written_without_header():
+    encoded = blob.encode(DATA, "json", "zlib")
+
+    assert json.loads(zlib.decompress(encoded)) == DATA
+
+
+def test_decode_legacy_compressed_json():
+    assert blob.decode(zlib.compress(json.dumps(DATA).encode("utf-8"))) == DATA
+
+
+def test_text_roundtrip():
+    source_code = "from airflow import DAG\n# ünïcödé\n"
+
+    assert blob.decode(blob.encode(source_code, "text", "zlib")) == source_code
+
+
+def test_msgpack_is_smaller_than_json():
+    pytest.importorskip("msgpack")
+
+    assert len(blob.encode(DATA, "msgpack", "none")) < len(blob.encode(DATA, "json", "none"))
+
+
+def test_unknown_format():
+    with pytest.raises(AirflowConfigException, match="Unknown serialization encoding"):
+        blob.encode(DATA, "xml", "zlib")
+    with pytest.raises(AirflowConfigException, match="Unknown serialization compression"):
+        blob.encode(DATA, "json", "lzma")
+    with pytest.raises(AirflowConfigException, match="Unknown serialization compression"):
+        blob.compress(b"{}", "json", "lzma")
+    with pytest.raises(AirflowException, match="Unknown encoding 9"):
+        blob.decode(blob.MAGIC + bytes([9, 0]))
+
+
+def test_missing_optional_package():
+    with mock.patch.dict("sys.modules", {"zstandard": None}):
+        with pytest.raises(AirflowException, match="pip install zstandard"):
+            blob.encode(DATA, "json", "zstd")
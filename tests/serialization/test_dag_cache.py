@@ -0,0 +1,99 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+
+import pendulum
+import pytest
+
+from airflow.models.dag import DAG
+from airflow.operators.empty import EmptyOperator
+from airflow.serialization.dag_cache import SharedDagCache
+from airflow.serialization.serialized_objects import SerializedDAG
+from airflow.utils.task_group import TaskGroup
+
+
+@pytest.fixture
+def serialized_dag():
+    with DAG("test_shared_dag_cache", start_date=pendulum.datetime(2022, 1, 1), schedule=None) as dag:
+        EmptyOperator(task_id="first") >> EmptyOperator(task_id="second")
+    return SerializedDAG.from_dict(SerializedDAG.to_dict(dag))
+
+
+def test_roundtrip(tmp_path, serialized_dag):
+    cache = SharedDagCache(str(tmp_path))
+    assert cache.get("test_shared_dag_cache", "hash1") is None
+
+    cache.set("test_shared_dag_cache", "hash1", serialized_dag)
+    loaded = SharedDagCache(str(tmp_path)).get("test_shared_dag_cache", "hash1")
+
+    assert loaded.dag_id == serialized_dag.dag_id
+    assert loaded.task_dict["first"].downstream_task_ids == {"second"}
+    assert loaded.task_dict["second"].dag is loaded
+    assert cache.get("test_shared_dag_cache", "hash2") is None
+
+
+def test_roundtrip_task_groups(tmp_path):
+    with DAG("test_shared_dag_cache", start_date=pendulum.datetime(2022, 1, 1), schedule=None) as dag:
+        start = EmptyOperator(task_id="start")
+        with TaskGroup("section") as section:
+            with TaskGroup("inner"):
+                EmptyOperator(task_id="task")
+        start >> section
+    serialized_dag = SerializedDAG.from_dict(SerializedDAG.to_dict(dag))
+    cache = SharedDagCache(str(tmp_path))
+
+    cache.set("test_shared_dag_cache", "hash1", serialized_dag)
+    loaded = cache.get("test_shared_dag_cache", "hash1")
+
+    task = loaded.task_dict["section.inner.task"]
+    assert task.label == "task"
+    assert task.task_group.group_id == "section.inner"
+    assert task.task_group.parent_group.group_id == "section"
+    inner = loaded.task_group.get_task_group_dict()["section.inner"]
+    assert inner.children["section.inner.task"] is task
+    assert loaded.task_dict["start"].task_group.group_id is None
+    assert loaded.task_dict["start"].downstream_task_ids == {"section.inner.task"}
+
+
+def test_set_removes_other_versions(tmp_path, serialized_dag):
+    cache = SharedDagCache(str(tmp_path))
+    cache.set("test_shared_dag_cache", "hash1", serialized_dag)
+    cache.set("test_shared_dag_cache", "hash2", serialized_dag)
+
+    assert cache.get("test_shared_dag_cache", "hash1") is None
+    assert cache.get("test_shared_dag_cache", "hash2") is not None
+    assert os.listdir(os.path.join(cache.directory, "test_shared_dag_cache")) == ["hash2.pickle"]
+
+
+def test_unreadable_entry_is_a_miss(tmp_path, serialized_dag):
+    cache = SharedDagCache(str(tmp_path))
+    cache.set("test_shared_dag_cache", "hash1", serialized_dag)
+    with open(os.path.join(cache.directory, "test_shared_dag_cache", "hash1.pickle"), "wb") as f:
+        f.write(b"not a pickle")
+
+    assert cache.get("test_shared_dag_cache", "hash1") is None
+
+
+def test_set_failure_is_ignored(tmp_path, serialized_dag):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = SharedDagCache(str(not_a_directory))
+
+    cache.set("test_shared_dag_cache", "hash1", serialized_dag)
+    assert cache.get("test_shared_dag_cache", "hash1") is None
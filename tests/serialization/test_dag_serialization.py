@@ -1265,6 +1265,77 @@ class TestStringifiedDAGs:
 
         check_task_group(serialized_dag.task_group)
 
+    def test_lazy_deserialization_example_dags(self):
+        """Lazily deserialized DAGs should match the DAGs they were serialized from."""
+        dags = collect_dags("airflow/example_dags")
+
+        for dag in dags.values():
+            serialized = SerializedDAG.to_dict(dag)
+            lazy_dag = SerializedDAG.from_dict(serialized, lazy=True)
+            self.validate_deserialized_dag(lazy_dag, dag)
+            eager_dag = SerializedDAG.from_dict(serialized)
+            assert SerializedDAG.to_dict(lazy_dag) == SerializedDAG.to_dict(eager_dag)
+
+    def test_lazy_deserialization_loads_tasks_on_access(self):
+        from airflow.operators.empty import EmptyOperator
+
+        with DAG("test_lazy_deserialization", start_date=datetime(2020, 1, 1)) as dag:
+            task1 = EmptyOperator(task_id="task1")
+            with TaskGroup("group") as group:
+                task2 = MockOperator(task_id="task2")
+                mapped = MockOperator.partial(task_id="mapped").expand(arg1=task2.output)
+            task1 >> group
+            group >> EmptyOperator(task_id="task3", end_date=datetime(2020, 2, 1))
+
+        eager_dag = SerializedDAG.from_dict(SerializedDAG.to_dict(dag))
+        with mock.patch.object(
+            SerializedBaseOperator,
+            "deserialize_operator",
+            side_effect=SerializedBaseOperator.deserialize_operator,
+        ) as mock_deserialize_operator:
+            lazy_dag = SerializedDAG.from_dict(SerializedDAG.to_dict(dag), lazy=True)
+
+            # The structure of the DAG is available without loading any task
+            assert lazy_dag.task_ids == eager_dag.task_ids
+            assert len(lazy_dag.task_dict) == 4
+            assert "group.mapped" in lazy_dag.task_dict
+            assert "missing" not in lazy_dag.task_dict
+            assert list(lazy_dag.task_group.children) == ["task1", "group", "task3"]
+            assert list(lazy_dag.task_group.children["group"].children) == ["group.task2", "group.mapped"]
+            assert lazy_dag.task_group.get_child_by_label("group").upstream_task_ids == {"task1"}
+            assert mock_deserialize_operator.call_count == 0
+
+            # Loading a mapped task loads the task its input refers to, and nothing else
+            lazy_mapped = lazy_dag.get_task(mapped.task_id)
+            assert mock_deserialize_operator.call_count == 2
+            assert lazy_mapped.dag is lazy_dag
+            assert lazy_mapped.task_group.group_id == "group"
+            assert lazy_mapped.upstream_task_ids == {"group.task2"}
+            assert lazy_mapped.start_date == dag.start_date
+            assert lazy_mapped.expand_input.value["arg1"].operator is lazy_dag.get_task(task2.task_id)
+            assert lazy_dag.task_group.children["group"].children["group.mapped"] is lazy_mapped
+            assert mock_deserialize_operator.call_count == 2
+
+            assert lazy_dag.task_dict.get("task3").end_date == datetime(2020, 2, 1, tzinfo=timezone.utc)
+            assert lazy_dag.task_dict.get("missing") is None
+            assert mock_deserialize_operator.call_count == 3
+
+            # Accessing all the tasks loads the remaining ones, in order
+            assert [task.task_id for task in lazy_dag.tasks] == eager_dag.task_ids
+            assert mock_deserialize_operator.call_count == 4
+
+        for task_id, task in lazy_dag.task_dict.items():
+            eager_task = eager_dag.get_task(task_id)
+            assert task.upstream_task_ids == eager_task.upstream_task_ids
+            assert task.downstream_task_ids == eager_task.downstream_task_ids
+            assert task.task_group.group_id == eager_task.task_group.group_id
+
+        # Copies of the lazily loaded DAG are plain DAGs
+        copied = copy.deepcopy(lazy_dag)
+        assert type(copied.task_dict) is dict
+        assert copied.task_ids == eager_dag.task_ids
+        assert pickle.loads(pickle.dumps(lazy_dag.task_dict)).keys() == eager_dag.task_dict.keys()
+
     def test_deps_sorted(self):
         """
         Tests serialize_operator, make sure the deps is in order
@@ -39,6 +39,7 @@ from airflow.models import (
 )
 from airflow.models.dag import DagOwnerAttributes
 from airflow.models.dagcode import DagCode
+from airflow.models.dagstatesummary import DagStateSummary
 from airflow.models.dagwarning import DagWarning
 from airflow.models.dataset import (
     DagScheduleDatasetReference,
@@ -75,6 +76,7 @@ def clear_db_dags():
     with create_session() as session:
         session.query(DagTag).delete()
         session.query(DagOwnerAttributes).delete()
+        session.query(DagStateSummary).delete()
         session.query(DagModel).delete()
 
 
@@ -27,13 +27,14 @@ from airflow.models import DAG
 from airflow.models.baseoperator import BaseOperator
 from airflow.models.taskinstance import TaskInstance
 from airflow.operators.empty import EmptyOperator
-from airflow.ti_deps.dep_context import DepContext
+from airflow.ti_deps.dep_context import DepContext, UpstreamStateSummary
 from airflow.ti_deps.deps.trigger_rule_dep import TriggerRuleDep
 from airflow.utils import timezone
 from airflow.utils.session import create_session
 from airflow.utils.state import State, TaskInstanceState
 from airflow.utils.trigger_rule import TriggerRule
 from tests.models import DEFAULT_DATE
+from tests.test_utils.asserts import assert_queries_count
 from tests.test_utils.db import clear_db_runs
 
 
@@ -851,6 +852,37 @@ class TestTriggerRuleDep:
         dr.update_state()
         assert State.SUCCESS == dr.state
 
+    def test_upstream_state_summary(self, session, get_mapped_task_dagrun):
+        """
+        The summary computed once per dag run gives the same counts as the per task instance helpers
+        """
+        dr, task = get_mapped_task_dagrun()
+        tis = dr.get_task_instances(session=session)
+        finished_tis = [ti for ti in tis if ti.state in State.finished]
+        upstream_states = UpstreamStateSummary(finished_tis, tis)
+        ti = dr.get_task_instance(task_id='do_something_else', map_index=3, session=session)
+        ti.task = task
+
+        assert upstream_states.count_states(task.upstream_task_ids) == (
+            TriggerRuleDep._get_states_count_upstream_ti(task=task, finished_tis=finished_tis)
+        )
+        assert upstream_states.count_states(task.upstream_task_ids) == (3, 0, 0, 0, 2, 5)
+        expected_upstreams = TriggerRuleDep._count_upstreams(ti, session=session)
+        with assert_queries_count(0):
+            assert (
+                TriggerRuleDep._count_upstreams(ti, session=session, upstream_states=upstream_states)
+                == expected_upstreams
+                == 5
+            )
+
+        # Once mapped tasks were expanded, the expanded task instances are counted in the database again
+        upstream_states.forget_expanded_tis()
+        with assert_queries_count(1):
+            assert (
+                TriggerRuleDep._count_upstreams(ti, session=session, upstream_states=upstream_states)
+                == expected_upstreams
+            )
+
     def test_mapped_task_upstream_removed_with_all_success_trigger_rules(
         self, session, get_mapped_task_dagrun
     ):
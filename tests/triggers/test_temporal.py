@@ -23,7 +23,13 @@ import pendulum
 import pytest
 
 from airflow.triggers.base import TriggerEvent
-from airflow.triggers.temporal import DateTimeTrigger, TimeDeltaTrigger
+from airflow.triggers.temporal import (
+    DateTimeTrigger,
+    TimeDeltaTrigger,
+    TimerHeap,
+    get_timer_heap,
+    sleep_until,
+)
 from airflow.utils import timezone
 
 
@@ -88,3 +94,90 @@ async def test_datetime_trigger_timing():
     result = trigger_task.result()
     assert isinstance(result, TriggerEvent)
     assert result.payload == past_moment
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_fires_reached_deadlines_together():
+    """
+    Tests that the TimerHeap calls the callbacks of all the reached deadlines
+    at once, in the order of their deadlines, and leaves the others waiting.
+    """
+    heap = TimerHeap(asyncio.get_running_loop())
+    now = timezone.utcnow()
+    called = []
+    heap.schedule(now - datetime.timedelta(seconds=1), lambda: called.append("second"))
+    heap.schedule(now - datetime.timedelta(seconds=2), lambda: called.append("first"))
+    heap.schedule(now + datetime.timedelta(seconds=60), lambda: called.append("later"))
+    assert len(heap) == 3
+
+    await asyncio.sleep(0.1)
+
+    assert called == ["first", "second"]
+    assert len(heap) == 1
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_survives_failing_callback(caplog):
+    """
+    Tests that a callback raising an exception does not keep the TimerHeap
+    from calling the other reached deadlines, nor from waiting for the later ones.
+    """
+    heap = TimerHeap(asyncio.get_running_loop())
+    now = timezone.utcnow()
+    called = []
+
+    def fail():
+        raise RuntimeError("callback failed")
+
+    heap.schedule(now - datetime.timedelta(seconds=2), fail)
+    heap.schedule(now - datetime.timedelta(seconds=1), lambda: called.append("due"))
+    heap.schedule(now + datetime.timedelta(seconds=0.2), lambda: called.append("later"))
+
+    await asyncio.sleep(0.5)
+
+    assert called == ["due", "later"]
+    assert len(heap) == 0
+    assert "Exception in the callback of a deadline of a TimerHeap" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_cancel():
+    """
+    Tests that cancelled entries are never called, and that the heap is
+    rebuilt once they are the majority of it.
+    """
+    heap = TimerHeap(asyncio.get_running_loop())
+    moment = timezone.utcnow() + datetime.timedelta(seconds=60)
+    called = []
+    entries = [heap.schedule(moment, lambda: called.append(i)) for i in range(4)]
+    entries[0].cancel()
+    entries[1].cancel()
+    # Cancelling twice is counted once
+    entries[1].cancel()
+    assert len(heap) == 2
+    assert len(heap._heap) == 4
+
+    entries[2].cancel()
+    assert len(heap) == 1
+    assert len(heap._heap) == 1
+    assert called == []
+
+
+@pytest.mark.asyncio
+async def test_sleep_until():
+    """
+    Tests that sleep_until waits in the timer heap of the running loop, and
+    leaves it when cancelled.
+    """
+    heap = get_timer_heap()
+    assert get_timer_heap() is heap
+
+    await asyncio.wait_for(sleep_until(timezone.utcnow() - datetime.timedelta(seconds=1)), timeout=1)
+
+    task = asyncio.create_task(sleep_until(timezone.utcnow() + datetime.timedelta(seconds=60)))
+    await asyncio.sleep(0.1)
+    assert len(heap) == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(heap) == 0
@@ -0,0 +1,91 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import gzip
+
+import pytest
+
+from airflow.exceptions import AirflowConfigException
+from airflow.utils.log.log_compression import (
+    compress_log,
+    find_compressed_log,
+    get_log_compression,
+    get_log_files,
+    log_exists,
+    open_log,
+)
+from tests.test_utils.config import conf_vars
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "1.log"
+    path.write_bytes(b"first line\n")
+    return str(path)
+
+
+class TestLogCompression:
+    @pytest.mark.parametrize("compression, suffix", [("gzip", ".gz"), ("zstd", ".zst")])
+    def test_compress_log(self, log_path, compression, suffix):
+        compress_log(log_path, compression)
+
+        assert get_log_files(log_path) == [log_path + suffix]
+        assert find_compressed_log(log_path) == (log_path + suffix, compression)
+        with open_log(log_path) as file:
+            assert file.read() == b"first line\n"
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_compress_log_appends_to_segment(self, log_path, compression):
+        compress_log(log_path, compression)
+        with open(log_path, "wb") as file:
+            file.write(b"second line\n")
+        compress_log(log_path, "gzip")
+        with open(log_path, "wb") as file:
+            file.write(b"third line\n")
+
+        # The log keeps the compression of its segment
+        assert find_compressed_log(log_path)[1] == compression
+        assert len(get_log_files(log_path)) == 2
+        with open_log(log_path) as file:
+            assert not file.seekable()
+            assert file.read() == b"first line\nsecond line\nthird line\n"
+
+    def test_gzip_segment_is_readable_by_gzip(self, log_path):
+        compress_log(log_path, "gzip")
+
+        with gzip.open(log_path + ".gz") as file:
+            assert file.read() == b"first line\n"
+
+    def test_compress_missing_log(self, tmp_path):
+        compress_log(str(tmp_path / "missing.log"), "gzip")
+
+        assert not log_exists(str(tmp_path / "missing.log"))
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("none", None), ("", None), ("gzip", "gzip"), ("ZSTD", "zstd")],
+    )
+    def test_get_log_compression(self, value, expected):
+        with conf_vars({("logging", "task_log_compression"): value}):
+            assert get_log_compression() == expected
+
+    def test_get_unknown_log_compression(self):
+        with conf_vars({("logging", "task_log_compression"): "bzip2"}):
+            with pytest.raises(AirflowConfigException, match="Unknown task log compression"):
+                get_log_compression()
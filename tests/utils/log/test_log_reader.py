@@ -127,7 +127,7 @@ class TestLogView:
                 f"try_number=1.\n",
             )
         ] == logs[0]
-        assert metadatas == {'end_of_log': True, 'log_pos': 102 + len(self.log_dir)}
+        assert metadatas == {'end_of_log': True, 'log_pos': len("try_number=1.\n")}
 
     def test_test_read_log_chunks_should_read_all_files(self):
         task_log_reader = TaskLogReader()
@@ -159,7 +159,7 @@ class TestLogView:
                 )
             ],
         ] == logs
-        assert {'end_of_log': True, 'log_pos': 102 + len(self.log_dir)} == metadatas
+        assert {'end_of_log': True, 'log_pos': len("try_number=1.\n")} == metadatas
 
     def test_test_test_read_log_stream_should_read_one_try(self):
         task_log_reader = TaskLogReader()
@@ -213,6 +213,20 @@ class TestLogView:
             any_order=False,
         )
 
+    @mock.patch("airflow.utils.log.file_task_handler.FileTaskHandler.read")
+    def test_read_log_stream_should_read_running_try_until_caught_up(self, mock_read):
+        first_return = ([[('', "1st line")]], [{"end_of_log": False, "log_pos": 9}])
+        second_return = ([[('', "2nd line")]], [{"end_of_log": False, "log_pos": 18}])
+        third_return = ([[('', "")]], [{"end_of_log": False, "log_pos": 18}])
+        fourth_return = ([[('', "should never be read")]], [{"end_of_log": True}])
+        mock_read.side_effect = [first_return, second_return, third_return, fourth_return]
+
+        task_log_reader = TaskLogReader()
+        self.ti.state = TaskInstanceState.RUNNING
+        log_stream = task_log_reader.read_log_stream(ti=self.ti, try_number=1, metadata={})
+        assert ["\n1st line\n", "\n2nd line\n", "\n\n"] == list(log_stream)
+        assert mock_read.call_count == 3
+
     @mock.patch("airflow.utils.log.file_task_handler.FileTaskHandler.read")
     def test_read_log_stream_should_read_each_try_in_turn(self, mock_read):
         first_return = ([[('', "try_number=1.")]], [{"end_of_log": True}])
@@ -0,0 +1,115 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import io
+import re
+
+import pytest
+
+from airflow.utils import timezone
+from airflow.utils.log.log_search import LogMatch, LogSearchQuery, search_log_lines
+
+LOG = b"""\
+[2022-06-12T13:00:00.000+0000] {taskinstance.py:1} INFO - Starting attempt 1 of 1
+[2022-06-12T13:00:01.000+0000] {taskinstance.py:2} INFO - Executing task
+[2022-06-12T13:00:02.000+0000] {taskinstance.py:3} ERROR - Task failed with exception
+Traceback (most recent call last):
+ValueError: something went wrong
+[2022-06-12T13:00:03.000+0000] {taskinstance.py:4} INFO - Marking task as FAILED
+"""
+LINES = LOG.decode().splitlines()
+
+
+def search(**kwargs):
+    return list(search_log_lines(io.BytesIO(LOG), LogSearchQuery(**kwargs), try_number=1))
+
+
+class TestSearchLogLines:
+    def test_substring(self):
+        assert search(pattern="task as") == [LogMatch(1, LOG.index(LINES[5].encode()), LINES[5], [], [])]
+        assert search(pattern="Executing")[0].offset == len(LINES[0]) + 1
+
+    def test_regex_ignoring_case(self):
+        matches = search(pattern=r"^valueerror: .* wrong$", regex=True, ignore_case=True)
+        assert [match.line for match in matches] == [LINES[4]]
+
+    def test_substring_is_not_a_regex(self):
+        assert search(pattern="1 of .") == []
+
+    def test_context_lines(self):
+        matches = search(pattern="ERROR", context_lines=2)
+        assert matches == [LogMatch(1, LOG.index(LINES[2].encode()), LINES[2], LINES[0:2], LINES[3:5])]
+
+    def test_context_lines_at_end_of_log(self):
+        matches = search(pattern="FAILED", context_lines=2)
+        assert matches == [LogMatch(1, LOG.index(LINES[5].encode()), LINES[5], LINES[3:5], [])]
+
+    def test_overlapping_context_lines(self):
+        matches = search(pattern="INFO", context_lines=1)
+        assert [(match.line, match.context_before, match.context_after) for match in matches] == [
+            (LINES[0], [], [LINES[1]]),
+            (LINES[1], [LINES[0]], [LINES[2]]),
+            (LINES[5], [LINES[4]], []),
+        ]
+
+    def test_levels_apply_to_the_lines_of_a_record(self):
+        matches = search(levels=["error"])
+        assert [match.line for match in matches] == LINES[2:5]
+
+    def test_time_window(self):
+        matches = search(
+            start_date=timezone.datetime(2022, 6, 12, 13, 0, 1),
+            end_date=timezone.datetime(2022, 6, 12, 13, 0, 2),
+        )
+        assert [match.line for match in matches] == LINES[1:5]
+
+    def test_max_matches(self):
+        matches = search(pattern="INFO", max_matches=2, context_lines=1)
+        assert [(match.line, match.context_after) for match in matches] == [
+            (LINES[0], [LINES[1]]),
+            (LINES[1], [LINES[2]]),
+        ]
+
+    def test_invalid_regex(self):
+        with pytest.raises(re.error):
+            search(pattern="(", regex=True)
+
+
+class TestLogSearchQuery:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            LogSearchQuery(),
+            LogSearchQuery(
+                pattern="a|b",
+                regex=True,
+                ignore_case=True,
+                levels=["ERROR", "WARNING"],
+                start_date=timezone.datetime(2022, 6, 12),
+                end_date=timezone.datetime(2022, 6, 13),
+                context_lines=3,
+                max_matches=10,
+            ),
+        ],
+    )
+    def test_params_round_trip(self, query):
+        assert LogSearchQuery.from_params(query.to_params()) == query
+
+    def test_invalid_params(self):
+        with pytest.raises(ValueError):
+            LogSearchQuery.from_params({"context_lines": "many"})
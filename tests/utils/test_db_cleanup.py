@@ -20,6 +20,7 @@ from __future__ import annotations
 from contextlib import suppress
 from importlib import import_module
 from pathlib import Path
+from unittest import mock
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
@@ -117,6 +118,32 @@ class TestDBCleanup:
         run_cleanup(**base_kwargs, table_names=table_names)
         assert clean_table_mock.call_count == len(table_names) if table_names else len(config_dict)
 
+    @pytest.mark.parametrize(
+        'table_names, dry_run, called',
+        [
+            param(['xcom'], False, True, id='xcom'),
+            param(['dag_run'], False, True, id='dag_run'),
+            param(['log'], False, False, id='other'),
+            param(['xcom'], True, False, id='dry_run'),
+        ],
+    )
+    @patch('airflow.utils.db_cleanup._cleanup_table', new=MagicMock())
+    @patch('airflow.models.xcom.XCom.purge_unreferenced')
+    def test_run_cleanup_purge_xcom_values(self, purge_mock, table_names, dry_run, called):
+        """Values stored outside the database by the XCom backend are purged with the XComs"""
+        clean_before_timestamp = pendulum.datetime(2022, 1, 1)
+        run_cleanup(
+            clean_before_timestamp=clean_before_timestamp,
+            table_names=table_names,
+            dry_run=dry_run,
+            verbose=None,
+            confirm=False,
+        )
+        if called:
+            purge_mock.assert_called_once_with(older_than=clean_before_timestamp, session=mock.ANY)
+        else:
+            purge_mock.assert_not_called()
+
     @pytest.mark.parametrize(
         'dry_run',
         [None, True, False],
@@ -264,6 +291,7 @@ class TestDBCleanup:
             'dag_pickle',  # unsure of consequences
             'dag_code',  # self-maintaining
             'dag_warning',  # self-maintaining
+            'dag_state_summary',  # self-maintaining
             'connection',  # leave alone
             'slot_pool',  # leave alone
             'dag_schedule_dataset_reference',  # leave alone for now
@@ -0,0 +1,58 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from airflow.utils.hashring import ConsistentHashRing
+
+KEYS = [f"dag_{i}" for i in range(1000)]
+
+
+class TestConsistentHashRing:
+    def test_keys_are_spread_between_nodes(self):
+        ring = ConsistentHashRing(["1", "2", "3"])
+
+        counts = Counter(ring.get_node(key) for key in KEYS)
+
+        assert set(counts) == {"1", "2", "3"}
+        assert all(count > 200 for count in counts.values())
+
+    def test_mapping_does_not_depend_on_node_order(self):
+        assert [ConsistentHashRing(["1", "2", "3"]).get_node(key) for key in KEYS] == [
+            ConsistentHashRing(["3", "1", "2"]).get_node(key) for key in KEYS
+        ]
+
+    def test_only_keys_of_removed_node_move(self):
+        before = ConsistentHashRing(["1", "2", "3"])
+        after = ConsistentHashRing(["1", "3"])
+
+        for key in KEYS:
+            if before.get_node(key) != "2":
+                assert after.get_node(key) == before.get_node(key)
+            else:
+                assert after.get_node(key) in ("1", "3")
+
+    def test_empty_ring(self):
+        ring = ConsistentHashRing([])
+
+        assert len(ring) == 0
+        with pytest.raises(ValueError, match="no nodes"):
+            ring.get_node("dag")
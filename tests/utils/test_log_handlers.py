@@ -21,16 +21,24 @@ import logging
 import logging.config
 import os
 import re
+from unittest import mock
+
+import httpx
+import pytest
 
 from airflow.config_templates.airflow_local_settings import DEFAULT_LOGGING_CONFIG
+from airflow.exceptions import AirflowException
 from airflow.models import DAG, DagRun, TaskInstance
 from airflow.operators.python import PythonOperator
-from airflow.utils.log.file_task_handler import FileTaskHandler
+from airflow.utils.log.file_task_handler import FileTaskHandler, find_tail_offset
+from airflow.utils.log.log_compression import compress_log, find_compressed_log, open_log
+from airflow.utils.log.log_search import LogMatch, LogSearchQuery
 from airflow.utils.log.logging_mixin import set_context
 from airflow.utils.session import create_session
 from airflow.utils.state import State
 from airflow.utils.timezone import datetime
 from airflow.utils.types import DagRunType
+from tests.test_utils.config import conf_vars
 
 DEFAULT_DATE = datetime(2016, 1, 1)
 TASK_LOGGER = 'airflow.task'
@@ -264,3 +272,252 @@ class TestLogUrl:
         log_url_ti.hostname = 'hostname'
         url = FileTaskHandler._get_log_retrieval_url(log_url_ti, 'DYNAMIC_PATH')
         assert url == "http://hostname:8793/log/DYNAMIC_PATH"
+
+
+class TestFindTailOffset:
+    @pytest.mark.parametrize(
+        "content, num_lines, expected",
+        [
+            (b"a\nb\nc\n", 2, 2),
+            (b"a\nb\nc", 2, 2),
+            (b"a\nb\nc\n", 1, 4),
+            (b"a\nb\nc\n", 3, 0),
+            (b"a\nb\nc\n", 10, 0),
+            (b"a\nb\nc\n", 0, 6),
+            (b"", 1, 0),
+        ],
+    )
+    def test_find_tail_offset(self, tmp_path, content, num_lines, expected):
+        path = tmp_path / "test.log"
+        path.write_bytes(content)
+        with open(path, "rb") as file:
+            assert find_tail_offset(file, len(content), num_lines) == expected
+
+    def test_find_tail_offset_across_blocks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("airflow.utils.log.file_task_handler.TAIL_BLOCK_SIZE", 3)
+        content = b"".join(f"line {i}\n".encode() for i in range(100))
+        path = tmp_path / "test.log"
+        path.write_bytes(content)
+        with open(path, "rb") as file:
+            offset = find_tail_offset(file, len(content), 5)
+        assert content[offset:] == b"".join(f"line {i}\n".encode() for i in range(95, 100))
+
+
+class TestFileTaskHandlerChunkedRead:
+    LOG_LINES = "".join(f"line {i}\n" for i in range(10))
+
+    @pytest.fixture
+    def ti(self, create_log_template, create_task_instance):
+        create_log_template("{dag_id}/{task_id}/{try_number}.log")
+        ti = create_task_instance(
+            dag_id="dag_for_testing_chunked_read",
+            task_id="task_for_testing_chunked_read",
+            run_type=DagRunType.SCHEDULED,
+            execution_date=DEFAULT_DATE,
+            state=State.SUCCESS,
+        )
+        ti.try_number = 2
+        ti.hostname = "hostname"
+        return ti
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        log_dir = tmp_path / "dag_for_testing_chunked_read" / "task_for_testing_chunked_read"
+        log_dir.mkdir(parents=True)
+        log_file = log_dir / "1.log"
+        log_file.write_text(self.LOG_LINES)
+        return log_file
+
+    @conf_vars({("logging", "log_read_chunk_size"): "15"})
+    def test_read_local_file_in_chunks(self, ti, tmp_path, log_file):
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {})
+        # The chunk is cut after its last complete line
+        assert log == f"*** Reading local file: {log_file}\nline 0\nline 1\n"
+        assert metadata == {"end_of_log": False, "log_pos": 14}
+
+        content = ""
+        while not metadata["end_of_log"]:
+            log, metadata = handler._read(ti, 1, metadata)
+            content += log
+        assert content == self.LOG_LINES[14:]
+        assert metadata == {"end_of_log": True, "log_pos": len(self.LOG_LINES)}
+
+    def test_read_local_file_tail(self, ti, tmp_path, log_file):
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {"tail_lines": 2})
+        assert log == f"*** Reading local file: {log_file}\nline 8\nline 9\n"
+        assert metadata == {"end_of_log": True, "log_pos": len(self.LOG_LINES)}
+
+    def test_read_local_file_from_position(self, ti, tmp_path, log_file):
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {"log_pos": 63})
+        assert log == "line 9\n"
+        assert metadata == {"end_of_log": True, "log_pos": len(self.LOG_LINES)}
+
+    @conf_vars({("logging", "log_read_chunk_size"): "15"})
+    def test_read_compressed_local_file(self, ti, tmp_path, log_file):
+        compress_log(str(log_file), "gzip")
+        log_file.write_text("line 10\n")
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {"tail_lines": 2})
+        assert log == (
+            f"*** Reading local file: {log_file}.gz\n*** Reading local file: {log_file}\nline 9\nline 10\n"
+        )
+        assert metadata == {"end_of_log": True, "log_pos": len(self.LOG_LINES) + 8}
+
+        log, metadata = handler._read(ti, 1, {"log_pos": 14})
+        assert log == "line 2\nline 3\n"
+        assert metadata == {"end_of_log": False, "log_pos": 28}
+
+    @conf_vars({("logging", "task_log_compression"): "gzip"})
+    def test_close_compresses_log(self, ti, tmp_path):
+        handler = FileTaskHandler(str(tmp_path))
+        handler.set_context(ti)
+        handler.emit(logging.makeLogRecord({"msg": "test"}))
+        handler.close()
+
+        log_file = handler.handler.baseFilename
+        assert not os.path.exists(log_file)
+        with open_log(log_file) as file:
+            assert file.read() == b"test\n"
+
+    @conf_vars({("logging", "task_log_compression"): "gzip"})
+    def test_close_does_not_compress_log_of_raw_task(self, ti, tmp_path):
+        ti.raw = True
+        handler = FileTaskHandler(str(tmp_path))
+        handler.set_context(ti)
+        handler.close()
+
+        log_file = handler.handler.baseFilename
+        assert os.path.exists(log_file)
+        assert find_compressed_log(log_file) is None
+
+    @conf_vars({("logging", "task_log_compression"): "gzip"})
+    def test_close_does_not_compress_log_of_raw_task_forked_from_supervisor(self, ti, tmp_path):
+        handler = FileTaskHandler(str(tmp_path))
+        handler.set_context(ti)
+        assert handler.compression == "gzip"
+
+        # The raw task process forked from its supervisor sets the context of the same handler again
+        ti.raw = True
+        handler.set_context(ti)
+        assert handler.compression is None
+        handler.close()
+
+        log_file = handler.handler.baseFilename
+        assert os.path.exists(log_file)
+        assert find_compressed_log(log_file) is None
+
+    def test_search_local_file(self, ti, tmp_path, log_file):
+        compress_log(str(log_file), "gzip")
+        handler = FileTaskHandler(str(tmp_path))
+
+        matches = list(handler.search_log(ti, 1, LogSearchQuery(pattern="line 3", context_lines=1)))
+        assert matches == [LogMatch(1, 21, "line 3", ["line 2"], ["line 4"])]
+
+    @mock.patch("httpx.stream")
+    def test_search_remote_file(self, mock_stream, ti, tmp_path):
+        response = mock_stream.return_value.__enter__.return_value
+        response.iter_lines.return_value = [
+            '{"try_number": 1, "offset": 21, "line": "line 3", "context_before": [], "context_after": []}'
+        ]
+        handler = FileTaskHandler(str(tmp_path))
+
+        matches = list(handler.search_log(ti, 1, LogSearchQuery(pattern="line 3")))
+        assert matches == [LogMatch(1, 21, "line 3", [], [])]
+        assert mock_stream.call_args.args == (
+            "GET",
+            "http://hostname:8793/search/dag_for_testing_chunked_read/task_for_testing_chunked_read/1.log",
+        )
+        assert mock_stream.call_args.kwargs["params"]["pattern"] == "line 3"
+        assert mock_stream.call_args.kwargs["params"]["try_number"] == "1"
+
+    @conf_vars({("logging", "log_read_chunk_size"): "15"})
+    @mock.patch("httpx.get")
+    @mock.patch("httpx.stream")
+    def test_search_remote_file_of_worker_without_search(self, mock_stream, mock_get, ti, tmp_path):
+        request = httpx.Request("GET", "http://hostname")
+        mock_stream.return_value.__enter__.return_value = httpx.Response(403, request=request)
+
+        def get(url, headers, **kwargs):
+            start, end = map(int, headers["Range"][len("bytes=") :].split("-"))
+            if start >= len(self.LOG_LINES):
+                return httpx.Response(416, request=request)
+            content = self.LOG_LINES[start : end + 1]
+            content_range = f"bytes {start}-{start + len(content) - 1}/{len(self.LOG_LINES)}"
+            return httpx.Response(
+                206, content=content, headers={"Content-Range": content_range}, request=request
+            )
+
+        mock_get.side_effect = get
+        handler = FileTaskHandler(str(tmp_path))
+
+        # The log is fetched a chunk at a time to its end and searched here
+        matches = list(handler.search_log(ti, 1, LogSearchQuery(pattern="line 9")))
+        assert [match.line for match in matches] == ["line 9"]
+        assert mock_get.call_count > 1
+
+    @mock.patch("httpx.stream")
+    def test_search_remote_file_of_unreachable_worker(self, mock_stream, ti, tmp_path):
+        mock_stream.side_effect = httpx.ConnectError("Connection refused")
+        handler = FileTaskHandler(str(tmp_path))
+
+        with pytest.raises(AirflowException, match="Could not search the log on worker hostname"):
+            list(handler.search_log(ti, 1, LogSearchQuery(pattern="line 3")))
+
+    def test_search_log_read_in_chunks(self, ti, tmp_path):
+        class ChunkedTaskHandler(FileTaskHandler):
+            def _read(self, ti, try_number, metadata=None):
+                chunks = ["line 1\nli", "ne 2\nline", " 3\n"]
+                pos = metadata.get("log_pos", 0)
+                return chunks[pos], {"end_of_log": pos == len(chunks) - 1, "log_pos": pos + 1}
+
+        handler = ChunkedTaskHandler(str(tmp_path))
+
+        matches = list(handler.search_log(ti, 1, LogSearchQuery(pattern="line", context_lines=1)))
+        assert [match.line for match in matches] == ["line 1", "line 2", "line 3"]
+
+    @conf_vars({("logging", "log_read_chunk_size"): "15"})
+    @mock.patch("httpx.get")
+    def test_read_remote_file_in_chunks(self, mock_get, ti, tmp_path):
+        mock_get.return_value = httpx.Response(
+            206,
+            content=self.LOG_LINES[14:29].encode(),
+            headers={"Content-Range": f"bytes 14-28/{len(self.LOG_LINES)}"},
+            request=httpx.Request("GET", "http://hostname"),
+        )
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {"log_pos": 14})
+        assert mock_get.call_args.kwargs["headers"]["Range"] == "bytes=14-28"
+        assert log == "line 2\nline 3\n"
+        assert metadata == {"end_of_log": False, "log_pos": 28}
+
+    @mock.patch("httpx.get")
+    def test_read_remote_file_tail(self, mock_get, ti, tmp_path):
+        mock_get.return_value = httpx.Response(
+            206,
+            content=self.LOG_LINES[63:].encode(),
+            headers={"Content-Range": f"bytes 63-69/{len(self.LOG_LINES)}"},
+            request=httpx.Request("GET", "http://hostname"),
+        )
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {"tail_lines": 1})
+        assert mock_get.call_args.kwargs["params"] == {"tail_lines": 1}
+        assert log.endswith("\nline 9\n")
+        assert metadata == {"end_of_log": True, "log_pos": len(self.LOG_LINES)}
+
+    @mock.patch("httpx.get")
+    def test_read_remote_file_without_new_bytes(self, mock_get, ti, tmp_path):
+        mock_get.return_value = httpx.Response(416, request=httpx.Request("GET", "http://hostname"))
+        handler = FileTaskHandler(str(tmp_path))
+
+        log, metadata = handler._read(ti, 1, {"log_pos": len(self.LOG_LINES)})
+        assert log == ""
+        assert metadata == {"end_of_log": True, "log_pos": len(self.LOG_LINES)}
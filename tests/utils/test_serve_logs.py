@@ -17,6 +17,8 @@
 from __future__ import annotations
 
 import datetime
+import gzip
+import json
 from typing import TYPE_CHECKING
 
 import jwt
@@ -24,6 +26,7 @@ import pytest
 from freezegun import freeze_time
 
 from airflow.utils.jwt_signer import JWTSigner
+from airflow.utils.log.log_compression import compress_log
 from airflow.utils.serve_logs import create_app
 from tests.test_utils.config import conf_vars
 
@@ -82,6 +85,101 @@ class TestServeLogs:
         assert response.data.decode() == LOG_DATA
         assert response.status_code == 200
 
+    def test_should_serve_range(self, client: FlaskClient, signer):
+        response = client.get(
+            '/log/sample.log',
+            headers={
+                'Authorization': signer.generate_signed_token({"filename": 'sample.log'}),
+                'Range': 'bytes=16-31',
+            },
+        )
+        assert response.data.decode() == LOG_DATA[16:32]
+        assert response.headers['Content-Range'] == f"bytes 16-31/{len(LOG_DATA)}"
+        assert response.status_code == 206
+
+    def test_should_serve_tail(self, client: FlaskClient, signer, tmpdir):
+        (tmpdir / 'lines.log').write(b"first\nsecond\nthird\n")
+        response = client.get(
+            '/log/lines.log',
+            query_string={'tail_lines': 2},
+            headers={
+                'Authorization': signer.generate_signed_token({"filename": 'lines.log'}),
+            },
+        )
+        assert response.data.decode() == "second\nthird\n"
+        assert response.headers['Content-Range'] == "bytes 6-18/19"
+        assert response.status_code == 206
+
+    def test_should_serve_compressed_file(self, client: FlaskClient, signer, sample_log):
+        compress_log(str(sample_log), 'gzip')
+        response = client.get(
+            '/log/sample.log',
+            headers={
+                'Authorization': signer.generate_signed_token({"filename": 'sample.log'}),
+                'Accept-Encoding': 'gzip',
+            },
+        )
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data).decode() == LOG_DATA
+        assert response.status_code == 200
+
+    def test_should_decompress_file(self, client: FlaskClient, signer, sample_log):
+        compress_log(str(sample_log), 'gzip')
+        response = client.get(
+            '/log/sample.log',
+            headers={
+                'Authorization': signer.generate_signed_token({"filename": 'sample.log'}),
+                'Accept-Encoding': 'identity',
+            },
+        )
+        assert 'Content-Encoding' not in response.headers
+        assert response.data.decode() == LOG_DATA
+        assert response.status_code == 200
+
+    def test_should_serve_range_of_compressed_file(self, client: FlaskClient, signer, sample_log):
+        compress_log(str(sample_log), 'gzip')
+        token = signer.generate_signed_token({"filename": 'sample.log'})
+        response = client.get('/log/sample.log', headers={'Authorization': token, 'Range': 'bytes=16-31'})
+        assert response.data.decode() == LOG_DATA[16:32]
+        # The size of the log is only known when it is read to its end
+        assert response.headers['Content-Range'] == "bytes 16-31/*"
+        assert response.status_code == 206
+
+        response = client.get('/log/sample.log', headers={'Authorization': token, 'Range': 'bytes=16-'})
+        assert response.data.decode() == LOG_DATA[16:]
+        assert response.headers['Content-Range'] == f"bytes 16-{len(LOG_DATA) - 1}/{len(LOG_DATA)}"
+
+    def test_should_search_file(self, client: FlaskClient, signer, tmpdir):
+        (tmpdir / 'lines.log').write(b"first\nsecond\nthird\n")
+        response = client.get(
+            '/search/lines.log',
+            query_string={'pattern': 'sec', 'context_lines': 1, 'try_number': 2},
+            headers={
+                'Authorization': signer.generate_signed_token({"filename": 'lines.log'}),
+            },
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert [json.loads(line) for line in response.data.splitlines()] == [
+            {
+                'try_number': 2,
+                'offset': 6,
+                'line': 'second',
+                'context_before': ['first'],
+                'context_after': ['third'],
+            }
+        ]
+
+    def test_should_not_search_invalid_regex(self, client: FlaskClient, signer):
+        response = client.get(
+            '/search/sample.log',
+            query_string={'pattern': '(', 'regex': 'true'},
+            headers={
+                'Authorization': signer.generate_signed_token({"filename": 'sample.log'}),
+            },
+        )
+        assert response.status_code == 400
+
     def test_forbidden_different_logname(self, client: FlaskClient, signer):
         response = client.get(
             '/log/sample.log',
@@ -18,10 +18,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from unittest import mock
 
 import pendulum
 import pytest
 from dateutil.tz import UTC
+from freezegun import freeze_time
 
 from airflow.datasets import Dataset
 from airflow.lineage.entities import File
@@ -29,10 +31,11 @@ from airflow.models import DagBag
 from airflow.models.dagrun import DagRun
 from airflow.models.dataset import DatasetDagRunQueue, DatasetEvent, DatasetModel
 from airflow.operators.empty import EmptyOperator
+from airflow.utils import timezone
 from airflow.utils.state import DagRunState, TaskInstanceState
 from airflow.utils.task_group import TaskGroup
 from airflow.utils.types import DagRunType
-from airflow.www.views import dag_to_grid
+from airflow.www.views import GRID_DATA_CURSOR_MARGIN, GridDataCache, dag_to_grid
 from tests.test_utils.asserts import assert_queries_count
 from tests.test_utils.db import clear_db_datasets, clear_db_runs
 from tests.test_utils.mock_operators import MockOperator
@@ -125,6 +128,7 @@ def test_no_runs(admin_client, dag_without_runs):
             'instances': [],
             'label': None,
         },
+        'cursor': mock.ANY,
         'ordering': ['data_interval_end', 'execution_date'],
     }
 
@@ -274,6 +278,7 @@ def test_one_run(admin_client, dag_with_runs: list[DagRun], session):
             'instances': [],
             'label': None,
         },
+        'cursor': mock.ANY,
         'ordering': ['data_interval_end', 'execution_date'],
     }
 
@@ -284,6 +289,83 @@ def test_query_count(dag_with_runs, session):
         dag_to_grid(run1.dag, (run1, run2), session)
 
 
+def test_since_cursor(admin_client, dag_with_runs, session):
+    run1, run2 = dag_with_runs
+    now = timezone.utcnow()
+    with freeze_time(now + timedelta(hours=1)):
+        resp = admin_client.get(f'/object/grid_data?dag_id={DAG_ID}', follow_redirects=True)
+    assert resp.status_code == 200, resp.json
+    cursor = resp.json['cursor']
+    assert timezone.parse(cursor) == now + timedelta(hours=1) - GRID_DATA_CURSOR_MARGIN
+    assert [dr['run_id'] for dr in resp.json['dag_runs']] == ['run_1', 'run_2']
+
+    with freeze_time(now + timedelta(hours=2)):
+        ti = run2.get_task_instance('task1', session=session)
+        ti.state = TaskInstanceState.RUNNING
+        session.flush()
+
+        resp = admin_client.get(
+            '/object/grid_data', query_string={'dag_id': DAG_ID, 'since': cursor}, follow_redirects=True
+        )
+    assert resp.status_code == 200, resp.json
+    assert resp.json['cursor'] > cursor
+    assert resp.json['run_ids'] == ['run_1', 'run_2']
+    assert [dr['run_id'] for dr in resp.json['dag_runs']] == ['run_2']
+    task1 = resp.json['groups']['children'][0]
+    assert [(ti['run_id'], ti['state']) for ti in task1['instances']] == [('run_2', 'running')]
+
+    resp = admin_client.get(
+        '/object/grid_data', query_string={'dag_id': DAG_ID, 'since': 'foo'}, follow_redirects=True
+    )
+    assert resp.status_code == 400, resp.json
+
+
+def test_since_cursor_includes_changes_committed_after_the_request(admin_client, dag_with_runs, session):
+    run1, run2 = dag_with_runs
+    now = timezone.utcnow()
+    with freeze_time(now + timedelta(hours=1)):
+        cursor = admin_client.get(f'/object/grid_data?dag_id={DAG_ID}', follow_redirects=True).json['cursor']
+
+    # Stamped before the previous request, but only committed after it
+    with freeze_time(now + timedelta(hours=1) - timedelta(seconds=1)):
+        ti = run1.get_task_instance('task1', session=session)
+        ti.state = TaskInstanceState.FAILED
+        session.flush()
+
+    with freeze_time(now + timedelta(hours=2)):
+        resp = admin_client.get(
+            '/object/grid_data', query_string={'dag_id': DAG_ID, 'since': cursor}, follow_redirects=True
+        )
+    assert resp.status_code == 200, resp.json
+    assert [dr['run_id'] for dr in resp.json['dag_runs']] == ['run_1']
+
+
+def test_grid_data_without_cache(admin_client, dag_with_runs):
+    with mock.patch.object(GridDataCache, 'get') as mock_get:
+        resp = admin_client.get(f'/object/grid_data?dag_id={DAG_ID}', follow_redirects=True)
+    assert resp.status_code == 200, resp.json
+    mock_get.assert_not_called()
+
+
+def test_grid_data_cache(admin_client, dag_with_runs, session, monkeypatch):
+    run1, run2 = dag_with_runs
+    monkeypatch.setattr('airflow.www.views.grid_data_cache', GridDataCache(max_size=1))
+
+    with mock.patch('airflow.www.views.dag_to_grid', wraps=dag_to_grid) as mock_dag_to_grid:
+        first = admin_client.get(f'/object/grid_data?dag_id={DAG_ID}', follow_redirects=True).json
+        second = admin_client.get(f'/object/grid_data?dag_id={DAG_ID}', follow_redirects=True).json
+        assert mock_dag_to_grid.call_count == 1
+        assert first['groups'] == second['groups']
+        assert first['dag_runs'] == second['dag_runs']
+
+        ti = run1.get_task_instance('task1', session=session)
+        ti.state = TaskInstanceState.FAILED
+        session.flush()
+        third = admin_client.get(f'/object/grid_data?dag_id={DAG_ID}', follow_redirects=True).json
+        assert mock_dag_to_grid.call_count == 2
+        assert third['groups']['children'][0]['instances'][0]['state'] == 'failed'
+
+
 def test_has_outlet_dataset_flag(admin_client, dag_maker, session, app, monkeypatch):
     with monkeypatch.context() as m:
         # Remove global operator links for this test
@@ -326,6 +408,7 @@ def test_has_outlet_dataset_flag(admin_client, dag_maker, session, app, monkeypa
             'instances': [],
             'label': None,
         },
+        'cursor': mock.ANY,
         'ordering': ['data_interval_end', 'execution_date'],
     }
 
@@ -21,18 +21,24 @@ from unittest import mock
 
 import flask
 import markupsafe
+import pendulum
 import pytest
 
 from airflow.dag_processing.processor import DagFileProcessor
+from airflow.models.dagstatesummary import DagStateSummary
+from airflow.operators.empty import EmptyOperator
 from airflow.security import permissions
 from airflow.utils.session import create_session
 from airflow.utils.state import State
 from airflow.www.utils import UIAlert
 from airflow.www.views import FILTER_STATUS_COOKIE, FILTER_TAGS_COOKIE
 from tests.test_utils.api_connexion_utils import create_user
-from tests.test_utils.db import clear_db_dags, clear_db_import_errors, clear_db_serialized_dags
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_dags, clear_db_import_errors, clear_db_runs, clear_db_serialized_dags
 from tests.test_utils.www import check_content_in_response, check_content_not_in_response, client_with_login
 
+DEFAULT_DATE = pendulum.datetime(2022, 1, 1, tz="UTC")
+
 
 def clean_db():
     clear_db_dags()
@@ -268,3 +274,29 @@ def test_sorting_home_view(url, lower_key, greater_key, user_client, working_dag
     lower_index = resp_html.find(lower_key)
     greater_index = resp_html.find(greater_key)
     assert lower_index < greater_index
+
+
+@pytest.fixture
+def dag_with_runs(dag_maker, session):
+    with dag_maker('test_dag_state_summary_view', start_date=DEFAULT_DATE, session=session):
+        EmptyOperator(task_id='task_1')
+        EmptyOperator(task_id='task_2')
+    finished = dag_maker.create_dagrun(run_id='finished', execution_date=DEFAULT_DATE, state=State.FAILED)
+    finished.get_task_instance('task_1', session=session).state = State.FAILED
+    dag_maker.create_dagrun(run_id='running', execution_date=DEFAULT_DATE.add(days=1), state=State.RUNNING)
+    session.commit()
+    yield 'test_dag_state_summary_view'
+    clear_db_runs()
+
+
+@pytest.mark.parametrize("show_recent_stats", ["True", "False"])
+@pytest.mark.parametrize("url", ["dag_stats", "task_stats", "last_dagruns"])
+def test_stats_from_dag_state_summaries(admin_client, dag_with_runs, url, show_recent_stats):
+    data = {'dag_ids': [dag_with_runs]}
+    with conf_vars({('webserver', 'show_recent_stats_for_completed_runs'): show_recent_stats}):
+        expected = admin_client.post(url, data=data, follow_redirects=True).json
+        DagStateSummary.refresh([dag_with_runs])
+        with conf_vars({('scheduler', 'dag_state_summary_update_interval'): '10'}):
+            resp = admin_client.post(url, data=data, follow_redirects=True)
+
+    assert resp.json == expected